@@ -11,7 +11,7 @@ from datetime import datetime, timezone, timedelta
 from typing import Any, Dict, Callable
 from flask import current_app as flask_app
 from amundsen_common.log import action_log_callback
-from amundsen_common.log.action_log_model import ActionLogParams
+from amundsen_common.log.action_log_model import ActionLogParams, SerializedOutput
 
 LOGGER = logging.getLogger(__name__)
 EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)  # use POSIX epoch
@@ -19,6 +19,16 @@ EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)  # use POSIX epoch
 # CONFIG KEY FOR caller_retrieval instance
 CALLER_RETRIEVAL_INSTANCE_KEY = 'CALLER_RETRIEVAL_INSTANCE'
 
+# CONFIG KEYS FOR asynchronous action logging, where callbacks are called from a background thread
+ACTION_LOG_ASYNC_KEY = 'ACTION_LOG_ASYNC'
+ACTION_LOG_QUEUE_SIZE_KEY = 'ACTION_LOG_QUEUE_SIZE'
+ACTION_LOG_BATCH_SIZE_KEY = 'ACTION_LOG_BATCH_SIZE'
+# CONFIG KEY FOR the maximum number of characters of the JSON serialized output, not capped if not set
+ACTION_LOG_MAX_OUTPUT_SIZE_KEY = 'ACTION_LOG_MAX_OUTPUT_SIZE'
+
+DEFAULT_ACTION_LOG_QUEUE_SIZE = 1000
+DEFAULT_ACTION_LOG_BATCH_SIZE = 100
+
 
 def action_logging(f: Callable[..., Any]) -> Any:
     """
@@ -42,7 +52,8 @@ def action_logging(f: Callable[..., Any]) -> Any:
         :param kwargs: A passthrough keyword argument
         """
         metrics = _build_metrics(f.__name__, *args, **kwargs)
-        action_log_callback.on_pre_execution(ActionLogParams(**metrics))
+        submit = _get_submit()
+        submit(action_log_callback.PRE_EXECUTION, ActionLogParams(**metrics))
         output = None
         try:
             output = f(*args, **kwargs)
@@ -52,12 +63,10 @@ def action_logging(f: Callable[..., Any]) -> Any:
             raise
         finally:
             metrics['end_epoch_ms'] = get_epoch_millisec()
-            try:
-                metrics['output'] = json.dumps(output)
-            except Exception:
-                metrics['output'] = output
+            # serialized only once a callback reads it
+            metrics['output'] = SerializedOutput(output, max_size=flask_app.config.get(ACTION_LOG_MAX_OUTPUT_SIZE_KEY))
 
-            action_log_callback.on_post_execution(ActionLogParams(**metrics))
+            submit(action_log_callback.POST_EXECUTION, ActionLogParams(**metrics))
 
     if LOGGER.isEnabledFor(logging.DEBUG):
         LOGGER.debug('action has been logged')
@@ -65,6 +74,32 @@ def action_logging(f: Callable[..., Any]) -> Any:
     return wrapper
 
 
+def _get_submit() -> Callable[[str, ActionLogParams], None]:
+    """
+    Provides the function handing ActionLogParams over to the callbacks: either right away on the calling thread,
+    or through the background dispatcher if ACTION_LOG_ASYNC is enabled
+    """
+    if flask_app.config.get(ACTION_LOG_ASYNC_KEY, False):
+        dispatcher = action_log_callback.get_async_dispatcher(
+            queue_size=flask_app.config.get(ACTION_LOG_QUEUE_SIZE_KEY, DEFAULT_ACTION_LOG_QUEUE_SIZE),
+            batch_size=flask_app.config.get(ACTION_LOG_BATCH_SIZE_KEY, DEFAULT_ACTION_LOG_BATCH_SIZE))
+        return dispatcher.submit
+
+    return _submit_sync
+
+
+def _submit_sync(phase: str, action_log_params: ActionLogParams) -> None:
+    if phase == action_log_callback.PRE_EXECUTION:
+        action_log_callback.on_pre_execution(action_log_params)
+    else:
+        action_log_callback.on_post_execution(action_log_params)
+
+
+@functools.lru_cache(maxsize=1)
+def get_host_name() -> str:
+    return socket.gethostname()
+
+
 def get_epoch_millisec() -> int:
     return (datetime.now(timezone.utc) - EPOCH) // timedelta(milliseconds=1)
 
@@ -85,7 +120,7 @@ def _build_metrics(
     metrics = {
         'command': kwargs.get('command', func_name),
         'start_epoch_ms': get_epoch_millisec(),
-        'host_name': socket.gethostname(),
+        'host_name': get_host_name(),
         'pos_args_json': json.dumps(args),
         'keyword_args_json': json.dumps(kwargs),
     }  # type: Dict[str, Any]
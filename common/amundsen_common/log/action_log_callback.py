@@ -6,9 +6,12 @@ An Action Logger module. Singleton pattern has been applied into this module
 so that registered callbacks can be used all through the same python process.
 """
 
+import atexit
 import logging
+import queue
 import sys
-from typing import Callable, List, Any
+import threading
+from typing import Any, Callable, List, Optional, Tuple  # noqa: F401
 
 from pkg_resources import iter_entry_points
 
@@ -19,6 +22,9 @@ LOGGER = logging.getLogger(__name__)
 __pre_exec_callbacks = []  # type: List[Callable[..., Any]]
 __post_exec_callbacks = []  # type: List[Callable[..., Any]]
 
+PRE_EXECUTION = 'pre_execution'
+POST_EXECUTION = 'post_execution'
+
 
 def register_pre_exec_callback(action_log_callback: Callable[..., Any]) -> None:
     """
@@ -75,6 +81,94 @@ def on_post_execution(action_log_params: ActionLogParams) -> None:
             logging.exception('Failed on post-execution callback using {}'.format(call_back_function))
 
 
+class AsyncActionLogDispatcher(object):
+    """
+    Calls the callbacks on a background thread, so that they are off the request thread. ActionLogParams
+    are handed over through a bounded queue and drained in batches of up to batch_size. When the callbacks
+    can't keep up and the queue is full, action logs are dropped rather than slowing down the requests.
+
+    queue_size caps the number of queued action logs, not their memory. The output is serialized before it is
+    queued, so each entry holds the JSON of its arguments and output rather than the output objects. Queued
+    memory is about queue_size times that JSON, which ACTION_LOG_MAX_OUTPUT_SIZE bounds for the output.
+    """
+    def __init__(self, *, queue_size: int, batch_size: int) -> None:
+        self._queue = queue.Queue(maxsize=queue_size)  # type: queue.Queue[Tuple[str, ActionLogParams]]
+        self._batch_size = batch_size
+        self._lock = threading.Lock()
+        self.dropped = 0
+        self._thread = threading.Thread(target=self._run, name='action-log-dispatcher', daemon=True)
+        self._thread.start()
+
+    def submit(self, phase: str, action_log_params: ActionLogParams) -> None:
+        # replaces the output by its (possibly truncated) JSON, so the queue doesn't keep the output objects alive
+        action_log_params.output = action_log_params.output
+        try:
+            self._queue.put_nowait((phase, action_log_params))
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+                dropped = self.dropped
+            if dropped == 1 or dropped % 1000 == 0:
+                LOGGER.warning('Action log queue is full, {} action logs have been dropped'.format(dropped))
+
+    def flush(self) -> None:
+        """
+        Blocks until all the submitted action logs went through the callbacks
+        """
+        self._queue.join()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self._batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._dispatch(batch)
+
+    def _dispatch(self, batch: List[Tuple[str, ActionLogParams]]) -> None:
+        for phase, action_log_params in batch:
+            if phase == PRE_EXECUTION:
+                on_pre_execution(action_log_params)
+            else:
+                on_post_execution(action_log_params)
+            self._queue.task_done()
+
+    def drain(self) -> None:
+        """
+        Calls the callbacks for the action logs still queued, on the calling thread
+        """
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        self._dispatch(batch)
+
+
+__async_dispatcher = None  # type: Optional[AsyncActionLogDispatcher]
+__async_dispatcher_lock = threading.Lock()
+
+
+def get_async_dispatcher(*, queue_size: int, batch_size: int) -> AsyncActionLogDispatcher:
+    """
+    Provides the process wide AsyncActionLogDispatcher, starting it on first use. Queued action logs are
+    drained when the process exits.
+    """
+    global __async_dispatcher
+    if __async_dispatcher is not None:
+        return __async_dispatcher
+
+    with __async_dispatcher_lock:
+        if __async_dispatcher is None:
+            __async_dispatcher = AsyncActionLogDispatcher(queue_size=queue_size, batch_size=batch_size)
+            atexit.register(__async_dispatcher.drain)
+
+    return __async_dispatcher
+
+
 def logging_action_log(action_log_params: ActionLogParams) -> None:
     """
     An action logger callback that just logs the ActionLogParams that it receives.
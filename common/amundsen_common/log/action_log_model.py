@@ -1,8 +1,40 @@
 # Copyright Contributors to the Amundsen project.
 # SPDX-License-Identifier: Apache-2.0
 
+import json
 from typing import Any, Optional
 
+TRUNCATED_OUTPUT_SUFFIX = '...(truncated)'
+
+
+class SerializedOutput(object):
+    """
+    Output of an action, serialized to JSON on first use only. Serialized output longer than max_size
+    characters is truncated.
+    """
+    def __init__(self, output: Any, max_size: Optional[int] = None) -> None:
+        self._output = output
+        self._max_size = max_size
+        self._serialized = None  # type: Any
+        self._is_serialized = False
+
+    def get(self) -> Any:
+        if not self._is_serialized:
+            self._serialized = self._serialize()
+            self._is_serialized = True
+            self._output = None
+        return self._serialized
+
+    def _serialize(self) -> Any:
+        try:
+            serialized = json.dumps(self._output)
+        except Exception:
+            return self._output
+
+        if self._max_size and len(serialized) > self._max_size:
+            return serialized[:self._max_size] + TRUNCATED_OUTPUT_SUFFIX
+        return serialized
+
 
 class ActionLogParams(object):
     """
@@ -30,6 +62,16 @@ class ActionLogParams(object):
         self.output = output
         self.error = error
 
+    @property
+    def output(self) -> Any:
+        if isinstance(self._output, SerializedOutput):
+            return self._output.get()
+        return self._output
+
+    @output.setter
+    def output(self, output: Any) -> None:
+        self._output = output
+
     def __repr__(self) -> str:
         return 'ActionLogParams(command={!r}, start_epoch_ms={!r}, end_epoch_ms={!r}, user={!r}, ' \
                'host_name={!r}, pos_args_json={!r}, keyword_args_json={!r}, output={!r}, error={!r})'\
@@ -10,6 +10,8 @@ import textwrap
 # https://www.elastic.co/guide/en/elasticsearch/reference/current/analysis-simple-analyzer.html
 # Standard Analyzer is used for all text fields that don't explicitly specify an analyzer
 # https://www.elastic.co/guide/en/elasticsearch/reference/current/analysis-standard-analyzer.html
+# "name_suggest" fields back the typeahead endpoint with completion suggesters
+# https://www.elastic.co/guide/en/elasticsearch/reference/current/search-suggesters.html#completion-suggester
 TABLE_INDEX_MAP = textwrap.dedent(
     """
     {
@@ -35,6 +37,9 @@ TABLE_INDEX_MAP = textwrap.dedent(
                 }
               }
             },
+            "name_suggest": {
+              "type": "completion"
+            },
             "schema": {
               "type":"text",
               "analyzer": "simple",
@@ -150,6 +155,9 @@ DASHBOARD_ELASTICSEARCH_INDEX_MAPPING = textwrap.dedent(
                     }
                   }
                 },
+                "name_suggest": {
+                  "type": "completion"
+                },
                 "description": {
                   "type":"text",
                   "analyzer": "simple",
@@ -241,6 +249,9 @@ USER_INDEX_MAP = textwrap.dedent(
                 }
               }
             },
+            "name_suggest": {
+              "type": "completion"
+            },
             "total_read":{
               "type": "long"
             },
@@ -2,14 +2,16 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import socket
+import threading
 import unittest
 from contextlib import contextmanager
-from typing import Generator, Any
+from typing import Generator, Any, List
 
 import flask
 
 from amundsen_common.log import action_log, action_log_callback
 from amundsen_common.log.action_log import action_logging, get_epoch_millisec
+from amundsen_common.log.action_log_model import ActionLogParams, SerializedOutput
 
 app = flask.Flask(__name__)
 
@@ -52,6 +54,64 @@ class ActionLogTest(unittest.TestCase):
         with app.test_request_context(), fail_action_logger_callback():
             success_func()
 
+    def test_output_serialized_lazily(self) -> None:
+        with app.test_request_context(), capture_post_exec_callback() as captured:
+            output_func()
+
+        self.assertEqual(captured[0].output, '{"results": ["table"]}')
+
+    def test_output_max_size(self) -> None:
+        with app.test_request_context(), capture_post_exec_callback() as captured:
+            app.config[action_log.ACTION_LOG_MAX_OUTPUT_SIZE_KEY] = 5
+            try:
+                output_func()
+            finally:
+                del app.config[action_log.ACTION_LOG_MAX_OUTPUT_SIZE_KEY]
+
+        self.assertEqual(captured[0].output, '{"res...(truncated)')
+
+    def test_async_callbacks(self) -> None:
+        with app.test_request_context(), capture_post_exec_callback() as captured:
+            app.config[action_log.ACTION_LOG_ASYNC_KEY] = True
+            try:
+                output_func()
+            finally:
+                del app.config[action_log.ACTION_LOG_ASYNC_KEY]
+            action_log_callback.get_async_dispatcher(queue_size=1, batch_size=1).flush()
+
+        self.assertEqual(len(captured), 1)
+        self.assertEqual(captured[0].command, 'output_func')
+        self.assertNotEqual(captured[0].callback_thread, threading.get_ident())  # type: ignore
+
+    def test_async_output_serialized_before_queued(self) -> None:
+        output = {'results': ['table']}
+        action_log_params = ActionLogParams(command='output_func', start_epoch_ms=0, user='user', host_name='host',
+                                            pos_args_json='[]', keyword_args_json='{}',
+                                            output=SerializedOutput(output))
+        dispatcher = action_log_callback.get_async_dispatcher(queue_size=1, batch_size=1)
+        dispatcher.submit(action_log_callback.POST_EXECUTION, action_log_params)
+        dispatcher.flush()
+
+        self.assertEqual(action_log_params._output, '{"results": ["table"]}')
+
+
+@contextmanager
+def capture_post_exec_callback() -> Generator[List[ActionLogParams], Any, Any]:
+    """
+    Adding callback capturing the post execution ActionLogParams and revert it back when closed.
+    :return:
+    """
+    tmp = action_log_callback.__post_exec_callbacks[:]
+    captured = []  # type: List[ActionLogParams]
+
+    def capture_callback(action_log_params: ActionLogParams) -> None:
+        action_log_params.callback_thread = threading.get_ident()  # type: ignore
+        captured.append(action_log_params)
+
+    action_log_callback.register_post_exec_callback(capture_callback)
+    yield captured
+    action_log_callback.__post_exec_callbacks[:] = tmp
+
 
 @contextmanager
 def fail_action_logger_callback() -> Generator[Any, Any, Any]:
@@ -79,5 +139,10 @@ def success_func() -> None:
     pass
 
 
+@action_logging
+def output_func() -> Any:
+    return {'results': ['table']}
+
+
 if __name__ == '__main__':
     unittest.main()
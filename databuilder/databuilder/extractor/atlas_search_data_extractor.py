@@ -4,6 +4,7 @@
 import importlib
 import logging
 import multiprocessing.pool
+import threading
 from copy import deepcopy
 from functools import reduce
 from typing import (
@@ -21,6 +22,8 @@ LOGGER = logging.getLogger(__name__)
 # custom types
 type_fields_mapping_spec = Dict[str, List[Tuple[str, Any, Any, Any]]]
 type_fields_mapping = List[Tuple[str, Any, Any, Any]]
+# es_document field, split atlas field paths, modification function, default_value
+type_compiled_fields_mapping = List[Tuple[str, List[List[str]], Any, Any]]
 
 # @todo document classes/methods
 # @todo write tests
@@ -206,6 +209,21 @@ class AtlasSearchDataExtractor(Extractor):
     def field_mappings(self) -> type_fields_mapping:
         return AtlasSearchDataExtractor.FIELDS_MAPPING_SPEC.get(self.entity_type) or []
 
+    @property
+    def compiled_field_mappings(self) -> type_compiled_fields_mapping:
+        result = []
+
+        for model_field, atlas_fields_paths, transform_spec, default_value in self.field_mappings:
+            if not isinstance(atlas_fields_paths, list):
+                atlas_fields_paths = [atlas_fields_paths]
+
+            result.append((model_field,
+                           [atlas_field_path.split('.') for atlas_field_path in atlas_fields_paths],
+                           transform_spec or (lambda x: x),
+                           default_value))
+
+        return result
+
     @property
     def search_chunk_size(self) -> int:
         return self.conf.get_int(AtlasSearchDataExtractor.ATLAS_SEARCH_CHUNK_SIZE_KEY)
@@ -306,11 +324,14 @@ class AtlasSearchDataExtractor(Extractor):
             yield input_list[i:i + n]
 
     def _execute_query(self) -> Any:
+        """
+        Pipelines the guids search and the details fetching: guids chunks are sent to fetch details as soon as
+        their search batch completes, and details are yielded as soon as their chunk completes. The number of
+        guids chunks being fetched or waiting to be consumed is bounded, to keep memory flat.
+        """
         details_chunk_size = self.conf.get_int(AtlasSearchDataExtractor.ATLAS_DETAILS_CHUNK_SIZE_KEY)
         process_pool_size = self.conf.get_int(AtlasSearchDataExtractor.PROCESS_POOL_SIZE_KEY)
 
-        guids = []
-
         entity_count = self._get_count_of_active_entities()
 
         LOGGER.info(f'Received count: {entity_count}')
@@ -320,49 +341,59 @@ class AtlasSearchDataExtractor(Extractor):
         else:
             offsets = []
 
-        with multiprocessing.pool.ThreadPool(processes=process_pool_size) as pool:
-            guid_list = pool.map(self._get_entity_guids, offsets, chunksize=1)
+        chunks_in_flight = threading.Semaphore(2 * process_pool_size)
+        stopped = threading.Event()
 
-        for sub_list in guid_list:
-            guids += sub_list
+        def _get_guids_chunks(guid_lists: Iterator[List[str]]) -> Iterator[List[str]]:
+            guids_count = 0
 
-        LOGGER.info(f'Received guids: {len(guids)}')
+            for guid_list in guid_lists:
+                guids_count += len(guid_list)
 
-        if guids:
-            guids_chunks = AtlasSearchDataExtractor.split_list_to_chunks(guids, details_chunk_size)
+                for guids_chunk in AtlasSearchDataExtractor.split_list_to_chunks(guid_list, details_chunk_size):
+                    chunks_in_flight.acquire()
+                    if stopped.is_set():
+                        return
+                    yield guids_chunk
 
-            with multiprocessing.pool.ThreadPool(processes=process_pool_size) as pool:
-                return_list = pool.map(self._get_entity_details, guids_chunks)
+            LOGGER.info(f'Received guids: {guids_count}')
 
-            for sub_list in return_list:
-                for entry in sub_list:
-                    yield entry
+        with multiprocessing.pool.ThreadPool(processes=process_pool_size) as guids_pool, \
+                multiprocessing.pool.ThreadPool(processes=process_pool_size) as details_pool:
+            try:
+                guid_lists = guids_pool.imap_unordered(self._get_entity_guids, offsets)
+
+                for sub_list in details_pool.imap_unordered(self._get_entity_details, _get_guids_chunks(guid_lists)):
+                    chunks_in_flight.release()
+
+                    for entry in sub_list:
+                        yield entry
+            finally:
+                # unblocks the guids chunks producer if consumption stops early
+                stopped.set()
+                chunks_in_flight.release()
 
     def _get_extract_iter(self) -> Iterator[Any]:
+        field_mappings = self.compiled_field_mappings
+        model_class = self.model_class
+
         for atlas_entity in self._execute_query():
             model_dict = dict()
 
             try:
                 data = atlas_entity.__dict__['_data']
 
-                for spec in self.field_mappings:
-                    model_field, atlas_fields_paths, _transform_spec, default_value = spec
-
-                    if not isinstance(atlas_fields_paths, list):
-                        atlas_fields_paths = [atlas_fields_paths]
-
+                for model_field, atlas_fields_paths, transform_spec, default_value in field_mappings:
                     atlas_values = []
                     for atlas_field_path in atlas_fields_paths:
 
-                        atlas_value = reduce(lambda x, y: x.get(y, dict()), atlas_field_path.split('.'),
+                        atlas_value = reduce(lambda x, y: x.get(y, dict()), atlas_field_path,
                                              data) or default_value
                         atlas_values.append(atlas_value)
 
-                    transform_spec = _transform_spec or (lambda x: x)
-
                     es_entity_value = transform_spec(*atlas_values)
                     model_dict[model_field] = es_entity_value
 
-                yield self.model_class(**model_dict)
+                yield model_class(**model_dict)
             except Exception:
                 LOGGER.warning('Error building model object.', exc_info=True)
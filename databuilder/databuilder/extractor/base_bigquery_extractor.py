@@ -4,10 +4,12 @@
 import json
 import logging
 import re
+import threading
+import time
 from collections import namedtuple
 from datetime import datetime, timezone
 from typing import (
-    Any, Dict, Iterator, List,
+    Any, Callable, Dict, Iterable, Iterator, List, Optional, TypeVar,
 )
 
 import google.oauth2.service_account
@@ -17,12 +19,41 @@ from googleapiclient.discovery import build
 from pyhocon import ConfigTree
 
 from databuilder.extractor.base_extractor import Extractor
+from databuilder.utils.concurrency import map_concurrently
 
 DatasetRef = namedtuple('DatasetRef', ['datasetId', 'projectId'])
 TableKey = namedtuple('TableKey', ['schema', 'table_name'])
 
 LOGGER = logging.getLogger(__name__)
 
+T = TypeVar('T')
+R = TypeVar('R')
+
+
+class TokenBucket(object):
+    """
+    Allows {rate} requests per second on average, and bursts of up to {capacity} requests, across threads.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        self._rate = rate
+        self._capacity = capacity or max(rate, 1.0)
+        self._tokens = self._capacity
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self._capacity, self._tokens + (now - self._last_refill) * self._rate)
+                self._last_refill = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_sec = (1 - self._tokens) / self._rate
+            time.sleep(wait_sec)
+
 
 class BaseBigQueryExtractor(Extractor):
     PROJECT_ID_KEY = 'project_id'
@@ -33,6 +64,12 @@ class BaseBigQueryExtractor(Extractor):
     FILTER_KEY = 'filter'
     # metadata for tables created after the cutoff time would not be extracted from bigquery.
     CUTOFF_TIME_KEY = 'cutoff_time'
+    # Number of threads sending API requests, e.g. listing tables of several datasets at once. 1 means serial.
+    MAX_WORKERS_KEY = 'max_workers'
+    # Max number of API requests per second across all threads, 0 means no limit
+    MAX_REQUESTS_PER_SEC_KEY = 'max_requests_per_sec'
+    # Whether concurrently fetched results keep the order they would have when fetched serially
+    PRESERVE_ORDER_KEY = 'preserve_order'
     _DEFAULT_SCOPES = ['https://www.googleapis.com/auth/bigquery.readonly']
     DEFAULT_PAGE_SIZE = 300
     NUM_RETRIES = 3
@@ -50,6 +87,11 @@ class BaseBigQueryExtractor(Extractor):
         self.filter = conf.get_string(BaseBigQueryExtractor.FILTER_KEY, '')
         self.cutoff_time = conf.get_string(BaseBigQueryExtractor.CUTOFF_TIME_KEY,
                                            datetime.now(timezone.utc).strftime(BaseBigQueryExtractor.DATE_TIME_FORMAT))
+        self.max_workers = conf.get_int(BaseBigQueryExtractor.MAX_WORKERS_KEY, 1)
+        self.preserve_order = conf.get_bool(BaseBigQueryExtractor.PRESERVE_ORDER_KEY, True)
+        max_requests_per_sec = conf.get_float(BaseBigQueryExtractor.MAX_REQUESTS_PER_SEC_KEY, 0)
+        self._token_bucket = TokenBucket(max_requests_per_sec) if max_requests_per_sec else None
+        self._thread_local = threading.local()
 
         if self.key_path:
             credentials = (
@@ -66,6 +108,7 @@ class BaseBigQueryExtractor(Extractor):
                 google_auth: Any = getattr(google, 'auth')
                 credentials, _ = google_auth.default(scopes=self._DEFAULT_SCOPES)
 
+        self._credentials = credentials
         http = httplib2.Http()
         authed_http = google_auth_httplib2.AuthorizedHttp(credentials, http=http)
         self.bigquery_service = build('bigquery', 'v2', http=authed_http, cache_discovery=False)
@@ -101,7 +144,38 @@ class BaseBigQueryExtractor(Extractor):
         suffix = suffix_match.group() if suffix_match else ''
         return suffix
 
+    def _execute(self, request: Any, num_retries: int = NUM_RETRIES) -> Any:
+        """
+        Executes an API request, within the request rate limit. httplib2 is not thread safe, so with more than one
+        worker every thread sends its requests with its own authorized http.
+        """
+        if self._token_bucket:
+            self._token_bucket.acquire()
+
+        if self.max_workers <= 1:
+            return request.execute(num_retries=num_retries)
+
+        http = getattr(self._thread_local, 'http', None)
+        if http is None:
+            http = google_auth_httplib2.AuthorizedHttp(self._credentials, http=httplib2.Http())
+            self._thread_local.http = http
+        return request.execute(http=http, num_retries=num_retries)
+
+    def _map_concurrently(self, fn: Callable[[T], R], items: Iterable[T]) -> Iterator[R]:
+        """
+        Applies {fn} to every item on a pool of max_workers threads, with at most twice that many items in flight.
+        Results are yielded in the order of {items} when preserve_order is set, else as soon as they complete.
+        """
+        return map_concurrently(fn, items, self.max_workers, preserve_order=self.preserve_order)
+
     def _iterate_over_tables(self) -> Any:
+        if self.max_workers > 1:
+            # List and process datasets concurrently, every dataset's entries are collected by its worker
+            for entries in self._map_concurrently(lambda dataset: list(self._retrieve_tables(dataset)),
+                                                  self._retrieve_datasets()):
+                yield from entries
+            return
+
         for dataset in self._retrieve_datasets():
             for entry in self._retrieve_tables(dataset):
                 yield entry
@@ -125,43 +199,39 @@ class BaseBigQueryExtractor(Extractor):
         return datasets
 
     def _page_dataset_list_results(self) -> Iterator[Any]:
-        response = self.bigquery_service.datasets().list(
+        response = self._execute(self.bigquery_service.datasets().list(
             projectId=self.project_id,
             all=False,  # Do not return hidden datasets
             filter=self.filter,
-            maxResults=self.pagesize).execute(
-                num_retries=BaseBigQueryExtractor.NUM_RETRIES)
+            maxResults=self.pagesize))
 
         while response:
             yield response
 
             if 'nextPageToken' in response:
-                response = self.bigquery_service.datasets().list(
+                response = self._execute(self.bigquery_service.datasets().list(
                     projectId=self.project_id,
                     all=True,
                     filter=self.filter,
-                    pageToken=response['nextPageToken']).execute(
-                        num_retries=BaseBigQueryExtractor.NUM_RETRIES)
+                    pageToken=response['nextPageToken']))
             else:
                 response = None
 
     def _page_table_list_results(self, dataset: DatasetRef) -> Iterator[Dict[str, Any]]:
-        response = self.bigquery_service.tables().list(
+        response = self._execute(self.bigquery_service.tables().list(
             projectId=dataset.projectId,
             datasetId=dataset.datasetId,
-            maxResults=self.pagesize).execute(
-                num_retries=BaseBigQueryExtractor.NUM_RETRIES)
+            maxResults=self.pagesize))
 
         while response:
             yield response
 
             if 'nextPageToken' in response:
-                response = self.bigquery_service.tables().list(
+                response = self._execute(self.bigquery_service.tables().list(
                     projectId=dataset.projectId,
                     datasetId=dataset.datasetId,
                     maxResults=self.pagesize,
-                    pageToken=response['nextPageToken']).execute(
-                        num_retries=BaseBigQueryExtractor.NUM_RETRIES)
+                    pageToken=response['nextPageToken']))
             else:
                 response = None
 
@@ -3,7 +3,7 @@
 
 import logging
 from typing import (
-    Any, Dict, List, Set, cast,
+    Any, Dict, Iterator, List, Set, Tuple, cast,
 )
 
 from pyhocon import ConfigTree
@@ -30,7 +30,15 @@ class BigQueryMetadataExtractor(BaseBigQueryExtractor):
         BaseBigQueryExtractor.init(self, conf)
         self.iter = iter(self._iterate_over_tables())
 
-    def _retrieve_tables(self, dataset: DatasetRef) -> Any:
+    def _iterate_over_tables(self) -> Any:
+        # Table listing fans out over datasets, and the tables().get request of every listed table is sent
+        # concurrently as well, as it is the one request per table
+        yield from self._map_concurrently(self._get_table_metadata, super()._iterate_over_tables())
+
+    def _retrieve_tables(self, dataset: DatasetRef) -> Iterator[Tuple[Dict[str, str], str]]:
+        """
+        Lists the tables of the dataset, yielding the table reference and the table name of every table to describe
+        """
         grouped_tables: Set[str] = set([])
 
         for page in self._page_table_list_results(dataset):
@@ -56,33 +64,37 @@ class BigQueryMetadataExtractor(BaseBigQueryExtractor):
                     table_id = table_prefix
                     grouped_tables.add(table_prefix)
 
-                table = self.bigquery_service.tables().get(
-                    projectId=tableRef['projectId'],
-                    datasetId=tableRef['datasetId'],
-                    tableId=tableRef['tableId']).execute(num_retries=BigQueryMetadataExtractor.NUM_RETRIES)
-
-                # BigQuery tables also have interesting metadata about partitioning
-                # data location (EU/US), mod/create time, etc... Extract that some other time?
-                cols: List[ColumnMetadata] = []
-                # Not all tables have schemas
-                if 'schema' in table:
-                    schema = table['schema']
-                    if 'fields' in schema:
-                        total_cols = 0
-                        for column in schema['fields']:
-                            # TRICKY: this mutates :cols:
-                            total_cols = self._iterate_over_cols('', column, cols, total_cols + 1)
-
-                table_meta = TableMetadata(
-                    database='bigquery',
-                    cluster=tableRef['projectId'],
-                    schema=tableRef['datasetId'],
-                    name=table_id,
-                    description=table.get('description', ''),
-                    columns=cols,
-                    is_view=table['type'] == 'VIEW')
-
-                yield(table_meta)
+                yield tableRef, table_id
+
+    def _get_table_metadata(self, table_entry: Tuple[Dict[str, str], str]) -> TableMetadata:
+        tableRef, table_id = table_entry
+        table = self._execute(self.bigquery_service.tables().get(
+            projectId=tableRef['projectId'],
+            datasetId=tableRef['datasetId'],
+            tableId=tableRef['tableId']))
+
+        # BigQuery tables also have interesting metadata about partitioning
+        # data location (EU/US), mod/create time, etc... Extract that some other time?
+        cols: List[ColumnMetadata] = []
+        # Not all tables have schemas
+        if 'schema' in table:
+            schema = table['schema']
+            if 'fields' in schema:
+                total_cols = 0
+                for column in schema['fields']:
+                    # TRICKY: this mutates :cols:
+                    total_cols = self._iterate_over_cols('', column, cols, total_cols + 1)
+
+        table_meta = TableMetadata(
+            database='bigquery',
+            cluster=tableRef['projectId'],
+            schema=tableRef['datasetId'],
+            name=table_id,
+            description=table.get('description', ''),
+            columns=cols,
+            is_view=table['type'] == 'VIEW')
+
+        return table_meta
 
     def _iterate_over_cols(self,
                            parent: str,
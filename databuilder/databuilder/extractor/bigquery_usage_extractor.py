@@ -2,6 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import logging
+import random
 import re
 from collections import namedtuple
 from datetime import (
@@ -9,12 +10,13 @@ from datetime import (
 )
 from time import sleep
 from typing import (
-    Any, Dict, Iterator, List, Optional, Tuple,
+    Any, Dict, Iterable, Iterator, List, Optional, Tuple,
 )
 
 from pyhocon import ConfigTree
 
 from databuilder.extractor.base_bigquery_extractor import BaseBigQueryExtractor
+from databuilder.utils.spillable_counter import SpillableCounter
 
 TableColumnUsageTuple = namedtuple('TableColumnUsageTuple', ['database', 'cluster', 'schema',
                                                              'table', 'column', 'email'])
@@ -27,11 +29,26 @@ class BigQueryTableUsageExtractor(BaseBigQueryExtractor):
     An aggregate extractor for bigquery table usage. This class takes the data from
     the stackdriver logging API by filtering on timestamp, bigquery_resource and looking
     for referencedTables in the response.
+
+    The log query can be split into time windows of {shard_hours} hours, which are queried concurrently when
+    max_workers is above 1. Usage counts are aggregated into a SpillableCounter that spills to disk once
+    {max_keys_in_memory} distinct (table, user) keys are held in memory. Concurrent windows are counted into their
+    own counters, which share another {max_keys_in_memory} keys: up to twice max_workers windows are in flight,
+    each spilling to disk once it holds its share.
     """
     TIMESTAMP_KEY = 'timestamp'
     _DEFAULT_SCOPES = ['https://www.googleapis.com/auth/cloud-platform']
     EMAIL_PATTERN = 'email_pattern'
+    # Max seconds to wait before retrying a failed log request, e.g. when the quota is exceeded.
+    # The wait starts at min_delay_time and doubles with every consecutive failure.
     DELAY_TIME = 'delay_time'
+    MIN_DELAY_TIME = 'min_delay_time'
+    MAX_CONSECUTIVE_FAILURES = 'max_consecutive_failures'
+    # Length in hours of the time windows the log query is split into, 0 means a single query
+    SHARD_HOURS = 'shard_hours'
+    # Max distinct usage keys held in memory before spilling to disk, 0 means no limit
+    MAX_KEYS_IN_MEMORY = 'max_keys_in_memory'
+    SPILL_DIR = 'spill_dir'
     TABLE_DECORATORS = ['$', '@']
     COUNT_READS_ONLY_FROM_PROJECT_ID_KEY = 'count_reads_only_from_project_id_key'
 
@@ -43,7 +60,12 @@ class BigQueryTableUsageExtractor(BaseBigQueryExtractor):
 
         self.email_pattern = conf.get_string(BigQueryTableUsageExtractor.EMAIL_PATTERN, None)
         self.delay_time = conf.get_int(BigQueryTableUsageExtractor.DELAY_TIME, 100)
-        self.table_usage_counts: Dict[TableColumnUsageTuple, int] = {}
+        self.min_delay_time = min(conf.get_float(BigQueryTableUsageExtractor.MIN_DELAY_TIME, 1), self.delay_time)
+        self.max_consecutive_failures = conf.get_int(BigQueryTableUsageExtractor.MAX_CONSECUTIVE_FAILURES, 10)
+        self.shard_hours = conf.get_int(BigQueryTableUsageExtractor.SHARD_HOURS, 0)
+        self.max_keys_in_memory = conf.get_int(BigQueryTableUsageExtractor.MAX_KEYS_IN_MEMORY, 0)
+        self.spill_dir = conf.get_string(BigQueryTableUsageExtractor.SPILL_DIR, None)
+        self.table_usage_counts = self._create_counter(self.max_keys_in_memory)
         # GCP console allows running queries using tables from a project different from the one the extractor is
         # used for; only usage metadata of referenced tables present in the given project_id_key for the
         # extractor is taken into account and usage metadata of referenced tables from other projects
@@ -51,11 +73,59 @@ class BigQueryTableUsageExtractor(BaseBigQueryExtractor):
         self.count_reads_only_from_same_project = conf.get_bool(
             BigQueryTableUsageExtractor.COUNT_READS_ONLY_FROM_PROJECT_ID_KEY, True)
         self._count_usage()
-        self.iter = iter(self.table_usage_counts)
+        self.usage_iter = self.table_usage_counts.items()
+
+    def _count_usage(self) -> None:
+        time_windows = self._get_time_windows()
+        if self.max_workers <= 1:
+            for start, end in time_windows:
+                self._count_entries(self._retrieve_records(start, end), self.table_usage_counts)
+            return
+
+        # Every window is counted by a worker into its own counter, which is merged here in the calling thread
+        for window_counts in self._map_concurrently(self._count_window, time_windows):
+            try:
+                self.table_usage_counts.update(window_counts.items())
+            finally:
+                window_counts.close()
+
+    def _create_counter(self, max_keys_in_memory: int) -> SpillableCounter:
+        return SpillableCounter(max_keys_in_memory=max_keys_in_memory,
+                                key_factory=TableColumnUsageTuple._make,
+                                spill_dir=self.spill_dir)
+
+    def _get_time_windows(self) -> List[Tuple[str, str]]:
+        if self.shard_hours <= 0:
+            return [(self.timestamp, self.cutoff_time)]
+
+        start = datetime.strptime(self.timestamp, BigQueryTableUsageExtractor.DATE_TIME_FORMAT)
+        end = datetime.strptime(self.cutoff_time, BigQueryTableUsageExtractor.DATE_TIME_FORMAT)
+        windows = []
+        while start < end:
+            window_end = min(start + timedelta(hours=self.shard_hours), end)
+            windows.append((start.strftime(BigQueryTableUsageExtractor.DATE_TIME_FORMAT),
+                            window_end.strftime(BigQueryTableUsageExtractor.DATE_TIME_FORMAT)))
+            start = window_end
+        LOGGER.info(f'Querying usage logs in {len(windows)} windows of {self.shard_hours} hours')
+        return windows
+
+    def _count_window(self, time_window: Tuple[str, str]) -> SpillableCounter:
+        # windows in flight, counted or waiting to be merged, share max_keys_in_memory
+        max_keys_in_memory = 0
+        if self.max_keys_in_memory > 0:
+            max_keys_in_memory = max(self.max_keys_in_memory // (2 * self.max_workers), 1)
+        window_counts = self._create_counter(max_keys_in_memory)
+        try:
+            self._count_entries(self._retrieve_records(*time_window), window_counts)
+        except Exception:
+            window_counts.close()
+            raise
+        return window_counts
 
-    def _count_usage(self) -> None:  # noqa: C901
+    def _count_entries(self, entries: Iterable[Optional[Dict]],  # noqa: C901
+                       usage_counts: SpillableCounter) -> None:
         count = 0
-        for entry in self._retrieve_records():
+        for entry in entries:
             count += 1
             if count % self.pagesize == 0:
                 LOGGER.info(f'Aggregated {count} records')
@@ -86,17 +156,17 @@ class BigQueryTableUsageExtractor(BaseBigQueryExtractor):
                     self._create_records(
                         refTables,
                         job['jobStatistics']['totalTablesProcessed'], email,
-                        job['jobName']['jobId'])
+                        job['jobName']['jobId'], usage_counts)
 
             refViews = job['jobStatistics'].get('referencedViews', None)
             if refViews:
                 if 'totalViewsProcessed' in job['jobStatistics']:
                     self._create_records(
                         refViews, job['jobStatistics']['totalViewsProcessed'],
-                        email, job['jobName']['jobId'])
+                        email, job['jobName']['jobId'], usage_counts)
 
     def _create_records(self, refResources: List[dict], resourcesProcessed: int, email: str,
-                        jobId: str) -> None:
+                        jobId: str, usage_counts: Optional[SpillableCounter] = None) -> None:
         # if email filter is provided, only the email matched with filter will be recorded.
         if self.email_pattern:
             if not re.match(self.email_pattern, email):
@@ -133,15 +203,18 @@ class BigQueryTableUsageExtractor(BaseBigQueryExtractor):
                                             column='*',
                                             email=email)
 
-            new_count = self.table_usage_counts.get(key, 0) + 1
-            self.table_usage_counts[key] = new_count
+            (usage_counts if usage_counts is not None else self.table_usage_counts).add(key)
 
-    def _retrieve_records(self) -> Iterator[Optional[Dict]]:
+    def _retrieve_records(self, start: Optional[str] = None, end: Optional[str] = None) -> Iterator[Optional[Dict]]:
         """
         Extracts bigquery log data by looking at the principalEmail in the authenticationInfo block and
         referencedTables in the jobStatistics and filters out log entries of metadata queries.
+        :param start: Start of the time window to query, the configured timestamp by default
+        :param end: End of the time window to query (exclusive), the cutoff time by default
         :return: Provides a record or None if no more to extract
         """
+        start = start or self.timestamp
+        end = end or self.cutoff_time
         body = {
             'resourceNames': [f'projects/{self.project_id}'],
             'pageSize': self.pagesize,
@@ -149,7 +222,7 @@ class BigQueryTableUsageExtractor(BaseBigQueryExtractor):
                       'resource.type="bigquery_resource" AND '
                       'NOT protoPayload.serviceData.jobCompletedEvent.job.jobConfiguration.query.query:('
                       'INFORMATION_SCHEMA OR __TABLES__) AND '
-                      f'timestamp >= "{self.timestamp}" AND timestamp < "{self.cutoff_time}"'
+                      f'timestamp >= "{start}" AND timestamp < "{end}"'
         }
         for page in self._page_over_results(body):
             for entry in page['entries']:
@@ -157,28 +230,35 @@ class BigQueryTableUsageExtractor(BaseBigQueryExtractor):
 
     def extract(self) -> Optional[Tuple[Any, int]]:
         try:
-            key = next(self.iter)
-            return key, self.table_usage_counts[key]
+            return next(self.usage_iter)
         except StopIteration:
             return None
 
-    def _page_over_results(self, body: Dict) -> Iterator[Dict]:
-        response = self.logging_service.entries().list(body=body).execute(
-            num_retries=BigQueryTableUsageExtractor.NUM_RETRIES)
-        while response:
-            if 'entries' in response:
-                yield response
+    def close(self) -> None:
+        self.table_usage_counts.close()
 
+    def _page_over_results(self, body: Dict) -> Iterator[Dict]:
+        failures = 0
+        while True:
             try:
-                if 'nextPageToken' in response:
-                    body['pageToken'] = response['nextPageToken']
-                    response = self.logging_service.entries().list(body=body).execute(
-                        num_retries=BigQueryTableUsageExtractor.NUM_RETRIES)
-                else:
-                    response = None
+                response = self._execute(self.logging_service.entries().list(body=body))
             except Exception:
-                # Add a delay when BQ quota exceeds limitation
-                sleep(self.delay_time)
+                failures += 1
+                if failures > self.max_consecutive_failures:
+                    raise
+                # Back off when BQ quota exceeds limitation, with jitter so that concurrent windows do not retry
+                # in lockstep
+                delay = min(self.min_delay_time * 2 ** (failures - 1), self.delay_time)
+                LOGGER.warning(f'Failed to list log entries, retrying in up to {delay} seconds', exc_info=True)
+                sleep(random.uniform(delay / 2, delay))
+                continue
+
+            failures = 0
+            if 'entries' in response:
+                yield response
+            if 'nextPageToken' not in response:
+                return
+            body['pageToken'] = response['nextPageToken']
 
     def _remove_table_decorators(self, tableId: str) -> Optional[str]:
         for decorator in BigQueryTableUsageExtractor.TABLE_DECORATORS:
@@ -115,7 +115,7 @@ class BigQueryWatermarkExtractor(BaseBigQueryExtractor):
                 table=tableRef['tableId']),
             'useLegacySql': True
         }
-        result = self.bigquery_service.jobs().query(projectId=self.project_id, body=body).execute()
+        result = self._execute(self.bigquery_service.jobs().query(projectId=self.project_id, body=body), num_retries=0)
 
         if 'rows' not in result:
             return []
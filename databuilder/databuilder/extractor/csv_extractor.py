@@ -3,8 +3,11 @@
 
 import csv
 import importlib
+import os
 from collections import defaultdict
-from typing import Any, List
+from typing import (
+    Any, Dict, Iterator, List,
+)
 
 from pyhocon import ConfigTree
 
@@ -24,9 +27,20 @@ def split_badge_list(badges: str, separator: str) -> List[str]:
     return [badge for badge in badges.split(separator) if badge]
 
 
+def iter_csv(file_location: str) -> Iterator[Dict[str, Any]]:
+    """
+    Reads a CSV file lazily, one row dict at a time.
+    """
+    with open(file_location, 'r') as fin:
+        for row in csv.DictReader(fin):
+            yield dict(row)
+
+
 class CsvExtractor(Extractor):
     # Config keys
     FILE_LOCATION = 'file_location'
+    # Read the file and build models row by row, instead of loading the whole file first
+    STREAMING = 'streaming'
 
     """
     An Extractor that extracts records via CSV.
@@ -38,6 +52,7 @@ class CsvExtractor(Extractor):
         """
         self.conf = conf
         self.file_location = conf.get_string(CsvExtractor.FILE_LOCATION)
+        self.streaming = conf.get_bool(CsvExtractor.STREAMING, False)
 
         model_class = conf.get('model_class', None)
         if model_class:
@@ -50,6 +65,10 @@ class CsvExtractor(Extractor):
         """
         Create an iterator to execute sql.
         """
+        if self.streaming and not hasattr(self, 'results'):
+            self.iter = self._stream_csv()
+            return
+
         if not hasattr(self, 'results'):
             with open(self.file_location, 'r') as fin:
                 self.results = [dict(i) for i in csv.DictReader(fin)]
@@ -61,6 +80,10 @@ class CsvExtractor(Extractor):
             results = self.results
         self.iter = iter(results)
 
+    def _stream_csv(self) -> Iterator[Any]:
+        for result in iter_csv(self.file_location):
+            yield self.model_class(**result) if hasattr(self, 'model_class') else result
+
     def extract(self) -> Any:
         """
         Yield the csv result one at a time.
@@ -82,15 +105,24 @@ class CsvTableBadgeExtractor(Extractor):
     TABLE_FILE_LOCATION = 'table_file_location'
     BADGE_FILE_LOCATION = 'badge_file_location'
     BADGE_SEPARATOR = 'badge_separator'
+    STREAMING = 'streaming'
 
     """
     An Extractor that combines Table and Badge CSVs.
+
+    In streaming mode only the smaller of the two files is held in memory, as a lookup keyed by table key, and the
+    other one is read row by row:
+     - when the badge file is smaller, one BadgeMetadata is extracted per row of the table file, as without
+       streaming.
+     - when the table file is smaller, one BadgeMetadata is extracted per row of the badge file that belongs to a
+       table of the table file.
     """
     def init(self, conf: ConfigTree) -> None:
         self.conf = conf
         self.table_file_location = conf.get_string(CsvTableBadgeExtractor.TABLE_FILE_LOCATION)
         self.badge_file_location = conf.get_string(CsvTableBadgeExtractor.BADGE_FILE_LOCATION)
         self.badge_separator = conf.get_string(CsvTableBadgeExtractor.BADGE_SEPARATOR, default=',')
+        self.streaming = conf.get_bool(CsvTableBadgeExtractor.STREAMING, False)
         self._load_csv()
 
     def _get_key(self,
@@ -104,7 +136,44 @@ class CsvTableBadgeExtractor(Extractor):
                                                      schema=schema,
                                                      tbl=tbl)
 
+    def _get_table_key(self, table_dict: Dict[str, Any]) -> str:
+        return self._get_key(table_dict['database'], table_dict['cluster'], table_dict['schema'], table_dict['name'])
+
+    def _get_badge_table_key(self, badge_dict: Dict[str, Any]) -> str:
+        return self._get_key(badge_dict['database'], badge_dict['cluster'], badge_dict['schema'],
+                             badge_dict['table_name'])
+
+    def _parse_badges(self, badge_dict: Dict[str, Any]) -> List[Badge]:
+        return [Badge(name=badge_name, category=badge_dict['category'])
+                for badge_name in split_badge_list(badges=badge_dict['name'], separator=self.badge_separator)]
+
+    def _stream_badge_metadata(self) -> Iterator[BadgeMetadata]:
+        if os.path.getsize(self.badge_file_location) <= os.path.getsize(self.table_file_location):
+            parsed_badges: Dict[str, List[Badge]] = defaultdict(list)
+            for badge_dict in iter_csv(self.badge_file_location):
+                parsed_badges[self._get_badge_table_key(badge_dict)].extend(self._parse_badges(badge_dict))
+
+            for table_dict in iter_csv(self.table_file_location):
+                id = self._get_table_key(table_dict)
+                yield BadgeMetadata(start_label=TableMetadata.TABLE_NODE_LABEL,
+                                    start_key=id,
+                                    badges=parsed_badges.get(id, []))
+            return
+
+        table_keys = {self._get_table_key(table_dict) for table_dict in iter_csv(self.table_file_location)}
+        for badge_dict in iter_csv(self.badge_file_location):
+            id = self._get_badge_table_key(badge_dict)
+            badges = self._parse_badges(badge_dict)
+            if id in table_keys and badges:
+                yield BadgeMetadata(start_label=TableMetadata.TABLE_NODE_LABEL,
+                                    start_key=id,
+                                    badges=badges)
+
     def _load_csv(self) -> None:
+        if self.streaming:
+            self._iter = self._stream_badge_metadata()
+            return
+
         with open(self.badge_file_location, 'r') as fin:
             self.badges = [dict(i) for i in csv.DictReader(fin)]
         # print("BADGES: " + str(self.badges))
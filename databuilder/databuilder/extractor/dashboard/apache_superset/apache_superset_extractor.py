@@ -13,6 +13,9 @@ from dateutil import parser
 from pyhocon import ConfigFactory, ConfigTree
 
 from databuilder.extractor.base_extractor import Extractor
+from databuilder.rest_api.response_cache import (
+    RESPONSE_CACHE_DIR, RESPONSE_CACHE_MAX_AGE_SEC, create_response_cache,
+)
 
 type_fields_mapping = List[Tuple[str, str, Any, Any]]
 
@@ -45,6 +48,10 @@ class ApacheSupersetBaseExtractor(Extractor):
 
     DATABASE_TO_CLUSTER_MAPPING = 'database_to_cluster_mapping'  # map superset dbs to preferred clusters
 
+    # cache api responses on disk, see ResponseCache
+    RESPONSE_CACHE_DIR = RESPONSE_CACHE_DIR
+    RESPONSE_CACHE_MAX_AGE_SEC = RESPONSE_CACHE_MAX_AGE_SEC
+
     DEFAULT_CONFIG = ConfigFactory.from_dict({
         APACHE_SUPERSET_PROTOCOL: 'http',
         APACHE_SUPERSET_HOST: 'localhost',
@@ -59,6 +66,7 @@ class ApacheSupersetBaseExtractor(Extractor):
 
     def init(self, conf: ConfigTree) -> None:
         self.conf = conf.with_fallback(ApacheSupersetBaseExtractor.DEFAULT_CONFIG)
+        self._response_cache = create_response_cache(self.conf)
         self._extract_iter = self._get_extract_iter()
 
         self.authenticate()
@@ -85,19 +93,38 @@ class ApacheSupersetBaseExtractor(Extractor):
     def build_full_url(self, endpoint: str) -> str:
         return f'{self.base_url}/{endpoint}'
 
-    def execute_query(self, url: str, params: dict = {}) -> Dict:
+    def execute_query(self, url: str, params: dict = {}, updated_at: Any = None) -> Dict:
         try:
-            data = requests.get(url, params=params, headers={'Authorization': f'Bearer {self.token}'})
+            headers = {'Authorization': f'Bearer {self.token}'}
+            if self._response_cache:
+                data = self._response_cache.send(requests.get, url, updated_at=updated_at, params=params,
+                                                 headers=headers)
+            else:
+                data = requests.get(url, params=params, headers=headers)
 
             if data.status_code == 401:
                 self.authenticate()
 
-                return self.execute_query(url, params)
+                return self.execute_query(url, params, updated_at)
             else:
                 return data.json()
         except Exception:
             return {}
 
+    def get_ids_with_changed_on(self, url: str) -> Dict[Any, Any]:
+        """
+        Lists the ids of a list endpoint, e.g. api/v1/dashboard, mapped to the last modified time of every object.
+        It is passed as updated_at when the details of the object are fetched, so the response cache skips objects
+        that did not change. Responses that also hold other objects, e.g. the charts of a dashboard, are not keyed
+        on it, as those objects change on their own.
+        """
+        data = self.execute_query(url)
+
+        changed_on = {entry.get('id'): entry.get('changed_on_utc') or entry.get('changed_on')
+                      for entry in data.get('result', [])}
+
+        return {_id: changed_on.get(_id) for _id in data.get('ids', [])}
+
     @property
     def base_url(self) -> str:
         _protocol = self.conf.get(ApacheSupersetBaseExtractor.APACHE_SUPERSET_PROTOCOL)
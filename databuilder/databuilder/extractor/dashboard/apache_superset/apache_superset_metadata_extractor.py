@@ -3,7 +3,7 @@
 
 
 from typing import (
-    Any, Dict, Iterator, List, Union,
+    Any, Dict, Iterator, Union,
 )
 
 from databuilder.extractor.dashboard.apache_superset.apache_superset_extractor import (
@@ -39,7 +39,7 @@ class ApacheSupersetMetadataExtractor(ApacheSupersetBaseExtractor):
     def _get_extract_iter(self) -> Iterator[Union[DashboardMetadata, DashboardLastModifiedTimestamp, None]]:
         ids = self._get_dashboard_ids()
 
-        data = [self._get_dashboard_details(i) for i in ids]
+        data = [self._get_dashboard_details(i, changed_on) for i, changed_on in ids.items()]
 
         if self.extract_published_only:
             data = [d for d in data if self.get_nested_field(d, 'result.published')]
@@ -55,16 +55,14 @@ class ApacheSupersetMetadataExtractor(ApacheSupersetBaseExtractor):
 
             yield DashboardLastModifiedTimestamp(**dashboard_last_modified)
 
-    def _get_dashboard_ids(self) -> List[str]:
+    def _get_dashboard_ids(self) -> Dict[str, Any]:
         url = self.build_full_url('api/v1/dashboard')
 
-        data = self.execute_query(url)
+        return self.get_ids_with_changed_on(url)
 
-        return data.get('ids', [])
-
-    def _get_dashboard_details(self, dashboard_id: str) -> Dict[str, Any]:
+    def _get_dashboard_details(self, dashboard_id: str, changed_on: Any = None) -> Dict[str, Any]:
         url = self.build_full_url(f'api/v1/dashboard/{dashboard_id}')
 
-        data = self.execute_query(url)
+        data = self.execute_query(url, updated_at=changed_on)
 
         return data
@@ -4,7 +4,7 @@
 
 from functools import lru_cache
 from typing import (
-    Any, Dict, Iterator, List, Union,
+    Any, Dict, Iterator, Union,
 )
 
 from sqlalchemy.engine.url import make_url
@@ -20,7 +20,8 @@ class ApacheSupersetTableExtractor(ApacheSupersetBaseExtractor):
 
         ids = self._get_dataset_ids()
 
-        data = [(self._get_dataset_details(i), self._get_dataset_related_objects(i)) for i in ids]
+        data = [(self._get_dataset_details(i, changed_on), self._get_dataset_related_objects(i))
+                for i, changed_on in ids.items()]
 
         for entry in data:
             dataset_details, dataset_objects = entry
@@ -69,17 +70,15 @@ class ApacheSupersetTableExtractor(ApacheSupersetBaseExtractor):
 
             yield result
 
-    def _get_dataset_ids(self) -> List[str]:
+    def _get_dataset_ids(self) -> Dict[str, Any]:
         url = self.build_full_url('api/v1/dataset')
 
-        data = self.execute_query(url)
-
-        return data.get('ids', [])
+        return self.get_ids_with_changed_on(url)
 
-    def _get_dataset_details(self, dataset_id: str) -> Dict[str, Any]:
+    def _get_dataset_details(self, dataset_id: str, changed_on: Any = None) -> Dict[str, Any]:
         url = self.build_full_url(f'api/v1/dataset/{dataset_id}')
 
-        data = self.execute_query(url)
+        data = self.execute_query(url, updated_at=changed_on)
 
         return data
 
@@ -82,7 +82,8 @@ class ModeDashboardUtils(object):
                                        conf: ConfigTree
                                        ) -> RestAPIExtractor:
         """
-        Creates RestAPIExtractor. Note that RestAPIExtractor is already initialized
+        Creates RestAPIExtractor. Note that RestAPIExtractor is already initialized. RestAPIExtractor settings such as
+        max_workers and max_requests_per_sec are read from {conf}.
         :param restapi_query:
         :param conf:
         :return: RestAPIExtractor. Note that RestAPIExtractor is already initialized
@@ -13,7 +13,9 @@ from databuilder.extractor.dashboard.redash.redash_dashboard_utils import (
     RedashPaginatedRestApiQuery, generate_dashboard_description, get_auth_headers, get_text_widgets,
     get_visualization_widgets, sort_widgets,
 )
-from databuilder.extractor.restapi.rest_api_extractor import REST_API_QUERY, RestAPIExtractor
+from databuilder.extractor.restapi.rest_api_extractor import (
+    MAX_REQUESTS_PER_SEC, MAX_WORKERS, REST_API_QUERY, RestAPIExtractor,
+)
 from databuilder.models.dashboard.dashboard_chart import DashboardChart
 from databuilder.models.dashboard.dashboard_last_modified import DashboardLastModifiedTimestamp
 from databuilder.models.dashboard.dashboard_metadata import DashboardMetadata
@@ -21,7 +23,8 @@ from databuilder.models.dashboard.dashboard_owner import DashboardOwner
 from databuilder.models.dashboard.dashboard_query import DashboardQuery
 from databuilder.models.dashboard.dashboard_table import DashboardTable
 from databuilder.models.table_metadata import TableMetadata
-from databuilder.rest_api.base_rest_api_query import EmptyRestApiQuerySeed
+from databuilder.rest_api.base_rest_api_query import BaseRestApiQuery, EmptyRestApiQuerySeed
+from databuilder.rest_api.response_cache import create_response_cache
 from databuilder.rest_api.rest_api_query import RestApiQuery
 from databuilder.transformer.base_transformer import ChainedTransformer
 from databuilder.transformer.timestamp_string_to_epoch import FIELD_NAME as TS_FIELD_NAME, TimestampStringToEpoch
@@ -61,6 +64,12 @@ class RedashDashboardExtractor(Extractor):
     Given a `RedashVisualizationWidget`, this should return a list of potentially related tables
     in Amundsen. Any table returned that exists in Amundsen will be linked to the dashboard.
     Any table that does not exist will be ignored.
+    - (optional) `response_cache_dir`: Directory to cache dashboard details in. The details hold the widgets
+    of the dashboard and their queries, so they are read from the cache instead of the API only while neither
+    the `updated_at` of the dashboard nor the latest `updated_at` of all the Redash queries changed since the
+    last run.
+    - (optional) `max_workers`: Number of dashboards whose details are fetched concurrently (defaults to 1)
+    - (optional) `max_requests_per_sec`: Max number of requests per second sent to Redash (defaults to no limit)
     """
 
     REDASH_BASE_URL_KEY = 'redash_base_url'
@@ -69,6 +78,8 @@ class RedashDashboardExtractor(Extractor):
     CLUSTER_KEY = 'cluster'  # optional config
     TABLE_PARSER_KEY = 'table_parser'  # optional config
     REDASH_VERSION = 'redash_version'  # optional config
+    MAX_WORKERS_KEY = 'max_workers'  # optional config
+    MAX_REQUESTS_PER_SEC_KEY = 'max_requests_per_sec'  # optional config
 
     DEFAULT_CLUSTER = 'prod'
     DEFAULT_VERSION = 9
@@ -99,6 +110,10 @@ class RedashDashboardExtractor(Extractor):
             mod = importlib.import_module(module_name)
             self._parse_tables = getattr(mod, fn_name)
 
+        self._response_cache = create_response_cache(conf)
+        self._max_workers = conf.get_int(RedashDashboardExtractor.MAX_WORKERS_KEY, 1)
+        self._max_requests_per_sec = conf.get_float(RedashDashboardExtractor.MAX_REQUESTS_PER_SEC_KEY, 0)
+
         self._extractor = self._build_extractor()
         self._transformer = self._build_transformer()
         self._extract_iter: Optional[Iterator[Any]] = None
@@ -204,8 +219,22 @@ class RedashDashboardExtractor(Extractor):
 
     def _build_restapi_query(self) -> RestApiQuery:
 
+        seed_query: BaseRestApiQuery = EmptyRestApiQuerySeed()
+        updated_at_field = ['last_modified_timestamp']
+        if self._response_cache:
+            # Queries of the widgets change without changing the dashboard, so dashboard details are also keyed on
+            # the time the most recently changed query was updated at
+            seed_query = RestApiQuery(
+                query_to_join=seed_query,
+                url=f'{self._api_base_url}/queries',
+                params={'params': {'order': '-updated_at', 'page_size': 1}, **self._get_default_api_query_params()},
+                json_path='results[*].updated_at',
+                field_names=['queries_updated_at']
+            )
+            updated_at_field.append('queries_updated_at')
+
         dashes_query = RedashPaginatedRestApiQuery(
-            query_to_join=EmptyRestApiQuerySeed(),
+            query_to_join=seed_query,
             url=f'{self._api_base_url}/dashboards',
             params=self._get_default_api_query_params(),
             json_path='results[*].[id,name,slug,created_at,updated_at,is_archived,is_draft,user]',
@@ -227,7 +256,9 @@ class RedashDashboardExtractor(Extractor):
             params=self._get_default_api_query_params(),
             json_path='widgets',
             field_names=['widgets'],
-            skip_no_result=True
+            skip_no_result=True,
+            response_cache=self._response_cache,
+            updated_at_field=updated_at_field
         )
 
     def _get_default_api_query_params(self) -> Dict[str, Any]:
@@ -238,7 +269,9 @@ class RedashDashboardExtractor(Extractor):
 
         extractor = RestAPIExtractor()
         rest_api_extractor_conf = ConfigFactory.from_dict({
-            REST_API_QUERY: self._build_restapi_query()
+            REST_API_QUERY: self._build_restapi_query(),
+            MAX_WORKERS: self._max_workers,
+            MAX_REQUESTS_PER_SEC: self._max_requests_per_sec,
         })
         extractor.init(rest_api_extractor_conf)
         return extractor
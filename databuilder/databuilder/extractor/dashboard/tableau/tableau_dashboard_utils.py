@@ -13,6 +13,7 @@ from pyhocon import ConfigTree
 import databuilder.extractor.dashboard.tableau.tableau_dashboard_constants as const
 from databuilder.extractor.base_extractor import Extractor
 from databuilder.extractor.restapi.rest_api_extractor import STATIC_RECORD_DICT
+from databuilder.rest_api.response_cache import create_response_cache
 
 
 class TableauDashboardUtils:
@@ -68,6 +69,9 @@ class TableauDashboardUtils:
 class TableauGraphQLApiExtractor(Extractor):
     """
     Base class for querying the Tableau Metdata API, which uses a GraphQL schema.
+
+    Query results are cached in response_cache_dir when it is configured. The Metadata API does not support
+    conditional requests, so a cached result is only reused for response_cache_max_age_sec.
     """
 
     API_BASE_URL = const.API_BASE_URL
@@ -86,6 +90,7 @@ class TableauGraphQLApiExtractor(Extractor):
         )
         self._query_variables = self._conf.get(TableauGraphQLApiExtractor.QUERY_VARIABLES, {})
         self._verify_request = self._conf.get(TableauGraphQLApiExtractor.VERIFY_REQUEST, None)
+        self._response_cache = create_response_cache(self._conf)
 
     def execute_query(self) -> Dict[str, Any]:
         """
@@ -105,7 +110,10 @@ class TableauGraphQLApiExtractor(Extractor):
         if self._verify_request is not None:
             params['verify'] = self._verify_request
 
-        response = requests.post(url=self._metadata_url, data=query_payload, **params)
+        if self._response_cache:
+            response = self._response_cache.send(requests.post, self._metadata_url, data=query_payload, **params)
+        else:
+            response = requests.post(url=self._metadata_url, data=query_payload, **params)
         return response.json()['data']
 
     def execute(self) -> Iterator[Dict[str, Any]]:
@@ -6,7 +6,7 @@ import logging
 import os
 from enum import Enum
 from typing import (
-    Dict, Iterator, List, Optional, Tuple, Union,
+    Any, Dict, Iterator, List, Optional, Tuple, Union,
 )
 
 from pyhocon import ConfigTree
@@ -64,6 +64,10 @@ class DbtExtractor(Extractor):
     - Analysis (as queries for a table??)
     - Table / column level statistics
     - Table comments (as programatic descriptoins)
+
+    With `streaming` enabled and both inputs given as file locations, the files are parsed incrementally
+    (requires `ijson`, the `dbt` extra): the manifest nodes and child map are read one entry at a time and only
+    a lookup index of the catalog (table type and column name, type and index) is kept in memory.
     """
 
     CATALOG_JSON = "catalog_json"
@@ -91,6 +95,9 @@ class DbtExtractor(Extractor):
     # properly format the string value.
     FORCE_TABLE_KEY_LOWER = 'force_table_key_lower'
 
+    # Parse the manifest and catalog files incrementally instead of loading them as a whole
+    STREAMING = 'streaming'
+
     def init(self, conf: ConfigTree) -> None:
         self._conf = conf
         self._database_name = conf.get_string(DbtExtractor.DATABASE_NAME)
@@ -107,6 +114,7 @@ class DbtExtractor(Extractor):
         self._schema_filter = conf.get_string(DbtExtractor.SCHEMA_FILTER, '')
         self._model_name_key = DBT_MODEL_NAME_KEY(
             conf.get_string(DbtExtractor.MODEL_NAME_KEY, DBT_MODEL_NAME_KEY.NAME.value)).value
+        self._streaming = conf.get_bool(DbtExtractor.STREAMING, False)
         self._clean_inputs()
 
         self._extract_iter: Union[None, Iterator] = None
@@ -171,9 +179,44 @@ class DbtExtractor(Extractor):
                 'Must provide a dbt manifest file and dbt catalog file.'
             )
 
+        if self._streaming and os.path.isfile(self._dbt_manifest) and os.path.isfile(self._dbt_catalog):
+            # Sections are read lazily while extracting, a missing section is treated as empty
+            self._dbt_catalog = {'nodes': self._build_catalog_index(self._dbt_catalog)}
+            return
+
+        self._streaming = False
         self._validate_catalog()
         self._validate_manifest()
 
+    def _build_catalog_index(self, catalog_file: str) -> Dict[str, Any]:
+        """
+        Reads the catalog nodes one at a time and keeps only what extraction needs from them.
+        """
+        index = {}
+        for tbl_node, catalog_content in self._stream_json_section(catalog_file, 'nodes'):
+            index[tbl_node] = {
+                'metadata': {'type': catalog_content['metadata']['type']},
+                'columns': {col_name: {'name': col['name'], 'type': col['type'], 'index': col['index']}
+                            for col_name, col in catalog_content['columns'].items()}
+            }
+        LOGGER.info('Indexed %i dbt catalog nodes', len(index))
+        return index
+
+    @staticmethod
+    def _stream_json_section(file_location: str, section: str) -> Iterator[Tuple[str, Any]]:
+        """
+        Yields the key and value pairs of a top level object of a JSON file without loading the whole file.
+        """
+        import ijson
+
+        with open(file_location, 'rb') as f:
+            yield from ijson.kvitems(f, section, use_float=True)
+
+    def _get_manifest_section(self, section: str) -> Iterator[Tuple[str, Any]]:
+        if self._streaming:
+            return self._stream_json_section(self._dbt_manifest, section)
+        return iter(self._dbt_manifest[section].items())
+
     def extract(self) -> Union[TableMetadata, None]:
         """
         For every feature table from Feast, a multiple objets are extracted:
@@ -233,7 +276,7 @@ class DbtExtractor(Extractor):
         Generates the extract iterator for all of the model types created by the dbt files.
         """
         dbt_id_to_table_key = {}
-        for tbl_node, manifest_content in self._dbt_manifest['nodes'].items():
+        for tbl_node, manifest_content in self._get_manifest_section('nodes'):
 
             if manifest_content['resource_type'] == DBT_MODEL_TYPE and tbl_node in self._dbt_catalog['nodes']:
                 LOGGER.info(
@@ -283,7 +326,7 @@ class DbtExtractor(Extractor):
                                       source=os.path.join(self._source_url, manifest_content.get('original_file_path')))
 
         if self._extract_lineage:
-            for upstream, downstreams in self._dbt_manifest['child_map'].items():
+            for upstream, downstreams in self._get_manifest_section('child_map'):
                 valid_downstreams = [
                     dbt_id_to_table_key[k] for k in downstreams if k.startswith(DBT_MODEL_PREFIX)
                 ]
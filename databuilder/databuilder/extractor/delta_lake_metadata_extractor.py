@@ -3,10 +3,11 @@
 
 import concurrent.futures
 import logging
+import os
 from collections import namedtuple
 from datetime import datetime
 from typing import (  # noqa: F401
-    Any, Dict, Iterator, List, Optional, Union,
+    Any, Dict, Iterable, Iterator, List, Optional, Union,
 )
 
 from pyhocon import ConfigFactory, ConfigTree  # noqa: F401
@@ -20,6 +21,7 @@ from pyspark.sql.utils import AnalysisException
 from databuilder.extractor.base_extractor import Extractor
 from databuilder.models.table_last_updated import TableLastUpdated
 from databuilder.models.table_metadata import ColumnMetadata, TableMetadata
+from databuilder.utils.concurrency import map_concurrently
 
 TableKey = namedtuple('TableKey', ['schema', 'table_name'])
 
@@ -126,6 +128,9 @@ class DeltaLakeMetadataExtractor(Extractor):
 
     By default, the extractor does not extract nested columns. Set the EXTRACT_NESTED_COLUMNS conf to True
     if you would like nested columns extracted
+
+    Tables are listed schema by schema while they are scraped on a thread pool of MAX_WORKERS threads. At most
+    twice that many tables are scraped at once, and scraped tables are yielded as soon as they complete.
     """
     # CONFIG KEYS
     DATABASE_KEY = "database"
@@ -146,6 +151,9 @@ class DeltaLakeMetadataExtractor(Extractor):
     # Set this to true in the conf if you would like nested columns & complex types fully extracted
     EXTRACT_NESTED_COLUMNS = "extract_nested_columns"
 
+    # Number of threads scraping tables. Defaults to the number of CPUs plus 4, at most 32
+    MAX_WORKERS = "max_workers"
+
     def init(self, conf: ConfigTree) -> None:
         self.conf = conf.with_fallback(DeltaLakeMetadataExtractor.DEFAULT_CONFIG)
         self._extract_iter = None  # type: Union[None, Iterator]
@@ -156,6 +164,8 @@ class DeltaLakeMetadataExtractor(Extractor):
         self.delta_tables_only = self.conf.get_bool(DeltaLakeMetadataExtractor.DELTA_TABLES_ONLY)
         self.extract_nested_columns = self.conf.get_bool(DeltaLakeMetadataExtractor.EXTRACT_NESTED_COLUMNS,
                                                          default=False)
+        self.max_workers = self.conf.get_int(DeltaLakeMetadataExtractor.MAX_WORKERS,
+                                             default=min(32, (os.cpu_count() or 1) + 4))
 
     def set_spark(self, spark: SparkSession) -> None:
         self.spark = spark
@@ -181,16 +191,16 @@ class DeltaLakeMetadataExtractor(Extractor):
         """
         if self.schema_list:
             LOGGER.info("working on %s", self.schema_list)
-            tables = self.get_all_tables(self.schema_list)
+            schemas = self.schema_list
         else:
             LOGGER.info("fetching all schemas")
             LOGGER.info("Excluding: %s", self.exclude_list)
             schemas = self.get_schemas(self.exclude_list)
             LOGGER.info("working on %s", schemas)
-            tables = self.get_all_tables(schemas)
+        tables = (table for schema in schemas for table in self.get_tables_for_schema(schema))
         # TODO add the programmatic information as well?
         # TODO add watermarks
-        scraped_tables = self.scrape_all_tables(tables)
+        scraped_tables = self.scrape_tables_as_completed(tables)
         for scraped_table in scraped_tables:
             if not scraped_table:
                 continue
@@ -229,6 +239,13 @@ class DeltaLakeMetadataExtractor(Extractor):
         scraped_tables = [f.result() for f in futures]
         return scraped_tables
 
+    def scrape_tables_as_completed(self, tables: Iterable[Table]) -> Iterator[Optional[ScrapedTableMetadata]]:
+        """
+        Scrapes tables on a thread pool and yields them in completion order. Tables are only taken from {tables}
+        while fewer than twice max_workers are in flight.
+        """
+        return map_concurrently(self.scrape_table, tables, self.max_workers, preserve_order=False)
+
     def scrape_table(self, table: Table) -> Optional[ScrapedTableMetadata]:
         '''Takes a table object and creates a scraped table metadata object.'''
         met = ScrapedTableMetadata(schema=table.database, table=table.name)
@@ -1,13 +1,15 @@
 # Copyright Contributors to the Amundsen project.
 # SPDX-License-Identifier: Apache-2.0
 
-
+import logging
 from typing import (
-    Any, Dict, Iterator, List, Set, Union,
+    Any, Dict, Iterator, List, Optional, Set, Tuple, Union,
 )
 
 from databuilder.extractor.es_base_extractor import ElasticsearchBaseExtractor
-from databuilder.models.table_stats import TableColumnStats
+from databuilder.models.table_stats import TableColumnStats, TableColumnStatsBatch
+
+LOGGER = logging.getLogger(__name__)
 
 
 class ElasticsearchColumnStatsExtractor(ElasticsearchBaseExtractor):
@@ -15,11 +17,17 @@ class ElasticsearchColumnStatsExtractor(ElasticsearchBaseExtractor):
     Extractor to extract stats for Elasticsearch mapping attributes.
     """
 
+    # Number of indexes whose stats are aggregated in one multi search request
+    INDEX_BATCH_SIZE = 'index_batch_size'
+    # If True, all stats of an index are extracted as a single TableColumnStatsBatch record
+    BATCH_STATS = 'batch_stats'
+
     def get_scope(self) -> str:
         return 'extractor.es_column_stats'
 
-    def _get_index_stats(self, index_name: str, fields: List[str]) -> List[Dict[str, Any]]:
-        query = {
+    @staticmethod
+    def _get_stats_query(fields: List[str]) -> Dict[str, Any]:
+        return {
             "size": 0,
             "aggs": {
                 "stats": {
@@ -30,11 +38,37 @@ class ElasticsearchColumnStatsExtractor(ElasticsearchBaseExtractor):
             }
         }
 
-        _data = self.es.search(index=index_name, body=query)
+    @staticmethod
+    def _get_stats_fields(response: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return response.get('aggregations', dict()).get('stats', dict()).get('fields', list())
 
-        data = _data.get('aggregations', dict()).get('stats', dict()).get('fields', list())
+    def _get_index_stats(self, index_name: str, fields: List[str]) -> List[Dict[str, Any]]:
+        _data = self.es.search(index=index_name, body=self._get_stats_query(fields))
+
+        return self._get_stats_fields(_data)
+
+    def _get_multi_index_stats(self, index_fields: List[Tuple[str, List[str]]]) -> List[List[Dict[str, Any]]]:
+        """
+        Aggregates the stats of several indexes with a single multi search request
+        :param index_fields: Index name and fields to aggregate, per index
+        :return: Stats of the fields, per index
+        """
+        body: List[Dict[str, Any]] = []
+        for index_name, fields in index_fields:
+            body.append({'index': index_name})
+            body.append(self._get_stats_query(fields))
+
+        responses = self.es.msearch(body=body).get('responses', list())
+
+        result: List[List[Dict[str, Any]]] = []
+        for (index_name, _), response in zip(index_fields, responses):
+            if 'error' in response:
+                LOGGER.warning('Failed to aggregate stats of index %s: %s', index_name, response['error'])
+                result.append([])
+            else:
+                result.append(self._get_stats_fields(response))
 
-        return data
+        return result
 
     def _render_column_stats(self, index_name: str, spec: Dict[str, Any]) -> List[TableColumnStats]:
         result: List[TableColumnStats] = []
@@ -66,14 +100,70 @@ class ElasticsearchColumnStatsExtractor(ElasticsearchBaseExtractor):
         return set(['long', 'integer', 'short', 'byte', 'double',
                     'float', 'half_float', 'scaled_float', 'unsigned_long'])
 
-    def _get_extract_iter(self) -> Iterator[Union[TableColumnStats, None]]:
+    def _render_column_stats_batch(self,
+                                   index_name: str,
+                                   specifications: List[Dict[str, Any]]) -> Optional[TableColumnStatsBatch]:
+        col_names: List[str] = []
+        stat_names: List[str] = []
+        stat_vals: List[Any] = []
+
+        for spec in specifications:
+            col_name = spec['name']
+
+            for stat_name, stat_val in spec.items():
+                if stat_name == 'name' or isinstance(stat_val, (dict, list)) or stat_val == 'NaN':
+                    continue
+
+                col_names.append(col_name)
+                stat_names.append(stat_name)
+                stat_vals.append(stat_val)
+
+        if not stat_vals:
+            return None
+
+        return TableColumnStatsBatch(table_name=index_name,
+                                     col_names=col_names,
+                                     stat_names=stat_names,
+                                     stat_vals=stat_vals,
+                                     start_epoch='0',
+                                     end_epoch='0',
+                                     db=self.database,
+                                     cluster=self.cluster,
+                                     schema=self.schema)
+
+    def _get_stats_iter(self) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+        """
+        Provides the stats of every index, aggregated with one request per {index_batch_size} indexes
+        """
+        index_batch_size = self.conf.get_int(ElasticsearchColumnStatsExtractor.INDEX_BATCH_SIZE, 1)
+
         indexes: Dict = self._get_indexes()
+        index_fields: List[Tuple[str, List[str]]] = []
         for index_name, index_metadata in indexes.items():
             properties = self._get_index_mapping_properties(index_metadata) or dict()
 
             fields = [name for name, spec in properties.items() if spec['type'] in self._allowed_types]
 
-            specifications = self._get_index_stats(index_name, fields)
+            if index_batch_size <= 1:
+                yield index_name, self._get_index_stats(index_name, fields)
+            elif fields:
+                index_fields.append((index_name, fields))
+                if len(index_fields) >= index_batch_size:
+                    yield from zip([name for name, _ in index_fields], self._get_multi_index_stats(index_fields))
+                    index_fields = []
+
+        if index_fields:
+            yield from zip([name for name, _ in index_fields], self._get_multi_index_stats(index_fields))
+
+    def _get_extract_iter(self) -> Iterator[Union[TableColumnStats, TableColumnStatsBatch, None]]:
+        batch_stats = self.conf.get_bool(ElasticsearchColumnStatsExtractor.BATCH_STATS, False)
+
+        for index_name, specifications in self._get_stats_iter():
+            if batch_stats:
+                stats_batch = self._render_column_stats_batch(index_name, specifications)
+                if stats_batch:
+                    yield stats_batch
+                continue
 
             for spec in specifications:
                 stats = self._render_column_stats(index_name, spec)
@@ -1,6 +1,7 @@
 # Copyright Contributors to the Amundsen project.
 # SPDX-License-Identifier: Apache-2.0
 
+import logging
 from typing import (
     Any, Dict, Iterator, List, Union,
 )
@@ -10,23 +11,33 @@ from pyhocon import ConfigFactory, ConfigTree
 
 from databuilder.extractor.base_extractor import Extractor
 from databuilder.models.table_metadata import ColumnMetadata, TableMetadata
+from databuilder.utils.concurrency import map_concurrently
+
+LOGGER = logging.getLogger(__name__)
 
 
 class GlueExtractor(Extractor):
     """
     Extracts tables and columns metadata from AWS Glue metastore
+
+    Tables are yielded page by page as they are fetched. With {max_workers} greater than 1 (and no filters),
+    the tables of every database are fetched concurrently with GetTables and yielded database by database,
+    in no particular order.
     """
 
     CLUSTER_KEY = 'cluster'
     FILTER_KEY = 'filters'
     MAX_RESULTS_KEY = 'max_results'
-    DEFAULT_CONFIG = ConfigFactory.from_dict({CLUSTER_KEY: 'gold', FILTER_KEY: None, MAX_RESULTS_KEY: 500})
+    MAX_WORKERS_KEY = 'max_workers'
+    DEFAULT_CONFIG = ConfigFactory.from_dict({CLUSTER_KEY: 'gold', FILTER_KEY: None, MAX_RESULTS_KEY: 500,
+                                              MAX_WORKERS_KEY: 1})
 
     def init(self, conf: ConfigTree) -> None:
         conf = conf.with_fallback(GlueExtractor.DEFAULT_CONFIG)
         self._cluster = conf.get_string(GlueExtractor.CLUSTER_KEY)
         self._filters = conf.get(GlueExtractor.FILTER_KEY)
         self._max_results = conf.get(GlueExtractor.MAX_RESULTS_KEY)
+        self._max_workers = conf.get_int(GlueExtractor.MAX_WORKERS_KEY)
         self._glue = boto3.client('glue')
         self._extract_iter: Union[None, Iterator] = None
 
@@ -74,20 +85,42 @@ class GlueExtractor(Extractor):
         Provides iterator of results row from glue client
         :return:
         """
+        if self._max_workers > 1:
+            if not self._filters:
+                return self._get_tables_concurrently()
+            LOGGER.warning('Filters are only supported by search tables, fetching tables serially')
+
         tables = self._search_tables()
         return iter(tables)
 
-    def _search_tables(self) -> List[Dict[str, Any]]:
-        tables = []
+    def _search_tables(self) -> Iterator[Dict[str, Any]]:
         kwargs = {}
         if self._filters is not None:
             kwargs['Filters'] = self._filters
             kwargs['MaxResults'] = self._max_results
         data = self._glue.search_tables(**kwargs)
-        tables += data['TableList']
+        yield from data['TableList']
         while 'NextToken' in data:
             token = data['NextToken']
             kwargs['NextToken'] = token
             data = self._glue.search_tables(**kwargs)
-            tables += data['TableList']
-        return tables
+            yield from data['TableList']
+
+    def _get_databases(self) -> List[str]:
+        paginator = self._glue.get_paginator('get_databases')
+        return [database['Name'] for page in paginator.paginate() for database in page['DatabaseList']]
+
+    def _get_tables_concurrently(self) -> Iterator[Dict[str, Any]]:
+        """
+        Fetches the tables of all databases on a thread pool, with at most 2 * {max_workers} databases in flight,
+        and yields the tables of every database as soon as all its pages are fetched.
+        """
+        databases = self._get_databases()
+        LOGGER.info('Fetching tables of %i databases with %i workers', len(databases), self._max_workers)
+        for tables in map_concurrently(self._get_database_tables, databases, self._max_workers,
+                                       preserve_order=False):
+            yield from tables
+
+    def _get_database_tables(self, database: str) -> List[Dict[str, Any]]:
+        paginator = self._glue.get_paginator('get_tables')
+        return [table for page in paginator.paginate(DatabaseName=database) for table in page['TableList']]
@@ -2,12 +2,15 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import logging
+import multiprocessing
+import os
 import time
+from collections import defaultdict
 from datetime import datetime
 from functools import wraps
 from multiprocessing.pool import ThreadPool
 from typing import (
-    Any, Iterator, List, Union,
+    Any, Callable, Dict, Iterator, List, Optional, Set, Tuple, Union,
 )
 
 from pyhocon import ConfigFactory, ConfigTree
@@ -17,6 +20,8 @@ from databuilder import Scoped
 from databuilder.extractor.base_extractor import Extractor
 from databuilder.extractor.sql_alchemy_extractor import SQLAlchemyExtractor
 from databuilder.filesystem.filesystem import FileSystem, is_client_side_error
+from databuilder.filesystem.metadata import FileMetadata
+from databuilder.filesystem.probe_scheduler import AdaptiveConcurrencyLimiter
 from databuilder.models.table_last_updated import TableLastUpdated
 
 LOGGER = logging.getLogger(__name__)
@@ -57,6 +62,13 @@ class HiveTableLastUpdatedExtractor(Extractor):
     table. For partitioned table, it will fetch partition created timestamp, and it's close enough for last updated
     timestamp.
 
+    With {list_files_with_detail}, non-partitioned tables are probed {probe_window_size} tables at a time on the
+    thread pool, with one detailed listing per table location. When at least {batch_listing_min_tables} locations
+    of a window share a parent directory, the parent is listed once for the run, two levels deep, i.e. the files
+    directly under each of its sub-directories, without walking deeper into e.g. partitioned tables. The number
+    and latest modification time of the files of every directory found are cached for the rest of the run.
+    With {fs_target_latency_sec}, the number of concurrent storage requests adapts between {fs_min_concurrency} and
+    {fs_worker_pool_size} to the observed latency and throttling.
     """
     PARTITION_TABLE_SQL_STATEMENT = """
     SELECT
@@ -99,13 +111,27 @@ class HiveTableLastUpdatedExtractor(Extractor):
     FS_WORKER_TIMEOUT_SEC = 'fs_worker_timeout_sec'
     # If number of files that it needs to fetch metadata is larger than this threshold, it will skip the table.
     FILE_CHECK_THRESHOLD = 'file_check_threshold'
+    # Probe every table with one detailed listing instead of is_file and info requests per file
+    LIST_FILES_WITH_DETAIL = 'list_files_with_detail'
+    # Number of non-partitioned tables probed concurrently
+    PROBE_WINDOW_SIZE = 'probe_window_size'
+    # Min number of tables in a window sharing a parent directory to list that directory once for the run, 0 disables
+    BATCH_LISTING_MIN_TABLES = 'batch_listing_min_tables'
+    # Latency above which storage concurrency is decreased, 0 keeps it fixed at fs_worker_pool_size
+    FS_TARGET_LATENCY_SEC = 'fs_target_latency_sec'
+    FS_MIN_CONCURRENCY = 'fs_min_concurrency'
 
     DEFAULT_CONFIG = ConfigFactory.from_dict({PARTITIONED_TABLE_WHERE_CLAUSE_SUFFIX_KEY: ' ',
                                               NON_PARTITIONED_TABLE_WHERE_CLAUSE_SUFFIX_KEY: ' ',
                                               CLUSTER_KEY: 'gold',
                                               FS_WORKER_POOL_SIZE: 500,
                                               FS_WORKER_TIMEOUT_SEC: 60,
-                                              FILE_CHECK_THRESHOLD: -1})
+                                              FILE_CHECK_THRESHOLD: -1,
+                                              LIST_FILES_WITH_DETAIL: False,
+                                              PROBE_WINDOW_SIZE: 1000,
+                                              BATCH_LISTING_MIN_TABLES: 0,
+                                              FS_TARGET_LATENCY_SEC: 0,
+                                              FS_MIN_CONCURRENCY: 10})
 
     def init(self, conf: ConfigTree) -> None:
         self._conf = conf.with_fallback(HiveTableLastUpdatedExtractor.DEFAULT_CONFIG)
@@ -124,6 +150,21 @@ class HiveTableLastUpdatedExtractor(Extractor):
         self._last_updated_filecheck_threshold \
             = self._conf.get_int(HiveTableLastUpdatedExtractor.FILE_CHECK_THRESHOLD)
 
+        self._list_files_with_detail = self._conf.get_bool(HiveTableLastUpdatedExtractor.LIST_FILES_WITH_DETAIL)
+        self._probe_window_size = self._conf.get_int(HiveTableLastUpdatedExtractor.PROBE_WINDOW_SIZE)
+        self._batch_listing_min_tables = self._conf.get_int(HiveTableLastUpdatedExtractor.BATCH_LISTING_MIN_TABLES)
+        # Parent directories listed by a batched listing, and the number and latest modification time of the files
+        # directly under every directory found by these listings
+        self._listed_parents: Set[str] = set()
+        self._directory_cache: Dict[str, Tuple[int, datetime]] = {}
+        target_latency_sec = self._conf.get_float(HiveTableLastUpdatedExtractor.FS_TARGET_LATENCY_SEC)
+        self._fs_limiter: Optional[AdaptiveConcurrencyLimiter] = None
+        if target_latency_sec > 0:
+            self._fs_limiter = AdaptiveConcurrencyLimiter(
+                min_concurrency=self._conf.get_int(HiveTableLastUpdatedExtractor.FS_MIN_CONCURRENCY),
+                max_concurrency=pool_size,
+                target_latency_sec=target_latency_sec)
+
         self._extract_iter: Union[None, Iterator] = None
 
     def _get_partitioned_table_sql_alchemy_extractor(self) -> Extractor:
@@ -208,6 +249,10 @@ class HiveTableLastUpdatedExtractor(Extractor):
             partitioned_tbl_row = self._partitioned_table_extractor.extract()
 
         LOGGER.info('Extracting non-partitioned table')
+        if self._list_files_with_detail:
+            yield from self._get_non_partitioned_table_iter()
+            return
+
         count = 0
         non_partitioned_tbl_row = self._non_partitioned_table_extractor.extract()
         while non_partitioned_tbl_row:
@@ -273,7 +318,7 @@ class HiveTableLastUpdatedExtractor(Extractor):
                 time_stamp = time_stamp_future.get(timeout=self._fs_worker_timeout)
                 if time_stamp:
                     last_updated = max(time_stamp, last_updated)
-            except TimeoutError:
+            except multiprocessing.TimeoutError:
                 LOGGER.warning('Timed out on paths %s . Skipping', paths)
 
         if last_updated == OLDEST_TIMESTAMP:
@@ -288,6 +333,114 @@ class HiveTableLastUpdatedExtractor(Extractor):
 
         return result
 
+    def _get_non_partitioned_table_iter(self) -> Iterator[TableLastUpdated]:
+        """
+        Reads non-partitioned tables in windows of {probe_window_size} and probes the tables of a window concurrently
+        :return:
+        """
+        count = 0
+        window: List[Dict[str, Any]] = []
+        non_partitioned_tbl_row = self._non_partitioned_table_extractor.extract()
+        while non_partitioned_tbl_row:
+            if non_partitioned_tbl_row['location']:
+                window.append(non_partitioned_tbl_row)
+            else:
+                LOGGER.warning('Skipping as no storage location available. %s', non_partitioned_tbl_row)
+
+            if len(window) >= self._probe_window_size:
+                yield from self._probe_window(window)
+                count += len(window)
+                LOGGER.info('Processed %i non-partitioned tables', count)
+                window = []
+            non_partitioned_tbl_row = self._non_partitioned_table_extractor.extract()
+
+        if window:
+            yield from self._probe_window(window)
+
+    def _probe_window(self, rows: List[Dict[str, Any]]) -> Iterator[TableLastUpdated]:
+        self._batch_list_locations([row['location'] for row in rows])
+
+        futures = [self._fs_worker_pool.apply_async(self._get_last_updated_from_listing, (row,)) for row in rows]
+        for row, future in zip(rows, futures):
+            try:
+                table_last_updated = future.get(timeout=self._fs_worker_timeout)
+            except multiprocessing.TimeoutError:
+                LOGGER.warning('Timed out on %s.%s in %s . Skipping', row['schema'], row['table_name'],
+                               row['location'])
+                continue
+            if table_last_updated:
+                yield table_last_updated
+
+    def _batch_list_locations(self, locations: List[str]) -> None:
+        """
+        Lists every parent directory shared by at least {batch_listing_min_tables} locations, that was not listed
+        yet in this run, two levels deep and caches the files found per directory
+        :param locations:
+        :return:
+        """
+        if self._batch_listing_min_tables <= 0:
+            return
+
+        locations_per_parent: Dict[str, List[str]] = defaultdict(list)
+        for location in locations:
+            normalized_location = self._fs.strip_protocol(location)
+            locations_per_parent[os.path.dirname(normalized_location)].append(normalized_location)
+        parents = [parent for parent, children in locations_per_parent.items()
+                   if parent and parent not in self._listed_parents and len(children) >= self._batch_listing_min_tables]
+
+        futures = [self._fs_worker_pool.apply_async(self._find_files, (parent, 2)) for parent in parents]
+        for parent, future in zip(parents, futures):
+            try:
+                files = future.get(timeout=self._fs_worker_timeout)
+            except multiprocessing.TimeoutError:
+                LOGGER.warning('Timed out on listing %s . Probing its tables one by one', parent)
+                continue
+            if files is None:
+                continue
+
+            for file_metadata in files:
+                directory = os.path.dirname(file_metadata.path)
+                count, last_updated = self._directory_cache.get(directory, (0, OLDEST_TIMESTAMP))
+                self._directory_cache[directory] = (count + 1, max(last_updated, file_metadata.last_updated))
+            self._listed_parents.add(parent)
+
+    def _get_last_updated_from_listing(self, row: Dict[str, Any]) -> Union[TableLastUpdated, None]:
+        """
+        Gets latest timestamp of the files directly under the table location, from the cached listing of its parent
+        if there is one, or else with one detailed listing of the location.
+        :param row:
+        :return:
+        """
+        schema, table, storage_location = row['schema'], row['table_name'], row['location']
+        normalized_location = self._fs.strip_protocol(storage_location)
+        if os.path.dirname(normalized_location) in self._listed_parents:
+            count, last_updated = self._directory_cache.get(normalized_location, (0, OLDEST_TIMESTAMP))
+        else:
+            files = self._ls_files(storage_location) or []
+            count = len(files)
+            last_updated = max((file_metadata.last_updated for file_metadata in files), default=OLDEST_TIMESTAMP)
+
+        if not count:
+            LOGGER.info(f'{schema}.{table} does not have any file in path {storage_location}. Skipping')
+            return None
+
+        if 0 < self._last_updated_filecheck_threshold < count:
+            LOGGER.info(f'Skipping {schema}.{table} due to too many files. '
+                        f'{count} files exist in {storage_location}')
+            return None
+
+        return TableLastUpdated(table_name=table,
+                                last_updated_time_epoch=int((last_updated - OLDEST_TIMESTAMP).total_seconds()),
+                                schema=schema,
+                                db=HiveTableLastUpdatedExtractor.DATABASE,
+                                cluster=self._cluster)
+
+    def _call_fs(self, fs_fn: Callable[..., Any], *args: Any) -> Any:
+        if not self._fs_limiter:
+            return fs_fn(*args)
+        with self._fs_limiter.acquire():
+            return fs_fn(*args)
+
     @fs_error_handler
     def _ls(self, path: str) -> List[str]:
         """
@@ -295,7 +448,15 @@ class HiveTableLastUpdatedExtractor(Extractor):
         :param path:
         :return:
         """
-        return self._fs.ls(path)
+        return self._call_fs(self._fs.ls, path)
+
+    @fs_error_handler
+    def _ls_files(self, path: str) -> List[FileMetadata]:
+        return self._call_fs(self._fs.ls_files, path)
+
+    @fs_error_handler
+    def _find_files(self, path: str, maxdepth: Optional[int] = None) -> List[FileMetadata]:
+        return self._call_fs(self._fs.find_files, path, maxdepth)
 
     @fs_error_handler
     def _get_timestamp(self,
@@ -316,8 +477,8 @@ class HiveTableLastUpdatedExtractor(Extractor):
             LOGGER.info(f'Empty path {path} on {schema}.{table} in storage location {storage_location} . Skipping')
             return None
 
-        if not self._fs.is_file(path):
+        if not self._call_fs(self._fs.is_file, path):
             return None
 
-        file_metadata = self._fs.info(path)
+        file_metadata = self._call_fs(self._fs.info, path)
         return file_metadata.last_updated
@@ -4,10 +4,12 @@
 import importlib
 import logging
 from datetime import datetime, timedelta
-from typing import Any
+from typing import (
+    Any, Dict, Iterator, List, Optional, Tuple,
+)
 
 from confluent_kafka import (
-    Consumer, KafkaError, KafkaException,
+    Consumer, KafkaError, KafkaException, TopicPartition,
 )
 from pyhocon import ConfigTree
 
@@ -28,6 +30,12 @@ class KafkaSourceExtractor(Extractor, Callback):
     persist into downstream sink.
     Once the publisher commit successfully, it will trigger the extractor's callback to commit the
     consumer offset.
+
+    By default all messages are polled into memory until the total timeout is reached before anything is
+    transformed. In streaming mode, messages are consumed in batches of {consumer_batch_size} and every record is
+    handed downstream as soon as it is transformed, so memory stays bounded. Up to {max_records_per_run} messages
+    are consumed per run, and the offsets of exactly those messages are committed once the publisher succeeded,
+    so every job run is one micro-batch that is checkpointed when it is published.
     """
     # The dict of Kafka consumer config
     CONSUMER_CONFIG = 'consumer_config'
@@ -50,6 +58,15 @@ class KafkaSourceExtractor(Extractor, Callback):
     # The value transformer to deserde the Kafka message
     RAW_VALUE_TRANSFORMER = 'raw_value_transformer'
 
+    # Whether to stream records in batches instead of consuming everything before transforming it
+    STREAMING = 'streaming'
+
+    # Max number of messages consumed at once in streaming mode
+    CONSUMER_BATCH_SIZE = 'consumer_batch_size'
+
+    # Max number of messages consumed (and committed) by a run in streaming mode, 0 means no limit
+    MAX_RECORDS_PER_RUN = 'max_records_per_run'
+
     def init(self, conf: ConfigTree) -> None:
         self.conf = conf
         self.consumer_config = conf.get_config(KafkaSourceExtractor.CONSUMER_CONFIG).\
@@ -69,6 +86,13 @@ class KafkaSourceExtractor(Extractor, Callback):
         self.transformer_thrown_exception = conf.get_bool(KafkaSourceExtractor.TRANSFORMER_THROWN_EXCEPTION,
                                                           default=False)
 
+        self.streaming = conf.get_bool(KafkaSourceExtractor.STREAMING, default=False)
+        self.consumer_batch_size = conf.get_int(KafkaSourceExtractor.CONSUMER_BATCH_SIZE, default=1000)
+        self.max_records_per_run = conf.get_int(KafkaSourceExtractor.MAX_RECORDS_PER_RUN, default=0)
+        self._stream: Optional[Iterator[Any]] = None
+        # Next offset to commit per (topic, partition), for the messages handed downstream in streaming mode
+        self._offsets: Dict[Tuple[str, int], int] = {}
+
         # Transform the protoBuf message with a transformer
         val_transformer = conf.get(KafkaSourceExtractor.RAW_VALUE_TRANSFORMER)
         if val_transformer is None:
@@ -98,8 +122,17 @@ class KafkaSourceExtractor(Extractor, Callback):
 
     def extract(self) -> Any:
         """
-        :return: Provides a record or None if no more to extract
+        :return: Provides a record or None if no more to extract. When not streaming, provides an iterator of all
+        the records consumed instead.
         """
+        if not self.streaming:
+            return self._extract_all()
+
+        if self._stream is None:
+            self._stream = self._consume_stream()
+        return next(self._stream, None)
+
+    def _extract_all(self) -> Iterator[Any]:
         records = self.consume()
         for record in records:
             try:
@@ -113,6 +146,69 @@ class KafkaSourceExtractor(Extractor, Callback):
                     # Users need to figure out how to rewind the consumer offset
                     raise Exception('Encounter exception when transform the record')
 
+    def _consume_stream(self) -> Iterator[Any]:
+        """
+        Consumes messages in batches and yields their transformed records until the total timeout or the max number
+        of records per run is reached. Kafka errors fail the run, so no offset gets committed.
+        """
+        start = datetime.now()
+        count = 0
+        while datetime.now() - start <= timedelta(seconds=self.consumer_total_timeout):
+            num_messages = self.consumer_batch_size
+            if self.max_records_per_run:
+                if count >= self.max_records_per_run:
+                    break
+                num_messages = min(num_messages, self.max_records_per_run - count)
+
+            for msg in self.consumer.consume(num_messages=num_messages, timeout=self.consumer_poll_timeout):
+                err = msg.error()
+                if err is not None:
+                    # Hit the EOF of partition
+                    if err.code() == KafkaError._PARTITION_EOF:
+                        continue
+                    raise KafkaException(err)
+
+                count += 1
+                partition, offset = msg.partition(), msg.offset()
+                # only messages without error come from a partition, at an offset
+                assert partition is not None and offset is not None
+                self._offsets[(msg.topic(), partition)] = offset + 1
+                for record in self._transform(msg.value()):
+                    yield record
+
+        LOGGER.info('Consumed %i messages', count)
+
+    def _transform(self, value: Any) -> List[Any]:
+        try:
+            record = self.transformer.transform(record=value)
+        except Exception as e:
+            # Has issues tranform / deserde the record. drop the record in default
+            LOGGER.exception(e)
+            if self.transformer_thrown_exception:
+                # if config enabled, it will throw exception.
+                # Users need to figure out how to rewind the consumer offset
+                raise Exception('Encounter exception when transform the record')
+            return []
+
+        if record is None:
+            return []
+        # Support transformers which return one record, or yield multiple
+        return list(record) if isinstance(record, Iterator) else [record]
+
+    def commit_offsets(self) -> None:
+        """
+        Commits the offsets of the messages extracted in streaming mode so far. Only call it once the records are
+        persisted downstream.
+        :return:
+        """
+        if not self._offsets:
+            return
+
+        offsets = [TopicPartition(topic, partition, offset)
+                   for (topic, partition), offset in self._offsets.items()]
+        self.consumer.commit(offsets=offsets, asynchronous=False)
+        LOGGER.info('Committed offsets %s', offsets)
+
     def on_success(self) -> None:
         """
         Commit the offset
@@ -126,7 +222,10 @@ class KafkaSourceExtractor(Extractor, Callback):
         """
         # set enable.auto.commit to False to avoid auto commit offset
         if self.consumer:
-            self.consumer.commit(asynchronous=False)
+            if self.streaming:
+                self.commit_offsets()
+            else:
+                self.consumer.commit(asynchronous=False)
             self.consumer.close()
 
     def on_failure(self) -> None:
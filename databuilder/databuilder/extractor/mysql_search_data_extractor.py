@@ -32,15 +32,18 @@ from databuilder.extractor.base_extractor import Extractor
 LOGGER = logging.getLogger(__name__)
 
 
-def _table_search_query(session: Session, table_filter: List, offset: int, limit: int) -> List:
+def _table_search_query(session: Session, table_filter: List, last_rk: Optional[str], limit: int) -> List:
     """
     Table query
     :param session:
     :param table_filter:
-    :param offset:
+    :param last_rk: key of the last table of the previous page, the page starts after it
     :param limit:
     :return:
     """
+    if last_rk is not None:
+        table_filter = table_filter + [Table.rk > last_rk]
+
     # table
     query = session.query(Table).filter(*table_filter).options(
         load_only(Table.rk, Table.name, Table.schema_rk)
@@ -108,12 +111,12 @@ def _table_search_query(session: Session, table_filter: List, offset: int, limit
         )
     )
 
-    query = query.order_by(Table.rk).offset(offset).limit(limit)
+    query = query.order_by(Table.rk).limit(limit)
 
     return query.all()
 
 
-def _table_search(session: Session, published_tag: str, limit: int) -> List[Dict]:
+def _table_search(session: Session, published_tag: str, limit: int) -> Iterator[Dict]:
     """
     Query table metadata.
     :param session:
@@ -127,11 +130,12 @@ def _table_search(session: Session, published_tag: str, limit: int) -> List[Dict
     if published_tag:
         table_filter.append(Table.published_tag == published_tag)
 
-    table_results = []
+    last_rk = None
+    while True:
+        tables = _table_search_query(session, table_filter, last_rk, limit)
+        if not tables:
+            break
 
-    offset = 0
-    tables = _table_search_query(session, table_filter, offset, limit)
-    while tables:
         for table in tables:
             schema = table.schema
             schema_description = schema.description.description if schema.description else None
@@ -168,23 +172,27 @@ def _table_search(session: Session, published_tag: str, limit: int) -> List[Dict
                                 badges=badges,
                                 schema_description=schema_description,
                                 programmatic_descriptions=programmatic_descriptions)
-            table_results.append(table_result)
-
-        offset += limit
-        tables = _table_search_query(session, table_filter, offset, limit)
+            yield table_result
 
-    return table_results
+        if len(tables) < limit:
+            break
+        last_rk = tables[-1].rk
+        # the page has been yielded, don't keep its objects in the session
+        session.expunge_all()
 
 
-def _dashboard_search_query(session: Session, dashboard_filter: List, offset: int, limit: int) -> List:
+def _dashboard_search_query(session: Session, dashboard_filter: List, last_rk: Optional[str], limit: int) -> List:
     """
     Dashboard query
     :param session:
     :param dashboard_filter:
-    :param offset:
+    :param last_rk: key of the last dashboard of the previous page, the page starts after it
     :param limit:
     :return:
     """
+    if last_rk is not None:
+        dashboard_filter = dashboard_filter + [Dashboard.rk > last_rk]
+
     # dashboard
     query = session.query(Dashboard).filter(*dashboard_filter).options(
         load_only(Dashboard.rk,
@@ -251,12 +259,12 @@ def _dashboard_search_query(session: Session, dashboard_filter: List, offset: in
         )
     )
 
-    query = query.order_by(Dashboard.rk).offset(offset).limit(limit)
+    query = query.order_by(Dashboard.rk).limit(limit)
 
     return query.all()
 
 
-def _dashboard_search(session: Session, published_tag: str, limit: int) -> List[Dict]:
+def _dashboard_search(session: Session, published_tag: str, limit: int) -> Iterator[Dict]:
     """
     Query dashboard metadata.
     :param session:
@@ -270,11 +278,12 @@ def _dashboard_search(session: Session, published_tag: str, limit: int) -> List[
     if published_tag:
         dashboard_filter.append(Dashboard.published_tag == published_tag)
 
-    dashboard_results = []
+    last_rk = None
+    while True:
+        dashboards = _dashboard_search_query(session, dashboard_filter, last_rk, limit)
+        if not dashboards:
+            break
 
-    offset = 0
-    dashboards = _dashboard_search_query(session, dashboard_filter, offset, limit)
-    while dashboards:
         for dashboard in dashboards:
             group = dashboard.group
             description = dashboard.description.description if dashboard.description else None
@@ -309,61 +318,65 @@ def _dashboard_search(session: Session, published_tag: str, limit: int) -> List[
                                     tags=tags,
                                     badges=badges)
 
-            dashboard_results.append(dashboard_result)
-
-        offset += limit
-        dashboards = _dashboard_search_query(session, dashboard_filter, offset, limit)
+            yield dashboard_result
 
-    return dashboard_results
+        if len(dashboards) < limit:
+            break
+        last_rk = dashboards[-1].rk
+        # the page has been yielded, don't keep its objects in the session
+        session.expunge_all()
 
 
-def _user_search_query(session: Session, user_filter: List, offset: int, limit: int) -> List:
+def _user_search_query(session: Session, user_filter: List, last_rk: Optional[str], limit: int) -> List:
     """
     User query
     :param session:
     :param user_filter:
-    :param offset:
+    :param last_rk: key of the last user of the previous page, the page starts after it
     :param limit:
     :return:
     """
+    if last_rk is not None:
+        user_filter = user_filter + [User.rk > last_rk]
+
     # read
     table_usage_subquery = session \
         .query(User.rk, func.sum(TableUsage.read_count).label('table_read_count')) \
         .outerjoin(TableUsage) \
         .filter(*user_filter) \
-        .group_by(User.rk).order_by(User.rk).offset(offset).limit(limit).subquery()
+        .group_by(User.rk).order_by(User.rk).limit(limit).subquery()
 
     dashboard_usage_subquery = session \
         .query(User.rk, func.sum(DashboardUsage.read_count).label('dashboard_read_count')) \
         .outerjoin(DashboardUsage) \
         .filter(*user_filter) \
-        .group_by(User.rk).order_by(User.rk).offset(offset).limit(limit).subquery()
+        .group_by(User.rk).order_by(User.rk).limit(limit).subquery()
 
     # own
     table_owner_subquery = session \
         .query(User.rk, func.count(TableOwner.table_rk).label('table_own_count')) \
         .outerjoin(TableOwner) \
         .filter(*user_filter) \
-        .group_by(User.rk).order_by(User.rk).offset(offset).limit(limit).subquery()
+        .group_by(User.rk).order_by(User.rk).limit(limit).subquery()
 
     dashboard_owner_subquery = session \
         .query(User.rk, func.count(DashboardOwner.dashboard_rk).label('dashboard_own_count')) \
         .outerjoin(DashboardOwner) \
         .filter(*user_filter) \
-        .group_by(User.rk).order_by(User.rk).offset(offset).limit(limit).subquery()
+        .group_by(User.rk).order_by(User.rk).limit(limit).subquery()
 
     # follow
     table_follower_subquery = session \
         .query(User.rk, func.count(TableFollower.table_rk).label('table_follow_count')) \
         .outerjoin(TableFollower) \
         .filter(*user_filter) \
-        .group_by(User.rk).order_by(User.rk).offset(offset).limit(limit).subquery()
+        .group_by(User.rk).order_by(User.rk).limit(limit).subquery()
 
     dashboard_follower_subquery = session \
         .query(User.rk, func.count(DashboardFollower.dashboard_rk).label('dashboard_follow_count')) \
         .outerjoin(DashboardFollower) \
         .filter(*user_filter) \
-        .group_by(User.rk).order_by(User.rk).offset(offset).limit(limit).subquery()
+        .group_by(User.rk).order_by(User.rk).limit(limit).subquery()
 
     # user
     query = session \
@@ -379,7 +392,8 @@ def _user_search_query(session: Session, user_filter: List, offset: int, limit:
         .join(table_owner_subquery, table_owner_subquery.c.rk == User.rk) \
         .join(dashboard_owner_subquery, dashboard_owner_subquery.c.rk == User.rk) \
         .join(table_follower_subquery, table_follower_subquery.c.rk == User.rk) \
-        .join(dashboard_follower_subquery, dashboard_follower_subquery.c.rk == User.rk)
+        .join(dashboard_follower_subquery, dashboard_follower_subquery.c.rk == User.rk) \
+        .order_by(User.rk)
 
     # manager
     query = query.options(
@@ -391,7 +405,7 @@ def _user_search_query(session: Session, user_filter: List, offset: int, limit:
     return query.all()
 
 
-def _user_search(session: Session, published_tag: str, limit: int) -> List[Dict]:
+def _user_search(session: Session, published_tag: str, limit: int) -> Iterator[Dict]:
     """
     Query user metadata.
     :param session:
@@ -405,11 +419,12 @@ def _user_search(session: Session, published_tag: str, limit: int) -> List[Dict]
     if published_tag:
         user_filter.append(User.published_tag == published_tag)
 
-    user_results = []
+    last_rk = None
+    while True:
+        query_results = _user_search_query(session, user_filter, last_rk, limit)
+        if not query_results:
+            break
 
-    offset = 0
-    query_results = _user_search_query(session, user_filter, offset, limit)
-    while query_results:
         for query_result in query_results:
             user = query_result.User
             table_read_count = int(query_result.table_read_count) if query_result.table_read_count else 0
@@ -440,12 +455,13 @@ def _user_search(session: Session, published_tag: str, limit: int) -> List[Dict]
                                total_own=total_own_count,
                                total_follow=total_follow_count)
 
-            user_results.append(user_result)
-
-        offset += limit
-        query_results = _user_search_query(session, user_filter, offset, limit)
+            yield user_result
 
-    return user_results
+        if len(query_results) < limit:
+            break
+        last_rk = query_results[-1].User.rk
+        # the page has been yielded, don't keep its objects in the session
+        session.expunge_all()
 
 
 class MySQLSearchDataExtractor(Extractor):
@@ -516,24 +532,23 @@ class MySQLSearchDataExtractor(Extractor):
             return None
 
     def _get_extract_iter(self) -> Iterator[Any]:
-        if not hasattr(self, 'results'):
-            session = self._session_factory()
-            try:
-                self.results = self.search_function(session=session,
-                                                    published_tag=self.published_tag,
-                                                    limit=self.query_limit)
-            except Exception as e:
-                LOGGER.exception('Exception encountered while executing the search function.')
-                raise e
-            finally:
-                session.close()
-
-        for result in self.results:
-            if hasattr(self, 'model_class'):
-                obj = self.model_class(**result)
-                yield obj
-            else:
-                yield result
+        # the search function yields the results page by page, the session stays open until they are all extracted
+        session = self._session_factory()
+        try:
+            results = self.search_function(session=session,
+                                           published_tag=self.published_tag,
+                                           limit=self.query_limit)
+            for result in results:
+                if hasattr(self, 'model_class'):
+                    obj = self.model_class(**result)
+                    yield obj
+                else:
+                    yield result
+        except Exception as e:
+            LOGGER.exception('Exception encountered while executing the search function.')
+            raise e
+        finally:
+            session.close()
 
     def get_scope(self) -> str:
         return 'extractor.mysql_search_data'
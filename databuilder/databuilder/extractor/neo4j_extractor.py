@@ -4,7 +4,7 @@
 import importlib
 import logging
 from typing import (
-    Any, Iterator, Union,
+    Any, Iterable, Iterator, List, Optional, Union,
 )
 
 import neo4j
@@ -30,10 +30,19 @@ class Neo4jExtractor(Extractor):
     """NEO4J_ENCRYPTED is a boolean indicating whether to use SSL/TLS when connecting."""
     NEO4J_VALIDATE_SSL = 'neo4j_validate_ssl'
     """NEO4J_VALIDATE_SSL is a boolean indicating whether to validate the server's SSL/TLS cert against system CAs."""
+    NEO4J_FETCH_SIZE = 'neo4j_fetch_size'
+    """NEO4J_FETCH_SIZE is the number of records pulled from the server per round trip (0 uses the driver default)."""
+    NEO4J_TRANSACTION_TIMEOUT_SEC = 'neo4j_transaction_timeout_sec'
+    """NEO4J_TRANSACTION_TIMEOUT_SEC is the server side timeout of the read transaction (0 means no timeout)."""
+    MODEL_BATCH_SIZE_CONFIG_KEY = 'model_batch_size'
+    """MODEL_BATCH_SIZE_CONFIG_KEY is the number of records pulled before {model_class} objects are built from them."""
 
     DEFAULT_CONFIG = ConfigFactory.from_dict({NEO4J_MAX_CONN_LIFE_TIME_SEC: 50,
                                               NEO4J_ENCRYPTED: True,
-                                              NEO4J_VALIDATE_SSL: False})
+                                              NEO4J_VALIDATE_SSL: False,
+                                              NEO4J_FETCH_SIZE: 1000,
+                                              NEO4J_TRANSACTION_TIMEOUT_SEC: 0,
+                                              MODEL_BATCH_SIZE_CONFIG_KEY: 1})
 
     def init(self, conf: ConfigTree) -> None:
         """
@@ -43,9 +52,14 @@ class Neo4jExtractor(Extractor):
         self.conf = conf.with_fallback(Neo4jExtractor.DEFAULT_CONFIG)
         self.graph_url = conf.get_string(Neo4jExtractor.GRAPH_URL_CONFIG_KEY)
         self.cypher_query = conf.get_string(Neo4jExtractor.CYPHER_QUERY_CONFIG_KEY)
+        self.fetch_size = self.conf.get_int(Neo4jExtractor.NEO4J_FETCH_SIZE)
+        self.transaction_timeout_sec = self.conf.get_int(Neo4jExtractor.NEO4J_TRANSACTION_TIMEOUT_SEC)
+        self.model_batch_size = max(self.conf.get_int(Neo4jExtractor.MODEL_BATCH_SIZE_CONFIG_KEY), 1)
         self.driver = self._get_driver()
 
         self._extract_iter: Union[None, Iterator] = None
+        # records returned instead of running {cypher_query}, when set
+        self.results: Optional[Iterable[Any]] = None
 
         model_class = conf.get(Neo4jExtractor.MODEL_CLASS_CONFIG_KEY, None)
         if model_class:
@@ -84,20 +98,53 @@ class Neo4jExtractor(Extractor):
         result = tx.run(self.cypher_query)
         return result
 
+    def _get_session(self) -> Any:
+        """
+        Open a session that pulls {fetch_size} records per round trip. Drivers that predate fetch size
+        support ignore the argument and keep their default behaviour.
+        """
+        if self.fetch_size > 0:
+            return self.driver.session(access_mode=neo4j.READ_ACCESS, fetch_size=self.fetch_size)
+        return self.driver.session(access_mode=neo4j.READ_ACCESS)
+
+    def _stream_records(self) -> Iterator[Any]:
+        """
+        Execute {cypher_query} in an explicit read transaction and yield records as they are pulled
+        from the server, so the result is never fully buffered on the client side. The transaction
+        stays open until the consumer has exhausted (or closed) this iterator.
+        """
+        timeout = self.transaction_timeout_sec if self.transaction_timeout_sec > 0 else None
+        with self._get_session() as session:
+            with session.begin_transaction(timeout=timeout) as tx:
+                yield from self._execute_query(tx)
+
+    def _build_models(self, records: Iterable[Any]) -> Iterator[Any]:
+        """
+        Convert records into {model_class} objects, {model_batch_size} records at a time
+        """
+        if self.model_batch_size == 1:
+            for record in records:
+                yield self.model_class(**record)
+            return
+
+        batch: List[Any] = []
+        for record in records:
+            batch.append(record)
+            if len(batch) >= self.model_batch_size:
+                yield from [self.model_class(**record) for record in batch]
+                batch = []
+        yield from [self.model_class(**record) for record in batch]
+
     def _get_extract_iter(self) -> Iterator[Any]:
         """
         Execute {cypher_query} and yield result one at a time
         """
-        with self.driver.session() as session:
-            if not hasattr(self, 'results'):
-                self.results = session.read_transaction(self._execute_query)
+        records = self.results if self.results is not None else self._stream_records()
 
-            for result in self.results:
-                if hasattr(self, 'model_class'):
-                    obj = self.model_class(**result)
-                    yield obj
-                else:
-                    yield result
+        if hasattr(self, 'model_class'):
+            yield from self._build_models(records)
+        else:
+            yield from records
 
     def extract(self) -> Any:
         """
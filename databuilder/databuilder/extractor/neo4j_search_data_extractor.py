@@ -1,24 +1,95 @@
 # Copyright Contributors to the Amundsen project.
 # SPDX-License-Identifier: Apache-2.0
 
+import logging
+import queue
+import re
 import textwrap
-from typing import Any
+import threading
+from typing import (
+    Any, Dict, Generator, List, Optional,
+)
 
-from pyhocon import ConfigTree
+from pyhocon import ConfigFactory, ConfigTree
 
 from databuilder import Scoped
 from databuilder.extractor.base_extractor import Extractor
 from databuilder.extractor.neo4j_extractor import Neo4jExtractor
-from databuilder.publisher.neo4j_csv_publisher import JOB_PUBLISH_TAG
+from databuilder.publisher.neo4j_csv_publisher import JOB_PUBLISH_TAG, LAST_UPDATED_EPOCH_MS
+from databuilder.utils.watermark_file import (
+    get_pending_watermark_path, read_watermark, write_watermark,
+)
+
+LOGGER = logging.getLogger(__name__)
+
+_ORDER_BY_CLAUSE = re.compile(r'\n\s*order by [^\n]*\s*$', re.IGNORECASE)
+# how long partition threads wait for room in the buffer before checking whether the extraction was stopped
+_PARTITION_PUT_TIMEOUT_SEC = 0.1
+_PARTITION_THREAD_NAME = 'neo4j-search-data-partition'
+
+
+class _PartitionDone(object):
+    pass
+
+
+class _PartitionFailed(object):
+    def __init__(self, error: Exception) -> None:
+        self.error = error
+
+
+def _put_partition_item(records: queue.Queue, stopped: threading.Event, item: Any) -> bool:
+    """
+    :return: False if the extraction was stopped before there was room for the item
+    """
+    while not stopped.is_set():
+        try:
+            records.put(item, timeout=_PARTITION_PUT_TIMEOUT_SEC)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+def _extract_partition(neo4j_extractor: Neo4jExtractor, records: queue.Queue, stopped: threading.Event) -> None:
+    try:
+        record = neo4j_extractor.extract()
+        while record is not None:
+            if not _put_partition_item(records, stopped, record):
+                return
+            record = neo4j_extractor.extract()
+        _put_partition_item(records, stopped, _PartitionDone())
+    except Exception as e:
+        _put_partition_item(records, stopped, _PartitionFailed(e))
 
 
 class Neo4jSearchDataExtractor(Extractor):
     """
     Extractor to fetch data required to support search from Neo4j graph database
     Use Neo4jExtractor extractor class
+
+    With incremental_since_epoch_ms, the default queries only return the entities that were published by
+    Neo4jCsvPublisher since then, or whose relations or related nodes (descriptions, columns, ...) were. Without it,
+    the watermark is read from incremental_watermark_path. All entities are returned until there is one. The Neo4j
+    time, the clock of publisher_last_updated_epoch_ms, is stored there as pending watermark before anything is
+    extracted, and ElasticsearchPublisher commits it after publishing the extracted data.
+
+    With a partition_count, the default query is split by internal node id into partition_count queries without the
+    global sort, run concurrently on separate connections. Each query first matches the entities of its partition, so
+    only those are expanded into search documents. Records of all the partitions are extracted as they come.
     """
     CYPHER_QUERY_CONFIG_KEY = 'cypher_query'
     ENTITY_TYPE = 'entity_type'
+    # watermark of the incremental mode, usually the start time of the previous extraction
+    INCREMENTAL_SINCE_EPOCH_MS = 'incremental_since_epoch_ms'
+    # file the watermark is read from when incremental_since_epoch_ms is not set, and the next one is stored in
+    INCREMENTAL_WATERMARK_PATH = 'incremental_watermark_path'
+    PARTITION_COUNT = 'partition_count'
+    # number of records extracted by the partitions, waiting to be consumed
+    PARTITION_BUFFER_SIZE = 'partition_buffer_size'
+
+    DEFAULT_PARTITION_BUFFER_SIZE = 1000
+
+    SERVER_EPOCH_MS_CYPHER_QUERY = 'RETURN timestamp() AS epoch_ms'
 
     DEFAULT_NEO4J_TABLE_CYPHER_QUERY = textwrap.dedent(
         """
@@ -64,11 +135,11 @@ class Neo4jSearchDataExtractor(Extractor):
     DEFAULT_NEO4J_USER_CYPHER_QUERY = textwrap.dedent(
         """
         MATCH (user:User)
+        {publish_tag_filter}
         OPTIONAL MATCH (user)-[read:READ]->(a)
         OPTIONAL MATCH (user)-[own:OWNER_OF]->(b)
         OPTIONAL MATCH (user)-[follow:FOLLOWED_BY]->(c)
         OPTIONAL MATCH (user)-[manage_by:MANAGE_BY]->(manager)
-        {publish_tag_filter}
         with user, a, b, c, read, own, follow, manager
         where user.full_name is not null
         return user.email as email, user.first_name as first_name, user.last_name as last_name,
@@ -148,55 +219,194 @@ class Neo4jSearchDataExtractor(Extractor):
         'feature': DEFAULT_NEO4J_FEATURE_CYPHER_QUERY,
     }
 
+    LABEL_BY_ENTITY = {
+        'table': 'Table',
+        'user': 'User',
+        'dashboard': 'Dashboard',
+        'feature': 'Feature',
+    }
+
+    # Paths to the nodes, other than the entity itself, whose updates change the search document of the entity.
+    # Updates of the relations of the entity, e.g. tags, badges or usage, are always taken into account.
+    INCREMENTAL_RELATED_NODES_BY_ENTITY: Dict[str, List[str]] = {
+        'table': [
+            '(table)-[:DESCRIPTION|LAST_UPDATED_AT|COLUMN]->(n)',
+            '(table)-[:COLUMN]->(:Column)-[:DESCRIPTION]->(n)',
+            '(table)-[:TABLE_OF]->(:Schema)-[:DESCRIPTION]->(n)',
+        ],
+        'user': [],
+        'dashboard': [
+            '(dashboard)-[:DESCRIPTION|EXECUTED|HAS_QUERY|DASHBOARD_OF]->(n)',
+            '(dashboard)-[:HAS_QUERY]->(:Query)-[:HAS_CHART]->(n)',
+            '(dashboard)-[:DASHBOARD_OF]->(:Dashboardgroup)-[:DESCRIPTION]->(n)',
+        ],
+        'feature': [
+            '(feature)-[:DESCRIPTION]->(n)',
+        ],
+    }
+
     def init(self, conf: ConfigTree) -> None:
         """
         Initialize Neo4jExtractor object from configuration and use that for extraction
         """
         self.conf = conf
         self.entity = conf.get_string(Neo4jSearchDataExtractor.ENTITY_TYPE, default='table').lower()
+        partition_count = conf.get_int(Neo4jSearchDataExtractor.PARTITION_COUNT, 1)
+        watermark_path = conf.get_string(Neo4jSearchDataExtractor.INCREMENTAL_WATERMARK_PATH, None)
+        if watermark_path:
+            # taken before any query is run, so the changes made while extracting are extracted again next time
+            write_watermark(get_pending_watermark_path(watermark_path), self._get_server_epoch_ms())
+        self.partition_queries: List[str] = []
         # extract cypher query from conf, if specified, else use default query
         if Neo4jSearchDataExtractor.CYPHER_QUERY_CONFIG_KEY in conf:
             self.cypher_query = conf.get_string(Neo4jSearchDataExtractor.CYPHER_QUERY_CONFIG_KEY)
+            if partition_count > 1:
+                LOGGER.warning('Partitioning is only supported with the default queries, running the cypher query '
+                               'as is')
         else:
             default_query = Neo4jSearchDataExtractor.DEFAULT_QUERY_BY_ENTITY[self.entity]
-            self.cypher_query = self._add_publish_tag_filter(conf.get_string(JOB_PUBLISH_TAG, ''),
-                                                             cypher_query=default_query)
+            publish_tag = conf.get_string(JOB_PUBLISH_TAG, '')
+            since_epoch_ms = conf.get_int(Neo4jSearchDataExtractor.INCREMENTAL_SINCE_EPOCH_MS, None)
+            if since_epoch_ms is None and watermark_path:
+                since_epoch_ms = read_watermark(watermark_path)
+            self.cypher_query = self._add_publish_tag_filter(publish_tag,
+                                                             cypher_query=default_query,
+                                                             since_epoch_ms=since_epoch_ms)
+            if partition_count > 1:
+                unsorted_query = self._add_publish_tag_filter(publish_tag,
+                                                              cypher_query=_ORDER_BY_CLAUSE.sub('\n', default_query),
+                                                              since_epoch_ms=since_epoch_ms)
+                self.partition_queries = [self._add_partition_match(unsorted_query, index, partition_count)
+                                          for index in range(partition_count)]
+
+        if self.partition_queries:
+            self.partition_extractors = [self._init_neo4j_extractor(query) for query in self.partition_queries]
+            self.partition_buffer_size = conf.get_int(Neo4jSearchDataExtractor.PARTITION_BUFFER_SIZE,
+                                                      Neo4jSearchDataExtractor.DEFAULT_PARTITION_BUFFER_SIZE)
+            self._extract_iter: Optional[Generator[Any, None, None]] = None
+        else:
+            self.neo4j_extractor = self._init_neo4j_extractor(self.cypher_query)
+
+    def _get_server_epoch_ms(self) -> int:
+        neo4j_extractor = self._init_neo4j_extractor(Neo4jSearchDataExtractor.SERVER_EPOCH_MS_CYPHER_QUERY)
+        try:
+            return neo4j_extractor.extract()['epoch_ms']
+        finally:
+            neo4j_extractor.close()
 
-        self.neo4j_extractor = Neo4jExtractor()
+    def _init_neo4j_extractor(self, cypher_query: str) -> Neo4jExtractor:
+        neo4j_extractor = Neo4jExtractor()
         # write the cypher query in configs in Neo4jExtractor scope
-        key = self.neo4j_extractor.get_scope() + '.' + Neo4jExtractor.CYPHER_QUERY_CONFIG_KEY
-        self.conf.put(key, self.cypher_query)
+        key = neo4j_extractor.get_scope() + '.' + Neo4jExtractor.CYPHER_QUERY_CONFIG_KEY
+        conf = ConfigFactory.from_dict({key: cypher_query}).with_fallback(self.conf)
         # initialize neo4j_extractor from configs
-        self.neo4j_extractor.init(Scoped.get_scoped_conf(self.conf, self.neo4j_extractor.get_scope()))
+        neo4j_extractor.init(Scoped.get_scoped_conf(conf, neo4j_extractor.get_scope()))
+        return neo4j_extractor
 
     def close(self) -> None:
         """
         Use close() method specified by neo4j_extractor
         to close connection to neo4j cluster
         """
-        self.neo4j_extractor.close()
+        if self.partition_queries:
+            # stops and joins the partition threads, before closing the connections they use
+            if self._extract_iter:
+                self._extract_iter.close()
+            for neo4j_extractor in self.partition_extractors:
+                neo4j_extractor.close()
+        else:
+            self.neo4j_extractor.close()
 
     def extract(self) -> Any:
         """
         Invoke extract() method defined by neo4j_extractor
         """
-        return self.neo4j_extractor.extract()
+        if not self.partition_queries:
+            return self.neo4j_extractor.extract()
+
+        if not self._extract_iter:
+            self._extract_iter = self._get_partitioned_extract_iter()
+
+        try:
+            return next(self._extract_iter)
+        except StopIteration:
+            return None
+
+    def _get_partitioned_extract_iter(self) -> Generator[Any, None, None]:
+        """
+        Runs every partition on its own thread and yields their records as they are extracted. The threads are
+        stopped and joined when the iterator is closed, fails or is exhausted.
+        """
+        records: queue.Queue = queue.Queue(maxsize=self.partition_buffer_size)
+        stopped = threading.Event()
+        threads = [threading.Thread(target=_extract_partition, args=(neo4j_extractor, records, stopped),
+                                    name=f'{_PARTITION_THREAD_NAME}-{index}', daemon=True)
+                   for index, neo4j_extractor in enumerate(self.partition_extractors)]
+        for thread in threads:
+            thread.start()
+
+        try:
+            remaining_partitions = len(threads)
+            while remaining_partitions:
+                record = records.get()
+                if isinstance(record, _PartitionDone):
+                    remaining_partitions -= 1
+                elif isinstance(record, _PartitionFailed):
+                    raise record.error
+                else:
+                    yield record
+        finally:
+            stopped.set()
+            for thread in threads:
+                thread.join()
 
     def get_scope(self) -> str:
         return 'extractor.search_data'
 
-    def _add_publish_tag_filter(self, publish_tag: str, cypher_query: str) -> str:
+    def _add_publish_tag_filter(self, publish_tag: str, cypher_query: str,
+                                since_epoch_ms: Optional[int] = None) -> str:
         """
         Adds publish tag filter into Cypher query
         :param publish_tag: value of publish tag.
         :param cypher_query:
+        :param since_epoch_ms: if set, only entities that changed since then are queried
         :return:
         """
+        if not hasattr(self, 'entity'):
+            self.entity = 'table'
 
-        if not publish_tag:
-            publish_tag_filter = ''
-        else:
-            if not hasattr(self, 'entity'):
-                self.entity = 'table'
-            publish_tag_filter = f"WHERE {self.entity}.published_tag = '{publish_tag}'"
+        conditions = []
+        if publish_tag:
+            conditions.append(f"{self.entity}.published_tag = '{publish_tag}'")
+        if since_epoch_ms is not None:
+            conditions.append(self._get_changed_since_condition(since_epoch_ms))
+        publish_tag_filter = f"WHERE {' AND '.join(conditions)}" if conditions else ''
         return cypher_query.format(publish_tag_filter=publish_tag_filter)
+
+    def _add_partition_match(self, cypher_query: str, partition_index: int, partition_count: int) -> str:
+        """
+        Prepends the match of the entities of the partition to the Cypher query. Only their ids are read from the
+        label scan, and the patterns of the query are then only expanded from the entities already bound.
+        """
+        entity = self.entity
+        label = Neo4jSearchDataExtractor.LABEL_BY_ENTITY[entity]
+        partition_match = textwrap.dedent(f"""
+            MATCH ({entity}:{label}) WHERE id({entity}) % {partition_count} = {partition_index}
+            WITH {entity}""")
+        return partition_match + cypher_query
+
+    def _get_changed_since_condition(self, since_epoch_ms: int) -> str:
+        """
+        Builds the condition matching the entities that changed since since_epoch_ms, according to the
+        publisher_last_updated_epoch_ms of the entity, its relations and related nodes
+        """
+        entity = self.entity
+        changed_conditions = [
+            f'{entity}.{LAST_UPDATED_EPOCH_MS} >= {since_epoch_ms}',
+            f'ANY(updated IN [({entity})-[r]-() | r] WHERE updated.{LAST_UPDATED_EPOCH_MS} >= {since_epoch_ms})',
+        ]
+        for related_nodes in Neo4jSearchDataExtractor.INCREMENTAL_RELATED_NODES_BY_ENTITY.get(entity, []):
+            changed_conditions.append(
+                f'ANY(updated IN [{related_nodes} | n] WHERE updated.{LAST_UPDATED_EPOCH_MS} >= {since_epoch_ms})')
+
+        return f"({' OR '.join(changed_conditions)})"
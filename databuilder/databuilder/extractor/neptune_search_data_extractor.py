@@ -2,11 +2,14 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import importlib
+import logging
 from typing import (
-    Any, Dict, List, Optional,
+    Any, Callable, Dict, Iterator, List, Optional,
 )
 
-from gremlin_python.process.graph_traversal import GraphTraversalSource, __
+from gremlin_python.process.graph_traversal import (
+    GraphTraversal, GraphTraversalSource, __,
+)
 from gremlin_python.process.traversal import (
     Order, T, TextP,
 )
@@ -28,12 +31,25 @@ from databuilder.models.usage.usage_constants import (
 )
 from databuilder.models.user import User
 from databuilder.serializers.neptune_serializer import METADATA_KEY_PROPERTY_NAME
+from databuilder.utils.concurrency import map_concurrently
+
+LOGGER = logging.getLogger(__name__)
 
 
-def _table_search_query(graph: GraphTraversalSource, tag_filter: str) -> List[Dict]:
-    traversal = graph.V().hasLabel(TableMetadata.TABLE_NODE_LABEL)
+def _table_search_vertices(graph: GraphTraversalSource, tag_filter: str,
+                           ids: Optional[List[str]] = None) -> GraphTraversal:
+    traversal = graph.V(*ids) if ids else graph.V()
+    traversal = traversal.hasLabel(TableMetadata.TABLE_NODE_LABEL)
     if tag_filter:
         traversal = traversal.has('published_tag', tag_filter)
+    return traversal
+
+
+def _table_search_query(graph: GraphTraversalSource, tag_filter: str, ids: Optional[List[str]] = None) -> List[Dict]:
+    """
+    Queries the tables, sorted by name. When ids are given, only these tables are queried and results are not sorted.
+    """
+    traversal = _table_search_vertices(graph, tag_filter, ids)
     traversal = traversal.project(
         'database',
         'cluster',
@@ -95,15 +111,26 @@ def _table_search_query(graph: GraphTraversalSource, tag_filter: str) -> List[Di
     traversal = traversal.by(
         __.out(DescriptionMetadata.PROGRAMMATIC_DESCRIPTION_NODE_LABEL).values('description').fold()
     )  # programmatic_descriptions
-    traversal = traversal.order().by(__.select('name'), Order.asc)
+    if ids is None:
+        traversal = traversal.order().by(__.select('name'), Order.asc)
     return traversal.toList()
 
 
-def _user_search_query(graph: GraphTraversalSource, tag_filter: str) -> List[Dict]:
-    traversal = graph.V().hasLabel(User.USER_NODE_LABEL)
+def _user_search_vertices(graph: GraphTraversalSource, tag_filter: str,
+                          ids: Optional[List[str]] = None) -> GraphTraversal:
+    traversal = graph.V(*ids) if ids else graph.V()
+    traversal = traversal.hasLabel(User.USER_NODE_LABEL)
     traversal = traversal.has(User.USER_NODE_FULL_NAME)
     if tag_filter:
         traversal = traversal.where('published_tag', tag_filter)
+    return traversal
+
+
+def _user_search_query(graph: GraphTraversalSource, tag_filter: str, ids: Optional[List[str]] = None) -> List[Dict]:
+    """
+    Queries the users, sorted by email. When ids are given, only these users are queried and results are not sorted.
+    """
+    traversal = _user_search_vertices(graph, tag_filter, ids)
     traversal = traversal.project(
         'email',
         'first_name',
@@ -140,15 +167,28 @@ def _user_search_query(graph: GraphTraversalSource, tag_filter: str) -> List[Dic
     ).sum())  # total_read
     traversal = traversal.by(__.outE(OWNER_OF_OBJECT_RELATION_TYPE).fold().count())  # total_own
     traversal = traversal.by(__.outE('FOLLOWED_BY').fold().count())  # total_follow
-    traversal = traversal.order().by(__.select('email'), Order.asc)
+    if ids is None:
+        traversal = traversal.order().by(__.select('email'), Order.asc)
     return traversal.toList()
 
 
-def _dashboard_search_query(graph: GraphTraversalSource, tag_filter: str) -> List[Dict]:
-    traversal = graph.V().hasLabel(DashboardMetadata.DASHBOARD_NODE_LABEL)
+def _dashboard_search_vertices(graph: GraphTraversalSource, tag_filter: str,
+                               ids: Optional[List[str]] = None) -> GraphTraversal:
+    traversal = graph.V(*ids) if ids else graph.V()
+    traversal = traversal.hasLabel(DashboardMetadata.DASHBOARD_NODE_LABEL)
     traversal = traversal.has('name')
     if tag_filter:
         traversal = traversal.where('published_tag', tag_filter)
+    return traversal
+
+
+def _dashboard_search_query(graph: GraphTraversalSource, tag_filter: str,
+                            ids: Optional[List[str]] = None) -> List[Dict]:
+    """
+    Queries the dashboards, sorted by name. When ids are given, only these dashboards are queried and results are
+    not sorted.
+    """
+    traversal = _dashboard_search_vertices(graph, tag_filter, ids)
 
     traversal = traversal.project(
         'group_name',
@@ -218,7 +258,8 @@ def _dashboard_search_query(graph: GraphTraversalSource, tag_filter: str) -> Lis
         __.out('HAS_BADGE').values('keys').dedup().fold()
     )  # badges
 
-    traversal = traversal.order().by(__.select('name'), Order.asc)
+    if ids is None:
+        traversal = traversal.order().by(__.select('name'), Order.asc)
 
     dashboards = traversal.toList()
     for dashboard in dashboards:
@@ -230,12 +271,22 @@ def _dashboard_search_query(graph: GraphTraversalSource, tag_filter: str) -> Lis
 class NeptuneSearchDataExtractor(Extractor):
     """
     Extractor to fetch data required to support search from Neptune's graph database
+
+    By default, all the entities are queried at once and sorted. With a page_size, the ids of the entities are
+    queried first, then the entities are queried in pages of page_size ids, page_concurrency pages at a time, and
+    extracted as pages complete, without sorting. Pages can be spread over the replicas by using the reader endpoint
+    of the cluster as neptune host name. A custom query function used with a page_size is called with the ids of
+    the page as ids keyword argument.
     """
     QUERY_FUNCTION_CONFIG_KEY = 'query_function'
     QUERY_FUNCTION_KWARGS_CONFIG_KEY = 'query_function_kwargs'
     ENTITY_TYPE_CONFIG_KEY = 'entity_type'
     JOB_PUBLISH_TAG_CONFIG_KEY = 'job_publish_tag'
     MODEL_CLASS_CONFIG_KEY = 'model_class'
+    PAGE_SIZE_CONFIG_KEY = 'page_size'
+    PAGE_CONCURRENCY_CONFIG_KEY = 'page_concurrency'
+
+    DEFAULT_PAGE_CONCURRENCY = 4
 
     DEFAULT_QUERY_BY_ENTITY = {
         'table': _table_search_query,
@@ -243,6 +294,12 @@ class NeptuneSearchDataExtractor(Extractor):
         'dashboard': _dashboard_search_query
     }
 
+    DEFAULT_VERTICES_BY_ENTITY: Dict[str, Callable[..., GraphTraversal]] = {
+        'table': _table_search_vertices,
+        'user': _user_search_vertices,
+        'dashboard': _dashboard_search_vertices
+    }
+
     def init(self, conf: ConfigTree) -> None:
         self.conf = conf
         self.entity = conf.get_string(NeptuneSearchDataExtractor.ENTITY_TYPE_CONFIG_KEY, default='table').lower()
@@ -253,6 +310,9 @@ class NeptuneSearchDataExtractor(Extractor):
             self.query_function = NeptuneSearchDataExtractor.DEFAULT_QUERY_BY_ENTITY[self.entity]
 
         self.job_publish_tag = conf.get_string(NeptuneSearchDataExtractor.JOB_PUBLISH_TAG_CONFIG_KEY, '')
+        self.page_size = conf.get_int(NeptuneSearchDataExtractor.PAGE_SIZE_CONFIG_KEY, 0)
+        self.page_concurrency = conf.get_int(NeptuneSearchDataExtractor.PAGE_CONCURRENCY_CONFIG_KEY,
+                                             NeptuneSearchDataExtractor.DEFAULT_PAGE_CONCURRENCY)
         self.neptune_client = NeptuneSessionClient()
 
         neptune_client_conf = Scoped.get_scoped_conf(conf, self.neptune_client.get_scope())
@@ -279,15 +339,47 @@ class NeptuneSearchDataExtractor(Extractor):
             return None
 
     def _get_extract_iter(self) -> Any:
-        if not hasattr(self, 'results'):
-            self.results = self.query_function(self.neptune_client.get_graph(), tag_filter=self.job_publish_tag)
+        if self.page_size:
+            results = self._get_paged_results()
+        else:
+            results = self.query_function(self.neptune_client.get_graph(), tag_filter=self.job_publish_tag)
 
-        for result in self.results:
+        for result in results:
             if hasattr(self, 'model_class'):
                 obj = self.model_class(**result)
                 yield obj
             else:
                 yield result
 
+    def _get_paged_results(self) -> Iterator[Dict]:
+        """
+        Queries the documents of {page_size} vertices at a time, {page_concurrency} pages concurrently. The ids of
+        the next pages are only fetched when there is room for more pages in flight.
+        """
+        graph = self.neptune_client.get_graph()
+
+        def _query_page(page_ids: List[str]) -> List[Dict]:
+            return self.query_function(graph, tag_filter=self.job_publish_tag, ids=page_ids)
+
+        for page_results in map_concurrently(_query_page, self._get_page_ids(graph),
+                                             max_workers=self.page_concurrency, preserve_order=False):
+            yield from page_results
+
+    def _get_page_ids(self, graph: GraphTraversalSource) -> Iterator[List[str]]:
+        """
+        Pages through the ids of the vertices of the entity in id order, one window of {page_size} ids per request
+        """
+        vertices_function = NeptuneSearchDataExtractor.DEFAULT_VERTICES_BY_ENTITY[self.entity]
+        offset = 0
+        while True:
+            ids = vertices_function(graph, self.job_publish_tag).id().order() \
+                .range(offset, offset + self.page_size).toList()
+            if ids:
+                yield ids
+            if len(ids) < self.page_size:
+                LOGGER.info(f'Queried {offset + len(ids)} {self.entity} vertices')
+                return
+            offset += self.page_size
+
     def get_scope(self) -> str:
         return 'extractor.neptune_search_data'
@@ -1,13 +1,13 @@
 import json
 from typing import (
-    Any, Dict, Tuple,
+    Any, Dict, List, Tuple,
 )
 
 import dateutil.parser
 from pyhocon import ConfigFactory, ConfigTree
 
 from databuilder.extractor.base_extractor import Extractor
-from databuilder.models.table_stats import TableColumnStats
+from databuilder.models.table_stats import TableColumnStats, TableColumnStatsBatch
 
 
 class PandasProfilingColumnStatsExtractor(Extractor):
@@ -100,7 +100,11 @@ class PandasProfilingColumnStatsExtractor(Extractor):
 
     PRECISION = 'precision'
 
-    DEFAULT_CONFIG = ConfigFactory.from_dict({STAT_MAPPINGS: DEFAULT_STAT_MAPPINGS, PRECISION: 3})
+    # If True, all stats of the report are extracted as a single TableColumnStatsBatch record instead of one
+    # TableColumnStats record per (column, stat) pair
+    BATCH_STATS = 'batch_stats'
+
+    DEFAULT_CONFIG = ConfigFactory.from_dict({STAT_MAPPINGS: DEFAULT_STAT_MAPPINGS, PRECISION: 3, BATCH_STATS: False})
 
     def get_scope(self) -> str:
         return 'extractor.pandas_profiling'
@@ -124,21 +128,50 @@ class PandasProfilingColumnStatsExtractor(Extractor):
         variables = report.get('variables', dict())
         report_time = self.parse_date(report.get('analysis', dict()).get('date_start'))
 
+        col_names, stat_names, stat_vals = self._get_stats(variables)
+
+        if self.conf.get_bool(PandasProfilingColumnStatsExtractor.BATCH_STATS):
+            if stat_vals:
+                yield TableColumnStatsBatch(table_name=self.table_name, col_names=col_names, stat_names=stat_names,
+                                            stat_vals=stat_vals, start_epoch=report_time, end_epoch='0',
+                                            db=self.database_name, cluster=self.cluster_name,
+                                            schema=self.schema_name)
+            return
+
+        table_name, database_name, cluster_name, schema_name = \
+            self.table_name, self.database_name, self.cluster_name, self.schema_name
+        for column_name, stat_name, stat_value in zip(col_names, stat_names, stat_vals):
+            yield TableColumnStats(table_name=table_name, col_name=column_name, stat_name=stat_name,
+                                   stat_val=stat_value, start_epoch=report_time, end_epoch='0',
+                                   db=database_name, cluster=cluster_name, schema=schema_name)
+
+    def _get_stats(self, variables: Dict[str, Dict[str, Any]]) -> Tuple[List[str], List[str], List[Any]]:
+        """
+        Converts the stats of every column into three parallel lists: column names, stat names and stat values
+        """
+        # Resolved once, as reading them from the config for every stat dominates the runtime of large reports
+        stat_mappings = self.stat_mappings
+        precision = self.conf.get(PandasProfilingColumnStatsExtractor.PRECISION)
+
+        col_names: List[str] = []
+        stat_names: List[str] = []
+        stat_vals: List[Any] = []
         for column_name, column_stats in variables.items():
             for _stat_name, stat_value in column_stats.items():
-                stat_spec = self.stat_mappings.get(_stat_name)
+                stat_spec = stat_mappings.get(_stat_name)
+                if not stat_spec:
+                    continue
 
-                if stat_spec:
-                    stat_name, stat_modifier = stat_spec
+                stat_name, stat_modifier = stat_spec
 
-                    if isinstance(stat_value, float):
-                        stat_value = self.round_value(stat_value)
+                if isinstance(stat_value, float):
+                    stat_value = round(stat_value, precision)
 
-                    stat = TableColumnStats(table_name=self.table_name, col_name=column_name, stat_name=stat_name,
-                                            stat_val=stat_modifier(stat_value), start_epoch=report_time, end_epoch='0',
-                                            db=self.database_name, cluster=self.cluster_name, schema=self.schema_name)
+                col_names.append(column_name)
+                stat_names.append(stat_name)
+                stat_vals.append(stat_modifier(stat_value))
 
-                    yield stat
+        return col_names, stat_names, stat_vals
 
     def _load_report(self) -> Dict[str, Any]:
         path = self.conf.get(PandasProfilingColumnStatsExtractor.FILE_PATH)
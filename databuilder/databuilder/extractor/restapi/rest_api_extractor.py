@@ -11,6 +11,8 @@ from pyhocon import ConfigTree
 
 from databuilder.extractor.base_extractor import Extractor
 from databuilder.rest_api.base_rest_api_query import BaseRestApiQuery
+from databuilder.rest_api.response_cache import create_response_cache
+from databuilder.rest_api.rest_api_query import HostRateLimiter, RestApiQuery
 
 REST_API_QUERY = 'restapi_query'
 MODEL_CLASS = 'model_class'
@@ -20,6 +22,12 @@ MODEL_CLASS = 'model_class'
 #  it. and you can add {'product': 'mode'} so that it will be included in the record.
 STATIC_RECORD_DICT = 'static_record_dict'
 
+# Number of records of each query whose requests are sent concurrently, and the requests Session used to send them
+MAX_WORKERS = 'max_workers'
+SESSION = 'session'
+# Max number of requests per second sent to the same host by all the queries
+MAX_REQUESTS_PER_SEC = 'max_requests_per_sec'
+
 LOGGER = logging.getLogger(__name__)
 
 
@@ -27,11 +35,18 @@ class RestAPIExtractor(Extractor):
     """
     An Extractor that calls one or more REST API to extract the data.
     This extractor almost entirely depends on RestApiQuery.
+
+    When response_cache_dir is configured, responses of the RestApiQuery and of every query it joins are cached on
+    disk there, see ResponseCache. Likewise max_workers, session and max_requests_per_sec apply to every query it
+    joins, and all of them share one rate limit per host. Settings of the queries themselves are kept when these are
+    not configured.
     """
 
     def init(self, conf: ConfigTree) -> None:
 
         self._restapi_query: BaseRestApiQuery = conf.get(REST_API_QUERY)
+        if isinstance(self._restapi_query, RestApiQuery):
+            self._configure_restapi_query(self._restapi_query, conf)
         self._iterator: Optional[Iterator[Dict[str, Any]]] = None
         self._static_dict = conf.get(STATIC_RECORD_DICT, dict())
         LOGGER.info('static record: %s', self._static_dict)
@@ -42,6 +57,21 @@ class RestAPIExtractor(Extractor):
             mod = importlib.import_module(module_name)
             self.model_class = getattr(mod, class_name)
 
+    @staticmethod
+    def _configure_restapi_query(restapi_query: RestApiQuery, conf: ConfigTree) -> None:
+        response_cache = create_response_cache(conf)
+        if response_cache:
+            restapi_query.set_response_cache(response_cache)
+
+        max_workers = conf.get_int(MAX_WORKERS, 1)
+        session = conf.get(SESSION, None)
+        if max_workers > 1 or session:
+            restapi_query.set_max_workers(max_workers, session=session)
+
+        max_requests_per_sec = conf.get_float(MAX_REQUESTS_PER_SEC, 0)
+        if max_requests_per_sec:
+            restapi_query.set_rate_limiter(HostRateLimiter(max_requests_per_sec))
+
     def extract(self) -> Any:
         """
         Fetch one result row from RestApiQuery, convert to {model_class} if specified before
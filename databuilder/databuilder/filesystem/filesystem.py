@@ -2,7 +2,10 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import logging
-from typing import List
+import re
+from typing import (
+    Any, Dict, Iterable, List, Optional,
+)
 
 from pyhocon import ConfigFactory, ConfigTree
 from retrying import retry
@@ -106,5 +109,45 @@ class FileSystem(Scoped):
                           size=metadata_dict[self._metadata_key_mapping[FileSystem.SIZE]])
         return fm
 
+    @retry(retry_on_exception=is_retriable_error, stop_max_attempt_number=3, wait_exponential_multiplier=1000,
+           wait_exponential_max=5000)
+    def ls_files(self, path: str) -> List[FileMetadata]:
+        """
+        Metadata of the files (not directories) directly under the path, fetched with a single detailed listing
+        instead of is_file and info calls per entry. Requires a file system that supports ls(path, detail=True),
+        e.g. any fsspec implementation.
+        :return:
+        """
+        return self._to_file_metadata(self._dask_fs.ls(path, detail=True))
+
+    @retry(retry_on_exception=is_retriable_error, stop_max_attempt_number=3, wait_exponential_multiplier=1000,
+           wait_exponential_max=5000)
+    def find_files(self, path: str, maxdepth: Optional[int] = None) -> List[FileMetadata]:
+        """
+        Metadata of all files under the path, down to {maxdepth} levels or at any depth. Without maxdepth, on object
+        stores such as S3 this is a flat listing of the prefix, which is a lot fewer requests than listing every
+        sub-directory, but it lists everything under the prefix.
+        :return:
+        """
+        entries = self._dask_fs.find(path, maxdepth=maxdepth, detail=True)
+        return self._to_file_metadata(entries.values() if isinstance(entries, dict) else entries)
+
+    def strip_protocol(self, path: str) -> str:
+        """
+        The path the way the file system names its entries, e.g. s3://bucket/key becomes bucket/key with s3fs
+        """
+        strip_fn = getattr(self._dask_fs, '_strip_protocol', None)
+        if strip_fn:
+            path = strip_fn(path)
+        else:
+            path = re.sub(r'^[a-zA-Z0-9]+://', '', path)
+        return path.rstrip('/')
+
+    def _to_file_metadata(self, entries: Iterable[Dict[str, Any]]) -> List[FileMetadata]:
+        return [FileMetadata(path=entry['name'],
+                             last_updated=entry[self._metadata_key_mapping[FileSystem.LAST_UPDATED]],
+                             size=entry[self._metadata_key_mapping[FileSystem.SIZE]])
+                for entry in entries if entry.get('type') == 'file']
+
     def get_scope(self) -> str:
         return 'filesystem'
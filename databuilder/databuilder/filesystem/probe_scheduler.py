@@ -0,0 +1,112 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import (
+    Iterator, Optional, Tuple,
+)
+
+LOGGER = logging.getLogger(__name__)
+# Error codes, e.g. of botocore ClientError, and exception class names that storage backends use for throttling
+THROTTLING_ERROR_CODES = {'SlowDown', 'Throttling', 'ThrottlingException', 'ThrottledException', 'TooManyRequests',
+                          'TooManyRequestsException', 'RequestLimitExceeded', 'RequestThrottled',
+                          'RequestThrottledException', 'ProvisionedThroughputExceededException'}
+THROTTLING_STATUS_CODES = {429, 503}
+
+
+def _get_status_and_error_code(e: BaseException) -> Tuple[Optional[int], Optional[str]]:
+    response = getattr(e, 'response', None)
+    if isinstance(response, dict):
+        # botocore ClientError
+        return (response.get('ResponseMetadata', {}).get('HTTPStatusCode'),
+                response.get('Error', {}).get('Code'))
+    if response is not None and isinstance(getattr(response, 'status_code', None), int):
+        # requests HTTPError
+        return response.status_code, None
+    for attribute in ('status_code', 'status', 'code'):
+        status = getattr(e, attribute, None)
+        if isinstance(status, int):
+            return status, None
+    return None, None
+
+
+def is_throttling_error(e: BaseException) -> bool:
+    """
+    An method that determines if the error is the storage backend throttling requests, e.g. S3 SlowDown, by its
+    HTTP status code, error code or exception type. File systems often wrap the client error, e.g. s3fs raises
+    an OSError from the botocore ClientError, so the causes of the error are checked as well.
+    :param e:
+    :return:
+    """
+    error: Optional[BaseException] = e
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        status_code, error_code = _get_status_and_error_code(error)
+        if status_code in THROTTLING_STATUS_CODES or error_code in THROTTLING_ERROR_CODES \
+                or error.__class__.__name__ in THROTTLING_ERROR_CODES:
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+class AdaptiveConcurrencyLimiter(object):
+    """
+    Limits the number of concurrent requests to a storage backend and adapts the limit to it (AIMD):
+    the limit grows by one after {increase_every} requests in a row that finish within {target_latency_sec},
+    and it is halved, down to {min_concurrency}, when a request is slower than that or is throttled.
+    """
+
+    def __init__(self,
+                 min_concurrency: int,
+                 max_concurrency: int,
+                 target_latency_sec: float,
+                 increase_every: int = 10) -> None:
+        self._min_concurrency = max(min_concurrency, 1)
+        self._max_concurrency = max(max_concurrency, self._min_concurrency)
+        self._target_latency_sec = target_latency_sec
+        self._increase_every = increase_every
+        self.limit = self._min_concurrency
+        self._in_flight = 0
+        self._fast_in_a_row = 0
+        self._condition = threading.Condition()
+
+    @contextmanager
+    def acquire(self) -> Iterator[None]:
+        """
+        Waits for a free slot, and records the latency and outcome of the request made within the block
+        """
+        with self._condition:
+            while self._in_flight >= self.limit:
+                self._condition.wait()
+            self._in_flight += 1
+
+        start = time.monotonic()
+        throttled = False
+        try:
+            yield
+        except Exception as e:
+            throttled = is_throttling_error(e)
+            raise
+        finally:
+            self._release(time.monotonic() - start, throttled)
+
+    def _release(self, latency_sec: float, throttled: bool) -> None:
+        with self._condition:
+            self._in_flight -= 1
+            if throttled or latency_sec > self._target_latency_sec:
+                self._fast_in_a_row = 0
+                limit = max(self.limit // 2, self._min_concurrency)
+                if limit < self.limit:
+                    LOGGER.info('Decreasing storage concurrency to %i (latency: %.2f sec, throttled: %s)',
+                                limit, latency_sec, throttled)
+                    self.limit = limit
+            else:
+                self._fast_in_a_row += 1
+                if self._fast_in_a_row >= self._increase_every and self.limit < self._max_concurrency:
+                    self._fast_in_a_row = 0
+                    self.limit += 1
+            self._condition.notify_all()
@@ -1,11 +1,9 @@
 # Copyright Contributors to the Amundsen project.
 # SPDX-License-Identifier: Apache-2.0
 
-import csv
 import logging
 import os
 import shutil
-from csv import DictWriter
 from typing import (
     Any, Dict, FrozenSet,
 )
@@ -16,6 +14,7 @@ from databuilder.job.base_job import Job
 from databuilder.loader.base_loader import Loader
 from databuilder.models.table_serializable import TableSerializable
 from databuilder.serializers import mysql_serializer
+from databuilder.utils import record_file
 from databuilder.utils.closer import Closer
 
 LOGGER = logging.getLogger(__name__)
@@ -30,14 +29,17 @@ class FSMySQLCSVLoader(Loader):
     RECORD_DIR_PATH = 'record_dir_path'
     FORCE_CREATE_DIR = 'force_create_directory'
     SHOULD_DELETE_CREATED_DIR = 'delete_created_directories'
+    # Intermediate file format, csv or jsonl (typed, gzip compressed JSON lines). See databuilder.utils.record_file
+    FILE_FORMAT = 'file_format'
 
     _DEFAULT_CONFIG = ConfigFactory.from_dict({
         SHOULD_DELETE_CREATED_DIR: True,
-        FORCE_CREATE_DIR: False
+        FORCE_CREATE_DIR: False,
+        FILE_FORMAT: record_file.CSV_FORMAT
     })
 
     def __init__(self) -> None:
-        self._record_file_mapping: Dict[Any, DictWriter] = {}
+        self._record_file_mapping: Dict[Any, Any] = {}
         self._keys: Dict[FrozenSet[str], int] = {}
         self._closer = Closer()
 
@@ -53,6 +55,9 @@ class FSMySQLCSVLoader(Loader):
         self._record_dir = conf.get_string(FSMySQLCSVLoader.RECORD_DIR_PATH)
         self._delete_created_dir = conf.get_bool(FSMySQLCSVLoader.SHOULD_DELETE_CREATED_DIR)
         self._force_create_dir = conf.get_bool(FSMySQLCSVLoader.FORCE_CREATE_DIR)
+        self._file_format = conf.get_string(FSMySQLCSVLoader.FILE_FORMAT)
+        if self._file_format not in record_file.FILE_EXTENSIONS:
+            raise Exception(f'{FSMySQLCSVLoader.FILE_FORMAT} should be one of {list(record_file.FILE_EXTENSIONS)}')
         self._create_directory(self._record_dir)
 
     def _create_directory(self, path: str) -> None:
@@ -112,11 +117,11 @@ class FSMySQLCSVLoader(Loader):
 
     def _get_writer(self,
                     csv_record_dict: Dict[str, Any],
-                    file_mapping: Dict[Any, DictWriter],
+                    file_mapping: Dict[Any, Any],
                     key: Any,
                     dir_path: str,
                     file_suffix: str
-                    ) -> DictWriter:
+                    ) -> Any:
         """
         Finds a writer based on csv record, key.
         If writer does not exist, it's creates a csv writer and update the mapping.
@@ -134,16 +139,11 @@ class FSMySQLCSVLoader(Loader):
 
         LOGGER.info(f'Creating file for {key}')
 
-        file_out = open(f'{dir_path}/{file_suffix}.csv', 'w', encoding='utf8')
-        writer = csv.DictWriter(file_out, fieldnames=csv_record_dict.keys(),
-                                quoting=csv.QUOTE_NONNUMERIC)
-
-        def file_out_close() -> None:
-            LOGGER.info(f'Closing file IO {file_out}')
-            file_out.close()
+        writer, file_out_close = record_file.create_writer(f'{dir_path}/{file_suffix}',
+                                                           fieldnames=csv_record_dict.keys(),
+                                                           file_format=self._file_format)
         self._closer.register(file_out_close)
 
-        writer.writeheader()
         file_mapping[key] = writer
 
         return writer
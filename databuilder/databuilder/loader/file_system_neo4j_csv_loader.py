@@ -1,13 +1,12 @@
 # Copyright Contributors to the Amundsen project.
 # SPDX-License-Identifier: Apache-2.0
 
-import csv
 import logging
 import os
 import shutil
-from csv import DictWriter
+from collections import defaultdict
 from typing import (
-    Any, Dict, FrozenSet,
+    Any, Dict, FrozenSet, List, Tuple,
 )
 
 from pyhocon import ConfigFactory, ConfigTree
@@ -16,6 +15,7 @@ from databuilder.job.base_job import Job
 from databuilder.loader.base_loader import Loader
 from databuilder.models.graph_serializable import GraphSerializable
 from databuilder.serializers import neo4_serializer
+from databuilder.utils import record_file
 from databuilder.utils.closer import Closer
 
 LOGGER = logging.getLogger(__name__)
@@ -32,16 +32,20 @@ class FsNeo4jCSVLoader(Loader):
     RELATION_DIR_PATH = 'relationship_dir_path'
     FORCE_CREATE_DIR = 'force_create_directory'
     SHOULD_DELETE_CREATED_DIR = 'delete_created_directories'
+    # Intermediate file format, csv or jsonl (typed, gzip compressed JSON lines). See databuilder.utils.record_file
+    FILE_FORMAT = 'file_format'
 
     _DEFAULT_CONFIG = ConfigFactory.from_dict({
         SHOULD_DELETE_CREATED_DIR: True,
-        FORCE_CREATE_DIR: False
+        FORCE_CREATE_DIR: False,
+        FILE_FORMAT: record_file.CSV_FORMAT
     })
 
     def __init__(self) -> None:
-        self._node_file_mapping: Dict[Any, DictWriter] = {}
-        self._relation_file_mapping: Dict[Any, DictWriter] = {}
+        self._node_file_mapping: Dict[Any, Any] = {}
+        self._relation_file_mapping: Dict[Any, Any] = {}
         self._keys: Dict[FrozenSet[str], int] = {}
+        self._keys_by_fields: Dict[Tuple[str, ...], int] = {}
         self._closer = Closer()
 
     def init(self, conf: ConfigTree) -> None:
@@ -61,6 +65,9 @@ class FsNeo4jCSVLoader(Loader):
         self._delete_created_dir = \
             conf.get_bool(FsNeo4jCSVLoader.SHOULD_DELETE_CREATED_DIR)
         self._force_create_dir = conf.get_bool(FsNeo4jCSVLoader.FORCE_CREATE_DIR)
+        self._file_format = conf.get_string(FsNeo4jCSVLoader.FILE_FORMAT)
+        if self._file_format not in record_file.FILE_EXTENSIONS:
+            raise Exception(f'{FsNeo4jCSVLoader.FILE_FORMAT} should be one of {list(record_file.FILE_EXTENSIONS)}')
         self._create_directory(self._node_dir)
         self._create_directory(self._relation_dir)
 
@@ -101,26 +108,30 @@ class FsNeo4jCSVLoader(Loader):
         Common pattern for both nodes and relations:
          1. retrieve csv row (a dict where keys represent a header,
          values represent a row)
-         2. using this dict to get a appropriate csv writer and write to it.
+         2. using this dict to get a appropriate csv writer and collect the row for it.
          3. repeat 1 and 2
+         4. write the collected rows of each writer with a single writerows call
 
         :param csv_serializable:
         :return:
         """
 
+        node_rows: Dict[Any, List[Dict[str, Any]]] = defaultdict(list)
         node = csv_serializable.next_node()
         while node:
             node_dict = neo4_serializer.serialize_node(node)
             key = (node.label, self._make_key(node_dict))
-            file_suffix = '{}_{}'.format(*key)
-            node_writer = self._get_writer(node_dict,
-                                           self._node_file_mapping,
-                                           key,
-                                           self._node_dir,
-                                           file_suffix)
-            node_writer.writerow(node_dict)
+            if key not in self._node_file_mapping:
+                self._get_writer(node_dict,
+                                 self._node_file_mapping,
+                                 key,
+                                 self._node_dir,
+                                 '{}_{}'.format(*key))
+            node_rows[key].append(node_dict)
             node = csv_serializable.next_node()
+        self._write_rows(self._node_file_mapping, node_rows)
 
+        relation_rows: Dict[Any, List[Dict[str, Any]]] = defaultdict(list)
         relation = csv_serializable.next_relation()
         while relation:
             relation_dict = neo4_serializer.serialize_relationship(relation)
@@ -128,23 +139,30 @@ class FsNeo4jCSVLoader(Loader):
                     relation.end_label,
                     relation.type,
                     self._make_key(relation_dict))
-
-            file_suffix = f'{key2[0]}_{key2[1]}_{key2[2]}'
-            relation_writer = self._get_writer(relation_dict,
-                                               self._relation_file_mapping,
-                                               key2,
-                                               self._relation_dir,
-                                               file_suffix)
-            relation_writer.writerow(relation_dict)
+            if key2 not in self._relation_file_mapping:
+                self._get_writer(relation_dict,
+                                 self._relation_file_mapping,
+                                 key2,
+                                 self._relation_dir,
+                                 f'{key2[0]}_{key2[1]}_{key2[2]}')
+            relation_rows[key2].append(relation_dict)
             relation = csv_serializable.next_relation()
+        self._write_rows(self._relation_file_mapping, relation_rows)
+
+    def _write_rows(self,
+                    file_mapping: Dict[Any, Any],
+                    rows_by_key: Dict[Any, List[Dict[str, Any]]]
+                    ) -> None:
+        for key, rows in rows_by_key.items():
+            file_mapping[key].writerows(rows)
 
     def _get_writer(self,
                     csv_record_dict: Dict[str, Any],
-                    file_mapping: Dict[Any, DictWriter],
+                    file_mapping: Dict[Any, Any],
                     key: Any,
                     dir_path: str,
                     file_suffix: str
-                    ) -> DictWriter:
+                    ) -> Any:
         """
         Finds a writer based on csv record, key.
         If writer does not exist, it's creates a csv writer and update the
@@ -162,16 +180,11 @@ class FsNeo4jCSVLoader(Loader):
 
         LOGGER.info('Creating file for %s', key)
 
-        file_out = open(f'{dir_path}/{file_suffix}.csv', 'w', encoding='utf8')
-        writer = csv.DictWriter(file_out, fieldnames=csv_record_dict.keys(),
-                                quoting=csv.QUOTE_NONNUMERIC)
-
-        def file_out_close() -> None:
-            LOGGER.info('Closing file IO %s', file_out)
-            file_out.close()
+        writer, file_out_close = record_file.create_writer(f'{dir_path}/{file_suffix}',
+                                                           fieldnames=csv_record_dict.keys(),
+                                                           file_format=self._file_format)
         self._closer.register(file_out_close)
 
-        writer.writeheader()
         file_mapping[key] = writer
 
         return writer
@@ -188,4 +201,11 @@ class FsNeo4jCSVLoader(Loader):
 
     def _make_key(self, record_dict: Dict[str, Any]) -> int:
         """ Each unique set of record keys is assigned an increasing numeric key """
-        return self._keys.setdefault(frozenset(record_dict.keys()), len(self._keys))
+        # Serializers emit the keys of one model in a stable order, so the ordered fields are looked up
+        # first and the order insensitive frozenset is only built for a shape that was not seen yet.
+        fields = tuple(record_dict)
+        key = self._keys_by_fields.get(fields)
+        if key is None:
+            key = self._keys.setdefault(frozenset(fields), len(self._keys))
+            self._keys_by_fields[fields] = key
+        return key
@@ -1,11 +1,9 @@
 # Copyright Contributors to the Amundsen project.
 # SPDX-License-Identifier: Apache-2.0
 
-import csv
 import logging
 import os
 import shutil
-from csv import DictWriter
 from typing import Any, Dict
 
 from pyhocon import ConfigFactory, ConfigTree
@@ -14,6 +12,7 @@ from databuilder.job.base_job import Job
 from databuilder.loader.base_loader import Loader
 from databuilder.models.graph_serializable import GraphSerializable
 from databuilder.serializers import neptune_serializer
+from databuilder.utils import record_file
 from databuilder.utils.closer import Closer
 
 LOGGER = logging.getLogger(__name__)
@@ -33,15 +32,19 @@ class FSNeptuneCSVLoader(Loader):
     FORCE_CREATE_DIR = 'force_create_directory'
     SHOULD_DELETE_CREATED_DIR = 'delete_created_directories'
     JOB_PUBLISHER_TAG = 'job_publisher_tag'
+    # Intermediate file format, csv or jsonl (typed, gzip compressed JSON lines). NeptuneCSVPublisher converts
+    # jsonl files back to CSV on upload. See databuilder.utils.record_file
+    FILE_FORMAT = 'file_format'
 
     _DEFAULT_CONFIG = ConfigFactory.from_dict({
         SHOULD_DELETE_CREATED_DIR: True,
-        FORCE_CREATE_DIR: False
+        FORCE_CREATE_DIR: False,
+        FILE_FORMAT: record_file.CSV_FORMAT
     })
 
     def __init__(self) -> None:
-        self._node_file_mapping: Dict[Any, DictWriter] = {}
-        self._relation_file_mapping: Dict[Any, DictWriter] = {}
+        self._node_file_mapping: Dict[Any, Any] = {}
+        self._relation_file_mapping: Dict[Any, Any] = {}
         self._closer = Closer()
 
     def init(self, conf: ConfigTree) -> None:
@@ -57,6 +60,9 @@ class FSNeptuneCSVLoader(Loader):
 
         self._delete_created_dir = conf.get_bool(FSNeptuneCSVLoader.SHOULD_DELETE_CREATED_DIR)
         self._force_create_dir = conf.get_bool(FSNeptuneCSVLoader.FORCE_CREATE_DIR)
+        self._file_format = conf.get_string(FSNeptuneCSVLoader.FILE_FORMAT)
+        if self._file_format not in record_file.FILE_EXTENSIONS:
+            raise Exception(f'{FSNeptuneCSVLoader.FILE_FORMAT} should be one of {list(record_file.FILE_EXTENSIONS)}')
         self._create_directory(self._node_dir)
         self._create_directory(self._relation_dir)
         self.job_publisher_tag = conf.get_string(FSNeptuneCSVLoader.JOB_PUBLISHER_TAG)
@@ -140,11 +146,11 @@ class FSNeptuneCSVLoader(Loader):
 
     def _get_writer(self,
                     csv_record_dict: Dict[str, Any],
-                    file_mapping: Dict[Any, DictWriter],
+                    file_mapping: Dict[Any, Any],
                     key: Any,
                     dir_path: str,
                     file_suffix: str
-                    ) -> DictWriter:
+                    ) -> Any:
         """
         Finds a writer based on csv record, key.
         If writer does not exist, it's creates a csv writer and update the
@@ -156,15 +162,11 @@ class FSNeptuneCSVLoader(Loader):
 
         LOGGER.info('Creating file for {}'.format(key))
 
-        file_out = open('{}/{}.csv'.format(dir_path, file_suffix), 'w', encoding='utf8')
-        writer = csv.DictWriter(file_out, fieldnames=csv_record_dict.keys(), quoting=csv.QUOTE_NONNUMERIC)
-
-        def file_out_close() -> None:
-            LOGGER.info('Closing file IO {}'.format(file_out))
-            file_out.close()
+        writer, file_out_close = record_file.create_writer('{}/{}'.format(dir_path, file_suffix),
+                                                           fieldnames=csv_record_dict.keys(),
+                                                           file_format=self._file_format)
         self._closer.register(file_out_close)
 
-        writer.writeheader()
         file_mapping[key] = writer
 
         return writer
@@ -45,3 +45,5 @@ class DashboardESDocument(ElasticsearchDocument):
         self.chart_names = chart_names
         self.tags = tags
         self.badges = badges
+        # completion suggester input for typeahead
+        self.name_suggest = {'input': [name], 'weight': int(total_usage or 0)}
@@ -2,7 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import abc
-from typing import Union  # noqa: F401
+from typing import Set, Union  # noqa: F401
 
 from databuilder.models.graph_node import GraphNode
 from databuilder.models.graph_relationship import GraphRelationship
@@ -17,6 +17,11 @@ RELATION_END_LABEL = 'END_LABEL'
 RELATION_TYPE = 'TYPE'
 RELATION_REVERSE_TYPE = 'REVERSE_TYPE'
 
+# Labels and relation types that already passed validation. A job only ever sees a handful of distinct
+# values, so each one is checked once instead of once per node or relationship.
+_VALID_LABELS: Set[str] = set()
+_VALID_RELATION_TYPES: Set[str] = set()
+
 
 class GraphSerializable(object, metaclass=abc.ABCMeta):
     """
@@ -83,9 +88,17 @@ class GraphSerializable(object, metaclass=abc.ABCMeta):
         self._validate_relation_type_value(relation.reverse_type)
 
     def _validate_relation_type_value(self, value: str) -> None:
+        if value in _VALID_RELATION_TYPES:
+            return
+
         if not value.isupper():
             raise RuntimeError(f'TYPE needs to be upper case: {value}')
+        _VALID_RELATION_TYPES.add(value)
 
     def _validate_label_value(self, value: str) -> None:
+        if value in _VALID_LABELS:
+            return
+
         if not value.istitle():
             raise RuntimeError(f'LABEL should only have upper case character on its first one: {value}')
+        _VALID_LABELS.add(value)
@@ -47,3 +47,5 @@ class TableESDocument(ElasticsearchDocument):
         self.badges = badges
         self.schema_description = schema_description
         self.programmatic_descriptions = programmatic_descriptions
+        # completion suggester input for typeahead, matching both bare and schema qualified names
+        self.name_suggest = {'input': [name, f'{schema}.{name}'], 'weight': int(total_usage or 0)}
@@ -1,7 +1,7 @@
 # Copyright Contributors to the Amundsen project.
 # SPDX-License-Identifier: Apache-2.0
 from typing import (
-    Iterator, Optional, Union,
+    Any, Iterator, List, Optional, Union,
 )
 
 from amundsen_rds.models import RDSModel
@@ -130,3 +130,108 @@ class TableColumnStats(GraphSerializable, TableSerializable):
             column_rk=self.get_col_key()
         )
         yield record
+
+
+class TableColumnStatsBatch(GraphSerializable, TableSerializable):
+    """
+    All column stats of one table in a single record. Stats are kept in three parallel lists (column name, stat name,
+    stat value) and turned into the same nodes, relations and records as one TableColumnStats per stat would be,
+    without creating a model object per stat.
+    """
+
+    def __init__(self,
+                 table_name: str,
+                 col_names: List[str],
+                 stat_names: List[str],
+                 stat_vals: List[Any],
+                 start_epoch: str,
+                 end_epoch: str,
+                 db: str = 'hive',
+                 cluster: str = 'gold',
+                 schema: str = None
+                 ) -> None:
+        if not len(col_names) == len(stat_names) == len(stat_vals):
+            raise ValueError(f'Column names, stat names and stat values should have the same length. '
+                             f'Got {len(col_names)}, {len(stat_names)} and {len(stat_vals)}')
+
+        if schema is None:
+            self.schema, self.table = table_name.split('.')
+        else:
+            self.table = table_name
+            self.schema = schema
+        self.db = db
+        self.cluster = cluster
+        self.col_names = col_names
+        self.stat_types = stat_names
+        self.stat_vals = stat_vals
+        self.start_epoch = start_epoch
+        self.end_epoch = end_epoch
+        # Column key and stat key of every stat share this prefix
+        self._key_prefix = ColumnMetadata.COLUMN_KEY_FORMAT.format(db=self.db,
+                                                                   cluster=self.cluster,
+                                                                   schema=self.schema,
+                                                                   tbl=self.table,
+                                                                   col='')
+        self._node_iter = self._create_node_iterator()
+        self._relation_iter = self._create_relation_iterator()
+        self._record_iter = self._create_record_iterator()
+
+    def __len__(self) -> int:
+        return len(self.stat_vals)
+
+    def create_next_node(self) -> Optional[GraphNode]:
+        try:
+            return next(self._node_iter)
+        except StopIteration:
+            return None
+
+    def create_next_relation(self) -> Optional[GraphRelationship]:
+        try:
+            return next(self._relation_iter)
+        except StopIteration:
+            return None
+
+    def create_next_record(self) -> Union[RDSModel, None]:
+        try:
+            return next(self._record_iter)
+        except StopIteration:
+            return None
+
+    def _get_stat_key(self, col_name: str, stat_type: str) -> str:
+        return f'{self._key_prefix}{col_name}/{stat_type}/'
+
+    def _create_node_iterator(self) -> Iterator[GraphNode]:
+        for col_name, stat_type, stat_val in zip(self.col_names, self.stat_types, self.stat_vals):
+            yield GraphNode(
+                key=self._get_stat_key(col_name, stat_type),
+                label=TableColumnStats.LABEL,
+                attributes={
+                    'stat_val': str(stat_val),
+                    'stat_type': stat_type,
+                    'start_epoch': self.start_epoch,
+                    'end_epoch': self.end_epoch,
+                }
+            )
+
+    def _create_relation_iterator(self) -> Iterator[GraphRelationship]:
+        for col_name, stat_type in zip(self.col_names, self.stat_types):
+            yield GraphRelationship(
+                start_key=self._get_stat_key(col_name, stat_type),
+                start_label=TableColumnStats.LABEL,
+                end_key=self._key_prefix + col_name,
+                end_label=ColumnMetadata.COLUMN_NODE_LABEL,
+                type=TableColumnStats.STAT_Column_RELATION_TYPE,
+                reverse_type=TableColumnStats.Column_STAT_RELATION_TYPE,
+                attributes={}
+            )
+
+    def _create_record_iterator(self) -> Iterator[RDSModel]:
+        for col_name, stat_type, stat_val in zip(self.col_names, self.stat_types, self.stat_vals):
+            yield RDSColumnStat(
+                rk=self._get_stat_key(col_name, stat_type),
+                stat_val=str(stat_val),
+                stat_type=stat_type,
+                start_epoch=self.start_epoch,
+                end_epoch=self.end_epoch,
+                column_rk=self._key_prefix + col_name
+            )
@@ -39,3 +39,6 @@ class UserESDocument(ElasticsearchDocument):
         self.total_read = total_read
         self.total_own = total_own
         self.total_follow = total_follow
+        # completion suggester input for typeahead, matching full name, last name or email
+        self.name_suggest = {'input': [i for i in (full_name, last_name, email) if i],
+                             'weight': int(total_read or 0)}
@@ -3,13 +3,17 @@
 
 import json
 import logging
-from typing import List
+from typing import (
+    Any, Dict, List,
+)
 
 from amundsen_common.models.index_map import TABLE_INDEX_MAP
 from elasticsearch.exceptions import NotFoundError
+from elasticsearch.helpers import scan
 from pyhocon import ConfigTree
 
 from databuilder.publisher.base_publisher import Publisher
+from databuilder.utils.watermark_file import commit_pending_watermark
 
 LOGGER = logging.getLogger(__name__)
 
@@ -22,6 +26,18 @@ class ElasticsearchPublisher(Publisher):
     and traffic is routed to new index.
 
     Old index is deleted after the alias swap is complete
+
+    In incremental mode, documents are upserted in place into the index behind the alias, using the id_field of
+    the documents as id, and the documents of delete_ids are deleted. No index is created and the alias is not
+    swapped. The full publish needs to use the same id_field for the upserts to replace its documents.
+
+    With a current_ids_extractor, an initialized extractor of the ids of all the current entities (e.g. a
+    Neo4jExtractor returning the keys of all the tables), the documents of the index whose id it does not return
+    are deleted as well.
+
+    With an incremental_watermark_path, the pending watermark that Neo4jSearchDataExtractor stored when it was
+    initialized, i.e. the Neo4j time before the data was extracted, replaces the watermark after every successful
+    publish. Neo4jSearchDataExtractor reads it from the same path to only extract the entities changed since then.
     """
     FILE_PATH_CONFIG_KEY = 'file_path'
     FILE_MODE_CONFIG_KEY = 'mode'
@@ -31,6 +47,15 @@ class ElasticsearchPublisher(Publisher):
     ELASTICSEARCH_NEW_INDEX_CONFIG_KEY = 'new_index'
     ELASTICSEARCH_ALIAS_CONFIG_KEY = 'alias'
     ELASTICSEARCH_MAPPING_CONFIG_KEY = 'mapping'
+    # document field used as document id, e.g. key for tables
+    ELASTICSEARCH_ID_FIELD_CONFIG_KEY = 'id_field'
+    ELASTICSEARCH_INCREMENTAL_CONFIG_KEY = 'incremental'
+    # ids of the documents to delete in incremental mode
+    ELASTICSEARCH_DELETE_IDS_CONFIG_KEY = 'delete_ids'
+    # extractor of the ids of all the current entities, documents with other ids are deleted in incremental mode
+    ELASTICSEARCH_CURRENT_IDS_EXTRACTOR_CONFIG_KEY = 'current_ids_extractor'
+    # file the watermark of the incremental mode is stored in after publishing
+    ELASTICSEARCH_WATERMARK_PATH_CONFIG_KEY = 'incremental_watermark_path'
 
     # config to control how many max documents to publish at a time
     ELASTICSEARCH_PUBLISHER_BATCH_SIZE = 'batch_size'
@@ -55,6 +80,17 @@ class ElasticsearchPublisher(Publisher):
                                                    ElasticsearchPublisher.DEFAULT_ELASTICSEARCH_INDEX_MAPPING)
         self.elasticsearch_batch_size = self.conf.get(ElasticsearchPublisher.ELASTICSEARCH_PUBLISHER_BATCH_SIZE,
                                                       10000)
+        self.elasticsearch_id_field = self.conf.get(ElasticsearchPublisher.ELASTICSEARCH_ID_FIELD_CONFIG_KEY, None)
+        self.incremental = self.conf.get_bool(ElasticsearchPublisher.ELASTICSEARCH_INCREMENTAL_CONFIG_KEY, False)
+        self.elasticsearch_delete_ids = self.conf.get_list(ElasticsearchPublisher.ELASTICSEARCH_DELETE_IDS_CONFIG_KEY,
+                                                           [])
+        self.current_ids_extractor = self.conf.get(
+            ElasticsearchPublisher.ELASTICSEARCH_CURRENT_IDS_EXTRACTOR_CONFIG_KEY, None)
+        self.watermark_path = self.conf.get_string(ElasticsearchPublisher.ELASTICSEARCH_WATERMARK_PATH_CONFIG_KEY,
+                                                   None)
+        if self.incremental and not self.elasticsearch_id_field:
+            raise Exception(f'{ElasticsearchPublisher.ELASTICSEARCH_ID_FIELD_CONFIG_KEY} is required '
+                            f'in incremental mode')
         self.file_handler = open(self.file_path, self.file_mode)
 
     def _fetch_old_index(self) -> List[str]:
@@ -78,22 +114,100 @@ class ElasticsearchPublisher(Publisher):
         to route traffic to {new_index}
         """
         actions = [json.loads(line) for line in self.file_handler.readlines()]
+
+        if self.incremental:
+            self._publish_incremental(actions)
+            self._store_watermark()
+            return
+
         # ensure new data exists
         if not actions:
             LOGGER.warning("received no data to upload to Elasticsearch!")
             return
 
+        # create new index with mapping
+        self.elasticsearch_client.indices.create(index=self.elasticsearch_new_index, body=self.elasticsearch_mapping)
+        self._bulk_index(self.elasticsearch_new_index, actions)
+
+        # fetch indices that have {elasticsearch_alias} as alias
+        elasticsearch_old_indices = self._fetch_old_index()
+
+        # update alias to point to the new index
+        actions = [{"add": {"index": self.elasticsearch_new_index, "alias": self.elasticsearch_alias}}]
+
+        # delete old indices
+        delete_actions = [{"remove_index": {"index": index}} for index in elasticsearch_old_indices]
+        actions.extend(delete_actions)
+
+        update_action = {"actions": actions}
+
+        # perform alias update and index delete in single atomic operation
+        self.elasticsearch_client.indices.update_aliases(update_action)
+        self._store_watermark()
+
+    def _store_watermark(self) -> None:
+        if self.watermark_path:
+            commit_pending_watermark(self.watermark_path)
+
+    def _publish_incremental(self, actions: List[Dict[str, Any]]) -> None:
+        """
+        Upserts and deletes documents in place, through the alias
+        """
+        delete_ids = list(self.elasticsearch_delete_ids)
+        if self.current_ids_extractor:
+            delete_ids.extend(self._get_deleted_ids())
+
+        if not actions and not delete_ids:
+            LOGGER.info('No document changed, nothing to publish to Elasticsearch')
+            return
+
+        self._bulk_index(self.elasticsearch_alias, actions)
+
+        delete_actions = [dict(delete=dict(_index=self.elasticsearch_alias,
+                                           _type=self.elasticsearch_type,
+                                           _id=doc_id)) for doc_id in delete_ids]
+        for i in range(0, len(delete_actions), self.elasticsearch_batch_size):
+            self.elasticsearch_client.bulk(delete_actions[i:i + self.elasticsearch_batch_size])
+
+        LOGGER.info('Upserted %i and deleted %i documents in %s',
+                    len(actions), len(delete_actions), self.elasticsearch_alias)
+
+    def _get_deleted_ids(self) -> List[str]:
+        """
+        Ids of the documents in the index that are not among the ids of the current entities
+        """
+        current_ids = set()
+        try:
+            record = self.current_ids_extractor.extract()
+            while record is not None:
+                current_ids.add(record if isinstance(record, str) else record[self.elasticsearch_id_field])
+                record = self.current_ids_extractor.extract()
+        finally:
+            self.current_ids_extractor.close()
+
+        if not current_ids:
+            # Most likely a wrong query rather than every entity being deleted
+            LOGGER.warning('No current id was extracted, not deleting any document from Elasticsearch')
+            return []
+
+        hits = scan(self.elasticsearch_client, index=self.elasticsearch_alias,
+                    query={'query': {'match_all': {}}}, _source=False)
+        deleted_ids = [hit['_id'] for hit in hits if hit['_id'] not in current_ids]
+        LOGGER.info('Found %i documents of deleted entities in %s', len(deleted_ids), self.elasticsearch_alias)
+        return deleted_ids
+
+    def _bulk_index(self, index: str, actions: List[Dict[str, Any]]) -> None:
         # Convert object to json for elasticsearch bulk upload
         # Bulk load JSON format is defined here:
         # https://www.elastic.co/guide/en/elasticsearch/reference/6.2/docs-bulk.html
-        bulk_actions = []
+        bulk_actions: List[Dict[str, Any]] = []
         cnt = 0
 
-        # create new index with mapping
-        self.elasticsearch_client.indices.create(index=self.elasticsearch_new_index, body=self.elasticsearch_mapping)
         for action in actions:
-            index_row = dict(index=dict(_index=self.elasticsearch_new_index,
+            index_row = dict(index=dict(_index=index,
                                         _type=self.elasticsearch_type))
+            if self.elasticsearch_id_field:
+                index_row['index']['_id'] = action[self.elasticsearch_id_field]
             bulk_actions.append(index_row)
             bulk_actions.append(action)
             cnt += 1
@@ -107,20 +221,5 @@ class ElasticsearchPublisher(Publisher):
         if bulk_actions:
             self.elasticsearch_client.bulk(bulk_actions)
 
-        # fetch indices that have {elasticsearch_alias} as alias
-        elasticsearch_old_indices = self._fetch_old_index()
-
-        # update alias to point to the new index
-        actions = [{"add": {"index": self.elasticsearch_new_index, "alias": self.elasticsearch_alias}}]
-
-        # delete old indices
-        delete_actions = [{"remove_index": {"index": index}} for index in elasticsearch_old_indices]
-        actions.extend(delete_actions)
-
-        update_action = {"actions": actions}
-
-        # perform alias update and index delete in single atomic operation
-        self.elasticsearch_client.indices.update_aliases(update_action)
-
     def get_scope(self) -> str:
         return 'publisher.elasticsearch'
@@ -5,13 +5,11 @@ import csv
 import ctypes
 import logging
 import time
-from io import open
 from os import listdir
 from os.path import isfile, join
 from typing import List, Set
 
 import neo4j
-import pandas
 from jinja2 import Template
 from neo4j import GraphDatabase, Transaction
 from neo4j.exceptions import CypherError, TransientError
@@ -19,6 +17,7 @@ from pyhocon import ConfigFactory, ConfigTree
 
 from databuilder.publisher.base_publisher import Publisher
 from databuilder.publisher.neo4j_preprocessor import NoopRelationPreprocessor
+from databuilder.utils import record_file
 
 # Setting field_size_limit to solve the error below
 # _csv.Error: field larger than field limit (131072)
@@ -223,12 +222,11 @@ class Neo4jCsvPublisher(Publisher):
         """
         LOGGER.info('Creating indices. (Existing indices will be ignored)')
 
-        with open(node_file, 'r', encoding='utf8') as node_csv:
-            for node_record in pandas.read_csv(node_csv, na_filter=False).to_dict(orient='records'):
-                label = node_record[NODE_LABEL_KEY]
-                if label not in self.labels:
-                    self._try_create_index(label)
-                    self.labels.add(label)
+        for node_record in record_file.read_records(node_file):
+            label = node_record[NODE_LABEL_KEY]
+            if label not in self.labels:
+                self._try_create_index(label)
+                self.labels.add(label)
 
         LOGGER.info('Indices have been created.')
 
@@ -250,11 +248,10 @@ class Neo4jCsvPublisher(Publisher):
         :return:
         """
 
-        with open(node_file, 'r', encoding='utf8') as node_csv:
-            for node_record in pandas.read_csv(node_csv, na_filter=False).to_dict(orient="records"):
-                stmt = self.create_node_merge_statement(node_record=node_record)
-                params = self._create_props_param(node_record)
-                tx = self._execute_statement(stmt, tx, params)
+        for node_record in record_file.read_records(node_file):
+            stmt = self.create_node_merge_statement(node_record=node_record)
+            params = self._create_props_param(node_record)
+            tx = self._execute_statement(stmt, tx, params)
         return tx
 
     def is_create_only_node(self, node_record: dict) -> bool:
@@ -305,41 +302,39 @@ class Neo4jCsvPublisher(Publisher):
             LOGGER.info('Pre-processing relation with %s', self._relation_preprocessor)
 
             count = 0
-            with open(relation_file, 'r', encoding='utf8') as relation_csv:
-                for rel_record in pandas.read_csv(relation_csv, na_filter=False).to_dict(orient="records"):
-                    # TODO not sure if deadlock on badge node arises in preporcessing or not
-                    stmt, params = self._relation_preprocessor.preprocess_cypher(
-                        start_label=rel_record[RELATION_START_LABEL],
-                        end_label=rel_record[RELATION_END_LABEL],
-                        start_key=rel_record[RELATION_START_KEY],
-                        end_key=rel_record[RELATION_END_KEY],
-                        relation=rel_record[RELATION_TYPE],
-                        reverse_relation=rel_record[RELATION_REVERSE_TYPE])
-
-                    if stmt:
-                        tx = self._execute_statement(stmt, tx=tx, params=params)
-                        count += 1
+            for rel_record in record_file.read_records(relation_file):
+                # TODO not sure if deadlock on badge node arises in preporcessing or not
+                stmt, params = self._relation_preprocessor.preprocess_cypher(
+                    start_label=rel_record[RELATION_START_LABEL],
+                    end_label=rel_record[RELATION_END_LABEL],
+                    start_key=rel_record[RELATION_START_KEY],
+                    end_key=rel_record[RELATION_END_KEY],
+                    relation=rel_record[RELATION_TYPE],
+                    reverse_relation=rel_record[RELATION_REVERSE_TYPE])
+
+                if stmt:
+                    tx = self._execute_statement(stmt, tx=tx, params=params)
+                    count += 1
 
             LOGGER.info('Executed pre-processing Cypher statement %i times', count)
 
-        with open(relation_file, 'r', encoding='utf8') as relation_csv:
-            for rel_record in pandas.read_csv(relation_csv, na_filter=False).to_dict(orient="records"):
-                exception_exists = True
-                retries_for_exception = RETRIES_NUMBER
-                while exception_exists and retries_for_exception > 0:
-                    try:
-                        stmt = self.create_relationship_merge_statement(rel_record=rel_record)
-                        params = self._create_props_param(rel_record)
-                        tx = self._execute_statement(stmt, tx, params,
-                                                     expect_result=self._confirm_rel_created)
-                        exception_exists = False
-                    except TransientError as e:
-                        if rel_record[RELATION_START_LABEL] in self.deadlock_node_labels \
-                                or rel_record[RELATION_END_LABEL] in self.deadlock_node_labels:
-                            time.sleep(SLEEP_TIME)
-                            retries_for_exception -= 1
-                        else:
-                            raise e
+        for rel_record in record_file.read_records(relation_file):
+            exception_exists = True
+            retries_for_exception = RETRIES_NUMBER
+            while exception_exists and retries_for_exception > 0:
+                try:
+                    stmt = self.create_relationship_merge_statement(rel_record=rel_record)
+                    params = self._create_props_param(rel_record)
+                    tx = self._execute_statement(stmt, tx, params,
+                                                 expect_result=self._confirm_rel_created)
+                    exception_exists = False
+                except TransientError as e:
+                    if rel_record[RELATION_START_LABEL] in self.deadlock_node_labels \
+                            or rel_record[RELATION_END_LABEL] in self.deadlock_node_labels:
+                        time.sleep(SLEEP_TIME)
+                        retries_for_exception -= 1
+                    else:
+                        raise e
 
         return tx
 
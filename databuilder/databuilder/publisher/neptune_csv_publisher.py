@@ -2,18 +2,27 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import datetime
+import gzip
+import io
 import logging
 import os
+import shutil
+import tempfile
 import time
+from concurrent.futures import ThreadPoolExecutor
 from os import listdir
 from os.path import isfile, join
-from typing import List, Tuple
+from typing import (
+    IO, List, Tuple,
+)
 
 from amundsen_gremlin.neptune_bulk_loader.api import NeptuneBulkLoaderApi, NeptuneBulkLoaderLoadStatusErrorLogEntry
+from boto3.s3.transfer import TransferConfig
 from boto3.session import Session
 from pyhocon import ConfigTree
 
 from databuilder.publisher.base_publisher import Publisher
+from databuilder.utils import record_file
 
 LOGGER = logging.getLogger(__name__)
 
@@ -53,6 +62,25 @@ class NeptuneCSVPublisher(Publisher):
 
     FAIL_ON_ERROR = "fail_on_error"
     STATUS_POLLING_PERIOD = "status_polling_period"
+    # Polling starts every status_polling_period seconds and backs off up to this period while loads are running
+    STATUS_POLLING_MAX_PERIOD = "status_polling_max_period"
+
+    # --- UPLOAD CONFIGURATION ---
+    # Number of files uploaded concurrently
+    UPLOAD_MAX_WORKERS = "upload_max_workers"
+    # Size of the parts of S3 multipart uploads, files larger than this are uploaded in parts
+    UPLOAD_PART_SIZE_BYTES = "upload_part_size_bytes"
+    # Number of concurrent part uploads per file
+    UPLOAD_PART_CONCURRENCY = "upload_part_concurrency"
+    # Gzip files while uploading them. Neptune bulk loader reads gzip compressed files
+    UPLOAD_GZIP = "upload_gzip"
+    # Start a separate load job per file group: the node load is queued as soon as node files are uploaded,
+    # while relation files are still uploading. Neptune runs queued loads in FIFO order, so the relation load
+    # starts after the node load
+    LOAD_PER_FILE_GROUP = "load_per_file_group"
+
+    DEFAULT_UPLOAD_PART_SIZE_BYTES = 16 * (2 ** 20)  # 16MB
+    IN_PROGRESS_LOAD_STATUSES = ("LOAD_IN_PROGRESS", "LOAD_NOT_STARTED", "LOAD_IN_QUEUE")
 
     def __init__(self) -> None:
         super(NeptuneCSVPublisher, self).__init__()
@@ -85,6 +113,19 @@ class NeptuneCSVPublisher(Publisher):
         self.base_amundsen_data_path = conf.get_string(NeptuneCSVPublisher.AWS_BASE_S3_DATA_PATH)
         self.fail_on_error = conf.get_bool(NeptuneCSVPublisher.FAIL_ON_ERROR, default=False)
         self.status_polling_period = conf.get_int(NeptuneCSVPublisher.STATUS_POLLING_PERIOD, default=5)
+        self.status_polling_max_period = conf.get_int(NeptuneCSVPublisher.STATUS_POLLING_MAX_PERIOD, default=60)
+
+        self.upload_max_workers = conf.get_int(NeptuneCSVPublisher.UPLOAD_MAX_WORKERS, default=4)
+        self.upload_gzip = conf.get_bool(NeptuneCSVPublisher.UPLOAD_GZIP, default=False)
+        self.load_per_file_group = conf.get_bool(NeptuneCSVPublisher.LOAD_PER_FILE_GROUP, default=False)
+        part_size = conf.get_int(NeptuneCSVPublisher.UPLOAD_PART_SIZE_BYTES,
+                                 default=NeptuneCSVPublisher.DEFAULT_UPLOAD_PART_SIZE_BYTES)
+        self.s3_transfer_config = TransferConfig(
+            multipart_threshold=part_size,
+            multipart_chunksize=part_size,
+            max_concurrency=conf.get_int(NeptuneCSVPublisher.UPLOAD_PART_CONCURRENCY, default=4)
+        )
+        self._s3_client = self._boto_session.client('s3')
 
     def publish_impl(self) -> None:
         if not self._is_upload_required():
@@ -96,24 +137,13 @@ class NeptuneCSVPublisher(Publisher):
             datetime_portion=datetime_portion,
         )
 
-        self.upload_files(s3_folder_location)
+        if self.load_per_file_group:
+            load_ids = self._upload_and_load_per_file_group(s3_folder_location)
+        else:
+            self.upload_files(s3_folder_location)
+            load_ids = [self._load(s3_folder_location)]
 
-        bulk_upload_response = self.neptune_api_client.load(
-            s3_object_key=s3_folder_location,
-            failOnError=self.fail_on_error
-        )
-
-        try:
-            load_id = bulk_upload_response['payload']['loadId']
-        except KeyError:
-            raise Exception("Failed to load csv. Response: {0}".format(str(bulk_upload_response)))
-
-        load_status = "LOAD_NOT_STARTED"
-        all_errors: List[NeptuneBulkLoaderLoadStatusErrorLogEntry] = []
-        while load_status in ("LOAD_IN_PROGRESS", "LOAD_NOT_STARTED", "LOAD_IN_QUEUE"):
-            time.sleep(self.status_polling_period)
-            load_status, errors = self._poll_status(load_id)
-            all_errors.extend(errors)
+        all_errors = self._wait_for_loads(load_ids)
 
         for error in all_errors:
             exception_message = """
@@ -127,6 +157,52 @@ class NeptuneCSVPublisher(Publisher):
             )
             LOGGER.exception(exception_message)
 
+    def _upload_and_load_per_file_group(self, s3_folder_location: str) -> List[str]:
+        """
+        Uploads node files and queues their load, then uploads relation files and queues their load, so uploading
+        relations overlaps with loading nodes. Loads are queued (queueRequest) and run in the order they are queued.
+        """
+        load_ids: List[str] = []
+        for file_paths, group in ((self._get_node_file_paths(), 'nodes'),
+                                  (self._get_relation_file_paths(), 'relations')):
+            if not file_paths:
+                continue
+
+            group_location = f'{s3_folder_location}/{group}'
+            self._upload_file_paths(file_paths, group_location)
+            load_ids.append(self._load(group_location))
+        return load_ids
+
+    def _load(self, s3_object_key: str) -> str:
+        bulk_upload_response = self.neptune_api_client.load(
+            s3_object_key=s3_object_key,
+            queueRequest=True,
+            failOnError=self.fail_on_error
+        )
+
+        try:
+            return bulk_upload_response['payload']['loadId']
+        except KeyError:
+            raise Exception("Failed to load csv. Response: {0}".format(str(bulk_upload_response)))
+
+    def _wait_for_loads(self, load_ids: List[str]) -> List[NeptuneBulkLoaderLoadStatusErrorLogEntry]:
+        """
+        Polls the loads until none of them is in progress anymore. The polling period starts at
+        {status_polling_period} and doubles up to {status_polling_max_period}.
+        """
+        all_errors: List[NeptuneBulkLoaderLoadStatusErrorLogEntry] = []
+        pending_load_ids = list(load_ids)
+        polling_period = self.status_polling_period
+        while pending_load_ids:
+            time.sleep(polling_period)
+            for load_id in list(pending_load_ids):
+                load_status, errors = self._poll_status(load_id)
+                all_errors.extend(errors)
+                if load_status not in NeptuneCSVPublisher.IN_PROGRESS_LOAD_STATUSES:
+                    pending_load_ids.remove(load_id)
+            polling_period = min(polling_period * 2, max(self.status_polling_max_period, self.status_polling_period))
+        return all_errors
+
     def _poll_status(self, load_id: str) -> Tuple[str, List[NeptuneBulkLoaderLoadStatusErrorLogEntry]]:
         load_status_response = self.neptune_api_client.load_status(
             load_id=load_id,
@@ -142,34 +218,85 @@ class NeptuneCSVPublisher(Publisher):
             ))
         return load_status, load_status_payload.get('errors', {}).get('errorLogs', [])
 
-    def _get_file_paths(self) -> List[str]:
-        node_names = [
+    def _get_node_file_paths(self) -> List[str]:
+        return [
             join(self.node_files_dir, f) for f in listdir(self.node_files_dir)
             if isfile(join(self.node_files_dir, f))
         ]
-        edge_names = [
+
+    def _get_relation_file_paths(self) -> List[str]:
+        return [
             join(self.relation_files_dir, f) for f in listdir(self.relation_files_dir)
             if isfile(join(self.relation_files_dir, f))
         ]
-        return node_names + edge_names
+
+    def _get_file_paths(self) -> List[str]:
+        return self._get_node_file_paths() + self._get_relation_file_paths()
 
     def _is_upload_required(self) -> bool:
         file_names = self._get_file_paths()
         return len(file_names) > 0
 
     def upload_files(self, s3_folder_location: str) -> None:
-        file_paths = self._get_file_paths()
-        for file_location in file_paths:
-            with open(file_location, 'rb') as file_csv:
-                file_name = os.path.basename(file_location)
-                s3_object_key = "{s3_folder_location}/{file_name}".format(
-                    s3_folder_location=s3_folder_location,
-                    file_name=file_name
-                )
-                self.neptune_api_client.upload(
-                    f=file_csv,
-                    s3_object_key=s3_object_key
-                )
+        self._upload_file_paths(self._get_file_paths(), s3_folder_location)
+
+    def _upload_file_paths(self, file_paths: List[str], s3_folder_location: str) -> None:
+        """
+        Uploads files concurrently with {upload_max_workers} threads, each file as an S3 multipart upload
+        """
+        with ThreadPoolExecutor(max_workers=self.upload_max_workers) as executor:
+            futures = [executor.submit(self._upload_file, file_location, s3_folder_location)
+                       for file_location in file_paths]
+            for future in futures:
+                future.result()
+
+    def _upload_file(self, file_location: str, s3_folder_location: str) -> None:
+        file_name = os.path.basename(file_location)
+        if record_file.get_file_format(file_location) == record_file.JSONL_FORMAT:
+            # Neptune bulk loader only reads CSV, so typed JSON lines files are converted while uploading
+            file_name = record_file.strip_extension(file_name) + record_file.FILE_EXTENSIONS[record_file.CSV_FORMAT]
+        if self.upload_gzip:
+            file_name = file_name + '.gz'
+
+        s3_object_key = "{s3_folder_location}/{file_name}".format(
+            s3_folder_location=s3_folder_location,
+            file_name=file_name
+        )
+        LOGGER.info('Uploading %s to %s', file_location, s3_object_key)
+        with self._open_csv(file_location) as file_csv:
+            if self.upload_gzip:
+                with self._gzip(file_csv) as file_gz:
+                    self._s3_client.upload_fileobj(file_gz, self.bucket_name, s3_object_key,
+                                                   Config=self.s3_transfer_config)
+            else:
+                self._s3_client.upload_fileobj(file_csv, self.bucket_name, s3_object_key,
+                                               Config=self.s3_transfer_config)
+
+    def _gzip(self, file_in: IO[bytes]) -> IO[bytes]:
+        """
+        Compresses {file_in} into a temporary file, which is deleted once it is closed
+        """
+        file_gz = tempfile.TemporaryFile()
+        with gzip.GzipFile(fileobj=file_gz, mode='wb', compresslevel=6) as gzip_out:
+            shutil.copyfileobj(file_in, gzip_out)
+        file_gz.seek(0)
+        return file_gz
+
+    def _open_csv(self, file_location: str) -> IO[bytes]:
+        """
+        Opens a CSV version of the file for upload. JSON lines files are converted into a temporary file,
+        which is deleted once it is closed.
+        """
+        if record_file.get_file_format(file_location) != record_file.JSONL_FORMAT:
+            return open(file_location, 'rb')
+
+        file_csv = tempfile.TemporaryFile()
+        text_out = io.TextIOWrapper(file_csv, encoding='utf8', newline='')
+        record_file.convert_to_csv(file_location, text_out)
+        text_out.flush()
+        text_out.detach()
+        file_csv.seek(0)
+        return file_csv
 
     def get_scope(self) -> str:
         return 'publisher.neptune_csv_publisher'
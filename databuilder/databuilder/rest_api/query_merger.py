@@ -1,12 +1,14 @@
 # Copyright Contributors to the Amundsen project.
 # SPDX-License-Identifier: Apache-2.0
 
+import threading
 from typing import Any, Dict
 
 from databuilder.rest_api.base_rest_api_query import BaseRestApiQuery
+from databuilder.utils.picklable_lock import PicklableLockMixin
 
 
-class QueryMerger:
+class QueryMerger(PicklableLockMixin):
     """
     To be used in rest_api_query
 
@@ -38,6 +40,11 @@ class QueryMerger:
         self._query_to_merge = query_to_merge
         self._merge_key = merge_key
         self._computed_query_result: Dict[Any, Any] = dict()
+        self._lock = threading.Lock()
+
+    @property
+    def query_to_merge(self) -> BaseRestApiQuery:
+        return self._query_to_merge
 
     def merge_into(self, record_dict: dict) -> None:
         """
@@ -48,7 +55,10 @@ class QueryMerger:
         """
         # compute query results for easy lookup later to find the exact record to merge
         if not self._computed_query_result:
-            self._computed_query_result = self._compute_query_result()
+            # RestApiQuery may merge from several worker threads, the query to merge is only executed once
+            with self._lock:
+                if not self._computed_query_result:
+                    self._computed_query_result = self._compute_query_result()
 
         value_of_merge_key = record_dict.get(self._merge_key)
         record_dict_to_merge = self._computed_query_result.get(value_of_merge_key)
@@ -0,0 +1,144 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from typing import (
+    Any, Callable, Dict, Optional,
+)
+
+import requests
+from pyhocon import ConfigTree
+
+LOGGER = logging.getLogger(__name__)
+
+# Config keys, shared by the extractors that support the response cache
+RESPONSE_CACHE_DIR = 'response_cache_dir'
+RESPONSE_CACHE_MAX_AGE_SEC = 'response_cache_max_age_sec'
+
+
+class ResponseCache(object):
+    """
+    An on-disk cache of HTTP responses, keyed by URL plus query params and request body. Headers are not part of
+    the key, so rotating auth tokens do not invalidate it.
+
+    A cached response is reused without calling the API when:
+      1. the caller passes an {updated_at} value (e.g. last modified time of the dashboard that comes from the
+         previous query) and it is the same as the one the response was cached with, or
+      2. it is younger than {max_age_sec}.
+    Otherwise the request is sent conditionally with If-None-Match / If-Modified-Since when the cached response had
+    an ETag / Last-Modified header, and the cached response is reused when the API answers 304 Not Modified.
+
+    Every entry is a JSON file in {cache_dir}, written atomically, so a cache can be shared by concurrent queries.
+    """
+
+    def __init__(self,
+                 cache_dir: str,
+                 max_age_sec: int = 0) -> None:
+        self._cache_dir = cache_dir
+        self._max_age_sec = max_age_sec
+        os.makedirs(self._cache_dir, exist_ok=True)
+
+    def send(self,
+             send_fn: Callable[..., requests.Response],
+             url: str,
+             updated_at: Any = None,
+             **kwargs: Any) -> requests.Response:
+        """
+        Sends the request through the cache
+        :param send_fn: Function that sends the request, e.g. requests.get, requests.post or Session.get
+        :param url:
+        :param updated_at: Version of the resource known before sending the request, if any
+        :param kwargs: Keyword arguments for {send_fn}
+        :return: The response of the API, or the cached one with status code 200
+        """
+        key = self._get_key(url, kwargs)
+        entry = self._read(key)
+
+        if entry and self._is_fresh(entry, updated_at):
+            LOGGER.debug('Using cached response for URL %s', url)
+            return self._to_response(entry, url)
+
+        if entry:
+            headers = dict(kwargs.get('headers') or {})
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+            kwargs['headers'] = headers
+
+        response = send_fn(url, **kwargs)
+
+        if entry and response.status_code == 304:
+            LOGGER.debug('Response for URL %s is not modified', url)
+            entry['updated_at'] = updated_at
+            entry['cached_at'] = time.time()
+            self._write(key, entry)
+            return self._to_response(entry, url)
+
+        if response.ok:
+            self._write(key, {'url': url,
+                              'etag': response.headers.get('ETag'),
+                              'last_modified': response.headers.get('Last-Modified'),
+                              'updated_at': updated_at,
+                              'cached_at': time.time(),
+                              'content': response.text})
+        return response
+
+    def _is_fresh(self, entry: Dict[str, Any], updated_at: Any) -> bool:
+        if updated_at is not None and entry.get('updated_at') == updated_at:
+            return True
+        return 0 < self._max_age_sec and time.time() - entry['cached_at'] < self._max_age_sec
+
+    @staticmethod
+    def _get_key(url: str, kwargs: Dict[str, Any]) -> str:
+        request = {'url': url, 'params': kwargs.get('params'), 'data': kwargs.get('data'), 'json': kwargs.get('json')}
+        return hashlib.sha256(json.dumps(request, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+    def _get_path(self, key: str) -> str:
+        return os.path.join(self._cache_dir, f'{key}.json')
+
+    def _read(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._get_path(key), 'r', encoding='utf8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            LOGGER.warning('Ignoring corrupted response cache entry %s', self._get_path(key))
+            return None
+
+    def _write(self, key: str, entry: Dict[str, Any]) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=self._cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf8') as f:
+            json.dump(entry, f, default=str)
+        os.replace(tmp_path, self._get_path(key))
+
+    @staticmethod
+    def _to_response(entry: Dict[str, Any], url: str) -> requests.Response:
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response.encoding = 'utf-8'
+        response._content = entry['content'].encode('utf-8')
+        if entry.get('etag'):
+            response.headers['ETag'] = entry['etag']
+        if entry.get('last_modified'):
+            response.headers['Last-Modified'] = entry['last_modified']
+        return response
+
+
+def create_response_cache(conf: ConfigTree) -> Optional[ResponseCache]:
+    """
+    Creates a ResponseCache when {RESPONSE_CACHE_DIR} is configured
+    :param conf:
+    :return:
+    """
+    cache_dir = conf.get_string(RESPONSE_CACHE_DIR, None)
+    if not cache_dir:
+        return None
+    return ResponseCache(cache_dir=cache_dir, max_age_sec=conf.get_int(RESPONSE_CACHE_MAX_AGE_SEC, 0))
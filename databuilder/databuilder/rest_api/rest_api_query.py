@@ -3,19 +3,69 @@
 
 import copy
 import logging
+import threading
+import time
 from typing import (
-    Any, Callable, Dict, Iterator, List, Union,
+    Any, Callable, Dict, Iterator, List, Optional, Tuple, Union,
 )
+from urllib.parse import urlsplit
 
 import requests
 from jsonpath_rw import parse
+from requests.adapters import HTTPAdapter
 from retrying import retry
 
 from databuilder.rest_api.base_rest_api_query import BaseRestApiQuery
 from databuilder.rest_api.query_merger import QueryMerger
+from databuilder.rest_api.response_cache import ResponseCache
+from databuilder.utils.concurrency import map_concurrently
+from databuilder.utils.picklable_lock import PicklableLockMixin
 
 LOGGER = logging.getLogger(__name__)
 
+_pooled_session: Optional[requests.Session] = None
+_pooled_session_lock = threading.Lock()
+
+
+def get_pooled_session(pool_size: int = 10) -> requests.Session:
+    """
+    Returns a requests Session shared by concurrent RestApiQuery instances, so connections to the same host are
+    kept alive and reused across requests.
+    :param pool_size: Max number of connections kept per host, used when the session is created
+    :return:
+    """
+    global _pooled_session
+    with _pooled_session_lock:
+        if _pooled_session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _pooled_session = session
+        return _pooled_session
+
+
+class HostRateLimiter(PicklableLockMixin):
+    """
+    Spaces out requests to the same host so that at most {max_requests_per_sec} are sent per second,
+    whichever thread sends them.
+    """
+
+    def __init__(self, max_requests_per_sec: float) -> None:
+        self._interval = 1.0 / max_requests_per_sec
+        self._next_request_time: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, url: str) -> None:
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            request_time = max(now, self._next_request_time.get(host, now))
+            self._next_request_time[host] = request_time + self._interval
+
+        if request_time > now:
+            time.sleep(request_time - now)
+
 
 class RestApiQuery(BaseRestApiQuery):
     """
@@ -51,6 +101,12 @@ class RestApiQuery(BaseRestApiQuery):
     All extension point is designed for subclass because there's no exact standard on Oauth and pagination.
 
     (How it would work with Tableau/Looker is described in docstring of _authenticate method)
+
+    Requests are sent one record at a time unless max_workers is greater than 1. In that case records of the joined
+    query are fetched ahead on a thread pool, each one on its own copy of this query (so pagination state is not
+    shared), and results are still yielded in the order of the joined query.
+
+    Responses can be cached on disk with a ResponseCache, see set_response_cache.
     """
 
     def __init__(self,
@@ -64,6 +120,11 @@ class RestApiQuery(BaseRestApiQuery):
                  json_path_contains_or: bool = False,
                  can_skip_failure: Callable = None,
                  query_merger: QueryMerger = None,
+                 max_workers: int = 1,
+                 max_requests_per_sec: Optional[float] = None,
+                 session: Optional[requests.Session] = None,
+                 response_cache: Optional[ResponseCache] = None,
+                 updated_at_field: Optional[Union[str, List[str]]] = None,
                  **kwargs: Any
                  ) -> None:
         """
@@ -117,6 +178,16 @@ class RestApiQuery(BaseRestApiQuery):
 
         :param can_skip_failure A function that can determine if it can skip the failure. See BaseFailureHandler for
         the function interface
+        :param max_workers: Number of records of the joined query whose requests are sent concurrently. Uses a
+        pooled session shared with other concurrent queries unless a session is given.
+        :param max_requests_per_sec: Max number of requests per second sent to the same host, across all workers
+        and all the queries this one joins or merges with, see set_rate_limiter.
+        :param session: requests Session used to send requests. requests.get is used when there is none.
+        :param response_cache: Cache of the responses of this query.
+        :param updated_at_field: Field of the record from previous query that holds the last modified time of the
+        resource this query fetches. When it did not change, the cached response is used without calling the API.
+        A list of fields can be given when the response depends on several resources, e.g. a dashboard and the
+        queries of its widgets; the cached response is used while none of them changed.
 
         """
         self._inner_rest_api_query = query_to_join
@@ -134,61 +205,151 @@ class RestApiQuery(BaseRestApiQuery):
         self._can_skip_failure = can_skip_failure
         self._more_pages = False
         self._query_merger = query_merger
+        self._max_workers = max_workers
+        self._session = session
+        if self._max_workers > 1 and not self._session:
+            self._session = get_pooled_session(pool_size=max(self._max_workers, 10))
+        self._rate_limiter: Optional[HostRateLimiter] = None
+        self._response_cache = response_cache
+        self._updated_at_field = updated_at_field
+        if max_requests_per_sec:
+            self.set_rate_limiter(HostRateLimiter(max_requests_per_sec))
+
+    def _get_chained_queries(self) -> List['RestApiQuery']:
+        queries = [self._inner_rest_api_query]
+        if self._query_merger:
+            queries.append(self._query_merger.query_to_merge)
+        return [query for query in queries if isinstance(query, RestApiQuery)]
+
+    def set_response_cache(self, response_cache: Optional[ResponseCache]) -> None:
+        """
+        Sets the response cache of this query and of the queries it joins or merges with
+        :param response_cache:
+        :return:
+        """
+        self._response_cache = response_cache
+        for query in self._get_chained_queries():
+            query.set_response_cache(response_cache)
+
+    def set_max_workers(self, max_workers: int, session: Optional[requests.Session] = None) -> None:
+        """
+        Sets the number of workers of this query and of the queries it joins or merges with. Concurrent queries
+        share the pooled session unless a session is given.
+        :param max_workers:
+        :param session:
+        :return:
+        """
+        self._max_workers = max_workers
+        self._session = session or self._session
+        if self._max_workers > 1 and not self._session:
+            self._session = get_pooled_session(pool_size=max(self._max_workers, 10))
+        for query in self._get_chained_queries():
+            query.set_max_workers(max_workers, session=session)
+
+    def set_rate_limiter(self, rate_limiter: Optional[HostRateLimiter]) -> None:
+        """
+        Sets the rate limiter of this query and of the queries it joins or merges with, so that requests of the
+        whole chain to the same host are limited together
+        :param rate_limiter:
+        :return:
+        """
+        self._rate_limiter = rate_limiter
+        for query in self._get_chained_queries():
+            query.set_rate_limiter(rate_limiter)
 
-    def execute(self) -> Iterator[Dict[str, Any]]:  # noqa: C901
+    def execute(self) -> Iterator[Dict[str, Any]]:
         self._authenticate()
 
+        if self._max_workers > 1:
+            yield from self._execute_concurrently()
+            return
+
         for record_dict in self._inner_rest_api_query.execute():
+            yield from self._execute_record(record_dict)
 
-            first_try = True  # To control pagination. Always pass the while loop on the first try
-            while first_try or self._more_pages:
-                first_try = False
+    def _execute_concurrently(self) -> Iterator[Dict[str, Any]]:
+        """
+        Fetches up to twice {max_workers} records of the joined query ahead and yields their results in order
+        """
+        queries_and_records = ((self._copy_for_record(), record_dict)
+                               for record_dict in self._inner_rest_api_query.execute())
+        for results in map_concurrently(RestApiQuery._execute_copy, queries_and_records, self._max_workers):
+            yield from results
 
-                url = self._preprocess_url(record=record_dict)
+    @staticmethod
+    def _execute_copy(query_and_record: Tuple['RestApiQuery', Dict[str, Any]]) -> List[Dict[str, Any]]:
+        query, record_dict = query_and_record
+        return list(query._execute_record(record_dict))
 
-                try:
-                    response = self._send_request(url=url)
-                except Exception as e:
-                    if self._can_skip_failure and self._can_skip_failure(exception=e):
-                        continue
-                    raise e
+    def _copy_for_record(self) -> 'RestApiQuery':
+        """
+        A copy of this query that keeps its own URL, params and pagination state while serving a single record
+        """
+        query = copy.copy(self)
+        query._params = copy.deepcopy(self._params)
+        return query
 
-                response_json: Union[List[Any], Dict[str, Any]] = response.json()
+    def _execute_record(self, record_dict: Dict[str, Any]) -> Iterator[Dict[str, Any]]:  # noqa: C901
+        """
+        Sends the request(s) for one record of the joined query and yields the resulting records
+        """
+        first_try = True  # To control pagination. Always pass the while loop on the first try
+        while first_try or self._more_pages:
+            first_try = False
 
-                # value extraction via JSON Path
-                result_list: List[Any] = [match.value for match in self._jsonpath_expr.find(response_json)]
+            url = self._preprocess_url(record=record_dict)
+            updated_at = self._get_updated_at(record_dict)
 
-                if not result_list:
-                    log_msg = f'No result from URL: {self._url}, JSONPATH: {self._json_path} , ' \
-                              f'response payload: {response_json}'
-                    LOGGER.info(log_msg)
+            try:
+                response = self._send_request(url=url, updated_at=updated_at)
+            except Exception as e:
+                if self._can_skip_failure and self._can_skip_failure(exception=e):
+                    continue
+                raise e
 
-                    self._post_process(response)
+            response_json: Union[List[Any], Dict[str, Any]] = response.json()
 
-                    if self._fail_no_result:
-                        raise Exception(log_msg)
+            # value extraction via JSON Path
+            result_list: List[Any] = [match.value for match in self._jsonpath_expr.find(response_json)]
 
-                    if self._skip_no_result:
-                        continue
+            if not result_list:
+                log_msg = f'No result from URL: {self._url}, JSONPATH: {self._json_path} , ' \
+                          f'response payload: {response_json}'
+                LOGGER.info(log_msg)
 
-                    yield copy.deepcopy(record_dict)
+                self._post_process(response)
 
-                sub_records = RestApiQuery._compute_sub_records(result_list=result_list,
-                                                                field_names=self._field_names,
-                                                                json_path_contains_or=self._json_path_contains_or)
+                if self._fail_no_result:
+                    raise Exception(log_msg)
 
-                for sub_record in sub_records:
-                    if not sub_record or len(sub_record) != len(self._field_names):
-                        # skip the record
-                        continue
-                    new_record_dict = copy.deepcopy(record_dict)
-                    for field_name in self._field_names:
-                        new_record_dict[field_name] = sub_record.pop(0)
-                    if self._query_merger:
-                        self._query_merger.merge_into(new_record_dict)
-                    yield new_record_dict
+                if self._skip_no_result:
+                    continue
 
-                self._post_process(response)
+                yield copy.copy(record_dict)
+
+            sub_records = RestApiQuery._compute_sub_records(result_list=result_list,
+                                                            field_names=self._field_names,
+                                                            json_path_contains_or=self._json_path_contains_or)
+
+            for sub_record in sub_records:
+                if not sub_record or len(sub_record) != len(self._field_names):
+                    # skip the record
+                    continue
+                new_record_dict = copy.copy(record_dict)
+                for field_name in self._field_names:
+                    new_record_dict[field_name] = sub_record.pop(0)
+                if self._query_merger:
+                    self._query_merger.merge_into(new_record_dict)
+                yield new_record_dict
+
+            self._post_process(response)
+
+    def _get_updated_at(self, record: Dict[str, Any]) -> Any:
+        if not self._updated_at_field:
+            return None
+        if isinstance(self._updated_at_field, str):
+            return record.get(self._updated_at_field)
+        return [record.get(field) for field in self._updated_at_field]
 
     def _preprocess_url(self, record: Dict[str, Any]) -> str:
         """
@@ -199,17 +360,31 @@ class RestApiQuery(BaseRestApiQuery):
         return self._url.format(**record)
 
     @retry(stop_max_attempt_number=5, wait_exponential_multiplier=1000, wait_exponential_max=10000)
-    def _send_request(self, url: str) -> requests.Response:
+    def _send_request(self, url: str, updated_at: Any = None) -> requests.Response:
         """
         Performs HTTP GET operation with retry on failure.
         :param url:
+        :param updated_at: Last modified time of the resource, used by the response cache
         :return:
         """
         LOGGER.info('Calling URL %s', url)
-        response = requests.get(url, **self._params)
+        if self._response_cache:
+            response = self._response_cache.send(self._get, url, updated_at=updated_at, **self._params)
+        else:
+            response = self._get(url, **self._params)
         response.raise_for_status()
         return response
 
+    def _get(self, url: str, **kwargs: Any) -> requests.Response:
+        """
+        Sends the HTTP GET request, once the rate limiter allows it. Responses served by the response cache
+        do not go through here, so they are not rate limited.
+        """
+        if self._rate_limiter:
+            self._rate_limiter.acquire(url)
+        send_fn: Callable[..., requests.Response] = self._session.get if self._session else requests.get
+        return send_fn(url, **kwargs)
+
     @classmethod
     def _compute_sub_records(cls,
                              result_list: List[Any],
@@ -2,7 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 from typing import (
-    Any, Dict, Optional,
+    Any, Dict, Optional, Tuple,
 )
 
 from databuilder.models.graph_node import GraphNode
@@ -13,6 +13,10 @@ from databuilder.models.graph_serializable import (
 )
 from databuilder.publisher.neo4j_csv_publisher import UNQUOTED_SUFFIX
 
+# Serialized header of an attribute, keyed by attribute name and value type. Attribute names and types
+# come from a small fixed set of models, so the header is computed once per shape rather than per value.
+_FORMATTED_KEYS: Dict[Tuple[str, type], str] = {}
+
 
 def serialize_node(node: Optional[GraphNode]) -> Dict[str, Any]:
     if node is None:
@@ -23,9 +27,7 @@ def serialize_node(node: Optional[GraphNode]) -> Dict[str, Any]:
         NODE_KEY: node.key
     }
     for key, value in node.attributes.items():
-        key_suffix = _get_neo4j_suffix_value(value)
-        formatted_key = f'{key}{key_suffix}'
-        node_dict[formatted_key] = value
+        node_dict[_get_formatted_key(key, value)] = value
     return node_dict
 
 
@@ -42,13 +44,20 @@ def serialize_relationship(relationship: Optional[GraphRelationship]) -> Dict[st
         RELATION_REVERSE_TYPE: relationship.reverse_type,
     }
     for key, value in relationship.attributes.items():
-        key_suffix = _get_neo4j_suffix_value(value)
-        formatted_key = f'{key}{key_suffix}'
-        relationship_dict[formatted_key] = value
+        relationship_dict[_get_formatted_key(key, value)] = value
 
     return relationship_dict
 
 
+def _get_formatted_key(key: str, value: Any) -> str:
+    cache_key = (key, type(value))
+    formatted_key = _FORMATTED_KEYS.get(cache_key)
+    if formatted_key is None:
+        formatted_key = f'{key}{_get_neo4j_suffix_value(value)}'
+        _FORMATTED_KEYS[cache_key] = formatted_key
+    return formatted_key
+
+
 def _get_neo4j_suffix_value(value: Any) -> str:
     if isinstance(value, int):
         return UNQUOTED_SUFFIX
@@ -0,0 +1,144 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import logging
+import multiprocessing
+import os
+import shutil
+from typing import (
+    Any, Callable, Dict, List,
+)
+
+from pyhocon import ConfigFactory, ConfigTree
+
+from databuilder import Scoped
+from databuilder.job.base_job import Job
+from databuilder.task.base_task import Task
+from databuilder.utils import record_file
+
+LOGGER = logging.getLogger(__name__)
+
+
+def _run_shard(task_factory: Callable[[], Task], conf: ConfigTree) -> None:
+    """
+    Runs a single shard in a worker process
+    """
+    task = task_factory()
+    task.init(conf)
+    try:
+        task.run()
+    finally:
+        task.close()
+
+
+class ShardedTask(Task):
+    """
+    A task that splits extraction across a process pool. Every shard runs its own task, built by {task_factory},
+    in a separate process with the job config plus the shard's config overrides, e.g. a different schema filter
+    or a hash bucket in the extractor's where clause.
+
+    Each shard loads into its own sub-directory of the directories listed in {output_dir_config_keys}
+    (full config paths of the loader's output directories). Once every shard succeeded the files are moved up
+    into those directories, so a publisher configured with them consumes the union of all shards.
+
+    Workers are forked, so the task factory and the config must be picklable but extractors, loaders and their
+    connections are only ever created inside the worker.
+    """
+    # Config keys
+    MAX_WORKERS = 'max_workers'
+    OUTPUT_DIR_CONFIG_KEYS = 'output_dir_config_keys'
+    SHOULD_DELETE_OUTPUT_DIR = 'delete_output_directories'
+
+    _DEFAULT_CONFIG = ConfigFactory.from_dict({
+        MAX_WORKERS: os.cpu_count() or 1,
+        OUTPUT_DIR_CONFIG_KEYS: [],
+        SHOULD_DELETE_OUTPUT_DIR: True
+    })
+
+    def __init__(self,
+                 task_factory: Callable[[], Task],
+                 shard_confs: List[Dict[str, Any]]) -> None:
+        self._task_factory = task_factory
+        self._shard_confs = shard_confs
+
+    def init(self, conf: ConfigTree) -> None:
+        self.conf = conf
+        scoped_conf = Scoped.get_scoped_conf(conf, self.get_scope()).with_fallback(ShardedTask._DEFAULT_CONFIG)
+
+        self._max_workers = scoped_conf.get_int(ShardedTask.MAX_WORKERS)
+        self._delete_output_dir = scoped_conf.get_bool(ShardedTask.SHOULD_DELETE_OUTPUT_DIR)
+        self._output_dirs = {key: conf.get_string(key)
+                             for key in scoped_conf.get_list(ShardedTask.OUTPUT_DIR_CONFIG_KEYS)}
+
+    def run(self) -> None:
+        """
+        Runs all shards and merges their output
+        """
+        for output_dir in self._output_dirs.values():
+            if os.path.exists(output_dir):
+                raise RuntimeError(f'Directory should not exist: {output_dir}')
+            self._register_delete(output_dir)
+
+        LOGGER.info('Running %i shards with %i workers', len(self._shard_confs), self._max_workers)
+        # A fork context pool rather than ProcessPoolExecutor(mp_context=...), which needs Python 3.7
+        pool = multiprocessing.get_context('fork').Pool(processes=self._max_workers)
+        try:
+            results = [pool.apply_async(_run_shard, (self._task_factory, self._get_shard_conf(index)))
+                       for index in range(len(self._shard_confs))]
+            for result in results:
+                result.get()
+            pool.close()
+        except BaseException:
+            pool.terminate()
+            raise
+        finally:
+            pool.join()
+
+        for output_dir in self._output_dirs.values():
+            self._merge_shard_output(output_dir)
+        LOGGER.info('All %i shards completed', len(self._shard_confs))
+
+    def _get_shard_conf(self, index: int) -> ConfigTree:
+        shard_conf = dict(self._shard_confs[index])
+        for key, output_dir in self._output_dirs.items():
+            shard_conf[key] = self._get_shard_dir(output_dir, index)
+        return ConfigFactory.from_dict(shard_conf).with_fallback(self.conf)
+
+    def _get_shard_dir(self, output_dir: str, index: int) -> str:
+        return os.path.join(output_dir, f'shard_{index}')
+
+    def _merge_shard_output(self, output_dir: str) -> None:
+        """
+        Moves the files of every shard sub-directory into {output_dir}. The shard index is appended to the file
+        name (before its extension) so files with the same label or type from different shards do not collide.
+        """
+        for index in range(len(self._shard_confs)):
+            shard_dir = self._get_shard_dir(output_dir, index)
+            if not os.path.isdir(shard_dir):
+                continue
+
+            for file_name in os.listdir(shard_dir):
+                name = record_file.strip_extension(file_name)
+                if name == file_name:
+                    name, extension = os.path.splitext(file_name)
+                else:
+                    extension = file_name[len(name):]
+                os.replace(os.path.join(shard_dir, file_name),
+                           os.path.join(output_dir, f'{name}-shard{index}{extension}'))
+            os.rmdir(shard_dir)
+
+    def _register_delete(self, path: str) -> None:
+        def _delete_dir() -> None:
+            if not self._delete_output_dir:
+                LOGGER.warning('Skip Deleting directory %s', path)
+                return
+
+            if os.path.exists(path):
+                LOGGER.info('Deleting directory %s', path)
+                shutil.rmtree(path)
+
+        # Directory should be deleted after publish is finished
+        Job.closer.register(_delete_dir)
+
+    def get_scope(self) -> str:
+        return 'task.sharded'
@@ -0,0 +1,80 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED, Executor, Future, ThreadPoolExecutor, wait,
+)
+from typing import (
+    Callable, Deque, Iterable, Iterator, Optional, Set, TypeVar,
+)
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+
+def map_concurrently(fn: Callable[[T], R],
+                     items: Iterable[T],
+                     max_workers: int,
+                     preserve_order: bool = True,
+                     max_in_flight: Optional[int] = None) -> Iterator[R]:
+    """
+    Maps fn over items on a thread pool of {max_workers} threads. Items are consumed lazily and at most
+    {max_in_flight} (twice max_workers by default) are submitted at once, so memory stays bounded for large
+    or lazy inputs. Results are yielded in input order, or as soon as they complete if preserve_order is False.
+    With max_workers of 1 or less items are mapped serially on the calling thread.
+
+    Futures that have not started are cancelled if the caller stops iterating early, and the first exception
+    raised by fn is re-raised to the caller.
+    """
+    if max_workers <= 1:
+        yield from map(fn, items)
+        return
+
+    max_in_flight = max_in_flight or 2 * max_workers
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        if preserve_order:
+            yield from _map_in_order(executor, fn, items, max_in_flight)
+        else:
+            yield from _map_as_completed(executor, fn, items, max_in_flight)
+
+
+def _map_in_order(executor: Executor,
+                  fn: Callable[[T], R],
+                  items: Iterable[T],
+                  max_in_flight: int) -> Iterator[R]:
+    pending: Deque[Future] = deque()
+    try:
+        for item in items:
+            pending.append(executor.submit(fn, item))
+            if len(pending) >= max_in_flight:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def _map_as_completed(executor: Executor,
+                      fn: Callable[[T], R],
+                      items: Iterable[T],
+                      max_in_flight: int) -> Iterator[R]:
+    in_flight: Set[Future] = set()
+    try:
+        for item in items:
+            if len(in_flight) >= max_in_flight:
+                yield from _pop_completed(in_flight)
+            in_flight.add(executor.submit(fn, item))
+        while in_flight:
+            yield from _pop_completed(in_flight)
+    finally:
+        for future in in_flight:
+            future.cancel()
+
+
+def _pop_completed(in_flight: Set[Future]) -> Iterator[R]:
+    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+    in_flight.difference_update(done)
+    for future in done:
+        yield future.result()
@@ -0,0 +1,22 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import threading
+from typing import Any, Dict
+
+
+class PicklableLockMixin(object):
+    """
+    For classes that guard their state with a threading.Lock kept in self._lock. Locks can not be copied or
+    pickled, which happens e.g. when the object is part of a job config, so the lock is left out of the state
+    and a new one is created when the object is restored.
+    """
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
@@ -0,0 +1,164 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Helpers to write and read the intermediate record files that file system loaders hand over to publishers.
+
+Two formats are supported:
+ - csv: a CSV file with a header and non numeric values quoted (default, what publishers always consumed).
+ - jsonl: a gzip compressed JSON lines file. The first line is the list of field names and every following
+   line is the list of values of one record. Values keep their JSON types (int, float, bool, str), so readers do
+   not need to guess them back from text. None is written as '', like in csv.
+"""
+
+import csv
+import gzip
+import json
+import logging
+from typing import (
+    IO, Any, Callable, Dict, Iterable, Iterator, List, Tuple,
+)
+
+import pandas
+
+LOGGER = logging.getLogger(__name__)
+
+CSV_FORMAT = 'csv'
+JSONL_FORMAT = 'jsonl'
+
+FILE_EXTENSIONS = {CSV_FORMAT: '.csv',
+                   JSONL_FORMAT: '.jsonl.gz'}
+
+DEFAULT_WRITE_BATCH_SIZE = 1000
+
+
+class JsonLinesWriter(object):
+    """
+    A csv.DictWriter look-alike that writes records as typed JSON lines. Serialized rows are buffered
+    and written to the underlying file in batches of {batch_size}.
+    """
+
+    def __init__(self,
+                 file_out: IO[str],
+                 fieldnames: Iterable[str],
+                 batch_size: int = DEFAULT_WRITE_BATCH_SIZE) -> None:
+        self._file_out = file_out
+        self.fieldnames = list(fieldnames)
+        self._batch_size = batch_size
+        self._buffer: List[str] = []
+        self._encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'), default=str)
+
+    def writeheader(self) -> None:
+        self._file_out.write(self._encoder.encode(self.fieldnames) + '\n')
+
+    def writerow(self, record_dict: Dict[str, Any]) -> None:
+        # None and missing values are written as '', the way csv.DictWriter writes them, so that both formats
+        # read back the same values
+        values = [record_dict.get(field) for field in self.fieldnames]
+        self._buffer.append(self._encoder.encode(['' if value is None else value for value in values]) + '\n')
+        if len(self._buffer) >= self._batch_size:
+            self.flush()
+
+    def writerows(self, record_dicts: Iterable[Dict[str, Any]]) -> None:
+        for record_dict in record_dicts:
+            self.writerow(record_dict)
+
+    def flush(self) -> None:
+        if self._buffer:
+            self._file_out.writelines(self._buffer)
+            self._buffer = []
+
+
+def get_file_format(file_path: str) -> str:
+    """
+    Infers the record file format from its extension
+    :param file_path:
+    :return: One of CSV_FORMAT, JSONL_FORMAT
+    """
+    if file_path.endswith(FILE_EXTENSIONS[JSONL_FORMAT]):
+        return JSONL_FORMAT
+    return CSV_FORMAT
+
+
+def strip_extension(file_name: str) -> str:
+    """
+    Removes the record file extension, including the compression suffix, from a file name
+    :param file_name:
+    :return:
+    """
+    extension = FILE_EXTENSIONS[get_file_format(file_name)]
+    if file_name.endswith(extension):
+        return file_name[:-len(extension)]
+    return file_name
+
+
+def create_writer(file_path_prefix: str,
+                  fieldnames: Iterable[str],
+                  file_format: str = CSV_FORMAT,
+                  batch_size: int = DEFAULT_WRITE_BATCH_SIZE
+                  ) -> Tuple[Any, Callable[[], None]]:
+    """
+    Creates a record file and a writer for it. The header is already written.
+    :param file_path_prefix: Path of the file without extension
+    :param fieldnames:
+    :param file_format: One of CSV_FORMAT, JSONL_FORMAT
+    :param batch_size: Number of rows buffered before they are written, for JSONL_FORMAT
+    :return: A writer that supports writerow and writerows, and a callable that closes the file
+    """
+    if file_format not in FILE_EXTENSIONS:
+        raise ValueError(f'Unsupported record file format: {file_format}')
+
+    file_path = file_path_prefix + FILE_EXTENSIONS[file_format]
+    if file_format == JSONL_FORMAT:
+        file_out = gzip.open(file_path, 'wt', encoding='utf8', compresslevel=1)
+        writer: Any = JsonLinesWriter(file_out, fieldnames=fieldnames, batch_size=batch_size)
+    else:
+        file_out = open(file_path, 'w', encoding='utf8')
+        writer = csv.DictWriter(file_out, fieldnames=fieldnames, quoting=csv.QUOTE_NONNUMERIC)
+
+    def file_out_close() -> None:
+        LOGGER.info('Closing file IO %s', file_out)
+        if isinstance(writer, JsonLinesWriter):
+            writer.flush()
+        file_out.close()
+
+    writer.writeheader()
+    return writer, file_out_close
+
+
+def read_records(file_path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Reads the records of a record file. JSONL_FORMAT files are streamed line by line, CSV_FORMAT files are
+    parsed with pandas as a whole so column types are inferred across the file, as publishers always did.
+    :param file_path:
+    :return: Iterator of record dicts
+    """
+    if get_file_format(file_path) == JSONL_FORMAT:
+        with gzip.open(file_path, 'rt', encoding='utf8') as file_in:
+            header_line = file_in.readline()
+            if not header_line:
+                return
+            fieldnames = json.loads(header_line)
+            for line in file_in:
+                yield dict(zip(fieldnames, json.loads(line)))
+        return
+
+    with open(file_path, 'r', encoding='utf8') as file_csv:
+        records = pandas.read_csv(file_csv, na_filter=False).to_dict(orient='records')
+    yield from records
+
+
+def convert_to_csv(file_path: str, file_out: IO[str]) -> None:
+    """
+    Writes the records of a JSONL_FORMAT file into {file_out} as CSV, quoting non numeric values
+    :param file_path:
+    :param file_out:
+    :return:
+    """
+    with gzip.open(file_path, 'rt', encoding='utf8') as file_in:
+        header_line = file_in.readline()
+        if not header_line:
+            return
+        writer = csv.writer(file_out, quoting=csv.QUOTE_NONNUMERIC)
+        writer.writerow(json.loads(header_line))
+        writer.writerows(json.loads(line) for line in file_in)
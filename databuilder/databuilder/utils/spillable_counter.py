@@ -0,0 +1,98 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import gzip
+import heapq
+import json
+import logging
+import os
+import shutil
+import tempfile
+from typing import (
+    Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple,
+)
+
+LOGGER = logging.getLogger(__name__)
+
+
+class SpillableCounter(object):
+    """
+    Counts occurrences of tuple keys, e.g. (table, user) pairs. Once more than {max_keys_in_memory} distinct keys are
+    held in memory, the counts are sorted and spilled to a gzip compressed JSON lines run file in {spill_dir}.
+    items() merges the sorted runs and sums the counts of equal keys, so memory stays bounded by
+    {max_keys_in_memory} no matter how many distinct keys there are.
+
+    Key values must be JSON serializable and comparable with each other; keys are rebuilt from their list of values
+    with {key_factory}. With max_keys_in_memory of 0 nothing is ever spilled.
+    """
+
+    def __init__(self,
+                 max_keys_in_memory: int = 0,
+                 key_factory: Callable[[List[Any]], Any] = tuple,
+                 spill_dir: Optional[str] = None) -> None:
+        self._max_keys_in_memory = max_keys_in_memory
+        self._key_factory = key_factory
+        self._spill_dir = spill_dir
+        self._run_dir: Optional[str] = None
+        self._run_paths: List[str] = []
+        self._counts: Dict[Any, int] = {}
+
+    def add(self, key: Tuple, count: int = 1) -> None:
+        self._counts[key] = self._counts.get(key, 0) + count
+        if 0 < self._max_keys_in_memory < len(self._counts):
+            self._spill()
+
+    def update(self, counts: Iterable[Tuple[Any, int]]) -> None:
+        for key, count in counts:
+            self.add(key, count)
+
+    def items(self) -> Iterator[Tuple[Any, int]]:
+        """
+        Iterates over every key with its total count. Keys are in insertion order if nothing was spilled,
+        in sorted order otherwise.
+        """
+        if not self._run_paths:
+            yield from self._counts.items()
+            return
+
+        self._spill()
+        LOGGER.info('Merging %i spilled runs', len(self._run_paths))
+        runs = [self._read_run(path) for path in self._run_paths]
+        current_key: Optional[List[Any]] = None
+        current_count = 0
+        for key, count in heapq.merge(*runs, key=lambda row: row[0]):
+            if key == current_key:
+                current_count += count
+                continue
+            if current_key is not None:
+                yield self._key_factory(current_key), current_count
+            current_key, current_count = key, count
+        if current_key is not None:
+            yield self._key_factory(current_key), current_count
+
+    def close(self) -> None:
+        if self._run_dir:
+            shutil.rmtree(self._run_dir, ignore_errors=True)
+            self._run_dir = None
+        self._run_paths = []
+        self._counts = {}
+
+    def _spill(self) -> None:
+        if not self._counts:
+            return
+
+        if self._run_dir is None:
+            self._run_dir = tempfile.mkdtemp(prefix='spillable_counter_', dir=self._spill_dir)
+        path = os.path.join(self._run_dir, f'run_{len(self._run_paths)}.jsonl.gz')
+        with gzip.open(path, 'wt', encoding='utf-8') as f:
+            for key in sorted(self._counts):
+                f.write(json.dumps([list(key), self._counts[key]]) + '\n')
+        LOGGER.debug('Spilled %i keys to %s', len(self._counts), path)
+        self._run_paths.append(path)
+        self._counts = {}
+
+    @staticmethod
+    def _read_run(path: str) -> Iterator[List[Any]]:
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                yield json.loads(line)
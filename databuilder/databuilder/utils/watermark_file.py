@@ -0,0 +1,58 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Incremental jobs keep their watermark, e.g. the epoch ms the last successful run started at, in a local file.
+The file is only replaced once the new watermark is fully written, so a failed run leaves the previous one.
+
+The watermark of a run is taken before its extraction starts and kept as pending next to the watermark file.
+It only replaces the watermark once the run is published, with commit_pending_watermark.
+"""
+
+import logging
+import os
+import tempfile
+from typing import Optional
+
+LOGGER = logging.getLogger(__name__)
+
+
+def read_watermark(path: str) -> Optional[int]:
+    """
+    :return: The watermark stored in {path}, None if there is none yet
+    """
+    try:
+        with open(path, 'r', encoding='utf8') as f:
+            return int(f.read().strip())
+    except FileNotFoundError:
+        LOGGER.info('No watermark in %s yet', path)
+        return None
+
+
+def write_watermark(path: str, watermark: int) -> None:
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf8') as f:
+        f.write(str(watermark))
+    os.replace(tmp_path, path)
+    LOGGER.info('Stored watermark %i in %s', watermark, path)
+
+
+def get_pending_watermark_path(path: str) -> str:
+    return f'{path}.pending'
+
+
+def commit_pending_watermark(path: str) -> bool:
+    """
+    Replaces the watermark in {path} by the pending one of the current run
+    :return: False if the run has no pending watermark
+    """
+    pending_path = get_pending_watermark_path(path)
+    try:
+        os.replace(pending_path, path)
+    except FileNotFoundError:
+        LOGGER.warning('No pending watermark in %s, the watermark in %s is not updated', pending_path, path)
+        return False
+    LOGGER.info('Committed the pending watermark of %s', path)
+    return True
@@ -74,13 +74,17 @@ atlas = [
     'apache-atlas>=0.0.11'
 ]
 
+dbt = [
+    'ijson>=3.1.0'
+]
+
 rds = [
     'sqlalchemy>=1.3.6,<1.4',
     'mysqlclient>=1.3.6,<3'
 ]
 
 all_deps = requirements + requirements_dev + kafka + cassandra + glue + snowflake + athena + \
-    bigquery + jsonpath + db2 + dremio + druid + spark + feast + neptune + rds + atlas
+    bigquery + jsonpath + db2 + dremio + druid + spark + feast + neptune + rds + atlas + dbt
 
 setup(
     name='amundsen-databuilder',
@@ -111,7 +115,8 @@ setup(
         'delta': spark,
         'feast': feast,
         'atlas': atlas,
-        'rds': rds
+        'rds': rds,
+        'dbt': dbt
     },
     classifiers=[
         'Programming Language :: Python :: 3.6',
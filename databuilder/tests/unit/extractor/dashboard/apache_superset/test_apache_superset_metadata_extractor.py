@@ -76,3 +76,15 @@ class TestApacheSupersetMetadataExtractor(unittest.TestCase):
         self.assertEqual(record._last_modified_timestamp, 1620981665)
         self.assertEqual(record._product, 'superset')
         self.assertEqual(record._cluster, 'gold')
+
+    def test_extractor_passes_changed_on(self) -> None:
+        extractor = self._get_extractor()
+
+        dashboards_response = {'ids': [2], 'result': [{'id': 2, 'changed_on_utc': '2021-05-14T08:41:05.934134+0000'}]}
+        extractor.execute_query = Mock(side_effect=[dashboards_response, dashboard_data_response])
+
+        record = extractor.extract()
+
+        self.assertIsInstance(record, DashboardMetadata)
+        extractor.execute_query.assert_called_with('http://localhost:8088/api/v1/dashboard/2',
+                                                   updated_at='2021-05-14T08:41:05.934134+0000')
@@ -3,13 +3,15 @@
 
 import unittest
 
+from mock import MagicMock
 from pyhocon import ConfigFactory
 
 from databuilder.extractor.restapi.rest_api_extractor import (
-    MODEL_CLASS, REST_API_QUERY, STATIC_RECORD_DICT, RestAPIExtractor,
+    MAX_REQUESTS_PER_SEC, MAX_WORKERS, MODEL_CLASS, REST_API_QUERY, SESSION, STATIC_RECORD_DICT, RestAPIExtractor,
 )
 from databuilder.models.dashboard.dashboard_metadata import DashboardMetadata
 from databuilder.rest_api.base_rest_api_query import RestApiQuerySeed
+from databuilder.rest_api.rest_api_query import RestApiQuery
 
 
 class TestRestAPIExtractor(unittest.TestCase):
@@ -49,3 +51,31 @@ class TestRestAPIExtractor(unittest.TestCase):
                                      dashboard_group_description='doe')
 
         self.assertEqual(expected.__repr__(), record.__repr__())
+
+    def test_concurrency_conf(self) -> None:
+        inner_query = RestApiQuery(query_to_join=RestApiQuerySeed(seed_record=[{'id': '1'}]),
+                                   url='http://foo.bar/{id}', params={}, json_path='foo', field_names=['foo'])
+        query = RestApiQuery(query_to_join=inner_query, url='http://foo.bar/{id}/{foo}', params={},
+                             json_path='bar', field_names=['bar'])
+        session = MagicMock()
+        extractor = RestAPIExtractor()
+        extractor.init(conf=ConfigFactory.from_dict({REST_API_QUERY: query,
+                                                     MAX_WORKERS: 4,
+                                                     SESSION: session,
+                                                     MAX_REQUESTS_PER_SEC: 5}))
+
+        for restapi_query in (query, inner_query):
+            self.assertEqual(restapi_query._max_workers, 4)
+            self.assertIs(restapi_query._session, session)
+        self.assertIsNotNone(query._rate_limiter)
+        self.assertIs(inner_query._rate_limiter, query._rate_limiter)
+
+    def test_concurrency_conf_defaults(self) -> None:
+        query = RestApiQuery(query_to_join=RestApiQuerySeed(seed_record=[{'id': '1'}]),
+                             url='http://foo.bar/{id}', params={}, json_path='foo', field_names=['foo'])
+        extractor = RestAPIExtractor()
+        extractor.init(conf=ConfigFactory.from_dict({REST_API_QUERY: query}))
+
+        self.assertEqual(query._max_workers, 1)
+        self.assertIsNone(query._session)
+        self.assertIsNone(query._rate_limiter)
@@ -0,0 +1,86 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import unittest
+from typing import (
+    Any, Dict, List,
+)
+from unittest.mock import MagicMock, patch
+
+from pyhocon import ConfigFactory
+
+from databuilder.extractor.atlas_search_data_extractor import AtlasSearchDataExtractor
+from databuilder.models.table_elasticsearch_document import TableESDocument
+
+
+def _table_entity(name: str) -> Any:
+    entity = MagicMock()
+    entity._data = {
+        'typeName': 'hive_table',
+        'updateTime': 1000,
+        'attributes': {
+            'qualifiedName': f'db.{name}@gold',
+            'name': name,
+            'description': f'{name} description',
+            'popularityScore': 5,
+        },
+        'relationshipAttributes': {
+            'db': {'displayText': 'db'},
+            'columns': [{'status': 'ACTIVE', 'attributes': {'name': 'col', 'description': 'col description'}}],
+        },
+    }
+    return entity
+
+
+class TestAtlasSearchDataExtractor(unittest.TestCase):
+
+    @patch.object(AtlasSearchDataExtractor, '_get_driver')
+    def setUp(self, mock_driver: Any) -> None:
+        conf = ConfigFactory.from_dict({
+            AtlasSearchDataExtractor.ENTITY_TYPE_KEY: 'Table',
+            AtlasSearchDataExtractor.ATLAS_SEARCH_CHUNK_SIZE_KEY: 2,
+            AtlasSearchDataExtractor.ATLAS_DETAILS_CHUNK_SIZE_KEY: 1,
+            AtlasSearchDataExtractor.PROCESS_POOL_SIZE_KEY: 2,
+        })
+        self.extractor = AtlasSearchDataExtractor()
+        self.extractor.init(conf)
+
+    def test_extract(self) -> None:
+        guids_by_offset = {0: ['t1', 't2'], 2: ['t3', 't4'], 4: ['t5']}
+        details_calls: List[List[str]] = []
+
+        def get_entity_details(guid_list: List[str]) -> List:
+            details_calls.append(guid_list)
+            return [_table_entity(guid) for guid in guid_list]
+
+        with patch.object(self.extractor, '_get_count_of_active_entities', return_value=5), \
+                patch.object(self.extractor, '_get_entity_guids', side_effect=guids_by_offset.get), \
+                patch.object(self.extractor, '_get_entity_details', side_effect=get_entity_details):
+            results: Dict[str, TableESDocument] = {}
+            result = self.extractor.extract()
+            while result:
+                results[result.name] = result
+                result = self.extractor.extract()
+
+        self.assertCountEqual(results.keys(), ['t1', 't2', 't3', 't4', 't5'])
+        self.assertEqual(len(details_calls), 5)
+
+        table = results['t1']
+        self.assertIsInstance(table, TableESDocument)
+        self.assertEqual(table.key, 'hive_table://gold.db/t1')
+        self.assertEqual(table.cluster, 'gold')
+        self.assertEqual(table.display_name, 'db.t1')
+        self.assertEqual(table.column_names, ['col'])
+        self.assertEqual(table.total_usage, 5)
+        self.assertEqual(table.unique_usage, 1)
+
+    def test_compiled_field_mappings(self) -> None:
+        field_mappings = {model_field: atlas_fields_paths
+                          for model_field, atlas_fields_paths, _, _ in self.extractor.compiled_field_mappings}
+
+        self.assertEqual(field_mappings['name'], [['attributes', 'name']])
+        self.assertEqual(field_mappings['key'], [['attributes', 'qualifiedName'], ['typeName']])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -349,3 +349,35 @@ class TestBigQueryMetadataExtractor(unittest.TestCase):
 
         self.assertEqual(count, 1)
         self.assertEqual(table_name, 'date_range_')
+
+    @patch('databuilder.extractor.base_bigquery_extractor.build')
+    def test_concurrent_table_requests(self, mock_build: Any) -> None:
+        table_names = [f'table_{i}' for i in range(10)]
+        table_list = {
+            'kind': 'bigquery#tableList',
+            'tables': [{
+                'kind': 'bigquery#table',
+                'tableReference': {'projectId': 'your-project-here', 'datasetId': 'fdgdfgh', 'tableId': name},
+                'type': 'TABLE'
+            } for name in table_names],
+            'totalItems': len(table_names)
+        }
+        mock_build.return_value = MockBigQueryClient(ONE_DATASET, table_list, TABLE_DATA)
+        config_dict = {
+            f'extractor.bigquery_table_metadata.{BigQueryMetadataExtractor.PROJECT_ID_KEY}': 'your-project-here',
+            f'extractor.bigquery_table_metadata.{BigQueryMetadataExtractor.MAX_WORKERS_KEY}': 3,
+            f'extractor.bigquery_table_metadata.{BigQueryMetadataExtractor.MAX_REQUESTS_PER_SEC_KEY}': 1000
+        }
+        extractor = BigQueryMetadataExtractor()
+        extractor.init(Scoped.get_scoped_conf(conf=ConfigFactory.from_dict(config_dict),
+                                              scope=extractor.get_scope()))
+
+        result = []
+        record = extractor.extract()
+        while record:
+            result.append(record)
+            record = extractor.extract()
+
+        self.assertEqual([table.name for table in result], table_names)
+        self.assertEqual(mock_build.return_value.get_execute.execute.call_count, len(table_names))
+        self.assertIsNotNone(mock_build.return_value.get_execute.execute.call_args[1]['http'])
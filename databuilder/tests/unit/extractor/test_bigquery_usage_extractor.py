@@ -11,6 +11,7 @@ from pyhocon import ConfigFactory
 
 from databuilder import Scoped
 from databuilder.extractor.bigquery_usage_extractor import BigQueryTableUsageExtractor, TableColumnUsageTuple
+from databuilder.utils.spillable_counter import SpillableCounter
 
 CORRECT_DATA = {
     "entries": [{
@@ -398,3 +399,89 @@ class TestBigqueryUsageExtractor(unittest.TestCase):
         self.assertEqual(key.table, 'incidents_2008')
         self.assertEqual(key.email, 'your-user-here@test.com')
         self.assertEqual(value, 1)
+
+    @patch('databuilder.extractor.base_bigquery_extractor.build')
+    def test_concurrent_time_windows(self, mock_build: Any) -> None:
+        config_dict = {
+            f'extractor.bigquery_table_usage.{BigQueryTableUsageExtractor.PROJECT_ID_KEY}': 'bigquery-public-data',
+            f'extractor.bigquery_table_usage.{BigQueryTableUsageExtractor.TIMESTAMP_KEY}': '2019-01-01T00:00:00Z',
+            f'extractor.bigquery_table_usage.{BigQueryTableUsageExtractor.CUTOFF_TIME_KEY}': '2019-01-01T05:00:00Z',
+            f'extractor.bigquery_table_usage.{BigQueryTableUsageExtractor.SHARD_HOURS}': 2,
+            f'extractor.bigquery_table_usage.{BigQueryTableUsageExtractor.MAX_WORKERS_KEY}': 2,
+        }
+        conf = ConfigFactory.from_dict(config_dict)
+
+        client = MockLoggingClient(CORRECT_DATA)
+        mock_build.return_value = client
+        extractor = BigQueryTableUsageExtractor()
+        extractor.init(Scoped.get_scoped_conf(conf=conf,
+                                              scope=extractor.get_scope()))
+
+        filters = sorted(kwargs['body']['filter'] for _, kwargs in client.b.list.call_args_list)
+        self.assertEqual(len(filters), 3)
+        self.assertTrue(filters[0].endswith('timestamp >= "2019-01-01T00:00:00Z" AND '
+                                            'timestamp < "2019-01-01T02:00:00Z"'))
+        self.assertTrue(filters[2].endswith('timestamp >= "2019-01-01T04:00:00Z" AND '
+                                            'timestamp < "2019-01-01T05:00:00Z"'))
+
+        result = extractor.extract()
+        assert result is not None
+        key, value = result
+        self.assertEqual(key.table, 'incidents_2008')
+        self.assertEqual(value, 3)
+        self.assertIsNone(extractor.extract())
+
+    @patch('databuilder.extractor.base_bigquery_extractor.build')
+    def test_concurrent_time_windows_share_memory_limit(self, mock_build: Any) -> None:
+        with tempfile.TemporaryDirectory() as spill_dir, \
+                patch('databuilder.extractor.bigquery_usage_extractor.SpillableCounter',
+                      wraps=SpillableCounter) as mock_counter:
+            config_dict = {
+                f'extractor.bigquery_table_usage.{BigQueryTableUsageExtractor.PROJECT_ID_KEY}': 'bigquery-public-data',
+                f'extractor.bigquery_table_usage.{BigQueryTableUsageExtractor.TIMESTAMP_KEY}': '2019-01-01T00:00:00Z',
+                f'extractor.bigquery_table_usage.{BigQueryTableUsageExtractor.CUTOFF_TIME_KEY}': '2019-01-01T05:00:00Z',
+                f'extractor.bigquery_table_usage.{BigQueryTableUsageExtractor.SHARD_HOURS}': 2,
+                f'extractor.bigquery_table_usage.{BigQueryTableUsageExtractor.MAX_WORKERS_KEY}': 2,
+                f'extractor.bigquery_table_usage.{BigQueryTableUsageExtractor.MAX_KEYS_IN_MEMORY}': 8,
+                f'extractor.bigquery_table_usage.{BigQueryTableUsageExtractor.SPILL_DIR}': spill_dir,
+            }
+            conf = ConfigFactory.from_dict(config_dict)
+
+            mock_build.return_value = MockLoggingClient(CORRECT_DATA)
+            extractor = BigQueryTableUsageExtractor()
+            extractor.init(Scoped.get_scoped_conf(conf=conf,
+                                                  scope=extractor.get_scope()))
+
+            limits = [kwargs['max_keys_in_memory'] for _, kwargs in mock_counter.call_args_list]
+            # the merged counts, then the 3 windows sharing the limit among the 4 windows in flight
+            self.assertEqual(limits, [8, 2, 2, 2])
+            self.assertTrue(all(kwargs['spill_dir'] == spill_dir for _, kwargs in mock_counter.call_args_list))
+
+            result = extractor.extract()
+            assert result is not None
+            self.assertEqual(result[1], 3)
+
+    @patch('databuilder.extractor.bigquery_usage_extractor.sleep')
+    @patch('databuilder.extractor.base_bigquery_extractor.build')
+    def test_retry_with_backoff(self, mock_build: Any, mock_sleep: Any) -> None:
+        config_dict = {
+            f'extractor.bigquery_table_usage.{BigQueryTableUsageExtractor.PROJECT_ID_KEY}': 'bigquery-public-data',
+            f'extractor.bigquery_table_usage.{BigQueryTableUsageExtractor.MIN_DELAY_TIME}': 2,
+            f'extractor.bigquery_table_usage.{BigQueryTableUsageExtractor.DELAY_TIME}': 5,
+        }
+        conf = ConfigFactory.from_dict(config_dict)
+
+        client = MockLoggingClient(CORRECT_DATA)
+        client.a.execute.side_effect = [Exception('Quota exceeded'), Exception('Quota exceeded'),
+                                        Exception('Quota exceeded'), CORRECT_DATA]
+        mock_build.return_value = client
+        extractor = BigQueryTableUsageExtractor()
+        extractor.init(Scoped.get_scoped_conf(conf=conf,
+                                              scope=extractor.get_scope()))
+
+        delays = [args[0] for args, _ in mock_sleep.call_args_list]
+        self.assertEqual(len(delays), 3)
+        self.assertTrue(1 <= delays[0] <= 2)
+        self.assertTrue(2 <= delays[1] <= 4)
+        self.assertTrue(2.5 <= delays[2] <= 5)
+        self.assertIsNotNone(extractor.extract())
@@ -1,6 +1,7 @@
 # Copyright Contributors to the Amundsen project.
 # SPDX-License-Identifier: Apache-2.0
 
+import tempfile
 import unittest
 
 from pyhocon import ConfigFactory
@@ -65,6 +66,54 @@ class TestCsvExtractor(unittest.TestCase):
         result_2 = extractor.extract()
         self.assertEqual([b.name for b in result_2.badges], ['json', 'npi'])
 
+    def test_streaming_extraction_with_model_class(self) -> None:
+        config_dict = {
+            f'extractor.csv.{CsvExtractor.FILE_LOCATION}': 'example/sample_data/sample_table.csv',
+            f'extractor.csv.{CsvExtractor.STREAMING}': True,
+            'extractor.csv.model_class': 'databuilder.models.table_metadata.TableMetadata',
+        }
+        self.conf = ConfigFactory.from_dict(config_dict)
+        extractor = CsvExtractor()
+        extractor.init(Scoped.get_scoped_conf(conf=self.conf,
+                                              scope=extractor.get_scope()))
+
+        self.assertFalse(hasattr(extractor, 'results'))
+        names = []
+        result = extractor.extract()
+        while result:
+            names.append(result.name)
+            result = extractor.extract()
+        self.assertEqual(names[:3], ['test_table1', 'test_table2', 'test_view1'])
+
+    def test_streaming_extraction_table_badges(self) -> None:
+        with tempfile.NamedTemporaryFile('w', suffix='.csv') as table_file:
+            table_file.write('database,cluster,schema,name\ndynamo,gold,test_schema,test_table2\n')
+            table_file.flush()
+
+            for table_file_location in ['example/sample_data/sample_table.csv', table_file.name]:
+                config_dict = {
+                    f'extractor.csvtablebadge.{CsvTableBadgeExtractor.TABLE_FILE_LOCATION}': table_file_location,
+                    f'extractor.csvtablebadge.{CsvTableBadgeExtractor.BADGE_FILE_LOCATION}':
+                    'example/sample_data/sample_badges.csv',
+                    f'extractor.csvtablebadge.{CsvTableBadgeExtractor.STREAMING}': True,
+                }
+                self.conf = ConfigFactory.from_dict(config_dict)
+                extractor = CsvTableBadgeExtractor()
+                extractor.init(Scoped.get_scoped_conf(conf=self.conf,
+                                                      scope=extractor.get_scope()))
+
+                results = {}
+                result = extractor.extract()
+                while result:
+                    if result.badges:
+                        results[result.start_key] = [b.name for b in result.badges]
+                    result = extractor.extract()
+
+                expected = {'dynamo://gold.test_schema/test_table2': ['json', 'npi']}
+                if table_file_location != table_file.name:
+                    expected['hive://gold.test_schema/test_table1'] = ['beta']
+                self.assertEqual(results, expected)
+
     def test_extraction_of_tablecolumn_badges(self) -> None:
         """
         Test Extraction using the combined CsvTableModel model class
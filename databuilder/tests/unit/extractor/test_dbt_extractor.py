@@ -4,7 +4,7 @@
 import json
 import unittest
 from typing import (
-    Any, Optional, Union, no_type_check,
+    Any, Dict, Optional, Union, no_type_check,
 )
 
 import pyhocon
@@ -308,6 +308,32 @@ class TestCsvExtractor(unittest.TestCase):
         result = extractor.extract()
         self.assertEqual(result, None)
 
+    def test_streaming(self) -> None:
+        config_dict: Dict[str, Any] = {
+            f'extractor.dbt.{DbtExtractor.DATABASE_NAME}': self.database_name,
+            f'extractor.dbt.{DbtExtractor.CATALOG_JSON}': self.catalog_file_loc,
+            f'extractor.dbt.{DbtExtractor.MANIFEST_JSON}': self.manifest_data,
+            f'extractor.dbt.{DbtExtractor.SOURCE_URL}': self.source_url
+        }
+        results = []
+        for streaming in [False, True]:
+            config_dict[f'extractor.dbt.{DbtExtractor.STREAMING}'] = streaming
+            extractor = DbtExtractor()
+            extractor.init(Scoped.get_scoped_conf(conf=ConfigFactory.from_dict(config_dict),
+                                                  scope=extractor.get_scope()))
+            extracted = []
+            result = extractor.extract()
+            while result:
+                extracted.append(repr(result))
+                result = extractor.extract()
+            results.append(extracted)
+
+        self.assertTrue(results[0])
+        self.assertEqual(results[0], results[1])
+        self.assertTrue(all(col.keys() == {'name', 'type', 'index'}
+                            for node in extractor._dbt_catalog['nodes'].values()
+                            for col in node['columns'].values()))
+
     def test_invalid_dbt_inputs(self) -> None:
         """
         Test that table level lineage is not extracted from dbt
@@ -243,6 +243,13 @@ class TestDeltaLakeExtractor(unittest.TestCase):
         actual = self.dExtractor.scrape_all_tables(tables)
         self.assertEqual(2, len(actual))
 
+    def test_scrape_tables_as_completed(self) -> None:
+        self.dExtractor.max_workers = 1
+        tables = [Table(name=name, database="test_schema1", description=None, tableType="delta", isTemporary=False)
+                  for name in ["test_table1", "test_table3", "test_table5"]]
+        actual = [t.table for t in self.dExtractor.scrape_tables_as_completed(iter(tables)) if t]
+        self.assertCountEqual(["test_table1", "test_table3"], actual)
+
     def test_scrape_complex_schema_no_config(self) -> None:
         # Don't set the extract_nested_columns config to verify backwards compatibility
         actual = self.dExtractor.fetch_columns(schema="complex_schema", table="struct_table")
@@ -7,7 +7,7 @@ from pyhocon import ConfigFactory
 
 from databuilder import Scoped
 from databuilder.extractor.es_column_stats_extractor import ElasticsearchColumnStatsExtractor
-from databuilder.models.table_stats import TableColumnStats
+from databuilder.models.table_stats import TableColumnStats, TableColumnStatsBatch
 
 
 class TestElasticsearchColumnStatsExtractor(unittest.TestCase):
@@ -129,3 +129,31 @@ class TestElasticsearchColumnStatsExtractor(unittest.TestCase):
             self.assertIsInstance(r, TableColumnStats)
 
         self.assertListEqual(expected, result_spec)
+
+    def test_extractor_with_multi_index_batches(self) -> None:
+        self.config = ConfigFactory.from_dict({
+            'extractor.es_column_stats.schema': 'schema_name',
+            'extractor.es_column_stats.cluster': 'cluster_name',
+            'extractor.es_column_stats.client': Elasticsearch(),
+            f'extractor.es_column_stats.{ElasticsearchColumnStatsExtractor.INDEX_BATCH_SIZE}': 2,
+            f'extractor.es_column_stats.{ElasticsearchColumnStatsExtractor.BATCH_STATS}': True
+        })
+        extractor = self._get_extractor()
+
+        indices = {**self.indices, 'other_index': self.indices['proper_index'],
+                   'keyword_index': {'mappings': {'doc': {'properties': {'keyword_property': {'type': 'keyword'}}}}}}
+        extractor.es.indices.get = MagicMock(return_value=indices)
+        extractor.es.msearch = MagicMock(return_value={'responses': [self.stats, {'error': {'type': 'timeout'}}]})
+
+        result = extractor.extract()
+
+        self.assertIsInstance(result, TableColumnStatsBatch)
+        self.assertEqual(result.table, 'proper_index')
+        self.assertEqual(result.col_names, ['long_property'] * 3)
+        self.assertEqual(result.stat_types, ['avg', 'sum', 'count'])
+        self.assertEqual(result.stat_vals, [5, 10, 2])
+        self.assertIsNone(extractor.extract())
+
+        body = extractor.es.msearch.call_args[1]['body']
+        self.assertEqual([header for header in body[::2]], [{'index': 'proper_index'}, {'index': 'other_index'}])
+        self.assertEqual(body[1]['aggs']['stats']['matrix_stats']['fields'], ['long_property'])
@@ -3,8 +3,11 @@
 
 import logging
 import unittest
+from typing import (
+    Any, Dict, List,
+)
 
-from mock import patch
+from mock import MagicMock, patch
 from pyhocon import ConfigFactory
 
 from databuilder.extractor.glue_extractor import GlueExtractor
@@ -240,6 +243,70 @@ class TestGlueExtractor(unittest.TestCase):
             self.assertIsNone(extractor.extract())
             self.assertIsNone(extractor.extract())
 
+    def test_search_tables_pages(self) -> None:
+        extractor = GlueExtractor()
+        extractor.init(self.conf)
+        extractor._glue = MagicMock()
+        extractor._glue.search_tables.side_effect = [
+            {'TableList': [{'Name': 'test_table1'}], 'NextToken': 'token'},
+            {'TableList': [{'Name': 'test_table2'}]},
+        ]
+
+        tables = extractor._search_tables()
+        self.assertEqual(next(tables)['Name'], 'test_table1')
+        self.assertEqual(extractor._glue.search_tables.call_count, 1)
+        self.assertEqual(next(tables)['Name'], 'test_table2')
+        extractor._glue.search_tables.assert_called_with(NextToken='token')
+
+    def test_extraction_with_max_workers(self) -> None:
+        extractor = GlueExtractor()
+        extractor.init(ConfigFactory.from_dict({GlueExtractor.MAX_WORKERS_KEY: 2}))
+        extractor._glue = MagicMock()
+
+        def _table(database: str, name: str) -> Dict[str, Any]:
+            return {'Name': name, 'DatabaseName': database,
+                    'StorageDescriptor': {'Columns': [{'Name': 'col', 'Type': 'varchar'}]}}
+
+        tables_by_database: Dict[str, List[List[Dict[str, Any]]]] = {
+            'test_schema1': [[_table('test_schema1', 'test_table1')], [_table('test_schema1', 'test_table2')]],
+            'test_schema2': [[_table('test_schema2', 'test_table3')]],
+            'test_schema3': [[]],
+        }
+
+        def get_paginator(operation: str) -> Any:
+            paginator = MagicMock()
+            if operation == 'get_databases':
+                paginator.paginate.return_value = [{'DatabaseList': [{'Name': name} for name in tables_by_database]}]
+            else:
+                paginator.paginate.side_effect = lambda DatabaseName: [
+                    {'TableList': page} for page in tables_by_database[DatabaseName]
+                ]
+            return paginator
+
+        extractor._glue.get_paginator.side_effect = get_paginator
+
+        results = []
+        result = extractor.extract()
+        while result:
+            results.append(f'{result.schema}.{result.name}')
+            result = extractor.extract()
+
+        self.assertCountEqual(results, ['test_schema1.test_table1', 'test_schema1.test_table2',
+                                        'test_schema2.test_table3'])
+        extractor._glue.search_tables.assert_not_called()
+
+    def test_extraction_with_max_workers_failure(self) -> None:
+        extractor = GlueExtractor()
+        extractor.init(ConfigFactory.from_dict({GlueExtractor.MAX_WORKERS_KEY: 2}))
+        extractor._glue = MagicMock()
+        extractor._glue.get_paginator.return_value.paginate.side_effect = [
+            [{'DatabaseList': [{'Name': 'test_schema1'}]}],
+            RuntimeError('access denied'),
+        ]
+
+        with self.assertRaises(RuntimeError):
+            extractor.extract()
+
 
 if __name__ == '__main__':
     unittest.main()
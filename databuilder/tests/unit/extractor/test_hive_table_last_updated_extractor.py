@@ -127,6 +127,61 @@ class TestHiveTableLastUpdatedExtractor(unittest.TestCase):
 
             self.assertIsNone(extractor.extract())
 
+    def test_extraction_with_batched_listing(self) -> None:
+        old_datetime = datetime(2018, 8, 14, 4, 12, 3, tzinfo=UTC)
+        new_datetime = datetime(2018, 11, 14, 4, 12, 3, tzinfo=UTC)
+
+        fs = MagicMock()
+        fs.strip_protocol = MagicMock(side_effect=lambda path: path.replace('s3://', '').rstrip('/'))
+        fs.find_files = MagicMock(return_value=[
+            FileMetadata(path='bucket/db/table_1/part-0', last_updated=old_datetime, size=10),
+            FileMetadata(path='bucket/db/table_2/part-0', last_updated=old_datetime, size=10),
+            FileMetadata(path='bucket/db/table_2/part-1', last_updated=new_datetime, size=10),
+            FileMetadata(path='bucket/db/table_1/_tmp/part-2', last_updated=new_datetime, size=10),
+        ])
+        fs.ls_files = MagicMock(return_value=[
+            FileMetadata(path='bucket/other/table_4/part-0', last_updated=new_datetime, size=10)
+        ])
+
+        pt_alchemy_extractor_instance = MagicMock()
+        non_pt_alchemy_extractor_instance = MagicMock()
+
+        with patch.object(HiveTableLastUpdatedExtractor, '_get_partitioned_table_sql_alchemy_extractor',
+                          return_value=pt_alchemy_extractor_instance), \
+            patch.object(HiveTableLastUpdatedExtractor, '_get_non_partitioned_table_sql_alchemy_extractor',
+                         return_value=non_pt_alchemy_extractor_instance), \
+            patch.object(HiveTableLastUpdatedExtractor, '_get_filesystem',
+                         return_value=fs):
+            pt_alchemy_extractor_instance.extract = MagicMock(return_value=None)
+
+            non_pt_alchemy_extractor_instance.extract = MagicMock(side_effect=null_iterator([
+                {'schema': 'db', 'table_name': 'table_1', 'location': 's3://bucket/db/table_1'},
+                {'schema': 'db', 'table_name': 'table_2', 'location': 's3://bucket/db/table_2/'},
+                {'schema': 'db', 'table_name': 'table_3', 'location': 's3://bucket/db/table_3'},
+                {'schema': 'other', 'table_name': 'table_4', 'location': 's3://bucket/other/table_4'},
+                {'schema': 'other', 'table_name': 'table_5', 'location': None},
+            ]))
+
+            extractor = HiveTableLastUpdatedExtractor()
+            extractor.init(ConfigFactory.from_dict({
+                HiveTableLastUpdatedExtractor.LIST_FILES_WITH_DETAIL: True,
+                HiveTableLastUpdatedExtractor.BATCH_LISTING_MIN_TABLES: 2,
+                HiveTableLastUpdatedExtractor.FS_TARGET_LATENCY_SEC: 5,
+                # table_3 is probed in the second window, from the listing of bucket/db cached by the first one
+                HiveTableLastUpdatedExtractor.PROBE_WINDOW_SIZE: 2,
+            }))
+
+            result = []
+            record = extractor.extract()
+            while record:
+                result.append(record)
+                record = extractor.extract()
+
+            self.assertEqual([(record.table_name, record.last_updated_time) for record in result],
+                             [('table_1', 1534219923), ('table_2', 1542168723), ('table_4', 1542168723)])
+            fs.find_files.assert_called_once_with('bucket/db', 2)
+            fs.ls_files.assert_called_once_with('s3://bucket/other/table_4')
+
 
 if __name__ == '__main__':
     unittest.main()
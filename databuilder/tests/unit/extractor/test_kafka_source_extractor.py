@@ -3,7 +3,9 @@
 
 import logging
 import unittest
+from typing import Any
 
+from confluent_kafka import TopicPartition
 from mock import MagicMock, patch
 from pyhocon import ConfigFactory
 
@@ -50,3 +52,41 @@ class TestKafkaSourceExtractor(unittest.TestCase):
 
             records = kafka_extractor.consume()
             self.assertEqual(len(records), 0)
+
+    @staticmethod
+    def _create_message(value: str, partition: int, offset: int) -> Any:
+        msg = MagicMock()
+        msg.error.return_value = None
+        msg.value.return_value = value
+        msg.topic.return_value = 'test-topic'
+        msg.partition.return_value = partition
+        msg.offset.return_value = offset
+        return msg
+
+    def test_streaming(self) -> None:
+        self.conf.put(f'extractor.kafka_source.{KafkaSourceExtractor.STREAMING}', True)
+        self.conf.put(f'extractor.kafka_source.{KafkaSourceExtractor.CONSUMER_BATCH_SIZE}', 2)
+        self.conf.put(f'extractor.kafka_source.{KafkaSourceExtractor.MAX_RECORDS_PER_RUN}', 3)
+        kafka_extractor = KafkaSourceExtractor()
+        kafka_extractor.init(Scoped.get_scoped_conf(conf=self.conf,
+                                                    scope=kafka_extractor.get_scope()))
+
+        with patch.object(kafka_extractor, 'consumer') as mock_consumer:
+            mock_consumer.consume.side_effect = [
+                [self._create_message('msg1', 0, 10), self._create_message('msg2', 1, 20)],
+                [self._create_message('msg3', 0, 11)],
+            ]
+
+            self.assertEqual(kafka_extractor.extract(), 'msg1')
+            self.assertEqual(mock_consumer.consume.call_count, 1)
+            self.assertEqual(kafka_extractor.extract(), 'msg2')
+            self.assertEqual(kafka_extractor.extract(), 'msg3')
+            self.assertIsNone(kafka_extractor.extract())
+
+            self.assertEqual(mock_consumer.consume.call_args_list[1][1]['num_messages'], 1)
+
+            kafka_extractor.on_success()
+            mock_consumer.commit.assert_called_once_with(offsets=[TopicPartition('test-topic', 0, 12),
+                                                                  TopicPartition('test-topic', 1, 21)],
+                                                         asynchronous=False)
+            mock_consumer.close.assert_called_once()
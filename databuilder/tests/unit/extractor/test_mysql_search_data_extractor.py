@@ -93,7 +93,8 @@ class MyTestCase(unittest.TestCase):
                              tags=['test_tag'],
                              badges=['test_badge'],
                              schema_description='test_schema_description',
-                             programmatic_descriptions=['test_table_prog_description'])
+                             programmatic_descriptions=['test_table_prog_description'],
+                             name_suggest={'input': ['test_table', 'test_schema.test_table'], 'weight': 15})
 
         config_dict = {
             f'extractor.mysql_search_data.{MySQLSearchDataExtractor.CONN_STRING}': 'test_conn_string',
@@ -149,7 +150,9 @@ class MyTestCase(unittest.TestCase):
                              is_active=True,
                              total_read=30,
                              total_own=2,
-                             total_follow=2)
+                             total_follow=2,
+                             name_suggest={'input': ['test_full_name', 'test_last_name', 'test_user@email.com'],
+                                           'weight': 30})
 
         config_dict = {
             f'extractor.mysql_search_data.{MySQLSearchDataExtractor.CONN_STRING}': 'test_conn_string',
@@ -230,7 +233,8 @@ class MyTestCase(unittest.TestCase):
                              last_successful_run_timestamp=123456789,
                              total_usage=15,
                              tags=['test_tag'],
-                             badges=['test_badge'])
+                             badges=['test_badge'],
+                             name_suggest={'input': ['test_dashboard'], 'weight': 15})
 
         config_dict = {
             f'extractor.mysql_search_data.{MySQLSearchDataExtractor.CONN_STRING}': 'test_conn_string',
@@ -252,6 +256,46 @@ class MyTestCase(unittest.TestCase):
         self.assertIsInstance(actual_obj, DashboardESDocument)
         self.assertDictEqual(vars(actual_obj), expected_dict)
 
+    @patch.object(mysql_search_data_extractor, '_table_search_query')
+    @patch.object(mysql_search_data_extractor, 'sessionmaker')
+    @patch.object(mysql_search_data_extractor, 'create_engine')
+    def test_table_search_keyset_pagination(self,
+                                            mock_create_engine: Any,
+                                            mock_session_maker: Any,
+                                            mock_table_search_query: Any) -> None:
+        config_dict = {
+            f'extractor.mysql_search_data.{MySQLSearchDataExtractor.CONN_STRING}': 'test_conn_string',
+            f'extractor.mysql_search_data.{MySQLSearchDataExtractor.ENTITY_TYPE}': 'table',
+            f'extractor.mysql_search_data.{MySQLSearchDataExtractor.QUERY_LIMIT}': 2
+        }
+        self.conf = ConfigFactory.from_dict(config_dict)
+
+        extractor = MySQLSearchDataExtractor()
+        extractor.init(Scoped.get_scoped_conf(conf=self.conf,
+                                              scope=extractor.get_scope()))
+
+        first_page = [MagicMock(rk='table_1'), MagicMock(rk='table_2')]
+        second_page = [MagicMock(rk='table_3')]
+        mock_table_search_query.side_effect = [first_page, second_page]
+
+        # the first page is yielded before the second one is queried
+        record = extractor.extract()
+        assert record is not None
+        self.assertEqual(record['key'], 'table_1')
+        self.assertEqual(mock_table_search_query.call_count, 1)
+
+        keys = []
+        for _ in range(2):
+            record = extractor.extract()
+            assert record is not None
+            keys.append(record['key'])
+        self.assertEqual(keys, ['table_2', 'table_3'])
+        self.assertIsNone(extractor.extract())
+
+        session = mock_session_maker.return_value.return_value
+        self.assertEqual([call[0][2] for call in mock_table_search_query.call_args_list], [None, 'table_2'])
+        session.close.assert_called_once()
+
 
 if __name__ == '__main__':
     unittest.main()
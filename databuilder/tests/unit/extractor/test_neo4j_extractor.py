@@ -4,7 +4,7 @@
 import unittest
 from typing import Any
 
-from mock import patch
+from mock import MagicMock, patch
 from pyhocon import ConfigFactory
 
 from databuilder import Scoped
@@ -118,5 +118,72 @@ class TestNeo4jExtractor(unittest.TestCase):
             extractor.results = [result_dict]
             result_obj = extractor.extract()
 
+            expected_dict = dict(result_dict,
+                                 name_suggest={'input': ['test_table_name', 'test_schema.test_table_name'],
+                                               'weight': 100})
+
             self.assertIsInstance(result_obj, TableESDocument)
-            self.assertDictEqual(vars(result_obj), result_dict)
+            self.assertDictEqual(vars(result_obj), expected_dict)
+
+    def test_extraction_streams_records_inside_transaction(self: Any) -> None:
+        """
+        Test records are pulled lazily inside a read transaction using the configured fetch size and timeout
+        """
+        config_dict = {
+            f'extractor.neo4j.{Neo4jExtractor.GRAPH_URL_CONFIG_KEY}': 'TEST_GRAPH_URL',
+            f'extractor.neo4j.{Neo4jExtractor.CYPHER_QUERY_CONFIG_KEY}': 'TEST_QUERY',
+            f'extractor.neo4j.{Neo4jExtractor.NEO4J_AUTH_USER}': 'TEST_USER',
+            f'extractor.neo4j.{Neo4jExtractor.NEO4J_AUTH_PW}': 'TEST_PW',
+            f'extractor.neo4j.{Neo4jExtractor.NEO4J_FETCH_SIZE}': 50,
+            f'extractor.neo4j.{Neo4jExtractor.NEO4J_TRANSACTION_TIMEOUT_SEC}': 30
+        }
+        self.conf = ConfigFactory.from_dict(config_dict)
+
+        with patch.object(Neo4jExtractor, '_get_driver') as mock_get_driver:
+            session = mock_get_driver.return_value.session.return_value.__enter__.return_value
+            tx = session.begin_transaction.return_value.__enter__.return_value
+            tx.run.return_value = iter(['test_result1', 'test_result2'])
+
+            extractor = Neo4jExtractor()
+            extractor.init(Scoped.get_scoped_conf(conf=self.conf,
+                                                  scope=extractor.get_scope()))
+
+            self.assertEqual(extractor.extract(), 'test_result1')
+            session.begin_transaction.assert_called_once_with(timeout=30)
+            tx.run.assert_called_once_with('TEST_QUERY')
+            self.assertEqual(mock_get_driver.return_value.session.call_args[1]['fetch_size'], 50)
+            session.begin_transaction.return_value.__exit__.assert_not_called()
+
+            self.assertEqual(extractor.extract(), 'test_result2')
+            self.assertIsNone(extractor.extract())
+            session.begin_transaction.return_value.__exit__.assert_called_once()
+
+    def test_extraction_with_model_batches(self: Any) -> None:
+        """
+        Test model objects are built a batch at a time
+        """
+        config_dict = {
+            f'extractor.neo4j.{Neo4jExtractor.GRAPH_URL_CONFIG_KEY}': 'TEST_GRAPH_URL',
+            f'extractor.neo4j.{Neo4jExtractor.CYPHER_QUERY_CONFIG_KEY}': 'TEST_QUERY',
+            f'extractor.neo4j.{Neo4jExtractor.NEO4J_AUTH_USER}': 'TEST_USER',
+            f'extractor.neo4j.{Neo4jExtractor.NEO4J_AUTH_PW}': 'TEST_PW',
+            f'extractor.neo4j.{Neo4jExtractor.MODEL_CLASS_CONFIG_KEY}': 'builtins.dict',
+            f'extractor.neo4j.{Neo4jExtractor.MODEL_BATCH_SIZE_CONFIG_KEY}': 2
+        }
+        self.conf = ConfigFactory.from_dict(config_dict)
+
+        with patch.object(Neo4jExtractor, '_get_driver'):
+            extractor = Neo4jExtractor()
+            extractor.init(Scoped.get_scoped_conf(conf=self.conf,
+                                                  scope=extractor.get_scope()))
+            extractor.model_class = MagicMock(side_effect=lambda **kwargs: kwargs)
+
+            extractor.results = [{'key': 'k1'}, {'key': 'k2'}, {'key': 'k3'}]
+
+            self.assertEqual(extractor.extract(), {'key': 'k1'})
+            self.assertEqual(extractor.model_class.call_count, 2)
+
+            self.assertEqual(extractor.extract(), {'key': 'k2'})
+            self.assertEqual(extractor.extract(), {'key': 'k3'})
+            self.assertEqual(extractor.model_class.call_count, 3)
+            self.assertIsNone(extractor.extract())
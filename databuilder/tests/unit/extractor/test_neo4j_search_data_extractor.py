@@ -1,16 +1,27 @@
 # Copyright Contributors to the Amundsen project.
 # SPDX-License-Identifier: Apache-2.0
 
+import os
+import tempfile
+import threading
 import unittest
 from typing import Any
 
-from mock import patch
+from mock import MagicMock, patch
 from pyhocon import ConfigFactory
 
 from databuilder import Scoped
 from databuilder.extractor.neo4j_extractor import Neo4jExtractor
 from databuilder.extractor.neo4j_search_data_extractor import Neo4jSearchDataExtractor
+from databuilder.job.job import DefaultJob
+from databuilder.loader.file_system_elasticsearch_json_loader import FSElasticsearchJSONLoader
+from databuilder.models.user_elasticsearch_document import UserESDocument
+from databuilder.publisher.elasticsearch_publisher import ElasticsearchPublisher
 from databuilder.publisher.neo4j_csv_publisher import JOB_PUBLISH_TAG
+from databuilder.task.task import DefaultTask
+from databuilder.utils.watermark_file import (
+    get_pending_watermark_path, read_watermark, write_watermark,
+)
 
 
 class TestNeo4jExtractor(unittest.TestCase):
@@ -58,6 +69,170 @@ class TestNeo4jExtractor(unittest.TestCase):
                              Neo4jSearchDataExtractor.DEFAULT_NEO4J_DASHBOARD_CYPHER_QUERY.format
                              (publish_tag_filter="""WHERE dashboard.published_tag = 'test-date'"""))
 
+    def test_incremental_search_query(self: Any) -> None:
+        with patch.object(Neo4jExtractor, '_get_driver'):
+            extractor = Neo4jSearchDataExtractor()
+            conf = ConfigFactory.from_dict({
+                f'extractor.search_data.extractor.neo4j.{Neo4jExtractor.GRAPH_URL_CONFIG_KEY}': 'test-endpoint',
+                f'extractor.search_data.extractor.neo4j.{Neo4jExtractor.NEO4J_AUTH_USER}': 'test-user',
+                f'extractor.search_data.extractor.neo4j.{Neo4jExtractor.NEO4J_AUTH_PW}': 'test-passwd',
+                f'extractor.search_data.{Neo4jSearchDataExtractor.ENTITY_TYPE}': 'user',
+                f'extractor.search_data.{Neo4jSearchDataExtractor.INCREMENTAL_SINCE_EPOCH_MS}': 1000,
+            })
+            extractor.init(Scoped.get_scoped_conf(conf=conf,
+                                                  scope=extractor.get_scope()))
+
+            self.assertEqual(extractor.cypher_query,
+                             Neo4jSearchDataExtractor.DEFAULT_NEO4J_USER_CYPHER_QUERY.format
+                             (publish_tag_filter='WHERE (user.publisher_last_updated_epoch_ms >= 1000 '
+                                                 'OR ANY(updated IN [(user)-[r]-() | r] '
+                                                 'WHERE updated.publisher_last_updated_epoch_ms >= 1000))'))
+
+    def test_incremental_search_query_from_watermark(self: Any) -> None:
+        with patch.object(Neo4jExtractor, '_get_driver'), tempfile.TemporaryDirectory() as directory, \
+                patch.object(Neo4jSearchDataExtractor, '_get_server_epoch_ms', return_value=2000):
+            watermark_path = os.path.join(directory, 'watermark')
+            write_watermark(watermark_path, 1000)
+            extractor = Neo4jSearchDataExtractor()
+            conf = ConfigFactory.from_dict({
+                f'extractor.search_data.extractor.neo4j.{Neo4jExtractor.GRAPH_URL_CONFIG_KEY}': 'test-endpoint',
+                f'extractor.search_data.extractor.neo4j.{Neo4jExtractor.NEO4J_AUTH_USER}': 'test-user',
+                f'extractor.search_data.extractor.neo4j.{Neo4jExtractor.NEO4J_AUTH_PW}': 'test-passwd',
+                f'extractor.search_data.{Neo4jSearchDataExtractor.ENTITY_TYPE}': 'user',
+                f'extractor.search_data.{Neo4jSearchDataExtractor.INCREMENTAL_WATERMARK_PATH}': watermark_path,
+            })
+            extractor.init(Scoped.get_scoped_conf(conf=conf,
+                                                  scope=extractor.get_scope()))
+
+            self.assertIn('user.publisher_last_updated_epoch_ms >= 1000', extractor.cypher_query)
+            # the next watermark is only pending until the extracted data is published
+            self.assertEqual(read_watermark(watermark_path), 1000)
+            self.assertEqual(read_watermark(get_pending_watermark_path(watermark_path)), 2000)
+
+    def test_full_search_query_without_watermark(self: Any) -> None:
+        with patch.object(Neo4jExtractor, '_get_driver'), tempfile.TemporaryDirectory() as directory, \
+                patch.object(Neo4jSearchDataExtractor, '_get_server_epoch_ms', return_value=2000):
+            extractor = Neo4jSearchDataExtractor()
+            conf = ConfigFactory.from_dict({
+                f'extractor.search_data.extractor.neo4j.{Neo4jExtractor.GRAPH_URL_CONFIG_KEY}': 'test-endpoint',
+                f'extractor.search_data.extractor.neo4j.{Neo4jExtractor.NEO4J_AUTH_USER}': 'test-user',
+                f'extractor.search_data.extractor.neo4j.{Neo4jExtractor.NEO4J_AUTH_PW}': 'test-passwd',
+                f'extractor.search_data.{Neo4jSearchDataExtractor.ENTITY_TYPE}': 'user',
+                f'extractor.search_data.{Neo4jSearchDataExtractor.INCREMENTAL_WATERMARK_PATH}':
+                    os.path.join(directory, 'watermark'),
+            })
+            extractor.init(Scoped.get_scoped_conf(conf=conf,
+                                                  scope=extractor.get_scope()))
+
+            self.assertEqual(extractor.cypher_query,
+                             Neo4jSearchDataExtractor.DEFAULT_NEO4J_USER_CYPHER_QUERY.format(publish_tag_filter=''))
+
+    def test_watermark_of_job(self: Any) -> None:
+        """
+        The job publishes after the extraction has finished, the committed watermark is still the Neo4j time
+        from before the extraction
+        """
+        user = UserESDocument(email='test@email.com', first_name='test', last_name='user', full_name='test user',
+                              github_username='', team_name='', employee_type='', manager_email='', slack_id='',
+                              role_name='', is_active=True, total_read=0, total_own=0, total_follow=0)
+        with tempfile.TemporaryDirectory() as directory, patch.object(Neo4jExtractor, '_get_driver'), \
+                patch.object(Neo4jExtractor, 'extract', side_effect=[{'epoch_ms': 1000}, user, None]):
+            watermark_path = os.path.join(directory, 'watermark')
+            data_path = os.path.join(directory, 'search_data.json')
+            mock_es_client = MagicMock()
+            conf = ConfigFactory.from_dict({
+                f'extractor.search_data.extractor.neo4j.{Neo4jExtractor.GRAPH_URL_CONFIG_KEY}': 'test-endpoint',
+                f'extractor.search_data.extractor.neo4j.{Neo4jExtractor.NEO4J_AUTH_USER}': 'test-user',
+                f'extractor.search_data.extractor.neo4j.{Neo4jExtractor.NEO4J_AUTH_PW}': 'test-passwd',
+                f'extractor.search_data.{Neo4jSearchDataExtractor.ENTITY_TYPE}': 'user',
+                f'extractor.search_data.{Neo4jSearchDataExtractor.INCREMENTAL_WATERMARK_PATH}': watermark_path,
+                f'loader.filesystem.elasticsearch.{FSElasticsearchJSONLoader.FILE_PATH_CONFIG_KEY}': data_path,
+                f'publisher.elasticsearch.{ElasticsearchPublisher.FILE_PATH_CONFIG_KEY}': data_path,
+                f'publisher.elasticsearch.{ElasticsearchPublisher.FILE_MODE_CONFIG_KEY}': 'r',
+                f'publisher.elasticsearch.{ElasticsearchPublisher.ELASTICSEARCH_CLIENT_CONFIG_KEY}': mock_es_client,
+                f'publisher.elasticsearch.{ElasticsearchPublisher.ELASTICSEARCH_DOC_TYPE_CONFIG_KEY}': 'user',
+                f'publisher.elasticsearch.{ElasticsearchPublisher.ELASTICSEARCH_NEW_INDEX_CONFIG_KEY}': 'unused',
+                f'publisher.elasticsearch.{ElasticsearchPublisher.ELASTICSEARCH_ALIAS_CONFIG_KEY}': 'user_search_index',
+                f'publisher.elasticsearch.{ElasticsearchPublisher.ELASTICSEARCH_INCREMENTAL_CONFIG_KEY}': True,
+                f'publisher.elasticsearch.{ElasticsearchPublisher.ELASTICSEARCH_ID_FIELD_CONFIG_KEY}': 'email',
+                f'publisher.elasticsearch.{ElasticsearchPublisher.ELASTICSEARCH_WATERMARK_PATH_CONFIG_KEY}':
+                    watermark_path,
+            })
+            job = DefaultJob(conf=conf,
+                             task=DefaultTask(extractor=Neo4jSearchDataExtractor(), loader=FSElasticsearchJSONLoader()),
+                             publisher=ElasticsearchPublisher())
+            job.launch()
+
+            mock_es_client.bulk.assert_called_once()
+            self.assertEqual(read_watermark(watermark_path), 1000)
+            self.assertFalse(os.path.exists(get_pending_watermark_path(watermark_path)))
+
+    def test_incremental_filter_with_related_nodes(self: Any) -> None:
+        extractor = Neo4jSearchDataExtractor()
+        extractor.entity = 'feature'
+        actual = extractor._add_publish_tag_filter('foo', 'MATCH (feature:Feature) {publish_tag_filter} RETURN feature',
+                                                   since_epoch_ms=1000)
+
+        self.assertEqual(actual, "MATCH (feature:Feature) WHERE feature.published_tag = 'foo' AND "
+                                 "(feature.publisher_last_updated_epoch_ms >= 1000 "
+                                 "OR ANY(updated IN [(feature)-[r]-() | r] "
+                                 "WHERE updated.publisher_last_updated_epoch_ms >= 1000) "
+                                 "OR ANY(updated IN [(feature)-[:DESCRIPTION]->(n) | n] "
+                                 "WHERE updated.publisher_last_updated_epoch_ms >= 1000)) RETURN feature")
+
+    def test_partitioned_extraction(self: Any) -> None:
+        with patch.object(Neo4jExtractor, '_get_driver'):
+            extractor = Neo4jSearchDataExtractor()
+            conf = ConfigFactory.from_dict({
+                f'extractor.search_data.extractor.neo4j.{Neo4jExtractor.GRAPH_URL_CONFIG_KEY}': 'test-endpoint',
+                f'extractor.search_data.extractor.neo4j.{Neo4jExtractor.NEO4J_AUTH_USER}': 'test-user',
+                f'extractor.search_data.extractor.neo4j.{Neo4jExtractor.NEO4J_AUTH_PW}': 'test-passwd',
+                f'extractor.search_data.{Neo4jSearchDataExtractor.ENTITY_TYPE}': 'user',
+                f'extractor.search_data.{Neo4jSearchDataExtractor.PARTITION_COUNT}': 2,
+            })
+            extractor.init(Scoped.get_scoped_conf(conf=conf,
+                                                  scope=extractor.get_scope()))
+
+            first_partition, second_partition = extractor.partition_extractors
+            self.assertTrue(first_partition.cypher_query.startswith(
+                '\nMATCH (user:User) WHERE id(user) % 2 = 0\nWITH user\nMATCH (user:User)\n'))
+            self.assertIn('MATCH (user:User) WHERE id(user) % 2 = 1\nWITH user', second_partition.cypher_query)
+            self.assertNotIn('order by', first_partition.cypher_query)
+
+            first_partition.results = ['user_1', 'user_3']
+            second_partition.results = ['user_2']
+
+            results = []
+            result = extractor.extract()
+            while result:
+                results.append(result)
+                result = extractor.extract()
+
+            self.assertCountEqual(results, ['user_1', 'user_2', 'user_3'])
+
+    def test_partitioned_extraction_stops_threads_on_close(self: Any) -> None:
+        with patch.object(Neo4jExtractor, '_get_driver'):
+            extractor = Neo4jSearchDataExtractor()
+            conf = ConfigFactory.from_dict({
+                f'extractor.search_data.extractor.neo4j.{Neo4jExtractor.GRAPH_URL_CONFIG_KEY}': 'test-endpoint',
+                f'extractor.search_data.extractor.neo4j.{Neo4jExtractor.NEO4J_AUTH_USER}': 'test-user',
+                f'extractor.search_data.extractor.neo4j.{Neo4jExtractor.NEO4J_AUTH_PW}': 'test-passwd',
+                f'extractor.search_data.{Neo4jSearchDataExtractor.ENTITY_TYPE}': 'user',
+                f'extractor.search_data.{Neo4jSearchDataExtractor.PARTITION_COUNT}': 2,
+                f'extractor.search_data.{Neo4jSearchDataExtractor.PARTITION_BUFFER_SIZE}': 1,
+            })
+            extractor.init(Scoped.get_scoped_conf(conf=conf,
+                                                  scope=extractor.get_scope()))
+
+            for partition in extractor.partition_extractors:
+                partition.results = [f'user_{i}' for i in range(100)]
+
+            self.assertIsNotNone(extractor.extract())
+            extractor.close()
+
+            self.assertFalse([thread for thread in threading.enumerate()
+                              if thread.name.startswith('neo4j-search-data-partition')])
+
 
 if __name__ == '__main__':
     unittest.main()
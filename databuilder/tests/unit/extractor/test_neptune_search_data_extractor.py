@@ -0,0 +1,82 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import unittest
+from typing import (
+    Any, Dict, List, Optional,
+)
+from unittest.mock import MagicMock, patch
+
+from pyhocon import ConfigFactory
+
+from databuilder import Scoped
+from databuilder.extractor import neptune_search_data_extractor
+from databuilder.extractor.neptune_search_data_extractor import NeptuneSearchDataExtractor
+
+
+class TestNeptuneSearchDataExtractor(unittest.TestCase):
+
+    def _init_extractor(self, mock_client: Any, config_dict: Dict[str, Any]) -> NeptuneSearchDataExtractor:
+        mock_client.return_value.get_scope.return_value = 'neptune.client'
+        conf = ConfigFactory.from_dict({
+            f'extractor.neptune_search_data.{key}': value for key, value in config_dict.items()
+        })
+        extractor = NeptuneSearchDataExtractor()
+        extractor.init(Scoped.get_scoped_conf(conf=conf, scope=extractor.get_scope()))
+        return extractor
+
+    @patch.object(neptune_search_data_extractor, 'NeptuneSessionClient')
+    def test_extract(self, mock_client: Any) -> None:
+        def query_function(graph: Any, tag_filter: str) -> List[Dict]:
+            return [{'key': 'table_1'}, {'key': 'table_2'}]
+
+        extractor = self._init_extractor(mock_client, {
+            NeptuneSearchDataExtractor.QUERY_FUNCTION_CONFIG_KEY: query_function,
+            NeptuneSearchDataExtractor.JOB_PUBLISH_TAG_CONFIG_KEY: 'test_tag',
+        })
+
+        self.assertEqual(extractor.extract(), {'key': 'table_1'})
+        self.assertEqual(extractor.extract(), {'key': 'table_2'})
+        self.assertIsNone(extractor.extract())
+
+    @patch.object(neptune_search_data_extractor, 'NeptuneSessionClient')
+    def test_extract_paged(self, mock_client: Any) -> None:
+        queried_pages = []
+
+        def query_function(graph: Any, tag_filter: str, ids: Optional[List[str]] = None) -> List[Dict]:
+            queried_pages.append(ids)
+            return [{'key': key} for key in ids or []]
+
+        ids = ['table_1', 'table_2', 'table_3']
+        id_windows = []
+
+        def id_range(start: int, end: int) -> MagicMock:
+            id_windows.append((start, end))
+            window = MagicMock()
+            window.toList.return_value = ids[start:end]
+            return window
+
+        mock_vertices = MagicMock()
+        mock_vertices.return_value.id.return_value.order.return_value.range.side_effect = id_range
+
+        extractor = self._init_extractor(mock_client, {
+            NeptuneSearchDataExtractor.QUERY_FUNCTION_CONFIG_KEY: query_function,
+            NeptuneSearchDataExtractor.JOB_PUBLISH_TAG_CONFIG_KEY: 'test_tag',
+            NeptuneSearchDataExtractor.PAGE_SIZE_CONFIG_KEY: 2,
+        })
+
+        with patch.dict(NeptuneSearchDataExtractor.DEFAULT_VERTICES_BY_ENTITY, {'table': mock_vertices}):
+            results = []
+            result = extractor.extract()
+            while result:
+                results.append(result)
+                result = extractor.extract()
+
+        mock_vertices.assert_called_with(mock_client.return_value.get_graph.return_value, 'test_tag')
+        self.assertEqual(id_windows, [(0, 2), (2, 4)])
+        self.assertCountEqual(queried_pages, [['table_1', 'table_2'], ['table_3']])
+        self.assertCountEqual(results, [{'key': 'table_1'}, {'key': 'table_2'}, {'key': 'table_3'}])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,7 +6,7 @@ from pyhocon import ConfigFactory
 
 from databuilder import Scoped
 from databuilder.extractor.pandas_profiling_column_stats_extractor import PandasProfilingColumnStatsExtractor
-from databuilder.models.table_stats import TableColumnStats
+from databuilder.models.table_stats import TableColumnStats, TableColumnStatsBatch
 
 
 class TestPandasProfilingColumnStatsExtractor(unittest.TestCase):
@@ -85,3 +85,22 @@ class TestPandasProfilingColumnStatsExtractor(unittest.TestCase):
             self.assertIsInstance(r, TableColumnStats)
 
         self.assertListEqual(expected, result_spec)
+
+    def test_extractor_batch_stats(self) -> None:
+        self.config = ConfigFactory.from_dict({
+            f'extractor.pandas_profiling.{PandasProfilingColumnStatsExtractor.BATCH_STATS}': True
+        }).with_fallback(self.config)
+        extractor = self._get_extractor()
+
+        extractor._load_report = MagicMock(return_value=self.report_data)
+
+        result = extractor.extract()
+
+        self.assertIsInstance(result, TableColumnStatsBatch)
+        self.assertEqual(result.col_names, ['column_1', 'column_1', 'column_2'])
+        self.assertEqual(result.stat_types, ['Mean', 'Maximum', 'Mean'])
+        self.assertEqual(result.stat_vals, [5.12, 15.235, 10.0])
+        self.assertEqual(result.start_epoch, '1621246215')
+        self.assertEqual((result.db, result.cluster, result.schema, result.table),
+                         ('database_name', 'cluster_name', 'schema_name', 'table_name'))
+        self.assertIsNone(extractor.extract())
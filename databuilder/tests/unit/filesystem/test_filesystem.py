@@ -45,6 +45,32 @@ class TestFileSystem(unittest.TestCase):
 
         self.assertEqual(metadata.__repr__(), expected.__repr__())
 
+    def test_ls_files(self) -> None:
+        last_updated = datetime(2018, 8, 14, 4, 12, 3, tzinfo=UTC)
+        dask_fs = MagicMock()
+        dask_fs.ls = MagicMock(return_value=[
+            {'name': 'bucket/foo/bar', 'type': 'file', 'LastModified': last_updated, 'Size': 15093},
+            {'name': 'bucket/foo/baz', 'type': 'directory', 'Size': 0}
+        ])
+        dask_fs.find = MagicMock(return_value={
+            'bucket/foo/baz/qux': {'name': 'bucket/foo/baz/qux', 'type': 'file', 'LastModified': last_updated,
+                                   'Size': 10}
+        })
+        dask_fs._strip_protocol = MagicMock(side_effect=lambda path: path.replace('s3://', ''))
+        fs = FileSystem()
+        conf = ConfigFactory.from_dict({FileSystem.DASK_FILE_SYSTEM: dask_fs})
+        fs.init(conf=conf)
+
+        files = fs.ls_files('s3://bucket/foo')
+        self.assertEqual(repr(files), repr([FileMetadata(path='bucket/foo/bar', last_updated=last_updated,
+                                                         size=15093)]))
+        fs._dask_fs.ls.assert_called_once_with('s3://bucket/foo', detail=True)
+
+        files = fs.find_files('s3://bucket/foo')
+        self.assertEqual([file.path for file in files], ['bucket/foo/baz/qux'])
+
+        self.assertEqual(fs.strip_protocol('s3://bucket/foo/'), 'bucket/foo')
+
 
 if __name__ == '__main__':
     unittest.main()
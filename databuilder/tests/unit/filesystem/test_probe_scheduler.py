@@ -0,0 +1,65 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import unittest
+from typing import Any, Dict
+
+from databuilder.filesystem.probe_scheduler import AdaptiveConcurrencyLimiter, is_throttling_error
+
+
+class SlowDown(Exception):
+    pass
+
+
+class ClientError(Exception):
+    def __init__(self, response: Dict[str, Any]) -> None:
+        super(ClientError, self).__init__(str(response))
+        self.response = response
+
+
+class TestAdaptiveConcurrencyLimiter(unittest.TestCase):
+
+    def test_adapts_limit(self) -> None:
+        limiter = AdaptiveConcurrencyLimiter(min_concurrency=1, max_concurrency=3, target_latency_sec=10,
+                                             increase_every=2)
+        for _ in range(6):
+            with limiter.acquire():
+                pass
+        self.assertEqual(limiter.limit, 3)
+
+        with self.assertRaises(SlowDown):
+            with limiter.acquire():
+                raise SlowDown('Please reduce your request rate.')
+        self.assertEqual(limiter.limit, 1)
+
+        with self.assertRaises(ValueError):
+            with limiter.acquire():
+                raise ValueError('not throttled')
+        self.assertEqual(limiter.limit, 1)
+
+    def test_is_throttling_error(self) -> None:
+        self.assertTrue(is_throttling_error(SlowDown()))
+        self.assertFalse(is_throttling_error(FileNotFoundError('foo')))
+        self.assertFalse(is_throttling_error(FileNotFoundError('bucket/db/table/part-503')))
+
+    def test_is_throttling_error_by_code(self) -> None:
+        unavailable = ClientError({'Error': {'Code': 'ServiceUnavailable'},
+                                   'ResponseMetadata': {'HTTPStatusCode': 503}})
+        slow_down = ClientError({'Error': {'Code': 'SlowDown'}, 'ResponseMetadata': {'HTTPStatusCode': 400}})
+        denied = ClientError({'Error': {'Code': 'AccessDenied'}, 'ResponseMetadata': {'HTTPStatusCode': 403}})
+        self.assertTrue(is_throttling_error(unavailable))
+        self.assertTrue(is_throttling_error(slow_down))
+        self.assertFalse(is_throttling_error(denied))
+
+        # e.g. s3fs raises OSError from the ClientError
+        try:
+            try:
+                raise slow_down
+            except ClientError as e:
+                raise OSError('Please reduce your request rate.') from e
+        except OSError as e:
+            self.assertTrue(is_throttling_error(e))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -113,6 +113,7 @@ class TestFSElasticsearchJSONLoader(unittest.TestCase):
              '"description": "test_description", "unique_usage": 5, "total_usage": 10, '
              '"tags": ["test_tag1", "test_tag2"], "schema_description": "schema description", '
              '"programmatic_descriptions": ["test"], '
+             '"name_suggest": {"input": ["test_table", "test_schema.test_table"], "weight": 10}, '
              '"badges": ["badge1"]}')
         ]
 
@@ -155,6 +156,7 @@ class TestFSElasticsearchJSONLoader(unittest.TestCase):
              '"description": "test_description", "unique_usage": 5, "total_usage": 10, '
              '"tags": ["test_tag1", "test_tag2"], "schema_description": "schema_description", '
              '"programmatic_descriptions":["test"], '
+             '"name_suggest": {"input": ["test_table", "test_schema.test_table"], "weight": 10}, '
              '"badges": ["badge1"]}')
         ] * 5
 
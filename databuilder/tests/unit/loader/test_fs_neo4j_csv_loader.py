@@ -20,6 +20,7 @@ from databuilder.loader.file_system_neo4j_csv_loader import FsNeo4jCSVLoader
 from databuilder.models.graph_serializable import (
     GraphNode, GraphRelationship, GraphSerializable,
 )
+from databuilder.utils import record_file
 from tests.unit.models.test_graph_serializable import (
     Actor, City, Movie,
 )
@@ -82,6 +83,36 @@ class TestFsNeo4jCSVLoader(unittest.TestCase):
                                           itemgetter('KEY'))
         self.assertEqual(expected_nodes, actual_nodes)
 
+    def test_load_jsonl(self) -> None:
+        actors = [Actor('Tom Cruise'), Actor('Meg Ryan')]
+        cities = [City('San Diego'), City('Oakland')]
+        movie = Movie('Top Gun', actors, cities)
+
+        loader = FsNeo4jCSVLoader()
+
+        folder = 'movies'
+        conf = ConfigFactory.from_dict({
+            FsNeo4jCSVLoader.FILE_FORMAT: record_file.JSONL_FORMAT
+        }).with_fallback(self._make_conf('movies_jsonl'))
+
+        loader.init(conf)
+        loader.load(movie)
+        loader.close()
+
+        node_dir = conf.get_string(FsNeo4jCSVLoader.NODE_DIR_PATH)
+        self.assertTrue(all(f.endswith('.jsonl.gz') for f in listdir(node_dir)))
+
+        expected_node_path = os.path.join(here, f'../resources/fs_neo4j_csv_loader/{folder}/nodes')
+        expected_nodes = self._get_csv_rows(expected_node_path, itemgetter('KEY'))
+        actual_nodes = self._get_jsonl_rows(node_dir, itemgetter('KEY'))
+        self.assertEqual(expected_nodes, actual_nodes)
+
+        expected_rel_path = os.path.join(here, f'../resources/fs_neo4j_csv_loader/{folder}/relationships')
+        expected_relations = self._get_csv_rows(expected_rel_path, itemgetter('START_KEY', 'END_KEY'))
+        actual_relations = self._get_jsonl_rows(conf.get_string(FsNeo4jCSVLoader.RELATION_DIR_PATH),
+                                                itemgetter('START_KEY', 'END_KEY'))
+        self.assertEqual(expected_relations, actual_relations)
+
     def _make_conf(self, test_name: str) -> ConfigTree:
         prefix = '/var/tmp/TestFsNeo4jCSVLoader'
 
@@ -105,6 +136,18 @@ class TestFsNeo4jCSVLoader(unittest.TestCase):
 
         return sorted(result, key=sorting_key_getter)
 
+    def _get_jsonl_rows(self,
+                        path: str,
+                        sorting_key_getter: Callable) -> Iterable[Dict[str, Any]]:
+        files = [join(path, f) for f in listdir(path) if isfile(join(path, f))]
+
+        result = []
+        for f in files:
+            for row in record_file.read_records(f):
+                result.append(collections.OrderedDict(sorted((k, str(v)) for k, v in row.items())))
+
+        return sorted(result, key=sorting_key_getter)
+
 
 class Person(GraphSerializable):
     """ A Person has multiple optional attributes. When an attribute is None,
@@ -44,7 +44,7 @@ class TestDashboardElasticsearchDocument(unittest.TestCase):
                                   "total_usage": 10,
                                   "tags": ["test"],
                                   "badges": ["test_badge"],
-
+                                  "name_suggest": {"input": ["test_dashboard_name"], "weight": 10}
                                   }
 
         result = test_obj.to_json()
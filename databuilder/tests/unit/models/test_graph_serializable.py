@@ -54,6 +54,29 @@ class TestSerialize(unittest.TestCase):
         ]
         self.assertEqual(expected, actual)
 
+    def test_serialize_attribute_types(self) -> None:
+        node = GraphNode(key='movie://Top Gun', label='Movie', attributes={'rank': 'top'})
+        self.assertEqual(neo4_serializer.serialize_node(node),
+                         {'LABEL': 'Movie', 'KEY': 'movie://Top Gun', 'rank': 'top'})
+
+        # The same attribute name with a different value type gets its own header
+        node = GraphNode(key='movie://Top Gun', label='Movie', attributes={'rank': 1})
+        self.assertEqual(neo4_serializer.serialize_node(node),
+                         {'LABEL': 'Movie', 'KEY': 'movie://Top Gun', 'rank:UNQUOTED': 1})
+
+    def test_validate_label(self) -> None:
+        movie = Movie('Top Gun', [], [])
+        movie.create_next_node = lambda: GraphNode(key='movie://Top Gun', label='movie', attributes={})  # type: ignore
+        with self.assertRaises(RuntimeError):
+            movie.next_node()
+
+        # A label that was already validated is still checked against other values
+        movie.create_next_node = lambda: GraphNode(key='movie://Top Gun', label='Movie', attributes={})  # type: ignore
+        self.assertEqual(movie.next_node().label, 'Movie')  # type: ignore
+        movie.create_next_node = lambda: GraphNode(key='movie://Top Gun', label='MOVIE', attributes={})  # type: ignore
+        with self.assertRaises(RuntimeError):
+            movie.next_node()
+
 
 class Actor(object):
     LABEL = 'Actor'
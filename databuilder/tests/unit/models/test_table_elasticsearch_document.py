@@ -44,7 +44,8 @@ class TestTableElasticsearchDocument(unittest.TestCase):
                                   "tags": ["test"],
                                   "programmatic_descriptions": ['test'],
                                   "badges": ["badge1"],
-                                  'schema_description': 'schema description'
+                                  'schema_description': 'schema description',
+                                  "name_suggest": {"input": ["test_table", "test_schema.test_table"], "weight": 100}
                                   }
 
         result = test_obj.to_json()
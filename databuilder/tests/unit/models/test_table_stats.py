@@ -2,13 +2,16 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import unittest
+from typing import (
+    Any, Callable, List, Tuple,
+)
 from unittest.mock import ANY
 
 from databuilder.models.graph_serializable import (
     NODE_KEY, NODE_LABEL, RELATION_END_KEY, RELATION_END_LABEL, RELATION_REVERSE_TYPE, RELATION_START_KEY,
     RELATION_START_LABEL, RELATION_TYPE,
 )
-from databuilder.models.table_stats import TableColumnStats
+from databuilder.models.table_stats import TableColumnStats, TableColumnStatsBatch
 from databuilder.serializers import (
     mysql_serializer, neo4_serializer, neptune_serializer,
 )
@@ -176,3 +179,47 @@ class TestTableStats(unittest.TestCase):
             record = self.table_stats.create_next_record()
 
         self.assertEqual(actual, expected)
+
+
+class TestTableColumnStatsBatch(unittest.TestCase):
+
+    def setUp(self) -> None:
+        super(TestTableColumnStatsBatch, self).setUp()
+        self.stats: List[Tuple[str, str, Any]] = [('col', 'avg', 1.5), ('col', 'max', 3), ('other_col', 'avg', '2')]
+        self.table_stats_batch = TableColumnStatsBatch(table_name='base.test',
+                                                       col_names=[col for col, _, _ in self.stats],
+                                                       stat_names=[stat for _, stat, _ in self.stats],
+                                                       stat_vals=[val for _, _, val in self.stats],
+                                                       start_epoch='1',
+                                                       end_epoch='2')
+        self.table_stats = [TableColumnStats(table_name='base.test', col_name=col, stat_name=stat, stat_val=val,
+                                             start_epoch='1', end_epoch='2') for col, stat, val in self.stats]
+
+    def test_same_output_as_table_column_stats(self) -> None:
+        self.assertEqual(len(self.table_stats_batch), 3)
+
+        serializers: List[Tuple[str, Callable[[Any], Any]]] = [
+            ('create_next_node', neo4_serializer.serialize_node),
+            ('create_next_relation', neo4_serializer.serialize_relationship),
+            ('create_next_record', mysql_serializer.serialize_record),
+        ]
+        for create_next, serialize in serializers:
+            expected = []
+            for table_stats in self.table_stats:
+                item = getattr(table_stats, create_next)()
+                while item:
+                    expected.append(serialize(item))
+                    item = getattr(table_stats, create_next)()
+
+            actual = []
+            item = getattr(self.table_stats_batch, create_next)()
+            while item:
+                actual.append(serialize(item))
+                item = getattr(self.table_stats_batch, create_next)()
+
+            self.assertEqual(actual, expected)
+
+    def test_lengths_should_match(self) -> None:
+        with self.assertRaises(ValueError):
+            TableColumnStatsBatch(table_name='test', col_names=['col'], stat_names=['avg', 'max'], stat_vals=[1],
+                                  start_epoch='1', end_epoch='2', schema='base')
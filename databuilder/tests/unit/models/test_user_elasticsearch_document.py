@@ -42,6 +42,8 @@ class TestUserElasticsearchDocument(unittest.TestCase):
                                   'github_username': "github_user",
                                   "employee_type": 'fte',
                                   "email": "test@email.com",
+                                  "name_suggest": {"input": ["full_name", "test_lastname", "test@email.com"],
+                                                   "weight": 2}
                                   }
 
         result = test_obj.to_json()
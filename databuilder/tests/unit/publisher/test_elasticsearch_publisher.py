@@ -115,3 +115,84 @@ class TestElasticsearchPublisher(unittest.TestCase):
                 {'actions': [{"add": {"index": self.test_es_new_index, "alias": self.test_es_alias}},
                              {"remove_index": {"index": 'test_old_index'}}]}
             )
+
+    def test_publish_incremental(self) -> None:
+        """
+        Test Publish functionality in incremental mode, documents are upserted and deleted through the alias
+        """
+        mock_data = json.dumps({'key': 'test_key', 'name': 'test_name'})
+        self.conf.put('publisher.elasticsearch.incremental', True)
+        self.conf.put('publisher.elasticsearch.id_field', 'key')
+        self.conf.put('publisher.elasticsearch.delete_ids', ['deleted_key'])
+
+        with patch('builtins.open', mock_open(read_data=mock_data)):
+            publisher = ElasticsearchPublisher()
+            publisher.init(conf=Scoped.get_scoped_conf(conf=self.conf,
+                                                       scope=publisher.get_scope()))
+            publisher.publish()
+
+            self.mock_es_client.indices.create.assert_not_called()
+            self.mock_es_client.indices.update_aliases.assert_not_called()
+            self.assertEqual(self.mock_es_client.bulk.call_args_list[0][0][0],
+                             [{'index': {'_type': self.test_doc_type, '_index': self.test_es_alias,
+                                         '_id': 'test_key'}},
+                              {'key': 'test_key', 'name': 'test_name'}])
+            self.assertEqual(self.mock_es_client.bulk.call_args_list[1][0][0],
+                             [{'delete': {'_type': self.test_doc_type, '_index': self.test_es_alias,
+                                          '_id': 'deleted_key'}}])
+
+    def test_publish_incremental_deletes_stale_documents(self) -> None:
+        """
+        Test documents of entities the current ids extractor does not return are deleted, and the pending
+        watermark is committed after publishing
+        """
+        mock_data = json.dumps({'key': 'test_key', 'name': 'test_name'})
+        current_ids_extractor = MagicMock()
+        current_ids_extractor.extract.side_effect = [{'key': 'test_key'}, 'other_key', None]
+        self.conf.put('publisher.elasticsearch.incremental', True)
+        self.conf.put('publisher.elasticsearch.id_field', 'key')
+        self.conf.put('publisher.elasticsearch.current_ids_extractor', current_ids_extractor)
+        self.conf.put('publisher.elasticsearch.incremental_watermark_path', '/tmp/watermark')
+
+        with patch('builtins.open', mock_open(read_data=mock_data)), \
+                patch('databuilder.publisher.elasticsearch_publisher.scan') as mock_scan, \
+                patch('databuilder.publisher.elasticsearch_publisher.commit_pending_watermark') as mock_commit:
+            mock_scan.return_value = [{'_id': 'test_key'}, {'_id': 'other_key'}, {'_id': 'stale_key'}]
+            publisher = ElasticsearchPublisher()
+            publisher.init(conf=Scoped.get_scoped_conf(conf=self.conf,
+                                                       scope=publisher.get_scope()))
+            publisher.publish()
+
+            current_ids_extractor.close.assert_called_once()
+            self.assertEqual(self.mock_es_client.bulk.call_args_list[1][0][0],
+                             [{'delete': {'_type': self.test_doc_type, '_index': self.test_es_alias,
+                                          '_id': 'stale_key'}}])
+            mock_commit.assert_called_once_with('/tmp/watermark')
+
+    def test_publish_incremental_without_current_ids(self) -> None:
+        """
+        Test nothing is deleted when the current ids extractor returns no id
+        """
+        current_ids_extractor = MagicMock()
+        current_ids_extractor.extract.return_value = None
+        self.conf.put('publisher.elasticsearch.incremental', True)
+        self.conf.put('publisher.elasticsearch.id_field', 'key')
+        self.conf.put('publisher.elasticsearch.current_ids_extractor', current_ids_extractor)
+
+        with patch('builtins.open', mock_open(read_data='')), \
+                patch('databuilder.publisher.elasticsearch_publisher.scan') as mock_scan:
+            publisher = ElasticsearchPublisher()
+            publisher.init(conf=Scoped.get_scoped_conf(conf=self.conf,
+                                                       scope=publisher.get_scope()))
+            publisher.publish()
+
+            mock_scan.assert_not_called()
+            self.mock_es_client.bulk.assert_not_called()
+
+    def test_incremental_requires_id_field(self) -> None:
+        self.conf.put('publisher.elasticsearch.incremental', True)
+
+        with patch('builtins.open', mock_open(read_data='')), self.assertRaises(Exception):
+            publisher = ElasticsearchPublisher()
+            publisher.init(conf=Scoped.get_scoped_conf(conf=self.conf,
+                                                       scope=publisher.get_scope()))
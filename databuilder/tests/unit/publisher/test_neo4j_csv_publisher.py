@@ -3,6 +3,7 @@
 
 import logging
 import os
+import tempfile
 import unittest
 import uuid
 
@@ -12,6 +13,7 @@ from pyhocon import ConfigFactory
 
 from databuilder.publisher import neo4j_csv_publisher
 from databuilder.publisher.neo4j_csv_publisher import Neo4jCsvPublisher
+from databuilder.utils import record_file
 
 here = os.path.dirname(__file__)
 
@@ -53,6 +55,44 @@ class TestPublish(unittest.TestCase):
             # 2 node files, 1 relation file
             self.assertEqual(mock_commit.call_count, 1)
 
+    def test_publisher_jsonl(self) -> None:
+        with patch.object(GraphDatabase, 'driver') as mock_driver, tempfile.TemporaryDirectory() as tmp_dir:
+            for sub_dir in ('nodes', 'relations'):
+                os.makedirs(f'{tmp_dir}/{sub_dir}')
+                for file_name in os.listdir(f'{self._resource_path}/{sub_dir}'):
+                    records = list(record_file.read_records(f'{self._resource_path}/{sub_dir}/{file_name}'))
+                    writer, close = record_file.create_writer(
+                        f'{tmp_dir}/{sub_dir}/{record_file.strip_extension(file_name)}',
+                        fieldnames=records[0].keys(),
+                        file_format=record_file.JSONL_FORMAT)
+                    writer.writerows(records)
+                    close()
+
+            mock_session = MagicMock()
+            mock_driver.return_value.session.return_value = mock_session
+
+            mock_transaction = MagicMock()
+            mock_session.begin_transaction.return_value = mock_transaction
+
+            mock_run = MagicMock()
+            mock_transaction.run = mock_run
+
+            publisher = Neo4jCsvPublisher()
+
+            conf = ConfigFactory.from_dict(
+                {neo4j_csv_publisher.NEO4J_END_POINT_KEY: 'dummy://999.999.999.999:7687/',
+                 neo4j_csv_publisher.NODE_FILES_DIR: f'{tmp_dir}/nodes',
+                 neo4j_csv_publisher.RELATION_FILES_DIR: f'{tmp_dir}/relations',
+                 neo4j_csv_publisher.NEO4J_USER: 'neo4j_user',
+                 neo4j_csv_publisher.NEO4J_PASSWORD: 'neo4j_password',
+                 neo4j_csv_publisher.JOB_PUBLISH_TAG: str(uuid.uuid4())}
+            )
+            publisher.init(conf)
+            publisher.publish()
+
+            self.assertEqual(mock_run.call_count, 6)
+            self.assertEqual(mock_transaction.commit.call_count, 1)
+
     def test_preprocessor(self) -> None:
         with patch.object(GraphDatabase, 'driver') as mock_driver:
             mock_session = MagicMock()
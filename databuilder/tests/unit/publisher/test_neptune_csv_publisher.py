@@ -0,0 +1,110 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import gzip
+import os
+import tempfile
+import unittest
+from typing import (
+    IO, Any, Dict,
+)
+
+from mock import call, patch
+from pyhocon import ConfigFactory
+
+from databuilder.publisher import neptune_csv_publisher
+from databuilder.publisher.neptune_csv_publisher import NeptuneCSVPublisher
+
+
+class TestNeptuneCSVPublisher(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.node_dir = os.path.join(self._tmp_dir.name, 'nodes')
+        self.relation_dir = os.path.join(self._tmp_dir.name, 'relations')
+        os.makedirs(self.node_dir)
+        os.makedirs(self.relation_dir)
+        with open(os.path.join(self.node_dir, 'Table_0.csv'), 'w') as node_file:
+            node_file.write('"~id","~label"\n"table_id","Table"\n')
+        with open(os.path.join(self.relation_dir, 'Table_Column_COLUMN.csv'), 'w') as relation_file:
+            relation_file.write('"~id","~from","~to","~label"\n"rel_id","table_id","column_id","COLUMN"\n')
+
+        self.conf_dict: Dict[str, Any] = {
+            NeptuneCSVPublisher.NODE_FILES_DIR: self.node_dir,
+            NeptuneCSVPublisher.RELATION_FILES_DIR: self.relation_dir,
+            NeptuneCSVPublisher.AWS_S3_BUCKET_NAME: 'test-bucket',
+            NeptuneCSVPublisher.AWS_BASE_S3_DATA_PATH: 'amundsen',
+            NeptuneCSVPublisher.NEPTUNE_HOST: 'neptune-host:8182',
+            NeptuneCSVPublisher.AWS_REGION: 'us-east-1',
+        }
+
+    def tearDown(self) -> None:
+        self._tmp_dir.cleanup()
+
+    def _create_publisher(self, conf_dict: Dict[str, Any]) -> NeptuneCSVPublisher:
+        publisher = NeptuneCSVPublisher()
+        with patch.object(neptune_csv_publisher, 'Session'), \
+                patch.object(neptune_csv_publisher, 'NeptuneBulkLoaderApi'):
+            publisher.init(ConfigFactory.from_dict(conf_dict))
+        return publisher
+
+    def test_publish_per_file_group(self) -> None:
+        self.conf_dict.update({
+            NeptuneCSVPublisher.LOAD_PER_FILE_GROUP: True,
+            NeptuneCSVPublisher.UPLOAD_GZIP: True,
+        })
+        publisher = self._create_publisher(self.conf_dict)
+
+        uploaded: Dict[str, bytes] = {}
+
+        def upload_fileobj(f: IO[bytes], bucket: str, key: str, Config: Any) -> None:
+            uploaded[key] = gzip.decompress(f.read())
+
+        with patch.object(publisher, '_s3_client') as mock_s3_client, \
+                patch.object(publisher, 'neptune_api_client') as mock_api_client, \
+                patch.object(neptune_csv_publisher.time, 'sleep'):
+            mock_s3_client.upload_fileobj.side_effect = upload_fileobj
+            mock_api_client.load.side_effect = [{'payload': {'loadId': 'node_load'}},
+                                                {'payload': {'loadId': 'relation_load'}}]
+            mock_api_client.load_status.return_value = {
+                'payload': {'overallStatus': {'status': 'LOAD_COMPLETED'}}
+            }
+            publisher.publish_impl()
+
+        node_key, relation_key = sorted(uploaded)
+        self.assertTrue(node_key.endswith('/nodes/Table_0.csv.gz'))
+        self.assertTrue(relation_key.endswith('/relations/Table_Column_COLUMN.csv.gz'))
+        self.assertEqual(uploaded[node_key], b'"~id","~label"\n"table_id","Table"\n')
+
+        load_calls = mock_api_client.load.call_args_list
+        self.assertEqual([load_call[1]['s3_object_key'].rsplit('/', 1)[-1] for load_call in load_calls],
+                         ['nodes', 'relations'])
+        self.assertTrue(all(load_call[1]['queueRequest'] for load_call in load_calls))
+        self.assertTrue(all('dependencies' not in load_call[1] for load_call in load_calls))
+        self.assertEqual(mock_api_client.load_status.call_count, 2)
+
+    def test_publish_adaptive_polling(self) -> None:
+        self.conf_dict.update({
+            NeptuneCSVPublisher.STATUS_POLLING_PERIOD: 5,
+            NeptuneCSVPublisher.STATUS_POLLING_MAX_PERIOD: 30,
+        })
+        publisher = self._create_publisher(self.conf_dict)
+        in_progress = {'payload': {'overallStatus': {'status': 'LOAD_IN_PROGRESS'}}}
+
+        with patch.object(publisher, '_s3_client') as mock_s3_client, \
+                patch.object(publisher, 'neptune_api_client') as mock_api_client, \
+                patch.object(neptune_csv_publisher.time, 'sleep') as mock_sleep:
+            mock_api_client.load.return_value = {'payload': {'loadId': 'load'}}
+            mock_api_client.load_status.side_effect = [
+                in_progress, in_progress, in_progress, in_progress,
+                {'payload': {'overallStatus': {'status': 'LOAD_COMPLETED'}}}
+            ]
+            publisher.publish_impl()
+
+        self.assertEqual(mock_s3_client.upload_fileobj.call_count, 2)
+        mock_api_client.load.assert_called_once()
+        self.assertEqual(mock_sleep.call_args_list, [call(5), call(10), call(20), call(30), call(30)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import tempfile
+import unittest
+from typing import Any
+
+import requests
+from mock import MagicMock
+
+from databuilder.rest_api.base_rest_api_query import RestApiQuerySeed
+from databuilder.rest_api.response_cache import ResponseCache
+from databuilder.rest_api.rest_api_query import RestApiQuery
+
+
+def _create_response(status_code: int, content: str = '', **headers: Any) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = content.encode('utf-8')
+    response.headers.update(headers)
+    return response
+
+
+class TestResponseCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = ResponseCache(cache_dir=self._tmp_dir.name)
+
+    def tearDown(self) -> None:
+        self._tmp_dir.cleanup()
+
+    def test_conditional_request(self) -> None:
+        send_fn = MagicMock(side_effect=[_create_response(200, '{"name": "foo"}', ETag='"v1"'),
+                                         _create_response(304)])
+
+        first = self.cache.send(send_fn, 'http://foo.bar/report/1', headers={'Authorization': 'token1'})
+        second = self.cache.send(send_fn, 'http://foo.bar/report/1', headers={'Authorization': 'token2'})
+
+        self.assertEqual(first.json(), {'name': 'foo'})
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.json(), {'name': 'foo'})
+        self.assertEqual(send_fn.call_args_list[1][1]['headers'],
+                         {'Authorization': 'token2', 'If-None-Match': '"v1"'})
+
+    def test_key_includes_params(self) -> None:
+        send_fn = MagicMock(side_effect=[_create_response(200, '[1]', ETag='"v1"'),
+                                         _create_response(200, '[2]', ETag='"v1"')])
+
+        self.cache.send(send_fn, 'http://foo.bar/reports', params={'page': 1})
+        second = self.cache.send(send_fn, 'http://foo.bar/reports', params={'page': 2})
+
+        self.assertEqual(second.json(), [2])
+        self.assertNotIn('headers', send_fn.call_args_list[1][1])
+
+    def test_updated_at(self) -> None:
+        send_fn = MagicMock(side_effect=[_create_response(200, '{"v": 1}'), _create_response(200, '{"v": 2}')])
+
+        self.cache.send(send_fn, 'http://foo.bar/report/1', updated_at='2021-01-01')
+        unchanged = self.cache.send(send_fn, 'http://foo.bar/report/1', updated_at='2021-01-01')
+        self.assertEqual(unchanged.json(), {'v': 1})
+        self.assertEqual(send_fn.call_count, 1)
+
+        changed = self.cache.send(send_fn, 'http://foo.bar/report/1', updated_at='2021-02-01')
+        self.assertEqual(changed.json(), {'v': 2})
+        self.assertEqual(send_fn.call_count, 2)
+
+    def test_failed_response_not_cached(self) -> None:
+        send_fn = MagicMock(side_effect=[_create_response(500), _create_response(200, '{"v": 1}')])
+
+        self.assertEqual(self.cache.send(send_fn, 'http://foo.bar', updated_at=1).status_code, 500)
+        self.assertEqual(self.cache.send(send_fn, 'http://foo.bar', updated_at=1).json(), {'v': 1})
+
+    def test_max_age(self) -> None:
+        cache = ResponseCache(cache_dir=self._tmp_dir.name, max_age_sec=3600)
+        send_fn = MagicMock(return_value=_create_response(200, '{"v": 1}'))
+
+        cache.send(send_fn, 'http://foo.bar', data='{"query": "foo"}')
+        self.assertEqual(cache.send(send_fn, 'http://foo.bar', data='{"query": "foo"}').json(), {'v': 1})
+        send_fn.assert_called_once()
+
+    def test_rest_api_query_updated_at_field(self) -> None:
+        seed_query = RestApiQuerySeed(seed_record=[{'report_id': '1', 'updated_at': '2021-01-01'},
+                                                   {'report_id': '1', 'updated_at': '2021-01-01'}])
+        session = MagicMock()
+        session.get.return_value = _create_response(200, '{"name": "foo"}')
+
+        query = RestApiQuery(query_to_join=seed_query, url='http://foo.bar/report/{report_id}', params={},
+                             json_path='name', field_names=['name'], session=session,
+                             updated_at_field='updated_at')
+        query.set_response_cache(self.cache)
+
+        result = list(query.execute())
+
+        self.assertEqual([record['name'] for record in result], ['foo', 'foo'])
+        session.get.assert_called_once_with('http://foo.bar/report/1')
+
+    def test_rest_api_query_updated_at_fields(self) -> None:
+        seed_query = RestApiQuerySeed(seed_record=[
+            {'report_id': '1', 'updated_at': '2021-01-01', 'queries_updated_at': '2021-01-01'},
+            {'report_id': '1', 'updated_at': '2021-01-01', 'queries_updated_at': '2021-01-01'},
+            {'report_id': '1', 'updated_at': '2021-01-01', 'queries_updated_at': '2021-01-02'},
+        ])
+        session = MagicMock()
+        session.get.side_effect = [_create_response(200, '{"name": "foo"}'), _create_response(200, '{"name": "bar"}')]
+
+        query = RestApiQuery(query_to_join=seed_query, url='http://foo.bar/report/{report_id}', params={},
+                             json_path='name', field_names=['name'], session=session,
+                             updated_at_field=['updated_at', 'queries_updated_at'])
+        query.set_response_cache(self.cache)
+
+        result = list(query.execute())
+
+        self.assertEqual([record['name'] for record in result], ['foo', 'foo', 'bar'])
+        self.assertEqual(session.get.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,12 +1,16 @@
 # Copyright Contributors to the Amundsen project.
 # SPDX-License-Identifier: Apache-2.0
 
+import copy
+import time
 import unittest
+from typing import Any
 
-from mock import patch
+from mock import MagicMock, patch
 
 from databuilder.rest_api.base_rest_api_query import EmptyRestApiQuerySeed, RestApiQuerySeed
-from databuilder.rest_api.rest_api_query import RestApiQuery
+from databuilder.rest_api.mode_analytics.mode_paginated_rest_api_query import ModePaginatedRestApiQuery
+from databuilder.rest_api.rest_api_query import HostRateLimiter, RestApiQuery
 
 
 class TestRestApiQuery(unittest.TestCase):
@@ -138,6 +142,94 @@ class TestRestApiQuery(unittest.TestCase):
 
         self.assertEqual(expected_records, sub_records)
 
+    def test_rest_api_query_concurrent(self) -> None:
+        seed_record = [{'id': str(i)} for i in range(10)]
+        seed_query = RestApiQuerySeed(seed_record=seed_record)
+
+        def get(url: str, **kwargs: Any) -> Any:
+            record_id = int(url.rsplit('/', 1)[1])
+            # Later records answer first, results still come back in the order of the seed records
+            time.sleep(0.001 * (10 - record_id))
+            response = MagicMock()
+            response.json.return_value = {'foo': {'name': f'name_{record_id}'}}
+            return response
+
+        session = MagicMock()
+        session.get.side_effect = get
+        query = RestApiQuery(query_to_join=seed_query, url='http://foo.bar/{id}', params={'timeout': 10},
+                             json_path='foo.name', field_names=['name_field'], max_workers=4, session=session)
+
+        expected = [{'id': str(i), 'name_field': f'name_{i}'} for i in range(10)]
+        self.assertListEqual(expected, list(query.execute()))
+        self.assertEqual(session.get.call_count, 10)
+        session.get.assert_any_call('http://foo.bar/0', timeout=10)
+
+    def test_rest_api_query_concurrent_pagination(self) -> None:
+        seed_query = RestApiQuerySeed(seed_record=[{'space': 'a'}, {'space': 'b'}])
+
+        def get(url: str, **kwargs: Any) -> Any:
+            response = MagicMock()
+            space, page = url.split('/')[-1].split('?page=')
+            reports = [{'token': f'{space}_{page}_{i}'} for i in range(2 if page == '1' else 1)]
+            response.json.return_value = {'reports': reports}
+            return response
+
+        session = MagicMock()
+        session.get.side_effect = get
+        query = ModePaginatedRestApiQuery(query_to_join=seed_query, url='http://foo.bar/{space}', params={},
+                                          json_path='reports[*].token', field_names=['token'],
+                                          pagination_json_path='reports[*]', max_record_size=2,
+                                          max_workers=2, session=session)
+
+        self.assertListEqual([record['token'] for record in query.execute()],
+                             ['a_1_0', 'a_1_1', 'a_2_0', 'b_1_0', 'b_1_1', 'b_2_0'])
+
+    def test_host_rate_limiter(self) -> None:
+        rate_limiter = HostRateLimiter(max_requests_per_sec=10)
+        with patch('databuilder.rest_api.rest_api_query.time.monotonic', return_value=100.0), \
+                patch('databuilder.rest_api.rest_api_query.time.sleep') as mock_sleep:
+            rate_limiter.acquire('http://foo.bar/1')
+            rate_limiter.acquire('http://foo.bar/2')
+            rate_limiter.acquire('http://other.host/1')
+            rate_limiter.acquire('http://foo.bar/3')
+
+        self.assertEqual(mock_sleep.call_count, 2)
+        self.assertAlmostEqual(mock_sleep.call_args_list[0][0][0], 0.1)
+        self.assertAlmostEqual(mock_sleep.call_args_list[1][0][0], 0.2)
+
+    def test_cached_responses_not_rate_limited(self) -> None:
+        query = RestApiQuery(query_to_join=RestApiQuerySeed(seed_record=[{'id': '1'}]), url='http://foo.bar/{id}',
+                             params={}, json_path='foo', field_names=['foo'])
+        rate_limiter = MagicMock()
+        response_cache = MagicMock()
+        query.set_rate_limiter(rate_limiter)
+        query.set_response_cache(response_cache)
+
+        # cache hit, no request is sent
+        query._send_request('http://foo.bar/1')
+        rate_limiter.acquire.assert_not_called()
+
+        # cache miss, the cache sends the request
+        response_cache.send.side_effect = lambda send_fn, url, **kwargs: send_fn(url)
+        with patch('databuilder.rest_api.rest_api_query.requests.get') as mock_get:
+            query._send_request('http://foo.bar/1')
+
+        rate_limiter.acquire.assert_called_once_with('http://foo.bar/1')
+        mock_get.assert_called_once_with('http://foo.bar/1')
+
+    def test_rate_limiter_shared_by_chain(self) -> None:
+        seed_query = RestApiQuerySeed(seed_record=[{'id': '1'}])
+        inner_query = RestApiQuery(query_to_join=seed_query, url='http://foo.bar/{id}', params={},
+                                   json_path='foo', field_names=['foo'])
+        query = RestApiQuery(query_to_join=inner_query, url='http://foo.bar/{id}/{foo}', params={},
+                             json_path='bar', field_names=['bar'], max_requests_per_sec=10)
+
+        self.assertIsNotNone(query._rate_limiter)
+        self.assertIs(inner_query._rate_limiter, query._rate_limiter)
+
+        copied_query = copy.deepcopy(query)
+        self.assertIs(copied_query._get_chained_queries()[0]._rate_limiter, copied_query._rate_limiter)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,98 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import tempfile
+import unittest
+from typing import Any
+
+from pyhocon import ConfigFactory, ConfigTree
+
+from databuilder.extractor.base_extractor import Extractor
+from databuilder.job.base_job import Job
+from databuilder.loader.file_system_neo4j_csv_loader import FsNeo4jCSVLoader
+from databuilder.task.base_task import Task
+from databuilder.task.sharded_task import ShardedTask
+from databuilder.task.task import DefaultTask
+from databuilder.utils import record_file
+from tests.unit.models.test_graph_serializable import (
+    Actor, City, Movie,
+)
+
+
+class MovieExtractor(Extractor):
+    NAMES = 'names'
+
+    def init(self, conf: ConfigTree) -> None:
+        self._iter = iter(conf.get_list(MovieExtractor.NAMES))
+
+    def extract(self) -> Any:
+        try:
+            return Movie(next(self._iter), [Actor('Tom Cruise')], [City('Oakland')])
+        except StopIteration:
+            return None
+
+    def get_scope(self) -> str:
+        return 'extractor.movie'
+
+
+def create_task() -> Task:
+    return DefaultTask(extractor=MovieExtractor(), loader=FsNeo4jCSVLoader())
+
+
+class TestShardedTask(unittest.TestCase):
+
+    def tearDown(self) -> None:
+        Job.closer.close()
+
+    def test_run(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            node_dir = f'{tmp_dir}/nodes'
+            relation_dir = f'{tmp_dir}/relationships'
+            conf = ConfigFactory.from_dict({
+                f'loader.filesystem_csv_neo4j.{FsNeo4jCSVLoader.NODE_DIR_PATH}': node_dir,
+                f'loader.filesystem_csv_neo4j.{FsNeo4jCSVLoader.RELATION_DIR_PATH}': relation_dir,
+                f'task.sharded.{ShardedTask.MAX_WORKERS}': 2,
+                f'task.sharded.{ShardedTask.OUTPUT_DIR_CONFIG_KEYS}': [
+                    f'loader.filesystem_csv_neo4j.{FsNeo4jCSVLoader.NODE_DIR_PATH}',
+                    f'loader.filesystem_csv_neo4j.{FsNeo4jCSVLoader.RELATION_DIR_PATH}'
+                ]
+            })
+
+            task = ShardedTask(task_factory=create_task,
+                               shard_confs=[{'extractor.movie.names': ['Top Gun', 'Cocktail']},
+                                            {'extractor.movie.names': ['Collateral']}])
+            task.init(conf)
+            task.run()
+
+            node_files = sorted(os.listdir(node_dir))
+            self.assertEqual(node_files, ['Actor_0-shard0.csv', 'Actor_0-shard1.csv',
+                                          'City_0-shard0.csv', 'City_0-shard1.csv',
+                                          'Movie_0-shard0.csv', 'Movie_0-shard1.csv'])
+
+            movies = [record['KEY']
+                      for file_name in node_files if file_name.startswith('Movie')
+                      for record in record_file.read_records(os.path.join(node_dir, file_name))]
+            self.assertCountEqual(movies, ['movie://Top Gun', 'movie://Cocktail', 'movie://Collateral'])
+            self.assertEqual(len(os.listdir(relation_dir)), 4)
+
+            Job.closer.close()
+            self.assertFalse(os.path.exists(node_dir))
+
+    def test_run_with_existing_output_dir(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            conf = ConfigFactory.from_dict({
+                f'loader.filesystem_csv_neo4j.{FsNeo4jCSVLoader.NODE_DIR_PATH}': tmp_dir,
+                f'task.sharded.{ShardedTask.OUTPUT_DIR_CONFIG_KEYS}': [
+                    f'loader.filesystem_csv_neo4j.{FsNeo4jCSVLoader.NODE_DIR_PATH}'
+                ]
+            })
+
+            task = ShardedTask(task_factory=create_task, shard_confs=[{}])
+            task.init(conf)
+            with self.assertRaises(RuntimeError):
+                task.run()
+
+
+if __name__ == '__main__':
+    unittest.main()
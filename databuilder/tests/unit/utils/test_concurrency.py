@@ -0,0 +1,66 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import threading
+import time
+import unittest
+from typing import Any, Iterator
+
+from databuilder.utils.concurrency import map_concurrently
+
+
+class TestMapConcurrently(unittest.TestCase):
+
+    def test_serial(self) -> None:
+        self.assertEqual(list(map_concurrently(lambda x: x * 2, [1, 2, 3], max_workers=1)), [2, 4, 6])
+
+    def test_preserve_order(self) -> None:
+        def slow_first(x: int) -> int:
+            time.sleep(0.05 if x == 0 else 0)
+            return x
+
+        self.assertEqual(list(map_concurrently(slow_first, range(10), max_workers=4)), list(range(10)))
+        self.assertCountEqual(list(map_concurrently(slow_first, range(10), max_workers=4, preserve_order=False)),
+                              list(range(10)))
+
+    def test_bounded_prefetch(self) -> None:
+        consumed = []
+
+        def items() -> Iterator[int]:
+            for i in range(100):
+                consumed.append(i)
+                yield i
+
+        results: Any = map_concurrently(lambda x: x, items(), max_workers=2)
+        self.assertEqual(next(results), 0)
+        self.assertLessEqual(len(consumed), 4)
+        results.close()
+
+    def test_error(self) -> None:
+        def fail_on_three(x: int) -> int:
+            if x == 3:
+                raise ValueError('three')
+            return x
+
+        for preserve_order in (True, False):
+            with self.assertRaises(ValueError):
+                list(map_concurrently(fail_on_three, range(10), max_workers=2, preserve_order=preserve_order))
+
+    def test_cancel_on_early_stop(self) -> None:
+        started = []
+        lock = threading.Lock()
+
+        def record(x: int) -> int:
+            with lock:
+                started.append(x)
+            time.sleep(0.01)
+            return x
+
+        results: Any = map_concurrently(record, range(100), max_workers=2, preserve_order=False)
+        next(results)
+        results.close()
+        self.assertLess(len(started), 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import tempfile
+import unittest
+from typing import (
+    Any, Dict, List,
+)
+
+from databuilder.utils import record_file
+
+
+class TestRecordFile(unittest.TestCase):
+
+    def _write_and_read(self, tmp_dir: str, file_format: str, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        writer, close = record_file.create_writer(os.path.join(tmp_dir, f'records_{file_format}'),
+                                                  fieldnames=['key', 'count', 'description'],
+                                                  file_format=file_format)
+        writer.writerows(records)
+        close()
+        file_path = os.path.join(tmp_dir, f'records_{file_format}{record_file.FILE_EXTENSIONS[file_format]}')
+        return list(record_file.read_records(file_path))
+
+    def test_csv_and_jsonl_parity(self) -> None:
+        records = [{'key': 'table_1', 'count': 1, 'description': None},
+                   {'key': 'table_2', 'count': 2, 'description': 'foo'},
+                   {'key': 'table_3', 'count': 3}]
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            csv_records = self._write_and_read(tmp_dir, record_file.CSV_FORMAT, records)
+            jsonl_records = self._write_and_read(tmp_dir, record_file.JSONL_FORMAT, records)
+
+        self.assertEqual(jsonl_records, csv_records)
+        self.assertEqual([record['description'] for record in jsonl_records], ['', 'foo', ''])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import tempfile
+import unittest
+from collections import namedtuple
+
+from databuilder.utils.spillable_counter import SpillableCounter
+
+UsageKey = namedtuple('UsageKey', ['table', 'email'])
+
+
+class TestSpillableCounter(unittest.TestCase):
+
+    def test_in_memory(self) -> None:
+        counter = SpillableCounter()
+        counter.add(UsageKey('foo', 'a@test.com'))
+        counter.add(UsageKey('bar', 'a@test.com'), 2)
+        counter.update([(UsageKey('foo', 'a@test.com'), 3)])
+
+        self.assertEqual(list(counter.items()), [(UsageKey('foo', 'a@test.com'), 4),
+                                                 (UsageKey('bar', 'a@test.com'), 2)])
+
+    def test_spill(self) -> None:
+        with tempfile.TemporaryDirectory() as spill_dir:
+            counter = SpillableCounter(max_keys_in_memory=2, key_factory=UsageKey._make, spill_dir=spill_dir)
+            for table in ['c', 'a', 'b', 'a', 'd', 'c', 'a']:
+                counter.add(UsageKey(table, 'a@test.com'))
+            self.assertEqual(len(os.listdir(spill_dir)), 1)
+
+            result = list(counter.items())
+            self.assertEqual(result, [(UsageKey('a', 'a@test.com'), 3),
+                                      (UsageKey('b', 'a@test.com'), 1),
+                                      (UsageKey('c', 'a@test.com'), 2),
+                                      (UsageKey('d', 'a@test.com'), 1)])
+            self.assertIsInstance(result[0][0], UsageKey)
+
+            counter.close()
+            self.assertEqual(os.listdir(spill_dir), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
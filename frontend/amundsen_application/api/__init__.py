@@ -4,10 +4,12 @@
 from typing import Any, Tuple
 import logging
 
-from flask import Flask, render_template
+from flask import Flask, Response, jsonify, render_template
 import jinja2
 import os
 
+from amundsen_application.api.utils.request_utils import get_upstream_pool_stats
+
 
 ENVIRONMENT = os.getenv('APPLICATION_ENV', 'development')
 LOGGER = logging.getLogger(__name__)
@@ -27,5 +29,6 @@ def index(path: str) -> Any:
         raise e
 
 
-def healthcheck() -> Tuple[str, int]:
-    return '', 200  # pragma: no cover
+def healthcheck() -> Tuple[Response, int]:
+    # usage of the connection pools to the upstream services, to spot saturated pools
+    return jsonify({'upstream_pools': get_upstream_pool_stats()}), 200
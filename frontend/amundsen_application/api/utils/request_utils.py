@@ -1,10 +1,31 @@
 # Copyright Contributors to the Amundsen project.
 # SPDX-License-Identifier: Apache-2.0
 
-from typing import Dict
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from threading import Lock
+from typing import (
+    Any, Callable, Dict, Iterator, List, Optional,
+)
 
 import requests
+from flask import copy_current_request_context
 from flask import current_app as app
+from flask import has_request_context
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+LOGGER = logging.getLogger(__name__)
+
+METADATA_UPSTREAM = 'METADATASERVICE'
+SEARCH_UPSTREAM = 'SEARCHSERVICE'
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_FANOUT_MAX_WORKERS = 8
+RETRY_STATUS_CODES = (502, 503, 504)
+# PUT and DELETE are idempotent for HTTP but not for all the upstream endpoints, so only reads are retried
+RETRY_METHODS = frozenset(['GET', 'HEAD'])
 
 
 def get_query_param(args: Dict, param: str, error_msg: str = None) -> str:
@@ -45,7 +66,8 @@ def request_metadata(*,     # type: ignore
                            headers=headers,
                            timeout_sec=timeout_sec,
                            data=data,
-                           json=json)
+                           json=json,
+                           upstream=METADATA_UPSTREAM)
 
 
 def request_search(*,     # type: ignore
@@ -79,11 +101,13 @@ def request_search(*,     # type: ignore
                            headers=headers,
                            timeout_sec=timeout_sec,
                            data=data,
-                           json=json)
+                           json=json,
+                           upstream=SEARCH_UPSTREAM)
 
 
 # TODO: Define an interface for envoy_client
-def request_wrapper(method: str, url: str, client, headers, timeout_sec: int, data=None, json=None):  # type: ignore
+def request_wrapper(method: str, url: str, client, headers, timeout_sec: int, data=None, json=None,  # type: ignore
+                    upstream: Optional[str] = None):
     """
     Wraps a request to use Envoy client and headers, if available
     :param method: DELETE | GET | POST | PUT
@@ -92,6 +116,8 @@ def request_wrapper(method: str, url: str, client, headers, timeout_sec: int, da
     :param headers: Optional Envoy request headers
     :param timeout_sec: Number of seconds before timeout is triggered. Not used with Envoy
     :param data: Optional request payload
+    :param upstream: Optional name of the upstream service, requests to the same upstream share
+    a pooled keep-alive session. A new session is used per request if not provided.
     :return:
     """
     # If no timeout specified, use the one from the configurations.
@@ -108,21 +134,34 @@ def request_wrapper(method: str, url: str, client, headers, timeout_sec: int, da
             return client.put(url, headers=headers, raw_response=True, raw_request=True, data=data, json=json)
         else:
             raise Exception('Method not allowed: {}'.format(method))
+    elif upstream is not None:
+        pool = get_upstream_pool(upstream)
+        with pool.track_request():
+            return _send_request(pool.session, method=method, url=url, headers=headers,
+                                 timeout_sec=timeout_sec, data=data, json=json)
     else:
         with build_session() as s:
-            if method == 'DELETE':
-                return s.delete(url, headers=headers, timeout=timeout_sec)
-            elif method == 'GET':
-                return s.get(url, headers=headers, timeout=timeout_sec)
-            elif method == 'POST':
-                return s.post(url, headers=headers, timeout=timeout_sec, data=data, json=json)
-            elif method == 'PUT':
-                return s.put(url, headers=headers, timeout=timeout_sec, data=data, json=json)
-            else:
-                raise Exception('Method not allowed: {}'.format(method))
-
-
-def build_session() -> requests.Session:
+            return _send_request(s, method=method, url=url, headers=headers,
+                                 timeout_sec=timeout_sec, data=data, json=json)
+
+
+def _send_request(session: requests.Session, *,  # type: ignore
+                  method: str, url: str, headers, timeout_sec: int, data=None, json=None):
+    if method == 'DELETE':
+        return session.delete(url, headers=headers, timeout=timeout_sec)
+    elif method == 'GET':
+        return session.get(url, headers=headers, timeout=timeout_sec)
+    elif method == 'POST':
+        return session.post(url, headers=headers, timeout=timeout_sec, data=data, json=json)
+    elif method == 'PUT':
+        return session.put(url, headers=headers, timeout=timeout_sec, data=data, json=json)
+    else:
+        raise Exception('Method not allowed: {}'.format(method))
+
+
+def build_session(pool_size: int = DEFAULT_POOL_SIZE,
+                  max_retries: int = 0,
+                  retry_backoff_factor: float = 0) -> requests.Session:
     session = requests.Session()
 
     cert = app.config.get('MTLS_CLIENT_CERT')
@@ -130,4 +169,151 @@ def build_session() -> requests.Session:
     if cert is not None and key is not None:
         session.cert = (cert, key)
 
+    # Only reads are retried, on connection errors and gateway failures
+    retry = Retry(total=max_retries,
+                  read=False,
+                  allowed_methods=RETRY_METHODS,
+                  backoff_factor=retry_backoff_factor,
+                  status_forcelist=RETRY_STATUS_CODES,
+                  raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
     return session
+
+
+class UpstreamPool:
+    """
+    Process wide keep-alive session used for all the requests to one upstream service,
+    keeping track of how many requests are using its connections.
+    """
+
+    def __init__(self, *, name: str, session: requests.Session, pool_size: int) -> None:
+        self.name = name
+        self.session = session
+        self.pool_size = pool_size
+        self._lock = Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.total_requests = 0
+        self.saturated_requests = 0
+
+    @contextmanager
+    def track_request(self) -> Iterator[None]:
+        with self._lock:
+            self.in_flight += 1
+            self.total_requests += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            saturated = self.in_flight > self.pool_size
+            if saturated:
+                self.saturated_requests += 1
+        if saturated:
+            # requests beyond the pool size open a connection that is discarded afterwards
+            LOGGER.warning('Connection pool for %s is saturated: %s requests in flight for %s pooled connections',
+                           self.name, self.in_flight, self.pool_size)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'pool_size': self.pool_size,
+                    'in_flight': self.in_flight,
+                    'max_in_flight': self.max_in_flight,
+                    'total_requests': self.total_requests,
+                    'saturated_requests': self.saturated_requests}
+
+
+_upstream_pools = {}  # type: Dict[str, UpstreamPool]
+_upstream_pools_lock = Lock()
+
+
+def get_upstream_pool(upstream: str) -> UpstreamPool:
+    """
+    Provides the singleton pool of the given upstream service, creating it from the configuration
+    on first use
+    """
+    pool = _upstream_pools.get(upstream)
+    if pool is not None:
+        return pool
+
+    with _upstream_pools_lock:
+        pool = _upstream_pools.get(upstream)
+        if pool is None:
+            pool_size = app.config.get(f'{upstream}_REQUEST_POOL_SIZE', DEFAULT_POOL_SIZE)
+            session = build_session(pool_size=pool_size,
+                                    max_retries=app.config.get('REQUEST_MAX_RETRIES', 0),
+                                    retry_backoff_factor=app.config.get('REQUEST_RETRY_BACKOFF_FACTOR', 0))
+            pool = UpstreamPool(name=upstream, session=session, pool_size=pool_size)
+            _upstream_pools[upstream] = pool
+
+    return pool
+
+
+def get_upstream_pool_stats() -> Dict[str, Dict[str, int]]:
+    """
+    Returns connection pool usage per upstream service, reported by the healthcheck
+    """
+    return {name: pool.get_stats() for name, pool in list(_upstream_pools.items())}
+
+
+_fanout_executor = None  # type: Optional[ThreadPoolExecutor]
+_fanout_executor_lock = Lock()
+
+
+def _get_fanout_executor() -> ThreadPoolExecutor:
+    global _fanout_executor
+    if _fanout_executor is not None:
+        return _fanout_executor
+
+    with _fanout_executor_lock:
+        if _fanout_executor is None:
+            max_workers = app.config.get('REQUEST_FANOUT_MAX_WORKERS', DEFAULT_FANOUT_MAX_WORKERS)
+            _fanout_executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='upstream-fanout')
+
+    return _fanout_executor
+
+
+def _with_context(call: Callable[[], Any]) -> Callable[[], Any]:
+    if has_request_context():
+        return copy_current_request_context(call)
+
+    flask_app = app._get_current_object()
+
+    def _call_with_app_context() -> Any:
+        with flask_app.app_context():
+            return call()
+
+    return _call_with_app_context
+
+
+def request_concurrently(calls: List[Callable[[], Any]],
+                         deadline_sec: Optional[float] = None,
+                         timeout_result: Any = None) -> List[Any]:
+    """
+    Runs independent upstream calls of one composite operation concurrently, each with the current
+    request context
+    :param calls: Functions without arguments, each making its own upstream request(s)
+    :param deadline_sec: Number of seconds to wait for all the calls together. Falls back to
+    REQUEST_FANOUT_DEADLINE_SEC
+    :param timeout_result: Result reported for the calls that did not complete before the deadline
+    :return: The results in the order of the calls. Exceptions raised by a call are re-raised
+    """
+    deadline_sec = deadline_sec or app.config.get('REQUEST_FANOUT_DEADLINE_SEC')
+
+    executor = _get_fanout_executor()
+    futures = [executor.submit(_with_context(call)) for call in calls]
+    _, not_done = wait(futures, timeout=deadline_sec)
+
+    results = []
+    for future in futures:
+        if future in not_done:
+            LOGGER.warning('Upstream call did not complete within %s seconds', deadline_sec)
+            future.cancel()
+            results.append(timeout_result)
+        else:
+            results.append(future.result())
+    return results
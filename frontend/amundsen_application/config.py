@@ -49,6 +49,17 @@ class Config:
     # Request Timeout Configurations in Seconds
     REQUEST_SESSION_TIMEOUT_SEC = 3
 
+    # Requests to the metadata and search services go through one keep-alive connection pool per service,
+    # whose usage is reported by /healthcheck.
+    # With REQUEST_MAX_RETRIES, GET and HEAD requests are retried on connection errors and 502, 503 or 504 responses.
+    REQUEST_MAX_RETRIES = int(os.environ.get('REQUEST_MAX_RETRIES', 0))
+    REQUEST_RETRY_BACKOFF_FACTOR = float(os.environ.get('REQUEST_RETRY_BACKOFF_FACTOR', 0.1))
+
+    # Independent upstream calls of one user action, e.g. updating a tag in both metadata and search,
+    # run concurrently and are given up on after the deadline.
+    REQUEST_FANOUT_MAX_WORKERS = int(os.environ.get('REQUEST_FANOUT_MAX_WORKERS', 8))
+    REQUEST_FANOUT_DEADLINE_SEC = float(os.environ.get('REQUEST_FANOUT_DEADLINE_SEC', 5))
+
     # Frontend Application
     FRONTEND_BASE = ''
 
@@ -56,11 +67,13 @@ class Config:
     SEARCHSERVICE_REQUEST_CLIENT = None
     SEARCHSERVICE_REQUEST_HEADERS = None
     SEARCHSERVICE_BASE = ''
+    SEARCHSERVICE_REQUEST_POOL_SIZE = int(os.environ.get('SEARCHSERVICE_REQUEST_POOL_SIZE', 10))
 
     # Metadata Service
     METADATASERVICE_REQUEST_CLIENT = None
     METADATASERVICE_REQUEST_HEADERS = None
     METADATASERVICE_BASE = ''
+    METADATASERVICE_REQUEST_POOL_SIZE = int(os.environ.get('METADATASERVICE_REQUEST_POOL_SIZE', 10))
 
     # Mail Client Features
     MAIL_CLIENT = None
@@ -860,13 +860,8 @@ class MetadataTest(unittest.TestCase):
         responses.add(responses.PUT, url, json={}, status=HTTPStatus.OK)
 
         searchservice_base = local_app.config['SEARCHSERVICE_BASE']
-        get_table_url = f'{searchservice_base}/search_table'
-        responses.add(responses.POST, get_table_url,
-                      json={'results': [{'id': '1', 'tags': [{'tag_name': 'tag_1'}, {'tag_name': 'tag_2'}]}]},
-                      status=HTTPStatus.OK)
-
-        post_table_url = f'{searchservice_base}/document_table'
-        responses.add(responses.PUT, post_table_url, json={}, status=HTTPStatus.OK)
+        update_tag_url = f'{searchservice_base}/document_table_tag'
+        responses.add(responses.PUT, update_tag_url, json={}, status=HTTPStatus.OK)
 
         with local_app.test_client() as test:
             response = test.put(
@@ -888,13 +883,8 @@ class MetadataTest(unittest.TestCase):
         responses.add(responses.DELETE, url, json={}, status=HTTPStatus.OK)
 
         searchservice_base = local_app.config['SEARCHSERVICE_BASE']
-        get_table_url = f'{searchservice_base}/search_table'
-        responses.add(responses.POST, get_table_url,
-                      json={'results': [{'id': '1', 'tags': [{'tag_name': 'tag_1'}, {'tag_name': 'tag_2'}]}]},
-                      status=HTTPStatus.OK)
-
-        post_table_url = f'{searchservice_base}/document_table'
-        responses.add(responses.PUT, post_table_url, json={}, status=HTTPStatus.OK)
+        update_tag_url = f'{searchservice_base}/document_table_tag'
+        responses.add(responses.DELETE, update_tag_url, json={}, status=HTTPStatus.OK)
 
         with local_app.test_client() as test:
             response = test.delete(
@@ -906,6 +896,32 @@ class MetadataTest(unittest.TestCase):
             )
             self.assertEqual(response.status_code, HTTPStatus.OK)
 
+    @responses.activate
+    def test_update_table_tags_search_failure(self) -> None:
+        """
+        Test adding a tag on a table fails if the search service fails to update it
+        :return:
+        """
+        url = local_app.config['METADATASERVICE_BASE'] + TABLE_ENDPOINT + '/db://cluster.schema/table/tag/tag_5'
+        responses.add(responses.PUT, url, json={}, status=HTTPStatus.OK)
+
+        searchservice_base = local_app.config['SEARCHSERVICE_BASE']
+        update_tag_url = f'{searchservice_base}/document_table_tag'
+        responses.add(responses.PUT, update_tag_url, json={}, status=HTTPStatus.INTERNAL_SERVER_ERROR)
+
+        with local_app.test_client() as test:
+            response = test.put(
+                '/api/metadata/v0/update_table_tags',
+                json={
+                    'key': 'db://cluster.schema/table',
+                    'tag': 'tag_5'
+                }
+            )
+            self.assertEqual(response.status_code, HTTPStatus.INTERNAL_SERVER_ERROR)
+            search_calls = [call for call in responses.calls if call.request.url.startswith(update_tag_url)]
+            self.assertEqual(search_calls[0].request.url,
+                             f'{update_tag_url}?key=db%3A%2F%2Fcluster.schema%2Ftable&tag=tag_5')
+
     @responses.activate
     def test_update_dashboard_tags_put(self) -> None:
         """
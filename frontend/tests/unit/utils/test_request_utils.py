@@ -0,0 +1,114 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import threading
+import unittest
+from unittest.mock import MagicMock
+
+import requests
+import responses
+from flask import current_app, request
+from requests.adapters import HTTPAdapter
+
+from amundsen_application import create_app
+from amundsen_application.api.utils import request_utils
+from amundsen_application.api.utils.request_utils import (
+    UpstreamPool, build_session, get_upstream_pool, get_upstream_pool_stats, request_concurrently,
+    request_metadata, request_search,
+)
+
+local_app = create_app('amundsen_application.config.TestConfig', 'tests/templates')
+
+
+class RequestUtilsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        request_utils._upstream_pools.clear()
+
+    def tearDown(self) -> None:
+        request_utils._upstream_pools.clear()
+
+    @responses.activate
+    def test_requests_reuse_upstream_session(self) -> None:
+        with local_app.app_context():
+            url = current_app.config['METADATASERVICE_BASE'] + '/table'
+            responses.add(responses.GET, url, json={}, status=200)
+
+            request_metadata(url=url)
+            session = get_upstream_pool(request_utils.METADATA_UPSTREAM).session
+            request_metadata(url=url)
+
+            self.assertIs(get_upstream_pool(request_utils.METADATA_UPSTREAM).session, session)
+            self.assertEqual(get_upstream_pool_stats()[request_utils.METADATA_UPSTREAM]['total_requests'], 2)
+
+    @responses.activate
+    def test_upstreams_use_separate_pools(self) -> None:
+        with local_app.app_context():
+            metadata_url = current_app.config['METADATASERVICE_BASE'] + '/table'
+            search_url = current_app.config['SEARCHSERVICE_BASE'] + '/search'
+            responses.add(responses.GET, metadata_url, json={}, status=200)
+            responses.add(responses.GET, search_url, json={}, status=200)
+
+            request_metadata(url=metadata_url)
+            request_search(url=search_url)
+
+            self.assertIsNot(get_upstream_pool(request_utils.METADATA_UPSTREAM),
+                             get_upstream_pool(request_utils.SEARCH_UPSTREAM))
+
+    def test_build_session_pool_size(self) -> None:
+        with local_app.app_context():
+            session = build_session(pool_size=3, max_retries=2)
+
+            adapter = session.get_adapter('http://localhost')
+            assert isinstance(adapter, HTTPAdapter)
+            self.assertEqual(adapter._pool_maxsize, 3)
+            self.assertEqual(adapter.max_retries.total, 2)
+            self.assertEqual(adapter.max_retries.allowed_methods, {'GET', 'HEAD'})
+
+    @responses.activate
+    def test_healthcheck_reports_pool_stats(self) -> None:
+        with local_app.app_context():
+            url = current_app.config['METADATASERVICE_BASE'] + '/table'
+            responses.add(responses.GET, url, json={}, status=200)
+            request_metadata(url=url)
+
+        response = local_app.test_client().get('/healthcheck')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json['upstream_pools'][request_utils.METADATA_UPSTREAM]['total_requests'], 1)
+
+    def test_track_request_saturation(self) -> None:
+        pool = UpstreamPool(name='TEST', session=MagicMock(spec=requests.Session), pool_size=1)
+
+        with pool.track_request():
+            with pool.track_request():
+                self.assertEqual(pool.get_stats()['in_flight'], 2)
+
+        self.assertEqual(pool.get_stats(), {'pool_size': 1,
+                                            'in_flight': 0,
+                                            'max_in_flight': 2,
+                                            'total_requests': 2,
+                                            'saturated_requests': 1})
+
+    def test_request_concurrently(self) -> None:
+        barrier = threading.Barrier(2, timeout=5)
+
+        def _call(value: str) -> str:
+            # both calls need to be in flight at the same time to get past the barrier
+            barrier.wait()
+            return f'{request.path}/{value}'
+
+        with local_app.test_request_context('/api/test'):
+            results = request_concurrently([lambda: _call('a'), lambda: _call('b')])
+
+        self.assertEqual(results, ['/api/test/a', '/api/test/b'])
+
+    def test_request_concurrently_deadline(self) -> None:
+        release = threading.Event()
+
+        with local_app.app_context():
+            results = request_concurrently([lambda: 'done', release.wait],
+                                           deadline_sec=0.1,
+                                           timeout_result='timed out')
+        release.set()
+
+        self.assertEqual(results, ['done', 'timed out'])
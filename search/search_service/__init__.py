@@ -14,9 +14,11 @@ from flask import Blueprint, Flask
 from flask_cors import CORS
 from flask_restful import Api
 
+from search_service.api.autocomplete import AutocompleteAPI
 from search_service.api.dashboard import SearchDashboardAPI, SearchDashboardFilterAPI
 from search_service.api.document import (
-    DocumentFeatureAPI, DocumentFeaturesAPI, DocumentTableAPI, DocumentTablesAPI, DocumentUserAPI, DocumentUsersAPI,
+    DocumentFeatureAPI, DocumentFeaturesAPI, DocumentTableAPI, DocumentTablesAPI, DocumentTableTagAPI, DocumentUserAPI,
+    DocumentUsersAPI,
 )
 from search_service.api.feature import SearchFeatureAPI, SearchFeatureFilterAPI
 from search_service.api.healthcheck import healthcheck
@@ -103,10 +105,14 @@ def create_app(*, config_module_class: str) -> Flask:
     api.add_resource(SearchFeatureAPI, '/search_feature')
     api.add_resource(SearchFeatureFilterAPI, '/search_feature_filter')
 
+    # Typeahead API
+    api.add_resource(AutocompleteAPI, '/autocomplete')
+
     # DocumentAPI
     # todo: needs to handle dashboard
     api.add_resource(DocumentTablesAPI, '/document_table')
     api.add_resource(DocumentTableAPI, '/document_table/<document_id>')
+    api.add_resource(DocumentTableTagAPI, '/document_table_tag')
 
     api.add_resource(DocumentUsersAPI, '/document_user')
     api.add_resource(DocumentUserAPI, '/document_user/<document_id>')
@@ -0,0 +1,60 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+from http import HTTPStatus
+from typing import Any, Iterable  # noqa: F401
+
+from flasgger import swag_from
+from flask_restful import Resource, reqparse
+
+from search_service.api.dashboard import DASHBOARD_INDEX
+from search_service.api.table import TABLE_INDEX
+from search_service.api.user import USER_INDEX
+from search_service.models.autocomplete import AutocompleteResultSchema
+from search_service.proxy import get_proxy_client
+
+DEFAULT_AUTOCOMPLETE_LIMIT = 10
+# indices with a completion suggester field, other indices are rejected as a bad request
+AUTOCOMPLETE_INDICES = (TABLE_INDEX, DASHBOARD_INDEX, USER_INDEX)
+
+
+class AutocompleteAPI(Resource):
+    """
+    Typeahead API, serving name prefix lookups without full search scoring
+    """
+
+    def __init__(self) -> None:
+        self.proxy = get_proxy_client()
+
+        self.parser = reqparse.RequestParser(bundle_errors=True)
+
+        self.parser.add_argument('query_term', required=True, type=str)
+        self.parser.add_argument('index', required=False, default=TABLE_INDEX, type=str, choices=AUTOCOMPLETE_INDICES)
+        self.parser.add_argument('limit', required=False, default=DEFAULT_AUTOCOMPLETE_LIMIT, type=int)
+
+        super(AutocompleteAPI, self).__init__()
+
+    @swag_from('swagger_doc/autocomplete.yml')
+    def get(self) -> Iterable[Any]:
+        """
+        Fetch typeahead suggestions whose name starts with query_term.
+
+        :return: list of suggestions. List can be empty if query
+        doesn't match any name
+        """
+        args = self.parser.parse_args(strict=True)
+
+        try:
+
+            results = self.proxy.fetch_autocomplete_results(
+                query_term=args.get('query_term'),
+                index=args.get('index'),
+                limit=args.get('limit')
+            )
+
+            return AutocompleteResultSchema().dump(results), HTTPStatus.OK
+
+        except RuntimeError:
+
+            err_msg = 'Exception encountered while processing autocomplete request'
+            return {'message': err_msg}, HTTPStatus.INTERNAL_SERVER_ERROR
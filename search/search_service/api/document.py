@@ -1,10 +1,13 @@
 # Copyright Contributors to the Amundsen project.
 # SPDX-License-Identifier: Apache-2.0
 
+import json
 import logging
 from ast import literal_eval
 from http import HTTPStatus
-from typing import Any, Tuple
+from typing import (
+    Any, Dict, List, Tuple,
+)
 
 from flasgger import swag_from
 from flask_restful import Resource, reqparse
@@ -13,6 +16,7 @@ from marshmallow.exceptions import ValidationError
 from search_service.api.feature import FEATURE_INDEX
 from search_service.api.table import TABLE_INDEX
 from search_service.api.user import USER_INDEX
+from search_service.exception import BulkDocumentException, NotFoundException
 from search_service.models.feature import FeatureSchema
 from search_service.models.table import TableSchema
 from search_service.models.user import UserSchema
@@ -21,6 +25,23 @@ from search_service.proxy.base import BaseProxy
 
 LOGGER = logging.getLogger(__name__)
 
+# Number of per-document errors returned in the response of a partially failed bulk request
+MAX_REPORTED_ERRORS = 100
+
+
+def _load_document(value: Any) -> Dict[str, Any]:
+    """
+    Parses a single document of the documents API payload. JSON request bodies carry documents
+    as objects and are used as is, documents sent as form values or strings are decoded as JSON,
+    falling back to python literals for clients sending stringified python dicts.
+    """
+    if isinstance(value, dict):
+        return value
+    try:
+        return json.loads(value)
+    except ValueError:
+        return literal_eval(value)
+
 
 class BaseDocumentAPI(Resource):
     def __init__(self, schema: Any, proxy: BaseProxy) -> None:
@@ -41,6 +62,10 @@ class BaseDocumentAPI(Resource):
         try:
             self.proxy.delete_document(data=[document_id], index=args.get('index'))
             return {}, HTTPStatus.OK
+        except BulkDocumentException as e:
+            err_msg = 'Exception encountered while deleting document '
+            LOGGER.error(err_msg + str(e))
+            return {'message': err_msg, 'errors': e.errors}, HTTPStatus.INTERNAL_SERVER_ERROR
         except RuntimeError as e:
             err_msg = 'Exception encountered while deleting document '
             LOGGER.error(err_msg + str(e))
@@ -54,6 +79,34 @@ class BaseDocumentsAPI(Resource):
         self.parser = reqparse.RequestParser(bundle_errors=True)
         super(BaseDocumentsAPI, self).__init__()
 
+    def _load_data(self, data: List[Any]) -> List[Any]:
+        """
+        Validates documents one at a time with a single schema instance, so invalid documents are
+        reported by position without materializing intermediate copies of the whole batch.
+        """
+        schema = self.schema()
+        documents = []
+        errors = {}  # type: Dict[int, Any]
+        for i, item in enumerate(data):
+            try:
+                documents.append(schema.load(_load_document(item)))
+            except ValidationError as e:
+                errors[i] = e.messages
+
+        if errors:
+            logging.warning("Invalid input for %s of %s documents: %s", len(errors), len(data), errors)
+            raise ValidationError("Invalid input")
+        return documents
+
+    def _bulk_error_response(self, e: BulkDocumentException) -> Tuple[Any, int]:
+        err_msg = 'Exception encountered while updating documents '
+        LOGGER.error(err_msg + str(e))
+        return {'message': err_msg,
+                'index': e.index,
+                'total_count': e.total,
+                'error_count': len(e.errors),
+                'errors': e.errors[:MAX_REPORTED_ERRORS]}, HTTPStatus.INTERNAL_SERVER_ERROR
+
     def post(self) -> Tuple[Any, int]:
         """
          Uses the Elasticsearch bulk API to load data from JSON. Uses Elasticsearch
@@ -62,19 +115,16 @@ class BaseDocumentsAPI(Resource):
          :param data: list of data objects to be indexed in Elasticsearch
          :return: name of new index
          """
-        self.parser.add_argument('data', required=True, action='append')
+        self.parser.add_argument('data', required=True, action='append', type=_load_document)
         args = self.parser.parse_args()
 
         try:
-            data_list = [literal_eval(item) for item in args.get('data')]
-            try:
-                data = self.schema(many=True).load(data_list)
-            except ValidationError as e:
-                logging.warning("Invalid input: %s", e.messages)
-                raise ValidationError("Invalid input")
+            data = self._load_data(args.get('data'))
 
             results = self.proxy.create_document(data=data, index=args.get('index'))
             return results, HTTPStatus.OK
+        except BulkDocumentException as e:
+            return self._bulk_error_response(e)
         except RuntimeError as e:
             err_msg = 'Exception encountered while updating documents '
             LOGGER.error(err_msg + str(e))
@@ -88,20 +138,16 @@ class BaseDocumentsAPI(Resource):
         :param data: list of data objects to be indexed in Elasticsearch
         :return: name of index
         """
-        self.parser.add_argument('data', required=True, action='append')
+        self.parser.add_argument('data', required=True, action='append', type=_load_document)
         args = self.parser.parse_args()
 
         try:
-            data_list = [literal_eval(item) for item in args.get('data')]
-            try:
-                data = self.schema(many=True).load(data_list)
-            except ValidationError as e:
-                logging.warning("Invalid input: %s", e.messages)
-
-                raise ValidationError("Invalid input")
+            data = self._load_data(args.get('data'))
 
             results = self.proxy.update_document(data=data, index=args.get('index'))
             return results, HTTPStatus.OK
+        except BulkDocumentException as e:
+            return self._bulk_error_response(e)
         except RuntimeError as e:
             err_msg = 'Exception encountered while updating documents '
             LOGGER.error(err_msg + str(e))
@@ -134,6 +180,44 @@ class DocumentTablesAPI(BaseDocumentsAPI):
         return super().put()
 
 
+class DocumentTableTagAPI(Resource):
+    """
+    Adds or removes a single tag of a table document in place, identified by table key
+    """
+
+    def __init__(self) -> None:
+        self.proxy = get_proxy_client()
+        self.parser = reqparse.RequestParser(bundle_errors=True)
+        self.parser.add_argument('key', required=True, type=str)
+        self.parser.add_argument('tag', required=True, type=str)
+        self.parser.add_argument('index', required=False, default=TABLE_INDEX, type=str)
+        super(DocumentTableTagAPI, self).__init__()
+
+    def _update_tag(self, *, delete: bool) -> Tuple[Any, int]:
+        args = self.parser.parse_args()
+
+        try:
+            results = self.proxy.update_document_tag(key=args.get('key'),
+                                                     tag=args.get('tag'),
+                                                     delete=delete,
+                                                     index=args.get('index'))
+            return results, HTTPStatus.OK
+        except NotFoundException:
+            return {'message': f'Document {args.get("key")} does not exist'}, HTTPStatus.NOT_FOUND
+        except RuntimeError as e:
+            err_msg = 'Exception encountered while updating document tag '
+            LOGGER.error(err_msg + str(e))
+            return {'message': err_msg}, HTTPStatus.INTERNAL_SERVER_ERROR
+
+    @swag_from('swagger_doc/document/table_tag_put.yml')
+    def put(self) -> Tuple[Any, int]:
+        return self._update_tag(delete=False)
+
+    @swag_from('swagger_doc/document/table_tag_delete.yml')
+    def delete(self) -> Tuple[Any, int]:
+        return self._update_tag(delete=True)
+
+
 class DocumentUserAPI(BaseDocumentAPI):
 
     def __init__(self) -> None:
@@ -7,6 +7,12 @@ ELASTICSEARCH_INDEX_KEY = 'ELASTICSEARCH_INDEX'
 SEARCH_PAGE_SIZE_KEY = 'SEARCH_PAGE_SIZE'
 STATS_FEATURE_KEY = 'STATS'
 
+ELASTICSEARCH_BULK_CHUNK_SIZE_KEY = 'ELASTICSEARCH_BULK_CHUNK_SIZE'
+ELASTICSEARCH_BULK_MAX_CHUNK_BYTES_KEY = 'ELASTICSEARCH_BULK_MAX_CHUNK_BYTES'
+ELASTICSEARCH_BULK_THREAD_COUNT_KEY = 'ELASTICSEARCH_BULK_THREAD_COUNT'
+ELASTICSEARCH_BULK_MAX_RETRIES_KEY = 'ELASTICSEARCH_BULK_MAX_RETRIES'
+ELASTICSEARCH_BULK_INITIAL_BACKOFF_KEY = 'ELASTICSEARCH_BULK_INITIAL_BACKOFF'
+
 PROXY_ENDPOINT = 'PROXY_ENDPOINT'
 PROXY_USER = 'PROXY_USER'
 PROXY_PASSWORD = 'PROXY_PASSWORD'
@@ -32,6 +38,15 @@ class Config:
     # Config used by ElastichSearch
     ELASTICSEARCH_INDEX = 'table_search_index'
 
+    # Document API bulk writes are split into chunks bounded by number of documents and
+    # request size, which are sent concurrently. Chunks rejected by Elasticsearch (HTTP 429)
+    # are retried with exponential backoff.
+    ELASTICSEARCH_BULK_CHUNK_SIZE = 500
+    ELASTICSEARCH_BULK_MAX_CHUNK_BYTES = 10 * 1024 * 1024
+    ELASTICSEARCH_BULK_THREAD_COUNT = 4
+    ELASTICSEARCH_BULK_MAX_RETRIES = 3
+    ELASTICSEARCH_BULK_INITIAL_BACKOFF = 2
+
     SWAGGER_ENABLED = os.environ.get('SWAGGER_ENABLED', False)
 
 
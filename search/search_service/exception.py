@@ -1,7 +1,23 @@
 # Copyright Contributors to the Amundsen project.
 # SPDX-License-Identifier: Apache-2.0
 
+from typing import (
+    Any, Dict, List,
+)
+
 
 class NotFoundException(Exception):
     def __init__(self, message: str) -> None:
         super().__init__(message)
+
+
+class BulkDocumentException(Exception):
+    """
+    Raised when some of the documents sent through the bulk document API failed to be written.
+    Carries the per-document errors reported by the search engine.
+    """
+    def __init__(self, message: str, *, index: str, total: int, errors: List[Dict[str, Any]]) -> None:
+        super().__init__(message)
+        self.index = index
+        self.total = total
+        self.errors = errors
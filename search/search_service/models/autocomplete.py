@@ -0,0 +1,36 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+from typing import List, Optional
+
+import attr
+from marshmallow3_annotations.ext.attrs import AttrsSchema
+
+
+@attr.s(auto_attribs=True, kw_only=True)
+class AutocompleteSuggestion:
+    """
+    A single typeahead suggestion. {key} identifies the resource (table key, dashboard uri
+    or user email) and {name} is what should be displayed for it.
+    """
+    text: str
+    key: str
+    name: Optional[str] = None
+    score: float = 0.0
+
+
+class AutocompleteSuggestionSchema(AttrsSchema):
+    class Meta:
+        target = AutocompleteSuggestion
+        register_as_scheme = True
+
+
+@attr.s(auto_attribs=True, kw_only=True)
+class AutocompleteResult:
+    results: List[AutocompleteSuggestion] = attr.ib(factory=list)
+
+
+class AutocompleteResultSchema(AttrsSchema):
+    class Meta:
+        target = AutocompleteResult
+        register_as_scheme = True
@@ -13,6 +13,7 @@ from atlasclient.models import Entity, EntityCollection
 # default search page size
 from atlasclient.utils import parse_table_qualified_name
 
+from search_service.models.autocomplete import AutocompleteResult
 from search_service.models.dashboard import SearchDashboardResult
 from search_service.models.feature import SearchFeatureResult
 from search_service.models.table import SearchTableResult, Table
@@ -287,11 +288,24 @@ class AtlasProxy(BaseProxy):
                                      index: str = '') -> SearchFeatureResult:
         pass
 
+    def fetch_autocomplete_results(self, *,
+                                   query_term: str,
+                                   index: str = '',
+                                   limit: int = 10) -> AutocompleteResult:
+        raise NotImplementedError()
+
     def update_document(self, *, data: List[Dict[str, Any]], index: str = '') -> str:
         raise NotImplementedError()
 
     def create_document(self, *, data: List[Dict[str, Any]], index: str = '') -> str:
         raise NotImplementedError()
 
+    def update_document_tag(self, *, key: str, tag: str, delete: bool = False, index: str = '') -> str:
+        """
+        Atlas is searched directly, so the tag updated through the metadata service is already searchable
+        and there is no document to update
+        """
+        return index
+
     def delete_document(self, *, data: List[str], index: str = '') -> str:
         raise NotImplementedError()
@@ -6,6 +6,7 @@ from typing import (
     Any, Dict, List, Union,
 )
 
+from search_service.models.autocomplete import AutocompleteResult
 from search_service.models.dashboard import SearchDashboardResult
 from search_service.models.feature import SearchFeatureResult
 from search_service.models.table import SearchTableResult
@@ -56,6 +57,13 @@ class BaseProxy(metaclass=ABCMeta):
                                                                    SearchFeatureResult]:
         pass
 
+    @abstractmethod
+    def fetch_autocomplete_results(self, *,
+                                   query_term: str,
+                                   index: str = '',
+                                   limit: int = 10) -> AutocompleteResult:
+        pass
+
     @abstractmethod
     def update_document(self, *,
                         data: List[Dict[str, Any]],
@@ -68,6 +76,14 @@ class BaseProxy(metaclass=ABCMeta):
                         index: str = '') -> str:
         pass
 
+    @abstractmethod
+    def update_document_tag(self, *,
+                            key: str,
+                            tag: str,
+                            delete: bool = False,
+                            index: str = '') -> str:
+        pass
+
     @abstractmethod
     def delete_document(self, *,
                         data: List[str],
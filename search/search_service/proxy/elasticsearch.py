@@ -1,18 +1,22 @@
 # Copyright Contributors to the Amundsen project.
 # SPDX-License-Identifier: Apache-2.0
 
+import functools
 import itertools
+import json
 import logging
+import time
 import uuid
+from multiprocessing.pool import ThreadPool
 from typing import (
-    Any, Dict, List, Union,
+    Any, Dict, Iterator, List, Union,
 )
 
 from amundsen_common.models.index_map import (
     FEATURE_INDEX_MAP, TABLE_INDEX_MAP, USER_INDEX_MAP,
 )
 from elasticsearch import Elasticsearch
-from elasticsearch.exceptions import NotFoundError
+from elasticsearch.exceptions import NotFoundError, TransportError
 from elasticsearch_dsl import Search, query
 from flask import current_app
 
@@ -21,6 +25,8 @@ from search_service.api.dashboard import DASHBOARD_INDEX
 from search_service.api.feature import FEATURE_INDEX
 from search_service.api.table import TABLE_INDEX
 from search_service.api.user import USER_INDEX
+from search_service.exception import BulkDocumentException, NotFoundException
+from search_service.models.autocomplete import AutocompleteResult, AutocompleteSuggestion
 from search_service.models.dashboard import Dashboard, SearchDashboardResult
 from search_service.models.feature import Feature, SearchFeatureResult
 from search_service.models.search_result import SearchResult
@@ -33,6 +39,13 @@ from search_service.proxy.statsd_utilities import timer_with_counter
 # Default Elasticsearch index to use, if none specified
 DEFAULT_ES_INDEX = 'table_search_index'
 
+# Defaults for bulk document writes, see search_service.config.Config
+DEFAULT_BULK_CHUNK_SIZE = 500
+DEFAULT_BULK_MAX_CHUNK_BYTES = 10 * 1024 * 1024
+DEFAULT_BULK_THREAD_COUNT = 4
+DEFAULT_BULK_MAX_RETRIES = 3
+DEFAULT_BULK_INITIAL_BACKOFF = 2
+
 LOGGING = logging.getLogger(__name__)
 
 
@@ -65,6 +78,21 @@ class ElasticsearchProxy(BaseProxy):
         'tag': 'tags',
     }
 
+    # painless script removing {tag} from the tags of a document, then adding it back if {add} is set
+    UPDATE_TAG_SCRIPT = ('if (ctx._source.tags == null) { ctx._source.tags = []; } '
+                         'ctx._source.tags.removeIf(t -> t == params.tag); '
+                         'if (params.add) { ctx._source.tags.add(params.tag); }')
+    # the tag update is idempotent, so it is simply re-run when documents changed concurrently
+    UPDATE_TAG_MAX_ATTEMPTS = 3
+
+    # completion suggester field and the (key, display name) source fields returned for each suggestion
+    AUTOCOMPLETE_FIELD = 'name_suggest'
+    AUTOCOMPLETE_SOURCE_MAPPING = {
+        TABLE_INDEX: ('key', 'display_name'),
+        DASHBOARD_INDEX: ('uri', 'name'),
+        USER_INDEX: ('email', 'full_name'),
+    }
+
     # mapping to translate request for feature resources
     FEATURE_MAPPING = {
         'feature_group': 'feature_group.raw',
@@ -618,6 +646,54 @@ class ElasticsearchProxy(BaseProxy):
                                    model=Feature,
                                    search_result_model=SearchFeatureResult)
 
+    @timer_with_counter
+    def fetch_autocomplete_results(self, *,
+                                   query_term: str,
+                                   index: str = '',
+                                   limit: int = 10) -> AutocompleteResult:
+        """
+        Fetch typeahead suggestions using the completion suggester, which looks up name prefixes
+        in an in-memory FST instead of running a scored query.
+        `Link https://www.elastic.co/guide/en/elasticsearch/reference/current/search-suggesters.html`_
+
+        :param query_term: prefix typed by the user
+        :param index: index to get suggestions from, one of table, dashboard or user index
+        :param limit: max number of suggestions to return
+        :return: AutocompleteResult Object
+        """
+        current_index = index if index else TABLE_INDEX
+        if current_index not in self.AUTOCOMPLETE_SOURCE_MAPPING:
+            raise RuntimeError(f'the {current_index} doesnt have autocomplete support')
+        if not query_term:
+            # return empty result for blank query term
+            return AutocompleteResult(results=[])
+
+        key_field, name_field = self.AUTOCOMPLETE_SOURCE_MAPPING[current_index]
+        body = {
+            'size': 0,
+            '_source': [key_field, name_field],
+            'suggest': {
+                'autocomplete': {
+                    'prefix': query_term,
+                    'completion': {
+                        'field': self.AUTOCOMPLETE_FIELD,
+                        'size': limit
+                    }
+                }
+            }
+        }
+        response = self.elasticsearch.search(index=current_index, body=body)
+
+        results = []
+        for suggestion in response.get('suggest', {}).get('autocomplete', []):
+            for option in suggestion.get('options', []):
+                source = option.get('_source', {})
+                results.append(AutocompleteSuggestion(text=option['text'],
+                                                      key=source.get(key_field),
+                                                      name=source.get(name_field),
+                                                      score=option.get('_score', 0.0)))
+        return AutocompleteResult(results=results)
+
     # The following methods are related to document API that needs to update
     @timer_with_counter
     def create_document(self, *, data: Union[List[Table], List[User], List[Feature]], index: str) -> str:
@@ -649,6 +725,46 @@ class ElasticsearchProxy(BaseProxy):
 
         return self._update_document_helper(data=data, index=index)
 
+    @timer_with_counter
+    def update_document_tag(self, *, key: str, tag: str, delete: bool = False, index: str) -> str:
+        """
+        Adds or removes a tag of the documents identified by {key} in place, with a single
+        update by query request instead of reading and re-indexing the whole document.
+        Documents updated concurrently are counted as version conflicts, the update is then
+        retried up to {UPDATE_TAG_MAX_ATTEMPTS} times before failing.
+        :param key: resource key, e.g. table key
+        :param tag: tag name to add or remove
+        :param delete: removes the tag if True, adds it otherwise
+        :param index: alias of the index to update
+        :return: str
+        """
+        if not index:
+            raise Exception('Index cant be empty for updating document tag')
+
+        body = {
+            'query': {'term': {'key': key}},
+            'script': {
+                'lang': 'painless',
+                'source': self.UPDATE_TAG_SCRIPT,
+                'params': {'tag': tag, 'add': not delete}
+            }
+        }
+        for attempt in range(1, self.UPDATE_TAG_MAX_ATTEMPTS + 1):
+            result = self.elasticsearch.update_by_query(index=index, body=body, conflicts='proceed', refresh=True)
+
+            if result.get('failures'):
+                LOGGING.error(f'Error during Elasticsearch tag update of {key}')
+                LOGGING.debug(result['failures'])
+                raise RuntimeError(f'Failed to update tag {tag} of {key}')
+            if not result.get('total'):
+                raise NotFoundException(f'No document with key {key} in {index}')
+            if not result.get('version_conflicts'):
+                return index
+            LOGGING.warning(f'{result["version_conflicts"]} version conflicts during Elasticsearch tag update '
+                            f'of {key}, attempt {attempt} of {self.UPDATE_TAG_MAX_ATTEMPTS}')
+
+        raise RuntimeError(f'Failed to update tag {tag} of {key} because of concurrent updates')
+
     @timer_with_counter
     def delete_document(self, *, data: List[str], index: str) -> str:
         if not index:
@@ -663,26 +779,30 @@ class ElasticsearchProxy(BaseProxy):
         # fetch indices that use our chosen alias (should only ever return one in a list)
         indices = self._fetch_old_index(index)
 
+        errors = []  # type: List[Dict[str, Any]]
         for i in indices:
             # build a list of elasticsearch actions for bulk upload
             actions = self._build_index_actions(data=data, index_key=i)
 
             # bulk create or update data
-            self._bulk_helper(actions)
+            errors.extend(self._bulk_helper(actions))
 
+        self._raise_on_bulk_errors(errors=errors, index=index, total=len(data))
         return index
 
     def _update_document_helper(self, data: Union[List[Table], List[User], List[Feature]], index: str) -> str:
         # fetch indices that use our chosen alias (should only ever return one in a list)
         indices = self._fetch_old_index(index)
 
+        errors = []  # type: List[Dict[str, Any]]
         for i in indices:
             # build a list of elasticsearch actions for bulk update
             actions = self._build_update_actions(data=data, index_key=i)
 
             # bulk update existing documents in index
-            self._bulk_helper(actions)
+            errors.extend(self._bulk_helper(actions))
 
+        self._raise_on_bulk_errors(errors=errors, index=index, total=len(data))
         return index
 
     def _delete_document_helper(self, data: List[str], index: str) -> str:
@@ -699,13 +819,15 @@ class ElasticsearchProxy(BaseProxy):
         else:
             raise Exception(f'document deletion not supported for index {index}')
 
+        errors = []  # type: List[Dict[str, Any]]
         for i in indices:
             # build a list of elasticsearch actions for bulk deletion
             actions = self._build_delete_actions(data=data, index_key=i, type=type)
 
             # bulk delete documents in index
-            self._bulk_helper(actions)
+            errors.extend(self._bulk_helper(actions))
 
+        self._raise_on_bulk_errors(errors=errors, index=index, total=len(data))
         return index
 
     def _build_index_actions(
@@ -729,15 +851,147 @@ class ElasticsearchProxy(BaseProxy):
     def _build_delete_actions(self, data: List[str], index_key: str, type: str) -> List[Dict[str, Any]]:
         return [{'delete': {'_index': index_key, '_id': id, '_type': type}} for id in data]
 
-    def _bulk_helper(self, actions: List[Dict[str, Any]]) -> None:
-        result = self.elasticsearch.bulk(actions)
+    def _bulk_helper(self, actions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Sends bulk actions to Elasticsearch. Actions are split into chunks bounded by number of
+        documents and request size, the chunks are sent concurrently and documents rejected because
+        the cluster is overloaded (HTTP 429) are retried with exponential backoff.
+
+        :param actions: bulk request body, i.e. action and metadata lines each followed by its source
+        line where the action needs one
+        :return: list of per-document errors, empty if every document was written
+        """
+        chunk_size = current_app.config.get(config.ELASTICSEARCH_BULK_CHUNK_SIZE_KEY, DEFAULT_BULK_CHUNK_SIZE)
+        max_chunk_bytes = current_app.config.get(config.ELASTICSEARCH_BULK_MAX_CHUNK_BYTES_KEY,
+                                                 DEFAULT_BULK_MAX_CHUNK_BYTES)
+        thread_count = current_app.config.get(config.ELASTICSEARCH_BULK_THREAD_COUNT_KEY,
+                                              DEFAULT_BULK_THREAD_COUNT)
+        max_retries = current_app.config.get(config.ELASTICSEARCH_BULK_MAX_RETRIES_KEY, DEFAULT_BULK_MAX_RETRIES)
+        initial_backoff = current_app.config.get(config.ELASTICSEARCH_BULK_INITIAL_BACKOFF_KEY,
+                                                 DEFAULT_BULK_INITIAL_BACKOFF)
+
+        chunks = list(self._chunk_bulk_actions(actions, chunk_size=chunk_size, max_chunk_bytes=max_chunk_bytes))
+        send_chunk = functools.partial(self._send_bulk_chunk,
+                                       max_retries=max_retries,
+                                       initial_backoff=initial_backoff)
+
+        if len(chunks) <= 1 or thread_count <= 1:
+            results = [send_chunk(chunk) for chunk in chunks]
+        else:
+            with ThreadPool(processes=min(thread_count, len(chunks))) as pool:
+                results = pool.map(send_chunk, chunks)
 
-        if result['errors']:
+        errors = list(itertools.chain.from_iterable(results))
+        if errors:
             # ES's error messages are nested within elasticsearch objects and can
             # fail silently if you aren't careful
-            LOGGING.error('Error during Elasticsearch bulk actions')
-            LOGGING.debug(result['items'])
-            return
+            LOGGING.error(f'Error during Elasticsearch bulk actions for {len(errors)} documents')
+            LOGGING.debug(errors)
+        return errors
+
+    @staticmethod
+    def _chunk_bulk_actions(actions: List[Dict[str, Any]],
+                            chunk_size: int,
+                            max_chunk_bytes: int) -> Iterator[List[List[Dict[str, Any]]]]:
+        """
+        Groups bulk body lines per document and splits the documents into chunks holding at most
+        {chunk_size} documents and at most {max_chunk_bytes} bytes of serialized body (a single
+        document bigger than {max_chunk_bytes} is sent on its own).
+
+        :return: iterator of chunks, each chunk being a list of per-document body lines
+        """
+        chunk = []  # type: List[List[Dict[str, Any]]]
+        chunk_bytes = 0
+        i = 0
+        while i < len(actions):
+            action = actions[i]
+            op_type = next(iter(action))
+            # every operation but delete is followed by a source line
+            step = 1 if op_type == 'delete' else 2
+            document = actions[i:i + step]
+            i += step
+
+            document_bytes = sum(len(json.dumps(line, default=str)) + 1 for line in document)
+            if chunk and (len(chunk) >= chunk_size or chunk_bytes + document_bytes > max_chunk_bytes):
+                yield chunk
+                chunk = []
+                chunk_bytes = 0
+            chunk.append(document)
+            chunk_bytes += document_bytes
+
+        if chunk:
+            yield chunk
+
+    def _send_bulk_chunk(self,
+                         chunk: List[List[Dict[str, Any]]],
+                         max_retries: int,
+                         initial_backoff: float) -> List[Dict[str, Any]]:
+        """
+        Sends one chunk of documents in a single bulk request. Documents rejected with HTTP 429
+        are resent up to {max_retries} times, doubling the backoff between attempts.
+
+        :return: list of per-document errors
+        """
+        errors = []  # type: List[Dict[str, Any]]
+        pending = chunk
+        for attempt in range(max_retries + 1):
+            if attempt > 0:
+                time.sleep(initial_backoff * 2 ** (attempt - 1))
+
+            try:
+                result = self.elasticsearch.bulk(list(itertools.chain.from_iterable(pending)))
+            except TransportError as e:
+                if e.status_code == 429 and attempt < max_retries:
+                    LOGGING.warning('Elasticsearch rejected bulk request, retrying')
+                    continue
+                raise
+
+            if not result['errors']:
+                return errors
+
+            rejected = self._collect_bulk_errors(documents=pending,
+                                                 items=result['items'],
+                                                 errors=errors,
+                                                 retry_rejected=attempt < max_retries)
+            if not rejected:
+                return errors
+            LOGGING.warning(f'Elasticsearch rejected {len(rejected)} documents, retrying')
+            pending = rejected
+
+        return errors
+
+    @staticmethod
+    def _collect_bulk_errors(*,
+                             documents: List[List[Dict[str, Any]]],
+                             items: List[Dict[str, Any]],
+                             errors: List[Dict[str, Any]],
+                             retry_rejected: bool) -> List[List[Dict[str, Any]]]:
+        """
+        Walks the per-document results of a bulk response, which come in request order, appending
+        failures to {errors}.
+
+        :return: documents rejected with HTTP 429 that should be retried
+        """
+        rejected = []
+        for document, item in zip(documents, items):
+            op_result = next(iter(item.values()))
+            if 'error' not in op_result:
+                continue
+            if op_result.get('status') == 429 and retry_rejected:
+                rejected.append(document)
+            else:
+                errors.append({'id': op_result.get('_id'),
+                               'status': op_result.get('status'),
+                               'error': op_result.get('error')})
+        return rejected
+
+    @staticmethod
+    def _raise_on_bulk_errors(*, errors: List[Dict[str, Any]], index: str, total: int) -> None:
+        if errors:
+            raise BulkDocumentException(f'{len(errors)} of {total} documents failed in index {index}',
+                                        index=index,
+                                        total=total,
+                                        errors=errors)
 
     def _fetch_old_index(self, alias: str) -> List[str]:
         """
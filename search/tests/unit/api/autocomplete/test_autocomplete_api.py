@@ -0,0 +1,73 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+from http import HTTPStatus
+from unittest import TestCase
+
+from mock import Mock, patch
+
+from search_service import create_app
+from search_service.models.autocomplete import AutocompleteResult, AutocompleteSuggestion
+
+
+class TestAutocompleteAPI(TestCase):
+
+    def setUp(self) -> None:
+        self.app = create_app(config_module_class='search_service.config.Config')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+        self.mock_client = patch('search_service.api.autocomplete.get_proxy_client')
+        self.mock_proxy = self.mock_client.start().return_value = Mock()
+
+    def tear_down(self) -> None:
+        self.app_context.pop()
+        self.mock_client.stop()
+
+    def test_should_get_suggestions(self) -> None:
+        self.mock_proxy.fetch_autocomplete_results.return_value = AutocompleteResult(results=[
+            AutocompleteSuggestion(text='test_table', key='hive://gold.test_schema/test_table',
+                                   name='test_schema.test_table', score=10.0)
+        ])
+
+        response = self.app.test_client().get('/autocomplete?query_term=test&limit=5')
+
+        expected_response = {
+            'results': [{'text': 'test_table',
+                         'key': 'hive://gold.test_schema/test_table',
+                         'name': 'test_schema.test_table',
+                         'score': 10.0}]
+        }
+        self.assertEqual(response.json, expected_response)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.mock_proxy.fetch_autocomplete_results.assert_called_with(query_term='test',
+                                                                      index='table_search_index',
+                                                                      limit=5)
+
+    def test_should_fail_without_query_term(self) -> None:
+        response = self.app.test_client().get('/autocomplete')
+
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+
+    def test_should_fail_with_unsupported_index(self) -> None:
+        response = self.app.test_client().get('/autocomplete?query_term=test&index=feature_search_index')
+
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+        self.mock_proxy.fetch_autocomplete_results.assert_not_called()
+
+    def test_should_get_user_suggestions(self) -> None:
+        self.mock_proxy.fetch_autocomplete_results.return_value = AutocompleteResult(results=[])
+
+        response = self.app.test_client().get('/autocomplete?query_term=test&index=user_search_index')
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.mock_proxy.fetch_autocomplete_results.assert_called_with(query_term='test',
+                                                                      index='user_search_index',
+                                                                      limit=10)
+
+    def test_should_fail_when_proxy_fails(self) -> None:
+        self.mock_proxy.fetch_autocomplete_results.side_effect = RuntimeError()
+
+        response = self.app.test_client().get('/autocomplete?query_term=test')
+
+        self.assertEqual(response.status_code, HTTPStatus.INTERNAL_SERVER_ERROR)
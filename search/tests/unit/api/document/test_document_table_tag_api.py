@@ -0,0 +1,64 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import unittest
+from http import HTTPStatus
+
+from mock import MagicMock, patch
+
+from search_service import create_app
+from search_service.exception import NotFoundException
+
+
+class TestDocumentTableTagAPI(unittest.TestCase):
+    def setUp(self) -> None:
+        self.app = create_app(config_module_class='search_service.config.Config')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+    def tear_down(self) -> None:
+        self.app_context.pop()
+
+    @patch('search_service.api.document.get_proxy_client')
+    def test_put(self, get_proxy: MagicMock) -> None:
+        mock_proxy = get_proxy.return_value
+        mock_proxy.update_document_tag.return_value = 'table_search_index'
+
+        response = self.app.test_client().put('/document_table_tag?key=db://cluster.schema/table&tag=tag_1')
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        mock_proxy.update_document_tag.assert_called_with(key='db://cluster.schema/table', tag='tag_1',
+                                                          delete=False, index='table_search_index')
+
+    @patch('search_service.api.document.get_proxy_client')
+    def test_delete(self, get_proxy: MagicMock) -> None:
+        mock_proxy = get_proxy.return_value
+        mock_proxy.update_document_tag.return_value = 'table_search_index'
+
+        response = self.app.test_client().delete('/document_table_tag?key=db://cluster.schema/table&tag=tag_1')
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        mock_proxy.update_document_tag.assert_called_with(key='db://cluster.schema/table', tag='tag_1',
+                                                          delete=True, index='table_search_index')
+
+    @patch('search_service.api.document.get_proxy_client')
+    def test_put_fails(self, get_proxy: MagicMock) -> None:
+        get_proxy.return_value.update_document_tag.side_effect = RuntimeError()
+
+        response = self.app.test_client().put('/document_table_tag?key=db://cluster.schema/table&tag=tag_1')
+
+        self.assertEqual(response.status_code, HTTPStatus.INTERNAL_SERVER_ERROR)
+
+    @patch('search_service.api.document.get_proxy_client')
+    def test_put_missing_document(self, get_proxy: MagicMock) -> None:
+        get_proxy.return_value.update_document_tag.side_effect = NotFoundException('missing')
+
+        response = self.app.test_client().put('/document_table_tag?key=db://cluster.schema/table&tag=tag_1')
+
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+    @patch('search_service.api.document.get_proxy_client')
+    def test_should_fail_without_tag(self, get_proxy: MagicMock) -> None:
+        response = self.app.test_client().put('/document_table_tag?key=db://cluster.schema/table')
+
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
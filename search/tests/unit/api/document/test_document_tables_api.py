@@ -12,6 +12,7 @@ from mock import (
 
 from search_service import create_app
 from search_service.api.document import DocumentTablesAPI
+from search_service.exception import BulkDocumentException
 from search_service.models.table import Table
 from search_service.models.tag import Tag
 
@@ -100,6 +101,44 @@ class TestDocumentTablesAPI(unittest.TestCase):
         with self.assertRaises(ValidationError):
             DocumentTablesAPI().put()
 
+    @patch('search_service.api.document.get_proxy_client')
+    def test_put_json_body(self, get_proxy: MagicMock) -> None:
+        mock_proxy = get_proxy.return_value = Mock()
+        mock_proxy.update_document.return_value = 'fake_index'
+        input_data = [{
+            'id': 'table1',
+            'key': 'table1',
+            'cluster': 'cluster1',
+            'database': 'database1',
+            'name': 'name1',
+            'schema': 'schema1',
+            'last_updated_timestamp': 12345678,
+            'tags': [{'tag_name': 'tag1'}]
+        }]
+        expected_data = [Table(id='table1', database='database1', cluster='cluster1', schema='schema1', name='name1',
+                               key='table1', tags=[Tag(tag_name='tag1')], last_updated_timestamp=12345678)]
+
+        response = self.app.test_client().put('/document_table', json={'data': input_data, 'index': 'fake_index'})
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        mock_proxy.update_document.assert_called_with(data=expected_data, index='fake_index')
+
+    @patch('search_service.api.document.reqparse.RequestParser')
+    @patch('search_service.api.document.get_proxy_client')
+    def test_put_returns_document_errors(self, get_proxy: MagicMock, RequestParser: MagicMock) -> None:
+        mock_proxy = get_proxy.return_value = Mock()
+        errors = [{'id': 'table1', 'status': 404, 'error': 'document_missing_exception'}]
+        mock_proxy.update_document.side_effect = BulkDocumentException('failed', index='fake_index', total=2,
+                                                                       errors=errors)
+        RequestParser().parse_args.return_value = dict(data=[], index='fake_index')
+
+        response, status = DocumentTablesAPI().put()
+
+        self.assertEqual(status, HTTPStatus.INTERNAL_SERVER_ERROR)
+        self.assertEqual(response['total_count'], 2)
+        self.assertEqual(response['error_count'], 1)
+        self.assertEqual(response['errors'], errors)
+
     def test_should_not_reach_create_with_id(self) -> None:
         response = self.app.test_client().post('/document_table/1')
 
@@ -291,3 +291,7 @@ class TestAtlasProxy(unittest.TestCase):
         self.assertIsInstance(resp, SearchTableResult, "Search result received is not of 'SearchResult' type!")
         self.assertDictEqual(vars(resp), vars(expected),
                              "Search Result doesn't match with expected result!")
+
+    def test_update_document_tag(self) -> None:
+        self.assertEqual(self.proxy.update_document_tag(key='db://cluster.schema/table', tag='tag_1',
+                                                        index='table_search_index'), 'table_search_index')
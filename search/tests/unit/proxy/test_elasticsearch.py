@@ -13,6 +13,8 @@ from search_service import create_app
 from search_service.api.feature import FEATURE_INDEX
 from search_service.api.table import TABLE_INDEX
 from search_service.api.user import USER_INDEX
+from search_service.exception import BulkDocumentException, NotFoundException
+from search_service.models.autocomplete import AutocompleteResult, AutocompleteSuggestion
 from search_service.models.dashboard import Dashboard
 from search_service.models.feature import Feature, SearchFeatureResult
 from search_service.models.search_result import SearchResult
@@ -514,6 +516,40 @@ class TestElasticsearchProxy(unittest.TestCase):
         self.assertDictEqual(vars(resp.results[0]), vars(expected.results[0]),
                              "Search Result doesn't match with expected result!")
 
+    def test_fetch_autocomplete_results(self) -> None:
+        mock_elasticsearch = self.es_proxy.elasticsearch
+        mock_elasticsearch.search.return_value = {
+            'suggest': {
+                'autocomplete': [{
+                    'text': 'test',
+                    'options': [{'text': 'test_table',
+                                 '_score': 10.0,
+                                 '_source': {'key': 'test_key', 'display_name': 'test_schema.test_table'}}]
+                }]
+            }
+        }
+
+        result = self.es_proxy.fetch_autocomplete_results(query_term='test', index=TABLE_INDEX, limit=5)
+
+        expected = AutocompleteResult(results=[AutocompleteSuggestion(text='test_table',
+                                                                      key='test_key',
+                                                                      name='test_schema.test_table',
+                                                                      score=10.0)])
+        self.assertEqual(result, expected)
+        body = mock_elasticsearch.search.call_args[1]['body']
+        self.assertEqual(body['suggest']['autocomplete']['prefix'], 'test')
+        self.assertEqual(body['suggest']['autocomplete']['completion'], {'field': 'name_suggest', 'size': 5})
+
+    def test_fetch_autocomplete_results_with_empty_query_term(self) -> None:
+        result = self.es_proxy.fetch_autocomplete_results(query_term='', index=USER_INDEX)
+
+        self.assertEqual(result, AutocompleteResult(results=[]))
+        self.es_proxy.elasticsearch.search.assert_not_called()
+
+    def test_fetch_autocomplete_results_unsupported_index(self) -> None:
+        with self.assertRaises(RuntimeError):
+            self.es_proxy.fetch_autocomplete_results(query_term='test', index=FEATURE_INDEX)
+
     def test_create_document_with_no_data(self) -> None:
         expected = ''
         result = self.es_proxy.create_document(data=None, index='table_search_index')
@@ -704,6 +740,113 @@ class TestElasticsearchProxy(unittest.TestCase):
         self.assertEqual(expected_alias, result)
         mock_elasticsearch.bulk.assert_called_with(expected_data)
 
+    def test_delete_document_chunks_bulk_actions(self) -> None:
+        mock_elasticsearch = self.es_proxy.elasticsearch
+        mock_elasticsearch.indices.get_alias.return_value = dict([('tester_index_name', {})])
+        mock_elasticsearch.bulk.return_value = {'errors': False}
+        self.app.config['ELASTICSEARCH_BULK_CHUNK_SIZE'] = 2
+        data = ['id1', 'id2', 'id3']
+
+        self.es_proxy.delete_document(data=data, index='table_search_index')
+
+        self.assertEqual(mock_elasticsearch.bulk.call_count, 2)
+        sent_ids = sorted(action['delete']['_id']
+                          for call in mock_elasticsearch.bulk.call_args_list
+                          for action in call[0][0])
+        self.assertEqual(sent_ids, data)
+
+    def test_chunk_bulk_actions_by_size(self) -> None:
+        actions = self.es_proxy._build_update_actions(data=[self.mock_result3, self.mock_result3],
+                                                      index_key='tester_index_name')
+
+        chunks = list(self.es_proxy._chunk_bulk_actions(actions, chunk_size=100, max_chunk_bytes=1))
+
+        self.assertEqual(len(chunks), 2)
+        self.assertEqual(chunks[0], [actions[0:2]])
+        self.assertEqual(chunks[1], [actions[2:4]])
+
+    @patch('search_service.proxy.elasticsearch.time.sleep')
+    def test_update_document_retries_rejected_documents(self, mock_sleep: MagicMock) -> None:
+        mock_elasticsearch = self.es_proxy.elasticsearch
+        mock_elasticsearch.indices.get_alias.return_value = dict([('tester_index_name', {})])
+        mock_elasticsearch.bulk.side_effect = [
+            {'errors': True, 'items': [{'update': {'_id': 'test_key3', 'status': 429, 'error': 'rejected'}}]},
+            {'errors': False, 'items': [{'update': {'_id': 'test_key3', 'status': 200}}]}
+        ]
+
+        result = self.es_proxy.update_document(data=[self.mock_result3], index='table_search_index')
+
+        self.assertEqual(result, 'table_search_index')
+        self.assertEqual(mock_elasticsearch.bulk.call_count, 2)
+        mock_sleep.assert_called_once()
+
+    def test_update_document_raises_with_document_errors(self) -> None:
+        mock_elasticsearch = self.es_proxy.elasticsearch
+        mock_elasticsearch.indices.get_alias.return_value = dict([('tester_index_name', {})])
+        mock_elasticsearch.bulk.return_value = {
+            'errors': True,
+            'items': [{'update': {'_id': 'test_key3', 'status': 404, 'error': 'document_missing_exception'}}]
+        }
+
+        with self.assertRaises(BulkDocumentException) as cm:
+            self.es_proxy.update_document(data=[self.mock_result3], index='table_search_index')
+
+        self.assertEqual(cm.exception.total, 1)
+        self.assertEqual(cm.exception.errors,
+                         [{'id': 'test_key3', 'status': 404, 'error': 'document_missing_exception'}])
+
+    def test_update_document_tag(self) -> None:
+        mock_elasticsearch = self.es_proxy.elasticsearch
+        mock_elasticsearch.update_by_query.return_value = {'total': 1, 'updated': 1, 'version_conflicts': 0,
+                                                           'failures': []}
+
+        result = self.es_proxy.update_document_tag(key='test_key', tag='tag_1', index='table_search_index')
+
+        self.assertEqual(result, 'table_search_index')
+        body = mock_elasticsearch.update_by_query.call_args[1]['body']
+        self.assertEqual(body['query'], {'term': {'key': 'test_key'}})
+        self.assertEqual(body['script']['params'], {'tag': 'tag_1', 'add': True})
+
+    def test_update_document_tag_retries_on_version_conflicts(self) -> None:
+        mock_elasticsearch = self.es_proxy.elasticsearch
+        mock_elasticsearch.update_by_query.side_effect = [
+            {'total': 1, 'updated': 0, 'version_conflicts': 1, 'failures': []},
+            {'total': 1, 'updated': 1, 'version_conflicts': 0, 'failures': []},
+        ]
+
+        result = self.es_proxy.update_document_tag(key='test_key', tag='tag_1', index='table_search_index')
+
+        self.assertEqual(result, 'table_search_index')
+        self.assertEqual(mock_elasticsearch.update_by_query.call_count, 2)
+
+    def test_update_document_tag_raises_on_persistent_version_conflicts(self) -> None:
+        mock_elasticsearch = self.es_proxy.elasticsearch
+        mock_elasticsearch.update_by_query.return_value = {'total': 1, 'updated': 0, 'version_conflicts': 1,
+                                                           'failures': []}
+
+        with self.assertRaises(RuntimeError):
+            self.es_proxy.update_document_tag(key='test_key', tag='tag_1', index='table_search_index')
+
+        self.assertEqual(mock_elasticsearch.update_by_query.call_count, ElasticsearchProxy.UPDATE_TAG_MAX_ATTEMPTS)
+
+    def test_update_document_tag_raises_on_missing_document(self) -> None:
+        mock_elasticsearch = self.es_proxy.elasticsearch
+        mock_elasticsearch.update_by_query.return_value = {'total': 0, 'updated': 0, 'version_conflicts': 0,
+                                                           'failures': []}
+
+        with self.assertRaises(NotFoundException):
+            self.es_proxy.update_document_tag(key='test_key', tag='tag_1', index='table_search_index')
+
+    def test_delete_document_tag_raises_on_failures(self) -> None:
+        mock_elasticsearch = self.es_proxy.elasticsearch
+        mock_elasticsearch.update_by_query.return_value = {'updated': 0, 'failures': [{'cause': 'error'}]}
+
+        with self.assertRaises(RuntimeError):
+            self.es_proxy.update_document_tag(key='test_key', tag='tag_1', delete=True, index='table_search_index')
+
+        body = mock_elasticsearch.update_by_query.call_args[1]['body']
+        self.assertEqual(body['script']['params'], {'tag': 'tag_1', 'add': False})
+
     def test_get_instance_string(self) -> None:
         result = self.es_proxy._get_instance('column', 'value')
         self.assertEqual('value', result)